@@ -0,0 +1 @@
+"""Benchmarks manuais de desempenho da aplicação Conecta SENAI."""
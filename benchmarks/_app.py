@@ -0,0 +1,71 @@
+"""Utilitários compartilhados pelos benchmarks.
+
+Os benchmarks rodam sobre um SQLite em memória e uma aplicação Flask mínima,
+sem depender de Redis ou de variáveis de ambiente de produção.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+os.environ.setdefault("DISABLE_REDIS", "1")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from conecta_senai.models import db  # noqa: E402
+
+
+def criar_app_benchmark(database_uri: str = "sqlite:///:memory:") -> Flask:
+    """Cria uma aplicação Flask com o banco inicializado."""
+
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("BENCH_DATABASE_URL", database_uri)
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SECRET_KEY"] = "benchmark"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@contextmanager
+def contar_queries() -> Iterator[List[str]]:
+    """Registra as instruções SQL executadas dentro do bloco."""
+
+    instrucoes: List[str] = []
+
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        instrucoes.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _registrar)
+    try:
+        yield instrucoes
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _registrar)
+
+
+def cronometrar(func: Callable[[], object], repeticoes: int = 5) -> float:
+    """Executa ``func`` ``repeticoes`` vezes e devolve o melhor tempo em ms."""
+
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def imprimir_comparacao(titulo: str, linhas: List[tuple]) -> None:
+    """Imprime uma tabela simples de resultados."""
+
+    print(f"\n{titulo}")
+    print("-" * len(titulo))
+    for nome, tempo_ms, queries in linhas:
+        print(f"{nome:<28} {tempo_ms:>10.2f} ms {queries:>8} queries")
@@ -0,0 +1,122 @@
+"""Busca de notícias: ``ILIKE`` versus índice textual.
+
+Cenário: 50 000 notícias com título, resumo e conteúdo (~80 palavras) e a
+primeira página (12 itens) de ``/api/noticias?busca=...`` para alguns termos.
+A versão anterior aplicava ``ILIKE '%termo%'`` em título e resumo — varredura
+completa que ignora o conteúdo; estender o ``ILIKE`` ao conteúdo torna a
+varredura ainda mais cara. A atual consulta o índice (FTS5 no SQLite,
+``tsvector`` + GIN no PostgreSQL via ``BENCH_DATABASE_URL``), ordena por
+relevância e gera os trechos apenas para os itens da página.
+
+Execução::
+
+    python -m benchmarks.busca_noticias [noticias]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, or_
+
+from benchmarks._app import contar_queries, criar_app_benchmark, cronometrar, imprimir_comparacao
+from conecta_senai.models import db
+from conecta_senai.models.noticia import Noticia
+from conecta_senai.services import noticia_busca
+
+NOTICIAS = 50_000
+POR_PAGINA = 12
+TERMOS = ("robótica", "matrícula aberta", "usinagem")
+VOCABULARIO = (
+    "curso técnico aprendizagem indústria escola unidade aluno professor evento "
+    "semana inscrição turma laboratório oficina competição projeto inovação "
+    "segurança trabalho qualidade energia automação elétrica mecânica logística "
+    "gestão tecnologia informação programa parceria empresa comunidade feira "
+    "palestra certificado vaga edital prazo resultado calendário atividade"
+).split()
+RAROS = ("robótica", "usinagem", "matrícula", "aberta")
+
+
+def _texto(gerador: random.Random, palavras: int) -> str:
+    tokens = [gerador.choice(VOCABULARIO) for _ in range(palavras)]
+    if gerador.random() < 0.02:
+        tokens[gerador.randrange(palavras)] = gerador.choice(RAROS)
+    return " ".join(tokens)
+
+
+def _popular(quantidade: int) -> None:
+    gerador = random.Random(42)
+    inicio = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    linhas = [
+        {
+            "titulo": _texto(gerador, 8).capitalize(),
+            "resumo": _texto(gerador, 20),
+            "conteudo": _texto(gerador, 80),
+            "ativo": True,
+            "destaque": False,
+            "marcar_calendario": False,
+            "data_publicacao": inicio + timedelta(minutes=indice),
+        }
+        for indice in range(quantidade)
+    ]
+    for lote in range(0, quantidade, 5000):
+        db.session.execute(insert(Noticia), linhas[lote:lote + 5000])
+    db.session.commit()
+
+
+def _busca_anterior(termo: str) -> None:
+    like = f"%{termo}%"
+    (
+        Noticia.query.filter(Noticia.ativo.is_(True))
+        .filter(or_(Noticia.titulo.ilike(like), Noticia.resumo.ilike(like)))
+        .order_by(Noticia.data_publicacao.desc(), Noticia.id.desc())
+        .paginate(page=1, per_page=POR_PAGINA, error_out=False)
+    )
+
+
+def _busca_like_conteudo(termo: str) -> None:
+    like = f"%{termo}%"
+    (
+        Noticia.query.filter(Noticia.ativo.is_(True))
+        .filter(or_(Noticia.titulo.ilike(like), Noticia.resumo.ilike(like), Noticia.conteudo.ilike(like)))
+        .order_by(Noticia.data_publicacao.desc(), Noticia.id.desc())
+        .paginate(page=1, per_page=POR_PAGINA, error_out=False)
+    )
+
+
+def _busca_indice(termo: str) -> None:
+    consulta = noticia_busca.aplicar_busca(Noticia.query.filter(Noticia.ativo.is_(True)), termo)
+    pagina = consulta.paginate(page=1, per_page=POR_PAGINA, error_out=False)
+    noticia_busca.trechos([noticia.id for noticia in pagina.items], termo)
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else NOTICIAS
+    app = criar_app_benchmark()
+    with app.test_request_context():
+        _popular(quantidade)
+        indice = noticia_busca.indice_disponivel() or "sem índice"
+
+        def medir(funcao):
+            def executar():
+                for termo in TERMOS:
+                    funcao(termo)
+                    db.session.expire_all()
+
+            with contar_queries() as queries:
+                executar()
+            return cronometrar(executar, repeticoes=5) / len(TERMOS), len(queries) // len(TERMOS)
+
+        linhas = [
+            ("ILIKE título/resumo (ant.)", *medir(_busca_anterior)),
+            ("ILIKE incluindo conteúdo", *medir(_busca_like_conteudo)),
+            (f"índice textual ({indice})", *medir(_busca_indice)),
+        ]
+
+    imprimir_comparacao(f"{quantidade} notícias — média por busca (página de {POR_PAGINA})", linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Teste de carga do Gunicorn com 1, 2, 4… workers no perfil de produção.
+
+Sobe o app com ``gunicorn.conf.py`` (``GUNICORN_PERFIL=producao``: app
+pré-carregado e reinicialização no ``post_fork``) sobre um SQLite em arquivo
+com 50 salas e um mês de ocupações, e dispara requisições autenticadas a
+``/api/ocupacoes/resumo-periodo`` a partir de vários processos clientes. O
+cache HTTP é desligado para que cada requisição exerça a rota.
+
+A vazão deve crescer com o número de workers até o número de núcleos
+(``os.cpu_count()``); acima disso fica estável.
+
+Execução::
+
+    python -m benchmarks.carga_gunicorn [requisicoes_por_cliente]
+"""
+
+from __future__ import annotations
+
+import http.client
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SALAS = 50
+REQUISICOES = 200
+CAMINHO = "/api/ocupacoes/resumo-periodo?data_inicio=2025-03-01&data_fim=2025-03-31"
+
+
+def _ambiente(banco: str) -> dict:
+    env = dict(os.environ)
+    env.update(
+        {
+            "DATABASE_URL": f"sqlite:///{banco}",
+            "SECRET_KEY": "benchmark-carga",
+            "DISABLE_REDIS": "1",
+            "RATELIMIT_STORAGE_URI": "memory://",
+            "SCHEDULER_ENABLED": "0",
+            "CACHE_HTTP_TTL": "0",
+            "GUNICORN_PERFIL": "producao",
+            "PYTHONPATH": RAIZ,
+        }
+    )
+    return env
+
+
+def _preparar_banco(env: dict) -> str:
+    """Cria o banco de teste e devolve um token de administrador."""
+
+    os.environ.update(env)
+    from conecta_senai import create_app
+    from conecta_senai.models import db
+    from conecta_senai.models.ocupacao import Ocupacao, TURNOS_PADRAO
+    from conecta_senai.models.sala import Sala
+    from conecta_senai.models.user import User
+    from conecta_senai.routes.user import gerar_token_acesso
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        usuario = User(nome="Carga", email="carga@example.com", senha="Password1!", tipo="admin")
+        db.session.add(usuario)
+        db.session.add_all(Sala(nome=f"Sala {i:02d}", capacidade=30) for i in range(SALAS))
+        db.session.flush()
+        inicio = date(2025, 3, 1)
+        linhas = [
+            {
+                "sala_id": sala_id,
+                "usuario_id": usuario.id,
+                "curso_evento": f"Curso {sala_id}",
+                "data": inicio + timedelta(days=d),
+                "horario_inicio": h_inicio,
+                "horario_fim": h_fim,
+                "status": "confirmado",
+            }
+            for d in range(31)
+            for t, (h_inicio, h_fim) in enumerate(TURNOS_PADRAO.values())
+            for sala_id in range(1, SALAS + 1)
+            if (sala_id + d + t) % 2 == 0
+        ]
+        db.session.execute(db.insert(Ocupacao), linhas)
+        db.session.commit()
+        return gerar_token_acesso(usuario)
+
+
+def _porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _aguardar(porta: int, limite: float = 30.0) -> None:
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        try:
+            conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=1)
+            conexao.request("GET", "/health")
+            if conexao.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Gunicorn não respondeu a /health")
+
+
+def _cliente(args) -> int:
+    porta, token, requisicoes = args
+    conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=30)
+    headers = {"Authorization": f"Bearer {token}"}
+    ok = 0
+    for _ in range(requisicoes):
+        conexao.request("GET", CAMINHO, headers=headers)
+        resposta = conexao.getresponse()
+        resposta.read()
+        ok += resposta.status == 200
+    return ok
+
+
+def _medir(env: dict, token: str, workers: int, requisicoes: int) -> float:
+    porta = _porta_livre()
+    processo = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "conecta_senai.main:create_app()",
+            "--config", os.path.join(RAIZ, "gunicorn.conf.py"),
+            "--bind", f"127.0.0.1:{porta}",
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "--access-logfile", os.devnull,
+        ],
+        cwd=RAIZ,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _aguardar(porta)
+        clientes = 2 * workers
+        with multiprocessing.Pool(clientes) as pool:
+            pool.map(_cliente, [(porta, token, 5)] * clientes)
+            inicio = time.perf_counter()
+            ok = sum(pool.map(_cliente, [(porta, token, requisicoes)] * clientes))
+            duracao = time.perf_counter() - inicio
+        assert ok == clientes * requisicoes, "requisições com erro"
+        return ok / duracao
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+
+
+def main() -> None:
+    requisicoes = int(sys.argv[1]) if len(sys.argv) > 1 else REQUISICOES
+    nucleos = os.cpu_count() or 1
+    contagens = sorted({1, *(n for n in (2, 4, 8, 16) if n <= nucleos), nucleos})
+
+    with tempfile.TemporaryDirectory() as pasta:
+        env = _ambiente(os.path.join(pasta, "carga.db"))
+        token = _preparar_banco(env)
+
+        titulo = f"Gunicorn (preload) — {CAMINHO.split('?')[0]}, {nucleos} núcleo(s)"
+        print(f"\n{titulo}\n{'-' * len(titulo)}")
+        base = None
+        for workers in contagens:
+            rps = _medir(env, token, workers, requisicoes)
+            base = base or rps
+            print(f"{workers:>3} worker(s) {rps:>10.1f} req/s {rps / base:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
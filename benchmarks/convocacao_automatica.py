@@ -0,0 +1,94 @@
+"""Convocação automática em lote único versus lotes paginados por chave.
+
+Cenário: 3 mil inscrições pendentes em 30 turmas. ``lote único`` lê todas as
+inscrições de uma vez, como a versão anterior do job; ``lotes de 200`` é o
+padrão atual, com commit por lote. Além do tempo e do número de consultas, é
+medido o pico de memória alocada (``tracemalloc``) durante a execução.
+
+Execução::
+
+    python -m benchmarks.convocacao_automatica [inscricoes]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks._app import contar_queries, criar_app_benchmark, imprimir_comparacao
+from conecta_senai.models import EmailOutbox, InscricaoTreinamento, Treinamento, TurmaTreinamento, db
+from conecta_senai.tasks.jobs.convocacao_automatica import convocacao_automatica_job
+
+INSCRICOES = 3000
+TURMAS = 30
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _popular(total: int) -> None:
+    treino = Treinamento(nome="Treino", codigo="BENCH", carga_horaria=8)
+    db.session.add(treino)
+    db.session.flush()
+    turmas = [
+        TurmaTreinamento(
+            treinamento_id=treino.id,
+            data_inicio=date(2025, 3, 1),
+            data_fim=date(2025, 3, 5),
+            local_realizacao="Local",
+            horario="08h",
+        )
+        for _ in range(TURMAS)
+    ]
+    db.session.add_all(turmas)
+    db.session.flush()
+    db.session.execute(
+        db.insert(InscricaoTreinamento),
+        [
+            {
+                "turma_id": turmas[i % TURMAS].id,
+                "nome": f"Aluno {i}",
+                "email": f"aluno{i}@example.com",
+                "cpf": str(i),
+            }
+            for i in range(total)
+        ],
+    )
+    db.session.commit()
+
+
+def _medir(lote: int) -> tuple:
+    db.session.execute(db.delete(EmailOutbox))
+    db.session.commit()
+    tracemalloc.start()
+    with contar_queries() as queries:
+        inicio = time.perf_counter()
+        resumo = convocacao_automatica_job(lote=lote)
+        duracao = (time.perf_counter() - inicio) * 1000
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, len(queries), pico, resumo
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else INSCRICOES
+    app = criar_app_benchmark()
+    app.template_folder = os.path.join(RAIZ, "templates")
+    with app.test_request_context():
+        _popular(total)
+        linhas = []
+        picos = []
+        for nome, lote in (("lote único", total), ("lotes de 200", 200)):
+            duracao, queries, pico, resumo = _medir(lote)
+            assert resumo["enfileiradas"] == total
+            linhas.append((nome, duracao, queries))
+            picos.append((nome, pico))
+
+    imprimir_comparacao(f"Convocação automática — {total} inscrições", linhas)
+    for nome, pico in picos:
+        print(f"{nome:<28} {pico / 1024 / 1024:>10.2f} MiB de pico")
+
+
+if __name__ == "__main__":
+    main()
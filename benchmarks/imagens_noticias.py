@@ -0,0 +1,93 @@
+"""Entrega de imagens de notícias: blob do banco versus arquivo por hash.
+
+Cenário: uma imagem de 300 KB servida 200 vezes por ``/api/noticias/imagens``.
+A versão anterior lia o ``LargeBinary`` do banco e o embrulhava em
+``BytesIO`` a cada requisição; a atual envia o arquivo endereçado por SHA-256
+direto do disco e responde ``304`` a quem já tem a imagem (``If-None-Match``).
+
+O SQLite em memória esconde o custo de trafegar o blob; em PostgreSQL cada
+requisição anterior transfere os 300 KB pela conexão, enquanto a atual só lê
+a linha de metadados (``conteudo`` é ``deferred``). Fora do cliente de testes,
+o Gunicorn envia o arquivo com ``sendfile``.
+
+Execução::
+
+    python -m benchmarks.imagens_noticias [requisicoes]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from io import BytesIO
+
+from flask import send_file
+from sqlalchemy.orm import undefer
+
+from benchmarks._app import contar_queries, criar_app_benchmark, cronometrar, imprimir_comparacao
+from conecta_senai.models import db
+from conecta_senai.models.imagem_noticia import ImagemNoticia
+from conecta_senai.models.noticia import Noticia
+from conecta_senai.routes.noticias import api_noticias_bp
+from conecta_senai.services.imagem_armazenamento import calcular_sha256, obter_armazenamento
+
+REQUISICOES = 200
+TAMANHO = 300 * 1024
+
+
+def _rota_anterior(imagem_id: int):
+    imagem = db.session.query(ImagemNoticia).options(undefer(ImagemNoticia.conteudo)).get(imagem_id)
+    return send_file(BytesIO(imagem.conteudo), mimetype=imagem.content_type)
+
+
+def main() -> None:
+    requisicoes = int(sys.argv[1]) if len(sys.argv) > 1 else REQUISICOES
+    with tempfile.TemporaryDirectory() as pasta:
+        app = criar_app_benchmark()
+        app.static_folder = pasta
+        app.register_blueprint(api_noticias_bp, url_prefix="/api")
+        app.add_url_rule("/anterior/<int:imagem_id>", view_func=_rota_anterior)
+        conteudo = os.urandom(TAMANHO)
+        sha256 = calcular_sha256(conteudo)
+
+        with app.app_context():
+            noticia = Noticia(titulo="Bench", conteudo="Bench")
+            noticia.imagem = ImagemNoticia(
+                nome_arquivo="bench.jpg",
+                caminho_relativo=obter_armazenamento().guardar(conteudo, sha256, ".jpg"),
+                conteudo=conteudo,
+                sha256=sha256,
+                tem_conteudo=True,
+                content_type="image/jpeg",
+            )
+            db.session.add(noticia)
+            db.session.commit()
+            imagem_id = noticia.imagem.id
+            url = noticia.imagem.url_publica
+
+        client = app.test_client()
+
+        def medir(caminho, headers=None):
+            def executar():
+                for _ in range(requisicoes):
+                    resposta = client.get(caminho, headers=headers)
+                    resposta.get_data()
+                    resposta.close()
+
+            with app.app_context():
+                with contar_queries() as queries:
+                    executar()
+                return cronometrar(executar, repeticoes=3), len(queries)
+
+        linhas = [
+            ("blob do banco (anterior)", *medir(f"/anterior/{imagem_id}")),
+            ("arquivo por hash", *medir(url)),
+            ("304 com If-None-Match", *medir(url, {"If-None-Match": f'"{sha256}"'})),
+        ]
+
+    imprimir_comparacao(f"Imagem de {TAMANHO // 1024} KB — {requisicoes} requisições", linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Jobs de notícias: laço no ORM versus ``UPDATE`` único.
+
+Cenário: 20 000 notícias agendadas e em destaque, todas vencidas. A versão
+anterior carregava cada notícia como objeto ORM para trocar ``ativo`` e, na
+expiração de destaques, percorria dia a dia ``_dias_uteis_decorridos`` para
+cada uma. A atual calcula o limite de dias úteis uma vez e executa um
+``UPDATE`` por job, sem trazer linhas para o Python. Também é medido o pico
+de memória alocada (``tracemalloc``, que encarece o laço anterior).
+
+Execução::
+
+    python -m benchmarks.jobs_noticias [noticias]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, update
+
+from benchmarks._app import contar_queries, criar_app_benchmark, imprimir_comparacao
+from conecta_senai.models import db
+from conecta_senai.models.noticia import Noticia
+from conecta_senai.services import noticia_service
+
+NOTICIAS = 20_000
+
+
+def _dias_uteis_decorridos(inicio: datetime, fim: datetime) -> int:
+    dia, dias = inicio.date(), 0
+    while dia < fim.date():
+        if dia.weekday() < 5:
+            dias += 1
+        dia += timedelta(days=1)
+    return dias
+
+
+def _jobs_anteriores() -> None:
+    agora = datetime.now(timezone.utc)
+    for noticia in Noticia.query.filter(Noticia.ativo.is_(False), Noticia.data_publicacao <= agora).all():
+        noticia.ativo = True
+    db.session.commit()
+    for noticia in Noticia.query.filter(Noticia.destaque.is_(True), Noticia.data_publicacao.isnot(None)).all():
+        publicacao = noticia.data_publicacao.replace(tzinfo=timezone.utc)
+        if _dias_uteis_decorridos(publicacao, agora) >= 5:
+            noticia.destaque = False
+    db.session.commit()
+
+
+def _jobs_atuais() -> None:
+    noticia_service.publicar_noticias_agendadas()
+    noticia_service.remover_destaques_expirados()
+
+
+def _popular(quantidade: int) -> None:
+    inicio = datetime.now(timezone.utc) - timedelta(days=400)
+    linhas = [
+        {
+            "titulo": f"Notícia {indice}",
+            "conteudo": "Conteúdo",
+            "ativo": False,
+            "destaque": True,
+            "marcar_calendario": False,
+            "data_publicacao": inicio + timedelta(minutes=indice),
+        }
+        for indice in range(quantidade)
+    ]
+    db.session.execute(insert(Noticia), linhas)
+    db.session.commit()
+
+
+def _restaurar() -> None:
+    db.session.execute(update(Noticia).values(ativo=False, destaque=True))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else NOTICIAS
+    app = criar_app_benchmark()
+    linhas = []
+    picos = []
+    with app.test_request_context():
+        _popular(quantidade)
+        for nome, jobs in (("laço no ORM (anterior)", _jobs_anteriores), ("UPDATE único", _jobs_atuais)):
+            _restaurar()
+            tracemalloc.start()
+            with contar_queries() as queries:
+                inicio = time.perf_counter()
+                jobs()
+                tempo_ms = (time.perf_counter() - inicio) * 1000
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            db.session.expunge_all()
+            linhas.append((nome, tempo_ms, len(queries)))
+            picos.append((nome, pico))
+
+    imprimir_comparacao(f"Publicação e expiração de destaques — {quantidade} notícias", linhas)
+    for nome, pico in picos:
+        print(f"{nome:<28} {pico / 1024 / 1024:>10.2f} MiB de pico")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compara a detecção de conflitos de ocupação dia a dia com o índice em memória.
+
+Cenário: uma sala com uma reserva recorrente de seis meses (dias úteis, turno
+da manhã) e uma nova solicitação para o mesmo período e turno.
+
+Execução::
+
+    python -m benchmarks.ocupacao_conflitos
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from benchmarks._app import contar_queries, criar_app_benchmark, cronometrar, imprimir_comparacao
+from conecta_senai.models import db
+from conecta_senai.models.ocupacao import Ocupacao, TURNOS_PADRAO
+from conecta_senai.models.sala import Sala
+from conecta_senai.models.user import User
+from conecta_senai.services.ocupacao_conflito_service import buscar_conflitos_periodo
+
+DIAS = 183
+
+
+def _popular(data_inicio: date) -> int:
+    usuario = User(nome="Bench", email="bench@example.com", senha="Password1!", tipo="admin")
+    sala = Sala(nome="Sala Bench", capacidade=30)
+    db.session.add_all([usuario, sala])
+    db.session.flush()
+    inicio, fim = TURNOS_PADRAO["Manhã"]
+    for deslocamento in range(DIAS):
+        dia = data_inicio + timedelta(days=deslocamento)
+        if dia.weekday() >= 5:
+            continue
+        db.session.add(
+            Ocupacao(
+                sala_id=sala.id,
+                usuario_id=usuario.id,
+                curso_evento="Curso semestral",
+                data=dia,
+                horario_inicio=inicio,
+                horario_fim=fim,
+                grupo_ocupacao_id="bench",
+            )
+        )
+    db.session.commit()
+    return sala.id
+
+
+def _legado(sala: Sala, data_inicio: date, data_fim: date):
+    """Implementação anterior: duas consultas por dia do período."""
+
+    inicio, fim = TURNOS_PADRAO["Manhã"]
+    conflitos = []
+    dia = data_inicio
+    while dia <= data_fim:
+        if not sala.is_disponivel(dia, inicio, fim):
+            conflitos.extend(Ocupacao.buscar_conflitos(sala.id, dia, inicio, fim))
+        dia += timedelta(days=1)
+    return conflitos
+
+
+def main() -> None:
+    app = criar_app_benchmark()
+    data_inicio = date(2025, 2, 3)
+    data_fim = data_inicio + timedelta(days=DIAS - 1)
+    inicio, fim = TURNOS_PADRAO["Manhã"]
+
+    with app.app_context():
+        sala_id = _popular(data_inicio)
+        sala = db.session.get(Sala, sala_id)
+
+        def indice():
+            return buscar_conflitos_periodo(sala_id, data_inicio, data_fim, inicio, fim)
+
+        assert [o.id for o in _legado(sala, data_inicio, data_fim)] == [o.id for o in indice()]
+
+        with contar_queries() as q_legado:
+            _legado(sala, data_inicio, data_fim)
+        with contar_queries() as q_indice:
+            indice()
+
+        imprimir_comparacao(
+            f"Reserva recorrente de {DIAS} dias",
+            [
+                ("dia a dia (legado)", cronometrar(lambda: _legado(sala, data_inicio, data_fim)), len(q_legado)),
+                ("índice em memória", cronometrar(indice), len(q_indice)),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
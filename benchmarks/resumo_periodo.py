@@ -0,0 +1,140 @@
+"""Compara o resumo de disponibilidade por dia e turno antes e depois da grade.
+
+Cenário: 100 salas ativas e um ano de ocupações (cerca de um terço das
+células sala × dia × turno ocupadas), resumidas como em
+``/ocupacoes/resumo-periodo``. A versão anterior carregava as entidades,
+buscava o instrutor de cada ocupação e calculava as salas livres de cada
+célula com teste de pertinência em lista; a atual usa
+``services/ocupacao_grade_service.py``.
+
+Execução::
+
+    python -m benchmarks.resumo_periodo [salas]
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import date, timedelta
+
+from benchmarks._app import contar_queries, criar_app_benchmark, cronometrar, imprimir_comparacao
+from conecta_senai.models import db
+from conecta_senai.models.instrutor import Instrutor
+from conecta_senai.models.ocupacao import Ocupacao, TURNOS_PADRAO
+from conecta_senai.models.sala import Sala
+from conecta_senai.models.user import User
+from conecta_senai.services.ocupacao_grade_service import carregar_grade_periodo
+
+SALAS = 100
+DIAS = 365
+INSTRUTORES = 20
+
+
+def _popular(salas: int, data_inicio: date) -> None:
+    usuario = User(nome="Bench", email="bench@example.com", senha="Password1!", tipo="admin")
+    db.session.add(usuario)
+    db.session.add_all(Sala(nome=f"Sala {i:03d}", capacidade=30) for i in range(salas))
+    db.session.add_all(
+        Instrutor(nome=f"Instrutor {i}", email=f"i{i}@example.com") for i in range(INSTRUTORES)
+    )
+    db.session.flush()
+    sala_ids = [s.id for s in Sala.query.order_by(Sala.id)]
+    instrutor_ids = [i.id for i in Instrutor.query.order_by(Instrutor.id)]
+    linhas = []
+    for deslocamento in range(DIAS):
+        dia = data_inicio + timedelta(days=deslocamento)
+        for t, (inicio, fim) in enumerate(TURNOS_PADRAO.values()):
+            for i, sala_id in enumerate(sala_ids):
+                if (i + deslocamento + t) % 3:
+                    continue
+                linhas.append(
+                    {
+                        "sala_id": sala_id,
+                        "instrutor_id": instrutor_ids[i % INSTRUTORES],
+                        "usuario_id": usuario.id,
+                        "curso_evento": f"Curso {i % 40}",
+                        "data": dia,
+                        "horario_inicio": inicio,
+                        "horario_fim": fim,
+                        "status": "confirmado",
+                    }
+                )
+    db.session.execute(db.insert(Ocupacao), linhas)
+    db.session.commit()
+
+
+def _legado(data_inicio: date, data_fim: date):
+    """Implementação anterior de ``obter_resumo_periodo``."""
+
+    db.session.expunge_all()
+    salas_ativas = Sala.query.filter_by(status='ativa').all()
+    total_salas = len(salas_ativas)
+    salas_dict = {s.id: s.nome for s in salas_ativas}
+    ocupacoes = Ocupacao.query.filter(
+        Ocupacao.data >= data_inicio,
+        Ocupacao.data <= data_fim,
+        Ocupacao.status.in_(['confirmado', 'pendente'])
+    ).all()
+
+    resumo = {}
+    dia = data_inicio
+    while dia <= data_fim:
+        resumo[dia.isoformat()] = {
+            turno: {'ocupadas': 0, 'salas_ocupadas': [], 'salas_livres': [], 'total_salas': total_salas}
+            for turno in TURNOS_PADRAO
+        }
+        dia += timedelta(days=1)
+
+    for oc in ocupacoes:
+        turno = oc.get_turno()
+        if not turno:
+            continue
+        info = resumo[oc.data.isoformat()][turno]
+        info['ocupadas'] += 1
+        info['salas_ocupadas'].append({
+            'sala_id': oc.sala_id,
+            'sala_nome': salas_dict.get(oc.sala_id, str(oc.sala_id)),
+            'curso_evento': oc.curso_evento,
+            'instrutor_nome': oc.instrutor.nome if oc.instrutor else None
+        })
+
+    for turnos in resumo.values():
+        for info in turnos.values():
+            ocupadas_ids = [s['sala_id'] for s in info['salas_ocupadas']]
+            info['salas_livres'] = [nome for sid, nome in salas_dict.items() if sid not in ocupadas_ids]
+            info['livres'] = info['total_salas'] - info['ocupadas']
+    return resumo
+
+
+def _grade(data_inicio: date, data_fim: date):
+    db.session.expunge_all()
+    return carregar_grade_periodo(data_inicio, data_fim).resumo()
+
+
+def main() -> None:
+    salas = int(sys.argv[1]) if len(sys.argv) > 1 else SALAS
+    app = criar_app_benchmark()
+    data_inicio = date(2025, 1, 1)
+    data_fim = data_inicio + timedelta(days=DIAS - 1)
+
+    with app.app_context():
+        _popular(salas, data_inicio)
+        assert _legado(data_inicio, data_fim) == _grade(data_inicio, data_fim)
+
+        with contar_queries() as q_legado:
+            _legado(data_inicio, data_fim)
+        with contar_queries() as q_grade:
+            _grade(data_inicio, data_fim)
+
+        imprimir_comparacao(
+            f"Resumo de {DIAS} dias × {len(TURNOS_PADRAO)} turnos, {salas} salas "
+            f"({Ocupacao.query.count()} ocupações)",
+            [
+                ("listas por célula (legado)", cronometrar(lambda: _legado(data_inicio, data_fim), 3), len(q_legado)),
+                ("grade de bits", cronometrar(lambda: _grade(data_inicio, data_fim), 3), len(q_grade)),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Requisições por segundo com e sem o filtro local de tokens revogados.
+
+Cenário: uma rota protegida por ``login_required`` recebe requisições com
+tokens válidos enquanto 5 mil outros tokens constam como revogados. Sem o
+filtro, cada requisição faz um ``GET`` no Redis; com ele, o Redis só é
+consultado quando o filtro acusa uma possível revogação.
+
+Sem ``REDIS_URL`` o Redis é simulado em memória com latência artificial por
+comando (``LATENCIA_MS``, padrão 0,3 ms, próxima de uma ida e volta na
+mesma rede local).
+
+Execução::
+
+    python -m benchmarks.revogacao_tokens [requisicoes]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import uuid
+
+from benchmarks._app import criar_app_benchmark
+from conecta_senai.auth.decorators import limpar_cache_autenticacao, login_required
+from conecta_senai.config.redis import DummyRedis, revogacao
+from conecta_senai.models import db
+from conecta_senai.models.user import User
+from conecta_senai.routes.user import gerar_token_acesso
+
+REQUISICOES = 2000
+REVOGADOS = 5000
+LATENCIA_MS = float(os.getenv("LATENCIA_MS", "0.3"))
+
+
+class RedisComLatencia(DummyRedis):
+    """``DummyRedis`` que espera ``LATENCIA_MS`` a cada ida ao servidor."""
+
+    def __init__(self, latencia_ms: float) -> None:
+        super().__init__()
+        self._latencia = latencia_ms / 1000
+
+    def get(self, nome):
+        time.sleep(self._latencia)
+        return super().get(nome)
+
+    def pipeline(self, transaction=True):
+        time.sleep(self._latencia)
+        return super().pipeline(transaction)
+
+
+def _cliente_redis():
+    url = os.getenv("REDIS_URL")
+    if url:
+        from redis import Redis
+
+        return Redis.from_url(url)
+    return RedisComLatencia(LATENCIA_MS)
+
+
+def _medir(app, token: str, requisicoes: int) -> float:
+    cliente = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    cliente.get("/protegida", headers=headers)
+    inicio = time.perf_counter()
+    for _ in range(requisicoes):
+        cliente.get("/protegida", headers=headers)
+    return requisicoes / (time.perf_counter() - inicio)
+
+
+def main() -> None:
+    requisicoes = int(sys.argv[1]) if len(sys.argv) > 1 else REQUISICOES
+    app = criar_app_benchmark()
+
+    @app.route("/protegida")
+    @login_required
+    def protegida():
+        return "ok"
+
+    redis = _cliente_redis()
+    with app.app_context():
+        usuario = User(nome="Bench", email="bench@example.com", senha="Senha@123", tipo="admin")
+        db.session.add(usuario)
+        db.session.commit()
+        token = gerar_token_acesso(usuario)
+
+    revogacao.configurar(redis, assinar=False)
+    revogacao.capacidade = 2 * REVOGADOS
+    expira = time.time() + 3600
+    for _ in range(REVOGADOS):
+        revogacao.revogar(str(uuid.uuid4()), expira)
+
+    print(f"\nRequisições autenticadas ({requisicoes}, {REVOGADOS} tokens revogados)")
+    print("-" * 60)
+    for nome, intervalo in (("GET no Redis (legado)", 0), ("filtro de Bloom local", 5)):
+        revogacao.configurar(redis, assinar=False)
+        revogacao.intervalo_sync = intervalo
+        revogacao.consultas_redis = 0
+        limpar_cache_autenticacao()
+        rps = _medir(app, token, requisicoes)
+        print(f"{nome:<28} {rps:>10.0f} req/s {revogacao.consultas_redis:>8} GETs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Compara a serialização de ocupações antes e depois do serializador compilado.
+
+Cenário: 10 mil ocupações distribuídas entre 20 salas e 10 instrutores,
+carregadas e convertidas com ``to_dict()`` como nas rotas de calendário e de
+ocupações por sala/instrutor. A versão anterior inspecionava o *mapper* a cada
+linha e carregava sala, instrutor e usuário sob demanda; a atual usa o
+serializador montado na importação do modelo e carrega as relações em lote.
+
+Execução::
+
+    python -m benchmarks.serializacao_ocupacoes [ocupacoes]
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy.inspection import inspect
+
+from benchmarks._app import contar_queries, criar_app_benchmark, cronometrar, imprimir_comparacao
+from conecta_senai.models import db
+from conecta_senai.models.instrutor import Instrutor
+from conecta_senai.models.ocupacao import Ocupacao, TURNOS_PADRAO
+from conecta_senai.models.sala import Sala
+from conecta_senai.models.user import User
+
+OCUPACOES = 10000
+SALAS = 20
+INSTRUTORES = 10
+
+
+def _popular(total: int) -> None:
+    usuario = User(nome="Bench", email="bench@example.com", senha="Password1!", tipo="admin")
+    salas = [Sala(nome=f"Sala {i}", capacidade=30) for i in range(SALAS)]
+    instrutores = [Instrutor(nome=f"Instrutor {i}", email=f"i{i}@example.com") for i in range(INSTRUTORES)]
+    db.session.add_all([usuario, *salas, *instrutores])
+    db.session.flush()
+    turnos = list(TURNOS_PADRAO.values())
+    inicio = date(2025, 1, 1)
+    db.session.add_all(
+        Ocupacao(
+            sala_id=salas[i % SALAS].id,
+            instrutor_id=instrutores[i % INSTRUTORES].id,
+            usuario_id=usuario.id,
+            curso_evento=f"Curso {i % 50}",
+            data=inicio + timedelta(days=i // (SALAS * len(turnos))),
+            horario_inicio=turnos[i % len(turnos)][0],
+            horario_fim=turnos[i % len(turnos)][1],
+            tipo_ocupacao="aula_regular",
+        )
+        for i in range(total)
+    )
+    db.session.commit()
+
+
+def _valor_legado(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, time):
+        return value.isoformat(timespec="minutes")
+    return value
+
+
+def _to_dict_legado(ocupacao: Ocupacao) -> dict:
+    """Implementação anterior de ``Ocupacao.to_dict``."""
+
+    mapper = inspect(ocupacao.__class__)
+    result = {}
+    for column in mapper.columns:
+        result[column.key] = _valor_legado(getattr(ocupacao, column.key))
+    result.update(
+        {
+            "duracao_minutos": int(
+                (
+                    datetime.combine(date.today(), ocupacao.horario_fim)
+                    - datetime.combine(date.today(), ocupacao.horario_inicio)
+                ).total_seconds() / 60
+            ),
+            "dia_semana": ocupacao.get_dia_semana(),
+            "turno": ocupacao.get_turno(),
+            "cor_tipo": ocupacao.get_cor_tipo(),
+        }
+    )
+    if ocupacao.sala:
+        result.update(
+            {
+                "sala_nome": ocupacao.sala.nome,
+                "sala_capacidade": ocupacao.sala.capacidade,
+                "sala_localizacao": ocupacao.sala.localizacao,
+            }
+        )
+    if ocupacao.instrutor:
+        result.update({"instrutor_nome": ocupacao.instrutor.nome, "instrutor_email": ocupacao.instrutor.email})
+    if ocupacao.usuario:
+        result["usuario_nome"] = ocupacao.usuario.nome
+    return result
+
+
+def _legado():
+    db.session.expunge_all()
+    return [_to_dict_legado(o) for o in Ocupacao.query.order_by(Ocupacao.id).all()]
+
+
+def _compilado():
+    db.session.expunge_all()
+    ocupacoes = Ocupacao.query.options(*Ocupacao.opcoes_serializacao()).order_by(Ocupacao.id).all()
+    return [o.to_dict() for o in ocupacoes]
+
+
+def _somente_serializacao(funcao):
+    db.session.expunge_all()
+    ocupacoes = Ocupacao.query.options(*Ocupacao.opcoes_serializacao()).order_by(Ocupacao.id).all()
+    return lambda: [funcao(o) for o in ocupacoes]
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else OCUPACOES
+    app = criar_app_benchmark()
+    with app.app_context():
+        _popular(total)
+        assert _legado() == _compilado()
+
+        with contar_queries() as q_legado:
+            _legado()
+        with contar_queries() as q_compilado:
+            _compilado()
+
+        imprimir_comparacao(
+            f"Carregar e serializar {total} ocupações",
+            [
+                ("inspeção + lazy (legado)", cronometrar(_legado, 3), len(q_legado)),
+                ("compilado + selectinload", cronometrar(_compilado, 3), len(q_compilado)),
+            ],
+        )
+        imprimir_comparacao(
+            f"Somente to_dict() de {total} ocupações já carregadas",
+            [
+                ("inspeção do mapper (legado)", cronometrar(_somente_serializacao(_to_dict_legado), 3), 0),
+                ("serializador compilado", cronometrar(_somente_serializacao(Ocupacao.to_dict), 3), 0),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
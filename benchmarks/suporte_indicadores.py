@@ -0,0 +1,146 @@
+"""Compara o cálculo legado de ``/indicadores`` com a consulta agregada única.
+
+Cenário: 100 mil chamados sintéticos distribuídos por status, urgência, área e
+tipo de equipamento, com tempos de atendimento/encerramento variados.
+
+Também mede uma consulta com período (um trimestre) sobre o agregado diário
+``suporte_indicadores_diarios`` versus a varredura de ``suporte_chamados``.
+
+Execução::
+
+    python -m benchmarks.suporte_indicadores [quantidade]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert
+
+from benchmarks._app import contar_queries, criar_app_benchmark, cronometrar, imprimir_comparacao
+from conecta_senai.models import db
+from conecta_senai.models.suporte_basedados import SuporteTipoEquipamento
+from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.services.suporte_indicadores_service import (
+    calcular_indicadores,
+    ler_filtros_indicadores,
+)
+from conecta_senai.services.suporte_rollup_service import reconstruir_rollup
+
+QUANTIDADE = 100_000
+STATUS = ("Aberto", "Em Atendimento", "Finalizado", "Cancelado")
+NIVEIS = ("Baixo", "Médio", "Alto")
+AREAS = ("Administrativo", "Ensino", "Manutenção")
+
+
+def _popular(quantidade: int) -> None:
+    rnd = random.Random(42)
+    tipos = [SuporteTipoEquipamento(nome=nome) for nome in ("Notebook", "Desktop", "Impressora", "Rede")]
+    db.session.add_all(tipos)
+    db.session.flush()
+    tipo_ids = [tipo.id for tipo in tipos]
+    base = datetime(2025, 1, 1)
+    linhas = []
+    for i in range(quantidade):
+        criado = base + timedelta(minutes=rnd.randrange(0, 525_600))
+        status = rnd.choice(STATUS)
+        inicio = criado + timedelta(minutes=rnd.randrange(5, 4_000)) if status != "Aberto" else None
+        fim = inicio + timedelta(minutes=rnd.randrange(5, 6_000)) if status == "Finalizado" else None
+        linhas.append({
+            "email": f"u{i}@example.com",
+            "area": rnd.choice(AREAS),
+            "tipo_equipamento_id": rnd.choice(tipo_ids),
+            "descricao_problema": "Problema",
+            "nivel_urgencia": rnd.choice(NIVEIS),
+            "status": status,
+            "created_at": criado,
+            "updated_at": criado,
+            "inicio_atendimento_at": inicio,
+            "encerrado_at": fim,
+        })
+    db.session.execute(insert(SuporteChamado), linhas)
+    db.session.commit()
+
+
+def _legado():
+    """Implementação anterior: ~14 consultas com subconsultas ``IN`` repetidas."""
+
+    query = db.session.query(SuporteChamado)
+    ids = lambda q: SuporteChamado.id.in_(q.with_entities(SuporteChamado.id).subquery())  # noqa: E731
+    epoch = lambda coluna: (  # noqa: E731
+        func.extract("epoch", coluna) - func.extract("epoch", SuporteChamado.created_at)
+    )
+
+    resultado = {"total": query.count()}
+    resultado["por_status"] = (
+        db.session.query(SuporteChamado.status, func.count(SuporteChamado.id))
+        .filter(ids(query)).group_by(SuporteChamado.status).all()
+    )
+    resultado["por_tipo"] = (
+        db.session.query(SuporteTipoEquipamento.nome, func.count(SuporteChamado.id))
+        .join(SuporteTipoEquipamento, SuporteTipoEquipamento.id == SuporteChamado.tipo_equipamento_id, isouter=True)
+        .filter(ids(query)).group_by(SuporteTipoEquipamento.nome).all()
+    )
+    resultado["por_urgencia"] = (
+        db.session.query(SuporteChamado.nivel_urgencia, func.count(SuporteChamado.id))
+        .filter(ids(query)).group_by(SuporteChamado.nivel_urgencia).all()
+    )
+    for coluna in (SuporteChamado.inicio_atendimento_at, SuporteChamado.encerrado_at):
+        db.session.query(func.avg(epoch(coluna))).filter(coluna.isnot(None)).filter(ids(query)).scalar()
+    com_atendimento = query.filter(SuporteChamado.inicio_atendimento_at.isnot(None))
+    if com_atendimento.count():
+        com_atendimento.filter(epoch(SuporteChamado.inicio_atendimento_at) < 86400).count()
+    for nivel in NIVEIS:
+        query_nivel = query.filter(SuporteChamado.nivel_urgencia == nivel)
+        for coluna in (SuporteChamado.inicio_atendimento_at, SuporteChamado.encerrado_at):
+            db.session.query(func.avg(epoch(coluna))).filter(coluna.isnot(None)).filter(ids(query_nivel)).scalar()
+    return resultado
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else QUANTIDADE
+    app = criar_app_benchmark()
+    with app.app_context():
+        _popular(quantidade)
+
+        def agregado():
+            return calcular_indicadores({})
+
+        assert agregado()["total_chamados"] == _legado()["total"]
+
+        with contar_queries() as q_legado:
+            _legado()
+        with contar_queries() as q_agregado:
+            agregado()
+
+        imprimir_comparacao(
+            f"Indicadores sobre {quantidade} chamados",
+            [
+                ("consultas separadas (legado)", cronometrar(_legado, 3), len(q_legado)),
+                ("agregação única", cronometrar(agregado, 3), len(q_agregado)),
+            ],
+        )
+
+        reconstruir_rollup()
+        filtros = ler_filtros_indicadores({"data_inicio": "2025-04-01", "data_fim": "2025-06-30"})
+
+        def periodo_direto():
+            return calcular_indicadores(filtros, usar_rollup=False)
+
+        def periodo_rollup():
+            return calcular_indicadores(filtros, usar_rollup=True)
+
+        assert periodo_direto()["total_chamados"] == periodo_rollup()["total_chamados"]
+        imprimir_comparacao(
+            "Indicadores de um trimestre",
+            [
+                ("agregação sobre chamados", cronometrar(periodo_direto, 3), 1),
+                ("agregado diário", cronometrar(periodo_rollup, 3), 1),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
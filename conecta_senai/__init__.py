@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Tuple
 
 from flasgger import Swagger
-from flask import Flask, abort, render_template, send_from_directory
+from flask import Flask, abort, jsonify, render_template, send_from_directory
 from flask_wtf.csrf import CSRFProtect
 from jinja2 import TemplateNotFound
 try:
@@ -18,14 +18,16 @@ except ImportError:  # pragma: no cover - sentry opcional em desenvolvimento
     sentry_sdk = None  # type: ignore[assignment]
     FlaskIntegration = None  # type: ignore[assignment]
 
-from conecta_senai.auth import auth_bp, auth_reset_bp
+from conecta_senai.auth import admin_required, auth_bp, auth_reset_bp
 from conecta_senai.cli import register_cli
 from conecta_senai.config import DevConfig, ProdConfig, TestConfig
+from conecta_senai.config.database import opcoes_engine
 from conecta_senai.config.redis import init_redis
 from conecta_senai.extensions import db, jwt, limiter, migrate
 from conecta_senai.logging_conf import setup_logging
 from conecta_senai.middlewares.request_id import request_id_bp
 from conecta_senai.repositories.user_repository import UserRepository
+from conecta_senai.routes.emails import emails_bp
 from conecta_senai.routes.inscricoes_treinamento import bp as inscricoes_treinamento_bp
 from conecta_senai.routes.laboratorios import agendamento_bp, laboratorio_bp
 from conecta_senai.routes.noticias import api_noticias_bp
@@ -45,8 +47,11 @@ from conecta_senai.routes.treinamentos.basedados import (
     horarios_bp as treinamentos_horarios_bp,
 )
 from conecta_senai.routes.user import user_bp
-from conecta_senai.tasks import start_scheduler
+from conecta_senai.tasks import iniciar_scheduler_com_lideranca
+from conecta_senai.tasks.execucao import resumo_execucoes
 from conecta_senai.telemetry import instrument
+from conecta_senai.utils.cache_http import obter_cache_http
+from conecta_senai.utils.metricas_pool import instrumentar_pool, obter_metricas_pool
 from conecta_senai.utils.paths import ensure_path_is_safe
 
 EMAIL_RE = re.compile(r"[^@]+@[^@]+")
@@ -100,8 +105,11 @@ def _configure_database(app: Flask) -> None:
     """Configura SQLAlchemy e a migração de banco."""
 
     migrations_dir = str(PROJECT_ROOT / "migrations")
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", opcoes_engine(app.config))
     db.init_app(app)
     migrate.init_app(app, db, directory=migrations_dir)
+    with app.app_context():
+        instrumentar_pool(app, db.engine)
 
 
 def _configure_security(app: Flask) -> None:
@@ -145,6 +153,7 @@ def _configure_flask(app: Flask) -> None:
     app.register_blueprint(user_bp, url_prefix="/api")
     app.register_blueprint(agendamento_bp, url_prefix="/api")
     app.register_blueprint(notificacao_bp, url_prefix="/api")
+    app.register_blueprint(emails_bp, url_prefix="/api")
     app.register_blueprint(laboratorio_bp, url_prefix="/api")
     app.register_blueprint(turma_bp, url_prefix="/api")
     app.register_blueprint(sala_bp, url_prefix="/api")
@@ -295,6 +304,23 @@ def _register_default_routes(app: Flask) -> None:
     def health_check() -> Tuple[str, int]:
         return "OK", 200
 
+    @app.route("/health/cache")
+    def health_cache():
+        return jsonify(obter_cache_http(app).metricas())
+
+    @app.route("/health/db-pool")
+    def health_db_pool():
+        return jsonify(obter_metricas_pool(app).resumo())
+
+    @app.route("/health/jobs")
+    def health_jobs():
+        return jsonify(resumo_execucoes())
+
+    @app.route("/health/jobs/detalhes")
+    @admin_required
+    def health_jobs_detalhes():
+        return jsonify(resumo_execucoes(detalhado=True))
+
     @app.route("/debug-sentry")
     def debug_sentry():
         1 / 0
@@ -417,8 +443,12 @@ def create_app() -> Flask:
 
     app.config["SCHEDULER_ENABLED"] = scheduler_enabled
 
-    if scheduler_enabled:
-        start_scheduler(app)
+    if scheduler_enabled and os.getenv("SCHEDULER_APOS_FORK") == "1":
+        # Gunicorn com ``preload_app``: a eleição acontece no ``post_fork`` de
+        # cada worker (ver ``conecta_senai.runtime``), não no processo mestre.
+        app.logger.info("Scheduler será iniciado nos workers após o fork.")
+    elif scheduler_enabled:
+        iniciar_scheduler_com_lideranca(app)
     else:
         motivo = (
             "modo de teste"
@@ -1,5 +1,12 @@
 """Pacote com a lógica de autenticação e autorização."""
-from .decorators import admin_required, login_required, verificar_admin, verificar_autenticacao
+from .decorators import (
+    admin_required,
+    invalidar_token_cache,
+    invalidar_usuario_cache,
+    login_required,
+    verificar_admin,
+    verificar_autenticacao,
+)
 from .routes import auth_bp
 from .reset_routes import auth_reset_bp
 
@@ -7,6 +14,8 @@ __all__ = [
     "admin_required",
     "auth_bp",
     "auth_reset_bp",
+    "invalidar_token_cache",
+    "invalidar_usuario_cache",
     "login_required",
     "verificar_admin",
     "verificar_autenticacao",
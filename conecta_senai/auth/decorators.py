@@ -2,49 +2,121 @@
 from functools import wraps
 
 """Funcoes de autenticacao e autorizacao."""
+import os
+import time
 from functools import wraps
 from flask import request, jsonify, current_app, g
 import jwt
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
-from conecta_senai.config.redis import redis_conn
+from conecta_senai.config.redis import revogacao
 
 from conecta_senai.models import db
 from conecta_senai.models.user import User
+from conecta_senai.utils.cache import CacheTTL
+
+
+# Claims decodificados por token e instantâneos das colunas do usuário. O
+# TTL curto limita por quanto tempo outro worker pode enxergar um usuário
+# alterado; no próprio processo a invalidação é imediata.
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "30"))
+AUTH_CACHE_MAX = int(os.getenv("AUTH_CACHE_MAX", "1024"))
+_claims_cache = CacheTTL(AUTH_CACHE_MAX, AUTH_CACHE_TTL)
+_usuarios_cache = CacheTTL(AUTH_CACHE_MAX, AUTH_CACHE_TTL)
+_CHAVE_MEMO = "conecta_senai.autenticacao"
+_COLUNAS_USUARIO = tuple(attr.key for attr in User.__mapper__.column_attrs)
+
+
+def invalidar_usuario_cache(user_id) -> None:
+    """Descarta o instantâneo em cache do usuário (alteração ou exclusão)."""
+    _usuarios_cache.pop(user_id)
+
+
+def invalidar_token_cache(token: str) -> None:
+    """Descarta os claims em cache de um token revogado."""
+    _claims_cache.pop(token)
+
+
+def limpar_cache_autenticacao() -> None:
+    """Esvazia os caches de claims e usuários (útil em testes)."""
+    _claims_cache.clear()
+    _usuarios_cache.clear()
+
+
+def _decodificar_token(token: str) -> dict:
+    dados = _claims_cache.get(token)
+    if dados is not None and dados.get('exp', 0) > time.time():
+        return dados
+    dados = jwt.decode(
+        token,
+        current_app.config['SECRET_KEY'],
+        algorithms=['HS256'],
+    )
+    exp = dados.get('exp')
+    _claims_cache.set(token, dados, ttl=exp - time.time() if exp else None)
+    return dados
+
+
+def _carregar_usuario(user_id):
+    """Obtém o usuário sem consultar o banco quando há instantâneo válido.
+
+    O instantâneo é reanexado à sessão com ``merge(load=False)``, então o
+    objeto devolvido é uma instância ORM comum (alterações são persistidas).
+    """
+    snapshot = _usuarios_cache.get(user_id)
+    if snapshot is not None:
+        user = User.__mapper__.class_manager.new_instance()
+        for chave, valor in snapshot.items():
+            set_committed_value(user, chave, valor)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        _usuarios_cache.set(
+            user_id, {chave: getattr(user, chave) for chave in _COLUNAS_USUARIO}
+        )
+    return user
 
 
 def verificar_autenticacao(req):
-    """Verifica o token JWT no cabeçalho Authorization ou cookie."""
+    """Verifica o token JWT no cabeçalho Authorization ou cookie.
+
+    O resultado é memorizado no ``environ`` da requisição, evitando repetir a
+    verificação quando a view chama esta função após o decorator.
+    """
     auth_header = req.headers.get('Authorization')
     token = None
     if auth_header and auth_header.startswith('Bearer '):
         token = auth_header.split(' ')[1]
     else:
         token = req.cookies.get('access_token')
+
+    memo = req.environ.get(_CHAVE_MEMO)
+    if memo is None or memo[0] != token:
+        memo = (token, *_verificar_token(token))
+        req.environ[_CHAVE_MEMO] = memo
+    g.token_message = memo[3]
+    return memo[1], memo[2]
+
+
+def _verificar_token(token):
     if not token:
-        g.token_message = None
-        return False, None
+        return False, None, None
     try:
-        dados = jwt.decode(
-            token,
-            current_app.config['SECRET_KEY'],
-            algorithms=['HS256'],
-        )
+        dados = _decodificar_token(token)
         jti = dados.get('jti')
-        if jti and redis_conn.get(jti):
-            g.token_message = "Token has been revoked"  # nosec B105
-            return False, None
-        user = db.session.get(User, dados.get('user_id'))
+        if jti and revogacao.esta_revogado(jti):
+            return False, None, "Token has been revoked"  # nosec B105
+        user = _carregar_usuario(dados.get('user_id'))
         if user:
-            g.token_message = None
-            return True, user
-        g.token_message = None
-        return False, None
+            return True, user, None
+        return False, None, None
     except jwt.ExpiredSignatureError:
-        g.token_message = None
-        return False, None
+        return False, None, None
     except jwt.InvalidTokenError:
-        g.token_message = None
-        return False, None
+        return False, None, None
 
 
 def verificar_admin(user: User) -> bool:
@@ -16,6 +16,7 @@ from email_validator import validate_email, EmailNotValidError
 from werkzeug.security import generate_password_hash
 from flask_wtf.csrf import generate_csrf, validate_csrf, CSRFError
 
+from conecta_senai.auth.decorators import invalidar_usuario_cache
 from conecta_senai.repositories.user_repository import UserRepository
 from conecta_senai.utils.tokens import generate_reset_token, confirm_reset_token
 from conecta_senai.services.email_service import send_email, render_email_template
@@ -144,6 +145,7 @@ def reset_post():
         password, method='pbkdf2:sha256', salt_length=16
     )
     UserRepository.commit()
+    invalidar_usuario_cache(user.id)
     logging.info(
         'Senha redefinida para usuário %s a partir do IP %s',
         user.id,
@@ -35,3 +35,24 @@ def register_cli(app):
         db.session.commit()
         current_app.logger.info("Seed de notícias criado.")
         click.echo("Notícia de demonstração criada com sucesso.")
+
+    @app.cli.command("processar_emails")
+    def processar_emails():
+        """Envia as mensagens pendentes da outbox de e-mails."""
+
+        from conecta_senai.tasks.jobs.emails import despachar_emails
+
+        resultado = despachar_emails()
+        click.echo(
+            f"{resultado['enviados']} enviados, {resultado['reagendados']} "
+            f"reagendados, {resultado['erros']} com erro."
+        )
+
+    @app.cli.command("reconstruir_indicadores_suporte")
+    def reconstruir_indicadores_suporte():
+        """Recalcula o agregado diário dos indicadores do suporte de TI."""
+
+        from conecta_senai.services.suporte_rollup_service import reconstruir_rollup
+
+        linhas = reconstruir_rollup()
+        click.echo(f"Agregado de indicadores reconstruído com {linhas} linhas.")
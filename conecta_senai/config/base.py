@@ -71,3 +71,21 @@ class BaseConfig:
     RATELIMIT_STORAGE_URI = os.getenv(
         "RATELIMIT_STORAGE_URI", f"redis://{REDIS_HOST}:{REDIS_PORT}"
     )
+
+    # Pool de conexões do SQLAlchemy (ver ``config/database.py``).
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+    DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", False)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+    # Imagens de notícias (ver ``services/imagem_armazenamento.py``).
+    IMAGENS_NOTICIAS_BACKEND = os.getenv("IMAGENS_NOTICIAS_BACKEND", "local")
+    IMAGENS_NOTICIAS_RAIZ = os.getenv("IMAGENS_NOTICIAS_RAIZ")
+    USE_X_SENDFILE = env_bool("USE_X_SENDFILE", False)
+    IMAGENS_VARIANTES_RAIZ = os.getenv("IMAGENS_VARIANTES_RAIZ")
+    IMAGENS_VARIANTES_MAX_MB = float(os.getenv("IMAGENS_VARIANTES_MAX_MB", "512"))
+
+    # Feriados (AAAA-MM-DD, separados por vírgula) fora da contagem de dias úteis.
+    FERIADOS = [dia.strip() for dia in os.getenv("FERIADOS", "").split(",") if dia.strip()]
@@ -0,0 +1,57 @@
+"""Opções do engine do SQLAlchemy a partir da configuração do app.
+
+Os valores padrão ficam em ``BaseConfig``/``ProdConfig``/``DevConfig`` e cada
+um pode ser sobrescrito pela variável de ambiente de mesmo nome:
+
+``DB_POOL_SIZE``
+    Conexões mantidas abertas por processo.
+``DB_MAX_OVERFLOW``
+    Conexões extras abertas sob pico e fechadas ao serem devolvidas.
+``DB_POOL_TIMEOUT``
+    Segundos de espera por uma conexão livre antes de erro.
+``DB_POOL_RECYCLE``
+    Idade máxima, em segundos, de uma conexão (``-1`` desativa).
+``DB_POOL_PRE_PING``
+    Testa a conexão na retirada, descartando as encerradas pelo servidor.
+``DB_STATEMENT_TIMEOUT_MS``
+    ``statement_timeout`` do PostgreSQL (``0`` desativa).
+
+SQLite em memória usa um pool próprio, sem dimensionamento; nele só
+``pool_pre_ping`` é aplicado.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+from sqlalchemy.engine import make_url
+
+from conecta_senai.utils.metricas_pool import PoolMedido
+
+
+def _em_memoria(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def opcoes_engine(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """Monta ``SQLALCHEMY_ENGINE_OPTIONS`` para a URI configurada."""
+
+    uri = config["SQLALCHEMY_DATABASE_URI"]
+    opcoes: Dict[str, Any] = {"pool_pre_ping": bool(config.get("DB_POOL_PRE_PING"))}
+    if _em_memoria(uri):
+        return opcoes
+
+    opcoes.update(
+        poolclass=PoolMedido,
+        pool_size=int(config.get("DB_POOL_SIZE", 5)),
+        max_overflow=int(config.get("DB_MAX_OVERFLOW", 10)),
+        pool_timeout=float(config.get("DB_POOL_TIMEOUT", 30)),
+        pool_recycle=int(config.get("DB_POOL_RECYCLE", -1)),
+    )
+    timeout_ms = int(config.get("DB_STATEMENT_TIMEOUT_MS", 0))
+    if timeout_ms > 0 and make_url(uri).get_backend_name() == "postgresql":
+        opcoes["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return opcoes
+
+
+__all__ = ["opcoes_engine"]
@@ -1,5 +1,6 @@
 """Configurações específicas do ambiente de desenvolvimento."""
 import logging
+import os
 
 from .base import BaseConfig
 
@@ -9,3 +10,6 @@ class DevConfig(BaseConfig):
 
     DEBUG = True
     LOG_LEVEL = logging.DEBUG
+
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "2"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "3"))
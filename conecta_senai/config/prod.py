@@ -1,10 +1,19 @@
 """Configurações específicas do ambiente de produção."""
 import logging
+import os
 
-from .base import BaseConfig
+from .base import BaseConfig, env_bool
 
 
 class ProdConfig(BaseConfig):
     """Aplicação configurada para execução em produção."""
 
     LOG_LEVEL = logging.INFO
+
+    # Conexões encerradas pelo servidor ou por proxies são descartadas na
+    # retirada; consultas presas não seguram uma conexão indefinidamente.
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
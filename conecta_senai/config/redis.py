@@ -1,20 +1,287 @@
-"""Inicializa a conexão com o Redis usada pela aplicação."""
+"""Inicializa a conexão com o Redis usada pela aplicação.
 
+Também mantém o controle de revogação de tokens JWT. Cada ``jti`` revogado é
+gravado em Redis (chave com TTL até a expiração do token, conjunto ordenado
+``tokens_revogados`` e publicação no canal de mesmo nome). Cada processo
+guarda um filtro de Bloom local com esses ``jti``, atualizado pela assinatura
+do canal e por uma ressincronização periódica; a verificação só consulta o
+Redis quando o filtro indica uma possível revogação, o que elimina a ida ao
+Redis para a quase totalidade das requisições.
+"""
+
+import hashlib
+import logging
+import math
 import os
+import threading
+import time
+from datetime import datetime, timezone
+
 from redis import Redis
 
+logger = logging.getLogger(__name__)
+
+CHAVE_REVOGADOS = "tokens_revogados"
+CANAL_REVOGADOS = "tokens_revogados"
+
 
 class DummyRedis:
-    """Implementação simplificada usada durante testes quando o Redis não está disponível."""
+    """Implementação em memória usada durante testes quando o Redis não está disponível.
+
+    Guarda as chaves com expiração e o conjunto ordenado de tokens revogados,
+    de modo que a revogação continua correta em um único processo.
+    """
+
+    def __init__(self):
+        self._valores = {}
+        self._zsets = {}
+        self._lock = threading.Lock()
 
     def ping(self):
         return True
 
-    def setex(self, *args, **kwargs):
+    def setex(self, nome, tempo, valor):
+        segundos = tempo.total_seconds() if hasattr(tempo, "total_seconds") else tempo
+        with self._lock:
+            self._valores[nome] = (time.time() + float(segundos), valor)
         return True
 
-    def get(self, *args, **kwargs):
-        return None
+    def get(self, nome):
+        with self._lock:
+            entrada = self._valores.get(nome)
+            if entrada is None:
+                return None
+            if entrada[0] <= time.time():
+                del self._valores[nome]
+                return None
+            return entrada[1]
+
+    def delete(self, *nomes):
+        removidos = 0
+        with self._lock:
+            for nome in nomes:
+                if self._valores.pop(nome, None) is not None:
+                    removidos += 1
+                if self._zsets.pop(nome, None) is not None:
+                    removidos += 1
+        return removidos
+
+    def zadd(self, nome, mapeamento):
+        with self._lock:
+            self._zsets.setdefault(nome, {}).update(mapeamento)
+        return len(mapeamento)
+
+    def zremrangebyscore(self, nome, minimo, maximo):
+        minimo, maximo = _limite(minimo), _limite(maximo)
+        with self._lock:
+            zset = self._zsets.get(nome, {})
+            removidos = [m for m, s in zset.items() if minimo <= s <= maximo]
+            for membro in removidos:
+                del zset[membro]
+        return len(removidos)
+
+    def zrangebyscore(self, nome, minimo, maximo):
+        minimo, maximo = _limite(minimo), _limite(maximo)
+        with self._lock:
+            zset = self._zsets.get(nome, {})
+            return [m for m, s in sorted(zset.items(), key=lambda i: i[1]) if minimo <= s <= maximo]
+
+    def publish(self, canal, mensagem):
+        return 0
+
+    def pipeline(self, transaction=True):
+        return _DummyPipeline(self)
+
+
+class _DummyPipeline:
+    """Pipeline que executa os comandos imediatamente no ``DummyRedis``."""
+
+    def __init__(self, cliente):
+        self._cliente = cliente
+        self._resultados = []
+
+    def __getattr__(self, nome):
+        comando = getattr(self._cliente, nome)
+
+        def _enfileirar(*args, **kwargs):
+            self._resultados.append(comando(*args, **kwargs))
+            return self
+
+        return _enfileirar
+
+    def execute(self):
+        resultados, self._resultados = self._resultados, []
+        return resultados
+
+
+def _limite(valor):
+    if valor == "-inf":
+        return float("-inf")
+    if valor == "+inf":
+        return float("inf")
+    return float(valor)
+
+
+class BloomFilter:
+    """Filtro de Bloom com ``k`` funções de hash derivadas de um BLAKE2b.
+
+    Nunca produz falso negativo; a taxa de falso positivo fica próxima de
+    ``taxa_erro`` enquanto o número de itens não passa de ``capacidade``.
+    """
+
+    def __init__(self, capacidade: int, taxa_erro: float = 0.001) -> None:
+        capacidade = max(int(capacidade), 1)
+        bits = math.ceil(-capacidade * math.log(taxa_erro) / (math.log(2) ** 2))
+        self.bits = max(bits, 8)
+        self.hashes = max(1, round(self.bits / capacidade * math.log(2)))
+        self._mapa = bytearray((self.bits + 7) // 8)
+        self.itens = 0
+
+    def _posicoes(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, item: str) -> None:
+        for pos in self._posicoes(item):
+            self._mapa[pos >> 3] |= 1 << (pos & 7)
+        self.itens += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._mapa[pos >> 3] & (1 << (pos & 7)) for pos in self._posicoes(item))
+
+
+class RevogacaoTokens:
+    """Registro de ``jti`` revogados com filtro de Bloom local por processo.
+
+    Um token revogado em outro worker passa a ser recusado assim que a
+    mensagem do canal chega ou, se a assinatura não estiver disponível, na
+    próxima ressincronização (``REVOGACAO_SYNC_INTERVALO`` segundos). Com
+    intervalo zero o filtro é desativado e toda verificação consulta o Redis.
+    Falhas ao sincronizar também desativam o filtro até a próxima tentativa.
+    """
+
+    def __init__(self, cliente, capacidade: int = 10000, taxa_erro: float = 0.001,
+                 intervalo_sync: float = 5.0) -> None:
+        self.cliente = cliente
+        self.capacidade = capacidade
+        self.taxa_erro = taxa_erro
+        self.intervalo_sync = intervalo_sync
+        self._filtro = None
+        self._proxima_sync = 0.0
+        self._pid = None
+        self._assinatura = None
+        self._assinar_canal = True
+        self._recebidos = []
+        self._lock = threading.Lock()
+        self.consultas_redis = 0
+
+    def configurar(self, cliente, assinar: bool = True) -> None:
+        """Troca o cliente Redis e descarta o estado local."""
+        self.parar()
+        with self._lock:
+            self.cliente = cliente
+            self._filtro = None
+            self._proxima_sync = 0.0
+            self._pid = None
+            self._assinar_canal = assinar
+
+    @property
+    def ativo(self) -> bool:
+        return self.intervalo_sync > 0
+
+    def revogar(self, jti: str, expira_em) -> None:
+        """Revoga ``jti`` até ``expira_em`` (``datetime`` UTC ou timestamp)."""
+        if isinstance(expira_em, datetime):
+            if expira_em.tzinfo is None:
+                expira_em = expira_em.replace(tzinfo=timezone.utc)
+            expira_em = expira_em.timestamp()
+        ttl = expira_em - time.time()
+        if ttl <= 0:
+            return
+        pipe = self.cliente.pipeline()
+        pipe.setex(jti, math.ceil(ttl), "revoked")
+        pipe.zadd(CHAVE_REVOGADOS, {jti: expira_em})
+        pipe.publish(CANAL_REVOGADOS, jti)
+        pipe.execute()
+        filtro = self._filtro
+        if filtro is not None:
+            filtro.add(jti)
+
+    def esta_revogado(self, jti: str) -> bool:
+        """Indica se ``jti`` foi revogado, consultando o Redis só em caso de suspeita."""
+        if self.ativo:
+            filtro = self._filtro_atual()
+            if filtro is not None and jti not in filtro:
+                return False
+        self.consultas_redis += 1
+        return bool(self.cliente.get(jti))
+
+    def sincronizar(self) -> None:
+        """Reconstrói o filtro local a partir do conjunto ``tokens_revogados``."""
+        agora = time.time()
+        self._recebidos = []
+        pipe = self.cliente.pipeline()
+        pipe.zremrangebyscore(CHAVE_REVOGADOS, "-inf", agora)
+        pipe.zrangebyscore(CHAVE_REVOGADOS, agora, "+inf")
+        _, membros = pipe.execute()
+        filtro = BloomFilter(max(self.capacidade, 2 * len(membros)), self.taxa_erro)
+        for membro in membros:
+            filtro.add(membro.decode() if isinstance(membro, bytes) else membro)
+        # Revogações publicadas enquanto o conjunto era lido.
+        for jti in self._recebidos:
+            filtro.add(jti)
+        self._filtro = filtro
+
+    def parar(self) -> None:
+        """Encerra a assinatura do canal, se houver."""
+        assinatura, self._assinatura = self._assinatura, None
+        if assinatura is not None:
+            try:
+                assinatura.stop()
+            except Exception:  # pragma: no cover - encerramento best effort
+                pass
+
+    def _filtro_atual(self):
+        agora = time.monotonic()
+        if self._pid == os.getpid() and agora < self._proxima_sync:
+            return self._filtro
+        with self._lock:
+            if self._pid != os.getpid():
+                # Após um fork a thread de assinatura não existe no filho.
+                self._assinatura = None
+                self._pid = os.getpid()
+                self._iniciar_assinatura()
+            if agora >= self._proxima_sync:
+                self._proxima_sync = agora + self.intervalo_sync
+                try:
+                    self.sincronizar()
+                except Exception as exc:
+                    logger.warning("Falha ao sincronizar tokens revogados: %s", exc)
+                    self._filtro = None
+        return self._filtro
+
+    def _iniciar_assinatura(self) -> None:
+        if not self._assinar_canal or isinstance(self.cliente, DummyRedis):
+            return
+        try:
+            pubsub = self.cliente.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{CANAL_REVOGADOS: self._ao_receber})
+            self._assinatura = pubsub.run_in_thread(sleep_time=1, daemon=True)
+        except Exception as exc:
+            logger.warning("Assinatura de tokens revogados indisponível: %s", exc)
+
+    def _ao_receber(self, mensagem) -> None:
+        jti = mensagem.get("data")
+        if not jti:
+            return
+        jti = jti.decode() if isinstance(jti, bytes) else jti
+        self._recebidos.append(jti)
+        filtro = self._filtro
+        if filtro is not None:
+            filtro.add(jti)
 
 
 def init_redis(app=None):
@@ -40,8 +307,13 @@ def init_redis(app=None):
         app.redis_conn = client
     global redis_conn
     redis_conn = client
+    revogacao.configurar(client)
     return client
 
 
 redis_conn = DummyRedis()
-
+revogacao = RevogacaoTokens(
+    redis_conn,
+    capacidade=int(os.getenv("REVOGACAO_CAPACIDADE", "10000")),
+    intervalo_sync=float(os.getenv("REVOGACAO_SYNC_INTERVALO", "5")),
+)
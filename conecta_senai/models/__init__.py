@@ -29,6 +29,9 @@ from .imagem_noticia import ImagemNoticia  # noqa: E402
 from .suporte_chamado import SuporteChamado  # noqa: E402
 from .suporte_anexo import SuporteAnexo  # noqa: E402
 from .suporte_basedados import SuporteTipoEquipamento, SuporteArea  # noqa: E402
+from .suporte_indicador_diario import SuporteIndicadorDiario  # noqa: E402
+from .email_outbox import EmailOutbox  # noqa: E402
+from .execucao_job import ExecucaoJob, LeaseJob  # noqa: E402
 
 __all__ = [
     "db",
@@ -57,4 +60,8 @@ __all__ = [
     "SuporteAnexo",
     "SuporteTipoEquipamento",
     "SuporteArea",
+    "SuporteIndicadorDiario",
+    "EmailOutbox",
+    "ExecucaoJob",
+    "LeaseJob",
 ]
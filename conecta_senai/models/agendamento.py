@@ -1,7 +1,71 @@
 """Modelos de agendamentos e notificacoes."""
+import json
 from datetime import datetime
+
+from sqlalchemy.orm import validates
+
 from conecta_senai.models import db
 
+HORARIOS_POR_TURNO = {
+    "Manhã": [
+        "08:00 - 08:45",
+        "08:45 - 09:30",
+        "09:30 - 10:15",
+        "10:30 - 11:15",
+        "11:15 - 12:00",
+    ],
+    "Tarde": [
+        "13:30 - 14:15",
+        "14:15 - 15:00",
+        "15:00 - 15:45",
+        "16:00 - 16:45",
+        "16:45 - 17:30",
+    ],
+    "Noite": [
+        "18:30 - 19:15",
+        "19:15 - 20:00",
+        "20:00 - 20:45",
+        "21:00 - 21:45",
+        "21:45 - 22:30",
+    ],
+}
+
+# Cada horário da grade ocupa um bit de ``mascara_horarios``; horários fora da
+# grade ligam apenas ``BIT_HORARIO_AVULSO`` e continuam comparados pelo texto.
+# A ordem dos bits é persistida: novos horários devem ser acrescentados ao fim.
+BIT_POR_HORARIO = {
+    horario: 1 << indice
+    for indice, horario in enumerate(
+        h for horarios in HORARIOS_POR_TURNO.values() for h in horarios
+    )
+}
+BIT_HORARIO_AVULSO = 1 << 30
+
+
+def normalizar_horarios(horarios):
+    """Devolve ``horarios`` como lista, decodificando JSON legado em texto."""
+    if isinstance(horarios, str):
+        try:
+            horarios = json.loads(horarios)
+        except json.JSONDecodeError:
+            return []
+    return horarios if isinstance(horarios, list) else []
+
+
+def mascara_horarios(horarios):
+    """Converte uma lista de horários na máscara de bits correspondente."""
+    mascara = 0
+    for horario in normalizar_horarios(horarios):
+        mascara |= BIT_POR_HORARIO.get(horario, BIT_HORARIO_AVULSO)
+    return mascara
+
+
+def horarios_da_mascara(mascara, horarios_possiveis=None):
+    """Lista os horários da grade presentes em ``mascara``, na ordem da grade."""
+    horarios_possiveis = horarios_possiveis or BIT_POR_HORARIO
+    return [h for h in horarios_possiveis if mascara & BIT_POR_HORARIO[h]]
+
+
 class Agendamento(db.Model):
     """
     Modelo de agendamento de laboratório.
@@ -13,6 +77,7 @@ class Agendamento(db.Model):
         turma (str): Turma para a qual o agendamento foi feito
         turno (str): Turno do agendamento (manhã, tarde ou noite)
         horarios (list): Horários reservados
+        mascara_horarios (int): Bits de ``horarios`` na grade ``HORARIOS_POR_TURNO``
         usuario_id (int): ID do usuário responsável pelo agendamento
         data_criacao (datetime): Data de criação do registro
         data_atualizacao (datetime): Data da última atualização do registro
@@ -25,9 +90,20 @@ class Agendamento(db.Model):
     turma = db.Column(db.String(50), nullable=False)
     turno = db.Column(db.String(20), nullable=False)
     horarios = db.Column(db.JSON, nullable=False)
+    mascara_horarios = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), nullable=False)
     data_criacao = db.Column(db.DateTime, default=datetime.utcnow)
     data_atualizacao = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index(
+            'ix_agendamentos_laboratorio_data_turno',
+            'laboratorio',
+            'data',
+            'turno',
+            'mascara_horarios',
+        ),
+    )
     
     def __init__(self, data, laboratorio, turma, turno, horarios, usuario_id):
         """
@@ -48,6 +124,12 @@ class Agendamento(db.Model):
         self.horarios = horarios
         self.usuario_id = usuario_id
     
+    @validates('horarios')
+    def _atualizar_mascara(self, _chave, horarios):
+        """Mantém ``mascara_horarios`` em sincronia com ``horarios``."""
+        self.mascara_horarios = mascara_horarios(horarios)
+        return horarios
+
     def to_dict(self):
         """
         Converte o objeto agendamento em um dicionário para serialização.
@@ -97,6 +179,18 @@ class Notificacao(db.Model):
     mensagem = db.Column(db.String(255), nullable=False)
     lida = db.Column(db.Boolean, default=False)
     data_criacao = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # No máximo um lembrete não lido por agendamento; garante que execuções
+    # concorrentes do job de lembretes não dupliquem notificações.
+    __table_args__ = (
+        db.Index(
+            'uq_notificacoes_agendamento_nao_lida',
+            'agendamento_id',
+            unique=True,
+            postgresql_where=db.text('lida = false'),
+            sqlite_where=db.text('lida = 0'),
+        ),
+    )
     
     # Relacionamentos
     usuario = db.relationship('User', backref=db.backref('notificacoes', lazy=True))
@@ -0,0 +1,48 @@
+"""Modelo da fila persistente de e-mails (outbox)."""
+from datetime import datetime
+
+from conecta_senai.models import db
+
+
+class EmailOutbox(db.Model):
+    """Mensagem de e-mail aguardando envio pelo dispatcher em segundo plano."""
+
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        db.Index('ix_email_outbox_referencia', 'referencia_tipo', 'referencia_id'),
+    )
+
+    STATUS_PENDENTE = 'pendente'
+    STATUS_ENVIANDO = 'enviando'
+    STATUS_ENVIADO = 'enviado'
+    STATUS_ERRO = 'erro'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), index=True, nullable=False)
+    destinatarios = db.Column(db.JSON, nullable=False)
+    assunto = db.Column(db.String(255), nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    parametros = db.Column(db.JSON)
+    referencia_tipo = db.Column(db.String(50))
+    referencia_id = db.Column(db.Integer)
+    status = db.Column(db.String(20), default=STATUS_PENDENTE, nullable=False, index=True)
+    tentativas = db.Column(db.Integer, default=0, nullable=False)
+    proxima_tentativa_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    ultimo_erro = db.Column(db.Text)
+    provedor_id = db.Column(db.String(100))
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow)
+    enviado_em = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_id': self.job_id,
+            'destinatarios': self.destinatarios,
+            'assunto': self.assunto,
+            'status': self.status,
+            'tentativas': self.tentativas,
+            'ultimo_erro': self.ultimo_erro,
+            'provedor_id': self.provedor_id,
+            'criado_em': self.criado_em.isoformat() if self.criado_em else None,
+            'enviado_em': self.enviado_em.isoformat() if self.enviado_em else None,
+        }
@@ -0,0 +1,52 @@
+"""Histórico de execuções e concessões (*leases*) dos jobs agendados."""
+from conecta_senai.models import db
+
+
+class ExecucaoJob(db.Model):
+    """Uma execução de job: início, fim, duração e linhas afetadas."""
+
+    __tablename__ = "execucoes_jobs"
+    __table_args__ = (
+        db.Index("ix_execucoes_jobs_job_inicio", "job", "inicio"),
+    )
+
+    STATUS_EXECUTANDO = "executando"
+    STATUS_SUCESSO = "sucesso"
+    STATUS_ERRO = "erro"
+    # Só em ``/health/jobs``: ainda "executando" depois de a concessão expirar.
+    STATUS_ABANDONADO = "abandonado"
+
+    id = db.Column(db.Integer, primary_key=True)
+    job = db.Column(db.String(100), nullable=False)
+    processo = db.Column(db.String(120))
+    status = db.Column(db.String(20), nullable=False, default=STATUS_EXECUTANDO)
+    inicio = db.Column(db.DateTime, nullable=False, index=True)
+    fim = db.Column(db.DateTime)
+    expira_em = db.Column(db.DateTime)
+    duracao_ms = db.Column(db.Integer)
+    linhas_afetadas = db.Column(db.Integer)
+    erro = db.Column(db.Text)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "job": self.job,
+            "processo": self.processo,
+            "status": self.status,
+            "inicio": self.inicio.isoformat() if self.inicio else None,
+            "fim": self.fim.isoformat() if self.fim else None,
+            "expira_em": self.expira_em.isoformat() if self.expira_em else None,
+            "duracao_ms": self.duracao_ms,
+            "linhas_afetadas": self.linhas_afetadas,
+            "erro": self.erro,
+        }
+
+
+class LeaseJob(db.Model):
+    """Concessão exclusiva de um job, usada quando o Redis não está disponível."""
+
+    __tablename__ = "jobs_leases"
+
+    job = db.Column(db.String(100), primary_key=True)
+    dono = db.Column(db.String(120), nullable=False)
+    expira_em = db.Column(db.DateTime, nullable=False)
@@ -3,9 +3,8 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from io import BytesIO
 
-from flask import send_file, url_for
+from flask import url_for
 from sqlalchemy import text
 from sqlalchemy.orm import deferred
 
@@ -33,7 +32,10 @@ class ImagemNoticia(db.Model):
     nome_arquivo = db.Column(db.String(255), nullable=False)
     caminho_relativo = db.Column(db.String(255), nullable=False)
     conteudo = deferred(db.Column(db.LargeBinary, nullable=True))
+    sha256 = db.Column(db.String(64), nullable=True, index=True)
     content_type = db.Column(db.String(255), nullable=False, default="application/octet-stream")
+    largura = db.Column(db.Integer, nullable=True)
+    altura = db.Column(db.Integer, nullable=True)
     tem_conteudo = db.Column(
         db.Boolean,
         nullable=False,
@@ -54,27 +56,25 @@ class ImagemNoticia(db.Model):
         """Retorna a URL pública do arquivo armazenado."""
 
         if self.id is not None and self.tem_conteudo:
+            # O hash na URL muda a cada nova imagem e permite cache imutável.
+            versao = {"v": self.sha256[:16]} if self.sha256 else {}
             try:
-                return url_for("api_noticias.obter_imagem", imagem_id=self.id, _external=False)
+                return url_for(
+                    "api_noticias.obter_imagem", imagem_id=self.id, _external=False, **versao
+                )
             except RuntimeError:
-                return f"/api/noticias/imagens/{self.id}"
+                sufixo = f"?v={versao['v']}" if versao else ""
+                return f"/api/noticias/imagens/{self.id}{sufixo}"
 
         caminho = (self.caminho_relativo or "").lstrip("/")
         return f"/static/{caminho}" if caminho else None
 
     def enviar_arquivo(self):
-        """Retorna uma resposta Flask com o conteúdo binário da imagem."""
+        """Retorna a resposta Flask da imagem (disco ou banco) com ``ETag``."""
 
-        if not self.tem_conteudo:
-            return None
+        from conecta_senai.services.imagem_armazenamento import responder_imagem
 
-        if self.conteudo:
-            return send_file(
-                BytesIO(self.conteudo),
-                mimetype=self.content_type or "application/octet-stream",
-                download_name=self.nome_arquivo,
-            )
-        return None
+        return responder_imagem(self)
 
     def to_dict(self) -> dict:
         """Serializa a imagem para um dicionário simples."""
@@ -85,4 +85,6 @@ class ImagemNoticia(db.Model):
             "caminho_relativo": self.caminho_relativo,
             "url": self.url_publica,
             "content_type": self.content_type,
+            "largura": self.largura,
+            "altura": self.altura,
         }
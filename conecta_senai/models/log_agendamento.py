@@ -14,11 +14,17 @@ class LogAgendamento(db.Model):
     data_agendamento = db.Column(db.Date)
     dados_antes = db.Column(db.JSON)
     dados_depois = db.Column(db.JSON)
+    intervalo_horarios = db.Column(db.String(20))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_logs_agendamentos_timestamp_id', 'timestamp', 'id'),
+    )
+
     def __init__(self, usuario: str, tipo_acao: str, laboratorio: str | None,
                  turno: str | None, data_agendamento: date | None,
-                 dados_antes: dict | None, dados_depois: dict | None):
+                 dados_antes: dict | None, dados_depois: dict | None,
+                 intervalo_horarios: str | None = None):
         self.usuario = usuario
         self.tipo_acao = tipo_acao
         self.laboratorio = laboratorio
@@ -26,4 +32,5 @@ class LogAgendamento(db.Model):
         self.data_agendamento = data_agendamento
         self.dados_antes = dados_antes
         self.dados_depois = dados_depois
+        self.intervalo_horarios = intervalo_horarios
 
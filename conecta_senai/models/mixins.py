@@ -1,21 +1,95 @@
+"""Serialização de modelos SQLAlchemy para dicionários de tipos nativos.
+
+``to_dict`` não inspeciona o *mapper* a cada chamada: na primeira
+serialização de cada modelo (e de cada conjunto de campos) é montado um
+serializador com a lista de colunas e um formatador escolhido pelo tipo da
+coluna, guardado em ``_SERIALIZADORES`` e reaproveitado daí em diante.
+"""
 from datetime import date, datetime, time
+from decimal import Decimal
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
 from sqlalchemy.inspection import inspect
 
+Serializador = Callable[[object], dict]
+
+_SERIALIZADORES: Dict[Tuple[type, Optional[Tuple[str, ...]]], Serializador] = {}
+_TIPOS_NATIVOS = (bool, int, float, str, bytes, Decimal, dict, list)
+
+
+def _serializar_valor(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, time):
+        return value.isoformat(timespec="minutes")
+    return value
+
+
+def _data(value):
+    return None if value is None else value.isoformat()
+
+
+def _hora(value):
+    return None if value is None else value.isoformat(timespec="minutes")
+
+
+def _formatador(column):
+    """Formatador da coluna, ou ``None`` quando o valor já é nativo."""
+    try:
+        tipo = column.type.python_type
+    except NotImplementedError:
+        return _serializar_valor
+    if issubclass(tipo, (datetime, date)):
+        return _data
+    if issubclass(tipo, time):
+        return _hora
+    if issubclass(tipo, _TIPOS_NATIVOS):
+        return None
+    return _serializar_valor
+
+
+def compilar_serializador(
+    modelo: type, campos: Optional[Iterable[str]] = None
+) -> Serializador:
+    """Devolve o serializador das colunas de ``modelo``, montando-o uma única vez.
+
+    ``campos`` restringe (e ordena) as colunas incluídas, permitindo que cada
+    rota registre o seu próprio conjunto; ``KeyError`` para colunas
+    inexistentes.
+    """
+    chave = (modelo, None if campos is None else tuple(campos))
+    serializador = _SERIALIZADORES.get(chave)
+    if serializador is not None:
+        return serializador
+
+    colunas = {column.key: column for column in inspect(modelo).columns}
+    nomes = tuple(colunas) if chave[1] is None else chave[1]
+    formatadores = tuple(_formatador(colunas[nome]) for nome in nomes)
+    ler = attrgetter(*nomes) if len(nomes) > 1 else (lambda obj: (getattr(obj, nomes[0]),))
+
+    if not any(formatadores):
+        def serializador(obj):
+            return dict(zip(nomes, ler(obj)))
+    else:
+        itens = tuple(zip(nomes, formatadores))
+
+        def serializador(obj):
+            return {
+                nome: valor if fmt is None else fmt(valor)
+                for (nome, fmt), valor in zip(itens, ler(obj))
+            }
+
+    _SERIALIZADORES[chave] = serializador
+    return serializador
+
 
 class SerializerMixin:
     """Mixin providing simple SQLAlchemy model serialization."""
 
     def _serialize_value(self, value):
-        if isinstance(value, (datetime, date)):
-            return value.isoformat()
-        if isinstance(value, time):
-            return value.isoformat(timespec="minutes")
-        return value
-
-    def to_dict(self):
-        """Return the model's columns as a dict of native types."""
-        mapper = inspect(self.__class__)
-        data = {}
-        for column in mapper.columns:
-            data[column.key] = self._serialize_value(getattr(self, column.key))
-        return data
+        return _serializar_valor(value)
+
+    def to_dict(self, campos=None):
+        """Return the model's columns (or only ``campos``) as a dict of native types."""
+        return compilar_serializador(type(self), campos)(self)
@@ -4,10 +4,97 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 
 from conecta_senai.models import db
 
+# Índice de busca textual mantido pelo próprio banco (ver
+# ``services/noticia_busca.py``). No PostgreSQL é a coluna ``busca_vetor``
+# (fora do ORM) preenchida por trigger com pesos A/B/C para título, resumo e
+# conteúdo e indexada com GIN; no SQLite é a tabela FTS5 ``noticias_fts`` com
+# conteúdo externo sincronizada por triggers.
+CONFIG_BUSCA_POSTGRES = "portuguese_unaccent"
+
+_DDL_BUSCA_POSTGRES = (
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{CONFIG_BUSCA_POSTGRES}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {CONFIG_BUSCA_POSTGRES} (COPY = portuguese);
+            ALTER TEXT SEARCH CONFIGURATION {CONFIG_BUSCA_POSTGRES}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+        END IF;
+    END
+    $$
+    """,
+    "ALTER TABLE noticias ADD COLUMN IF NOT EXISTS busca_vetor tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION noticias_busca_vetor_atualizar() RETURNS trigger AS $$
+    BEGIN
+        NEW.busca_vetor :=
+            setweight(to_tsvector('{CONFIG_BUSCA_POSTGRES}', coalesce(NEW.titulo, '')), 'A')
+            || setweight(to_tsvector('{CONFIG_BUSCA_POSTGRES}', coalesce(NEW.resumo, '')), 'B')
+            || setweight(to_tsvector('{CONFIG_BUSCA_POSTGRES}', coalesce(NEW.conteudo, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_noticias_busca_vetor ON noticias",
+    """
+    CREATE TRIGGER trg_noticias_busca_vetor
+        BEFORE INSERT OR UPDATE OF titulo, resumo, conteudo ON noticias
+        FOR EACH ROW EXECUTE FUNCTION noticias_busca_vetor_atualizar()
+    """,
+    "UPDATE noticias SET titulo = titulo WHERE busca_vetor IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_noticias_busca_vetor ON noticias USING GIN (busca_vetor)",
+)
+
+_DDL_BUSCA_SQLITE = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS noticias_fts USING fts5(
+        titulo, resumo, conteudo,
+        content='noticias', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS noticias_fts_ai AFTER INSERT ON noticias BEGIN
+        INSERT INTO noticias_fts(rowid, titulo, resumo, conteudo)
+        VALUES (new.id, new.titulo, new.resumo, new.conteudo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS noticias_fts_ad AFTER DELETE ON noticias BEGIN
+        INSERT INTO noticias_fts(noticias_fts, rowid, titulo, resumo, conteudo)
+        VALUES ('delete', old.id, old.titulo, old.resumo, old.conteudo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS noticias_fts_au AFTER UPDATE OF titulo, resumo, conteudo ON noticias BEGIN
+        INSERT INTO noticias_fts(noticias_fts, rowid, titulo, resumo, conteudo)
+        VALUES ('delete', old.id, old.titulo, old.resumo, old.conteudo);
+        INSERT INTO noticias_fts(rowid, titulo, resumo, conteudo)
+        VALUES (new.id, new.titulo, new.resumo, new.conteudo);
+    END
+    """,
+    "INSERT INTO noticias_fts(noticias_fts) VALUES ('rebuild')",
+)
+
+
+def instalar_busca_textual(conexao) -> bool:
+    """Cria (ou atualiza) o índice de busca textual no dialeto da conexão."""
+
+    instrucoes = {
+        "postgresql": _DDL_BUSCA_POSTGRES,
+        "sqlite": _DDL_BUSCA_SQLITE,
+    }.get(conexao.dialect.name)
+    if not instrucoes:
+        return False
+    for instrucao in instrucoes:
+        conexao.exec_driver_sql(instrucao)
+    return True
+
 
 def utcnow():
     """Retorna o horário atual em UTC com informação de timezone."""
@@ -85,3 +172,14 @@ class Noticia(db.Model):
 
     def __repr__(self) -> str:  # pragma: no cover - representação auxiliar
         return f"<Noticia {self.id} - {self.titulo!r}>"
+
+
+@event.listens_for(Noticia.__table__, "after_create")
+def _criar_indice_busca(tabela, conexao, **_kw) -> None:
+    instalar_busca_textual(conexao)
+
+
+@event.listens_for(Noticia.__table__, "before_drop")
+def _remover_indice_busca(tabela, conexao, **_kw) -> None:
+    if conexao.dialect.name == "sqlite":
+        conexao.exec_driver_sql("DROP TABLE IF EXISTS noticias_fts")
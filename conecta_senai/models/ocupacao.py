@@ -1,8 +1,10 @@
 """Modelo de ocupacao de sala."""
-from datetime import datetime, date, time, timedelta
+from datetime import datetime, date, time
+
+from sqlalchemy.orm import selectinload
 
 from conecta_senai.models import db
-from .mixins import SerializerMixin
+from .mixins import SerializerMixin, compilar_serializador
 
 # Mapeamento padrão de turnos utilizado em diversos pontos do sistema
 TURNOS_PADRAO = {
@@ -10,6 +12,19 @@ TURNOS_PADRAO = {
     'Tarde': (time.fromisoformat('13:30'), time.fromisoformat('17:30')),
     'Noite': (time.fromisoformat('18:30'), time.fromisoformat('22:30')),
 }
+_TURNO_POR_HORARIOS = {horarios: nome for nome, horarios in TURNOS_PADRAO.items()}
+
+DIAS_SEMANA = ('segunda', 'terca', 'quarta', 'quinta', 'sexta', 'sabado', 'domingo')
+
+CORES_TIPO_OCUPACAO = {
+    'aula_regular': '#006837',      # Verde FIEMG
+    'evento_especial': '#FFB612',   # Amarelo FIEMG
+    'reuniao': '#00539F',           # Azul FIEMG
+    'manutencao': '#D50032',        # Vermelho FIEMG
+    'reserva_especial': '#9C27B0'   # Roxo
+}
+COR_TIPO_PADRAO = '#888888'  # Cinza
+
 
 class Ocupacao(SerializerMixin, db.Model):
     """
@@ -56,29 +71,27 @@ class Ocupacao(SerializerMixin, db.Model):
         """
         Calcula a duração da ocupação em minutos.
         """
-        inicio_datetime = datetime.combine(date.today(), self.horario_inicio)
-        fim_datetime = datetime.combine(date.today(), self.horario_fim)
-        
+        inicio, fim = self.horario_inicio, self.horario_fim
+        segundos = (
+            (fim.hour - inicio.hour) * 3600
+            + (fim.minute - inicio.minute) * 60
+            + fim.second - inicio.second
+        )
+
         # Se o horário de fim for menor que o de início, assume que é no dia seguinte
-        if fim_datetime <= inicio_datetime:
-            fim_datetime = datetime.combine(date.today(), self.horario_fim) + timedelta(days=1)
-        
-        duracao = fim_datetime - inicio_datetime
-        return int(duracao.total_seconds() / 60)
+        if segundos <= 0:
+            segundos += 24 * 3600
+        return segundos // 60
     
     def get_dia_semana(self):
         """
         Retorna o dia da semana da ocupação.
         """
-        dias = ['segunda', 'terca', 'quarta', 'quinta', 'sexta', 'sabado', 'domingo']
-        return dias[self.data.weekday()]
+        return DIAS_SEMANA[self.data.weekday()]
 
     def get_turno(self):
         """Retorna o nome do turno baseado nos horários padrão."""
-        for nome, (inicio, fim) in TURNOS_PADRAO.items():
-            if self.horario_inicio == inicio and self.horario_fim == fim:
-                return nome
-        return None
+        return _TURNO_POR_HORARIOS.get((self.horario_inicio, self.horario_fim))
     
     def is_conflito_com(self, outra_ocupacao):
         """
@@ -126,51 +139,49 @@ class Ocupacao(SerializerMixin, db.Model):
         """
         Retorna a cor associada ao tipo de ocupação.
         """
-        cores = {
-            'aula_regular': '#006837',      # Verde FIEMG
-            'evento_especial': '#FFB612',   # Amarelo FIEMG
-            'reuniao': '#00539F',           # Azul FIEMG
-            'manutencao': '#D50032',        # Vermelho FIEMG
-            'reserva_especial': '#9C27B0'   # Roxo
-        }
-        return cores.get(self.tipo_ocupacao, '#888888')  # Cinza como padrão
+        return CORES_TIPO_OCUPACAO.get(self.tipo_ocupacao, COR_TIPO_PADRAO)
     
-    def to_dict(self, include_relations=True):
+    def to_dict(self, include_relations=True, campos=None):
         """Converte a ocupação para dicionário serializável.
 
         Args:
             include_relations: inclui dados relacionados (sala, instrutor, usuário).
+            campos: restringe as colunas incluídas (ver ``compilar_serializador``);
+                os campos calculados e os relacionados não são afetados.
+
+        Para listas, carregue as relações com ``Ocupacao.opcoes_serializacao()``
+        e evite uma consulta por ocupação.
         """
-        result = super().to_dict()
-        result.update(
-            {
-                "duracao_minutos": self.get_duracao_minutos(),
-                "dia_semana": self.get_dia_semana(),
-                "turno": self.get_turno(),
-                "cor_tipo": self.get_cor_tipo(),
-            }
-        )
+        result = compilar_serializador(Ocupacao, campos)(self)
+        result["duracao_minutos"] = self.get_duracao_minutos()
+        result["dia_semana"] = DIAS_SEMANA[self.data.weekday()]
+        result["turno"] = _TURNO_POR_HORARIOS.get((self.horario_inicio, self.horario_fim))
+        result["cor_tipo"] = CORES_TIPO_OCUPACAO.get(self.tipo_ocupacao, COR_TIPO_PADRAO)
 
         if include_relations:
-            if self.sala:
-                result.update(
-                    {
-                        "sala_nome": self.sala.nome,
-                        "sala_capacidade": self.sala.capacidade,
-                        "sala_localizacao": self.sala.localizacao,
-                    }
-                )
-            if self.instrutor:
-                result.update(
-                    {
-                        "instrutor_nome": self.instrutor.nome,
-                        "instrutor_email": self.instrutor.email,
-                    }
-                )
-            if self.usuario:
-                result["usuario_nome"] = self.usuario.nome
+            sala = self.sala
+            if sala:
+                result["sala_nome"] = sala.nome
+                result["sala_capacidade"] = sala.capacidade
+                result["sala_localizacao"] = sala.localizacao
+            instrutor = self.instrutor
+            if instrutor:
+                result["instrutor_nome"] = instrutor.nome
+                result["instrutor_email"] = instrutor.email
+            usuario = self.usuario
+            if usuario:
+                result["usuario_nome"] = usuario.nome
 
         return result
+
+    @staticmethod
+    def opcoes_serializacao():
+        """Opções de carga das relações usadas por ``to_dict``, em lote."""
+        return (
+            selectinload(Ocupacao.sala),
+            selectinload(Ocupacao.instrutor),
+            selectinload(Ocupacao.usuario),
+        )
     
     @staticmethod
     def buscar_conflitos(sala_id, data, horario_inicio, horario_fim, ocupacao_id=None, grupo_ocupacao_id=None):
@@ -238,3 +249,6 @@ class Ocupacao(SerializerMixin, db.Model):
     def __repr__(self):
         return f'<Ocupacao {self.curso_evento} - {self.data} {self.horario_inicio}-{self.horario_fim}>'
 
+
+# Monta o serializador das colunas na importação do modelo.
+compilar_serializador(Ocupacao)
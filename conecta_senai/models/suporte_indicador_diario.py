@@ -0,0 +1,40 @@
+"""Agregado diário dos chamados de suporte de TI usado pelos indicadores."""
+from conecta_senai.models import db
+
+
+class SuporteIndicadorDiario(db.Model):
+    """Contagens e somas de tempos por dia de abertura e dimensões do chamado.
+
+    Mantido incrementalmente pelas rotas que criam, alteram ou excluem
+    chamados; pode ser reconstruído com ``flask reconstruir_indicadores_suporte``.
+    As colunas da chave não aceitam ``NULL`` (o PostgreSQL trata ``NULL``s
+    como distintos na restrição única): valores ausentes são gravados como
+    ``CHAVE_VAZIA``.
+    """
+
+    CHAVE_VAZIA = {"area": "", "tipo_equipamento_id": 0, "nivel_urgencia": "", "status": ""}
+
+    __tablename__ = "suporte_indicadores_diarios"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "dia",
+            "area",
+            "tipo_equipamento_id",
+            "nivel_urgencia",
+            "status",
+            name="uq_suporte_indicadores_diarios_chave",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    dia = db.Column(db.Date, nullable=False, index=True)
+    area = db.Column(db.String(120), nullable=False, server_default="")
+    tipo_equipamento_id = db.Column(db.Integer, nullable=False, server_default="0")
+    nivel_urgencia = db.Column(db.String(20), nullable=False, server_default="")
+    status = db.Column(db.String(20), nullable=False, server_default="")
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+    atendidos = db.Column(db.Integer, nullable=False, default=0)
+    soma_atendimento_segundos = db.Column(db.Float, nullable=False, default=0)
+    encerrados = db.Column(db.Integer, nullable=False, default=0)
+    soma_encerramento_segundos = db.Column(db.Float, nullable=False, default=0)
+    atendidos_24h = db.Column(db.Integer, nullable=False, default=0)
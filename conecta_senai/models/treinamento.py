@@ -87,6 +87,11 @@ class TurmaTreinamento(db.Model):
         db.Boolean, nullable=False, server_default=text('FALSE'), default=False
     )
 
+    __table_args__ = (
+        db.Index("ix_turmas_treinamento_data_inicio", "data_inicio", "id"),
+        db.Index("ix_turmas_treinamento_data_fim", "data_fim"),
+    )
+
     # Relacionamentos
     treinamento = db.relationship(
         "Treinamento", back_populates='turmas'
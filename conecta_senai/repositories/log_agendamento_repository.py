@@ -0,0 +1,82 @@
+import base64
+from datetime import datetime, timedelta
+
+from sqlalchemy import tuple_
+
+from conecta_senai.models.log_agendamento import LogAgendamento
+
+
+class LogAgendamentoRepository:
+    """Repositório para logs de agendamentos com paginação por cursor.
+
+    A ordenação é sempre ``(timestamp, id)`` decrescente e cada página
+    continua a partir da última linha da anterior (*keyset*), usando o índice
+    ``ix_logs_agendamentos_timestamp_id`` em vez de ``OFFSET``.
+    """
+
+    @staticmethod
+    def filtrar(usuario=None, tipo=None, data_acao=None):
+        """Consulta com os filtros da tela de logs.
+
+        ``data_acao`` (``YYYY-MM-DD``) vira um intervalo semiaberto sobre
+        ``timestamp``; propaga ``ValueError`` para datas inválidas.
+        """
+        query = LogAgendamento.query
+        if usuario:
+            query = query.filter(LogAgendamento.usuario.ilike(f'%{usuario}%'))
+        if tipo:
+            query = query.filter(LogAgendamento.tipo_acao == tipo)
+        if data_acao:
+            inicio = datetime.strptime(data_acao, '%Y-%m-%d')
+            query = query.filter(
+                LogAgendamento.timestamp >= inicio,
+                LogAgendamento.timestamp < inicio + timedelta(days=1),
+            )
+        return query
+
+    @staticmethod
+    def codificar_cursor(log: LogAgendamento) -> str:
+        valor = f'{log.timestamp.isoformat()}|{log.id}'
+        return base64.urlsafe_b64encode(valor.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decodificar_cursor(cursor: str):
+        """Devolve ``(timestamp, id)``; propaga ``ValueError`` se inválido."""
+        try:
+            bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+            timestamp, id_ = bruto.split('|')
+            return datetime.fromisoformat(timestamp), int(id_)
+        except (UnicodeDecodeError, TypeError, ValueError) as exc:
+            raise ValueError('Cursor inválido') from exc
+
+    @staticmethod
+    def pagina(query, cursor=None, limite=50):
+        """Retorna ``(logs, proximo_cursor)``; o cursor é ``None`` na última página."""
+        if cursor:
+            timestamp, id_ = LogAgendamentoRepository.decodificar_cursor(cursor)
+            query = query.filter(
+                tuple_(LogAgendamento.timestamp, LogAgendamento.id) < tuple_(timestamp, id_)
+            )
+        logs = (
+            query.order_by(LogAgendamento.timestamp.desc(), LogAgendamento.id.desc())
+            .limit(limite + 1)
+            .all()
+        )
+        if len(logs) <= limite:
+            return logs, None
+        logs = logs[:limite]
+        return logs, LogAgendamentoRepository.codificar_cursor(logs[-1])
+
+    @staticmethod
+    def iterar(query, lote=1000):
+        """Percorre todas as linhas página a página, sem manter cursor aberto.
+
+        Use com ``query.with_entities(...)`` (incluindo ``timestamp`` e
+        ``id``) para não acumular objetos na sessão.
+        """
+        cursor = None
+        while True:
+            logs, cursor = LogAgendamentoRepository.pagina(query, cursor, lote)
+            yield from logs
+            if cursor is None:
+                return
@@ -0,0 +1,27 @@
+"""Rotas de acompanhamento da fila de envio de e-mails."""
+from flask import Blueprint, jsonify
+
+from conecta_senai.auth import admin_required
+from conecta_senai.services.email_outbox_service import status_job
+
+emails_bp = Blueprint('emails', __name__)
+
+
+@emails_bp.route('/emails/jobs/<job_id>', methods=['GET'])
+@admin_required
+def obter_status_job(job_id):
+    """Retorna o status de cada mensagem de um job de envio.
+
+    ---
+    tags:
+      - E-mails
+    responses:
+      200:
+        description: Andamento do job e status por mensagem
+      404:
+        description: Job não encontrado
+    """
+    status = status_job(job_id)
+    if status is None:
+        return jsonify({'erro': 'Job não encontrado'}), 404
+    return jsonify(status)
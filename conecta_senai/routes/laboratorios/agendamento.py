@@ -10,7 +10,14 @@ from openpyxl import Workbook
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from conecta_senai.models import db
-from conecta_senai.models.agendamento import Agendamento
+from conecta_senai.models.agendamento import (
+    Agendamento,
+    BIT_HORARIO_AVULSO,
+    BIT_POR_HORARIO,
+    HORARIOS_POR_TURNO,
+    horarios_da_mascara,
+    normalizar_horarios,
+)
 from conecta_senai.models.laboratorio_turma import Laboratorio, Turma
 from conecta_senai.models.user import User
 from conecta_senai.routes.user import verificar_autenticacao, verificar_admin
@@ -20,6 +27,9 @@ from sqlalchemy import func, extract
 from conecta_senai.utils.error_handler import handle_internal_error
 from conecta_senai.utils.audit import log_action
 from conecta_senai.models.log_agendamento import LogAgendamento
+from conecta_senai.repositories.log_agendamento_repository import LogAgendamentoRepository
+from conecta_senai.services.exportacao_service import resposta_csv
+from conecta_senai.utils.cache_http import cache_http
 from conecta_senai.services.agendamento_service import (
     listar_agendamentos as listar_agendamentos_service,
     obter_agendamento as obter_agendamento_service,
@@ -152,6 +162,7 @@ def agendamentos_calendario(mes, ano):
 
 
 @agendamento_bp.route('/agendamentos/calendario', methods=['GET'])
+@cache_http('agendamentos', por_usuario=True)
 def agendamentos_calendario_periodo():
     """Retorna agendamentos formatados para o componente de calendário.
     Aceita parâmetros de data_inicio e data_fim (YYYY-MM-DD) e filtros opcionais
@@ -211,6 +222,7 @@ def agendamentos_calendario_periodo():
 
 
 @agendamento_bp.route('/agendamentos/resumo-calendario', methods=['GET'])
+@cache_http('agendamentos', 'laboratorios')
 def agendamentos_resumo_calendario():
     """
     Retorna um resumo de agendamentos para o novo calendário, espelhando a lógica do resumo de ocupações.
@@ -301,31 +313,6 @@ def agendamentos_visao_semanal():
     return jsonify(resultado)
 
 
-HORARIOS_POR_TURNO = {
-    "Manhã": [
-        "08:00 - 08:45",
-        "08:45 - 09:30",
-        "09:30 - 10:15",
-        "10:30 - 11:15",
-        "11:15 - 12:00",
-    ],
-    "Tarde": [
-        "13:30 - 14:15",
-        "14:15 - 15:00",
-        "15:00 - 15:45",
-        "16:00 - 16:45",
-        "16:45 - 17:30",
-    ],
-    "Noite": [
-        "18:30 - 19:15",
-        "19:15 - 20:00",
-        "20:00 - 20:45",
-        "21:00 - 21:45",
-        "21:45 - 22:30",
-    ],
-}
-
-
 @agendamento_bp.route('/agendamentos/agenda-diaria', methods=['GET'])
 def agenda_diaria_laboratorios():
     autenticado, user = verificar_autenticacao(request)
@@ -353,22 +340,13 @@ def agenda_diaria_laboratorios():
     for turno, horarios_possiveis in HORARIOS_POR_TURNO.items():
         agendamentos_do_turno = [ag for ag in agendamentos if ag.turno == turno]
 
-        horarios_ocupados = set()
+        ocupados = 0
         for ag in agendamentos_do_turno:
-            horarios_agendados = ag.horarios
-            if isinstance(horarios_agendados, str):
-                try:
-                    horarios_agendados = json.loads(horarios_agendados)
-                except json.JSONDecodeError:
-                    horarios_agendados = []
-
-            if not isinstance(horarios_agendados, list):
-                continue
-
-            for h in horarios_agendados:
-                horarios_ocupados.add(h)
+            ocupados |= ag.mascara_horarios or 0
 
-        horarios_disponiveis = [h for h in horarios_possiveis if h not in horarios_ocupados]
+        horarios_disponiveis = [
+            h for h in horarios_possiveis if not ocupados & BIT_POR_HORARIO[h]
+        ]
 
         dados_finais[turno] = {
             "agendamentos": [
@@ -411,22 +389,26 @@ def verificar_disponibilidade():
 
     laboratorio_obj = Laboratorio.query.filter_by(nome=laboratorio_nome).first()
 
-    agendamentos = Agendamento.query.filter(
+    filtro = (
         Agendamento.data == data,
         Agendamento.laboratorio == laboratorio_nome,
-        Agendamento.turno == turno
-    ).all()
-
-    horarios_reservados = []
-    for ag in agendamentos:
-        try:
-            hrs = ag.horarios if isinstance(ag.horarios, list) else json.loads(ag.horarios)
-            if isinstance(hrs, list):
-                horarios_reservados.extend(hrs)
-        except Exception:  # nosec B110
-            pass
+        Agendamento.turno == turno,
+    )
+    # Consulta apenas as máscaras (coberta pelo índice); os horários em texto
+    # só são lidos quando algum agendamento tem horários fora da grade.
+    ocupados = 0
+    for (mascara,) in db.session.query(Agendamento.mascara_horarios).filter(*filtro):
+        ocupados |= mascara or 0
+
+    horarios_reservados = set(horarios_da_mascara(ocupados))
+    if ocupados & BIT_HORARIO_AVULSO:
+        avulsos = db.session.query(Agendamento.horarios).filter(
+            *filtro, Agendamento.mascara_horarios.op('&')(BIT_HORARIO_AVULSO) != 0
+        )
+        for (hrs,) in avulsos:
+            horarios_reservados.update(normalizar_horarios(hrs))
 
-    horarios_reservados = sorted(set(horarios_reservados))
+    horarios_reservados = sorted(horarios_reservados)
 
     return jsonify({
         'data': data.isoformat(),
@@ -498,109 +480,99 @@ def exportar_agendamentos():
     return output
 
 
+def _filtrar_logs_agenda():
+    return LogAgendamentoRepository.filtrar(
+        request.args.get('usuario'),
+        request.args.get('tipo'),
+        request.args.get('data'),
+    )
+
+
 @agendamento_bp.route('/logs-agenda', methods=['GET'])
 def listar_logs_agenda():
-    """Lista logs de agendamentos com filtros opcionais."""
+    """Lista logs de agendamentos com filtros opcionais.
+
+    Paginado por cursor: ``limite`` (padrão 50, máximo 200) e ``cursor`` com
+    o valor de ``proximo_cursor`` da página anterior.
+    """
     autenticado, user = verificar_autenticacao(request)
     if not autenticado or not verificar_admin(user):
         return jsonify({'erro': 'Permissão negada'}), 403
 
-    query = LogAgendamento.query
-    usuario = request.args.get('usuario')
-    tipo = request.args.get('tipo')
-    data_acao = request.args.get('data')
-
-    if usuario:
-        query = query.filter(LogAgendamento.usuario.ilike(f'%{usuario}%'))
-    if tipo:
-        query = query.filter(LogAgendamento.tipo_acao == tipo)
-    if data_acao:
-        try:
-            dia = datetime.strptime(data_acao, '%Y-%m-%d').date()
-            query = query.filter(func.date(LogAgendamento.timestamp) == dia)
-        except ValueError:
-            return jsonify({'erro': 'Formato de data inválido'}), 400
-
-    logs = query.order_by(LogAgendamento.timestamp.desc()).all()
-
-    def intervalo(horarios):
-        try:
-            if not horarios:
-                return None
-            if isinstance(horarios, str):
-                horarios = json.loads(horarios)
-            tempos = [h.split(' - ') for h in horarios]
-            if not tempos:
-                return None
-            inicio = tempos[0][0]
-            fim = tempos[-1][1]
-            return f"{inicio} - {fim}"
-        except Exception:  # nosec B110
-            return None
+    limite = max(1, min(request.args.get('limite', 50, type=int), 200))
+    try:
+        logs, proximo_cursor = LogAgendamentoRepository.pagina(
+            _filtrar_logs_agenda(), request.args.get('cursor'), limite
+        )
+    except ValueError:
+        return jsonify({'erro': 'Formato de data ou cursor inválido'}), 400
 
-    return jsonify([
-        {
-            'id': l.id,
-            'usuario': l.usuario,
-            'tipo_acao': l.tipo_acao,
-            'laboratorio': l.laboratorio,
-            'turno': l.turno,
-            'data_agendamento': l.data_agendamento.isoformat() if l.data_agendamento else None,
-            'dados_antes': l.dados_antes,
-            'dados_depois': l.dados_depois,
-            'intervalo_horarios': intervalo((l.dados_depois or {}).get('horarios') or (l.dados_antes or {}).get('horarios')),
-            'timestamp': l.timestamp.isoformat(),
-        }
-        for l in logs
-    ])
+    return jsonify({
+        'items': [
+            {
+                'id': l.id,
+                'usuario': l.usuario,
+                'tipo_acao': l.tipo_acao,
+                'laboratorio': l.laboratorio,
+                'turno': l.turno,
+                'data_agendamento': l.data_agendamento.isoformat() if l.data_agendamento else None,
+                'dados_antes': l.dados_antes,
+                'dados_depois': l.dados_depois,
+                'intervalo_horarios': l.intervalo_horarios,
+                'timestamp': l.timestamp.isoformat(),
+            }
+            for l in logs
+        ],
+        'limite': limite,
+        'proximo_cursor': proximo_cursor,
+    })
 
 
 @agendamento_bp.route('/logs-agenda/export', methods=['GET'])
 def exportar_logs_agenda():
-    """Exporta logs de agendamentos em CSV."""
+    """Exporta logs de agendamentos em CSV, com os mesmos filtros da listagem."""
     autenticado, user = verificar_autenticacao(request)
     if not autenticado or not verificar_admin(user):
         return jsonify({'erro': 'Permissão negada'}), 403
 
-    logs = LogAgendamento.query.order_by(LogAgendamento.timestamp.desc()).all()
-    si = StringIO()
-    writer = csv.writer(si)
-    writer.writerow(['Data/Hora', 'Usuário', 'Ação', 'Laboratório', 'Turno', 'Data Agendamento', 'Horário'])
-
-    def intervalo(horarios):
-        try:
-            if not horarios:
-                return ''
-            if isinstance(horarios, str):
-                horarios = json.loads(horarios)
-            tempos = [h.split(' - ') for h in horarios]
-            if not tempos:
-                return ''
-            return f"{tempos[0][0]} - {tempos[-1][1]}"
-        except Exception:  # nosec B110
-            return ''
-
-    for l in logs:
-        horarios = (l.dados_depois or {}).get('horarios') or (l.dados_antes or {}).get('horarios')
-        writer.writerow([
+    try:
+        query = _filtrar_logs_agenda().with_entities(
+            LogAgendamento.id,
+            LogAgendamento.timestamp,
+            LogAgendamento.usuario,
+            LogAgendamento.tipo_acao,
+            LogAgendamento.laboratorio,
+            LogAgendamento.turno,
+            LogAgendamento.data_agendamento,
+            LogAgendamento.intervalo_horarios,
+        )
+    except ValueError:
+        return jsonify({'erro': 'Formato de data inválido'}), 400
+
+    linhas = (
+        (
             l.timestamp.isoformat(),
             l.usuario,
             l.tipo_acao,
             l.laboratorio,
             l.turno,
             l.data_agendamento.isoformat() if l.data_agendamento else '',
-            intervalo(horarios),
-        ])
-    output = make_response(si.getvalue())
-    output.headers['Content-Disposition'] = 'attachment; filename=logs_agenda.csv'
-    output.headers['Content-Type'] = 'text/csv'
-    return output
+            l.intervalo_horarios or '',
+        )
+        for l in LogAgendamentoRepository.iterar(query)
+    )
+    return resposta_csv(
+        ['Data/Hora', 'Usuário', 'Ação', 'Laboratório', 'Turno', 'Data Agendamento', 'Horário'],
+        linhas,
+        'logs_agenda.csv',
+    )
 
 def verificar_conflitos_horarios(data, laboratorio, horarios_list, agendamento_id=None):
     return verificar_conflitos_horarios_service(data, laboratorio, horarios_list, agendamento_id)
 
 
 @agendamento_bp.route('/dashboard/laboratorios/kpis', methods=['GET'])
+@cache_http('agendamentos', 'laboratorios', 'turmas')
 def obter_kpis_dashboard():
     """Retorna contagens gerais para o dashboard de laboratórios."""
     autenticado, user = verificar_autenticacao(request)
@@ -629,6 +601,7 @@ def obter_kpis_dashboard():
 
 
 @agendamento_bp.route('/dashboard/laboratorios/proximos', methods=['GET'])
+@cache_http('agendamentos', por_usuario=True)
 def obter_proximos_agendamentos():
     """Retorna os próximos agendamentos (até 10)."""
     autenticado, user = verificar_autenticacao(request)
@@ -644,6 +617,7 @@ def obter_proximos_agendamentos():
 
 
 @agendamento_bp.route('/dashboard/laboratorios/mais-utilizados', methods=['GET'])
+@cache_http('agendamentos')
 def laboratorios_mais_utilizados():
     """Retorna laboratórios mais agendados no mês atual."""
     autenticado, user = verificar_autenticacao(request)
@@ -671,6 +645,7 @@ def laboratorios_mais_utilizados():
 
 
 @agendamento_bp.route('/dashboard/laboratorios/tendencia-mensal', methods=['GET'])
+@cache_http('agendamentos')
 def tendencia_mensal_agendamentos():
     """Retorna total de agendamentos por mês do ano atual."""
     autenticado, user = verificar_autenticacao(request)
@@ -3,7 +3,6 @@
 import hmac
 import logging
 from datetime import datetime, timezone
-from pathlib import Path
 from typing import Any, Dict, Tuple
 
 try:  # pragma: no cover - import opcional para ambientes sem psycopg2
@@ -11,17 +10,18 @@ try:  # pragma: no cover - import opcional para ambientes sem psycopg2
 except Exception:  # pragma: no cover - fallback se psycopg2 não estiver disponível
     psycopg2_errors = None
 
-from flask import Blueprint, current_app, jsonify, request, send_file
+from flask import Blueprint, current_app, jsonify, request
 from pydantic import ValidationError
-from sqlalchemy import or_
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 
 from conecta_senai.auth import admin_required
+from conecta_senai.models import db
 from conecta_senai.models.imagem_noticia import ImagemNoticia
 from conecta_senai.models.noticia import Noticia
 from conecta_senai.repositories.noticia_repository import NoticiaRepository
 from conecta_senai.schemas.noticia import NoticiaSchema
 from conecta_senai.schemas.noticia_validacao import NoticiaCreateSchema, NoticiaUpdateSchema
+from conecta_senai.services import imagem_variantes, noticia_busca, noticia_feed
 from conecta_senai.services.noticia_service import criar_noticia, atualizar_noticia, excluir_noticia
 from conecta_senai.utils.error_handler import handle_internal_error
 
@@ -143,7 +143,7 @@ def proteger_csrf():
 def obter_imagem(imagem_id: int):
     """Retorna o binário da imagem associada à notícia."""
 
-    imagem = ImagemNoticia.query.get(imagem_id)
+    imagem = db.session.get(ImagemNoticia, imagem_id)
     if not imagem:
         return jsonify({"erro": "Imagem não encontrada"}), 404
 
@@ -151,16 +151,36 @@ def obter_imagem(imagem_id: int):
     if resposta is not None:
         return resposta
 
-    caminho_relativo = (imagem.caminho_relativo or "").lstrip("/")
-    if caminho_relativo:
-        static_folder = Path(current_app.static_folder).resolve()
-        caminho = (static_folder / caminho_relativo).resolve()
-        if caminho.exists() and (static_folder in caminho.parents or caminho == static_folder):
-            return send_file(
-                caminho,
-                mimetype=imagem.content_type or "application/octet-stream",
-                download_name=imagem.nome_arquivo,
-            )
+    return jsonify({"erro": "Imagem não disponível"}), 404
+
+
+@api_noticias_bp.route("/noticias/imagens/<int:imagem_id>/<int:largura>", methods=["GET"])
+def obter_variante(imagem_id: int, largura: int):
+    """Retorna a imagem reduzida para ``largura`` pixels, no formato original."""
+
+    return _responder_variante(imagem_id, largura, webp=False)
+
+
+@api_noticias_bp.route("/noticias/imagens/<int:imagem_id>/<int:largura>.webp", methods=["GET"])
+def obter_variante_webp(imagem_id: int, largura: int):
+    """Retorna a imagem reduzida para ``largura`` pixels em WebP."""
+
+    return _responder_variante(imagem_id, largura, webp=True)
+
+
+def _responder_variante(imagem_id: int, largura: int, webp: bool):
+    if largura not in imagem_variantes.LARGURAS:
+        return jsonify({"erro": "Largura não suportada"}), 404
+    imagem = db.session.get(ImagemNoticia, imagem_id)
+    if not imagem:
+        return jsonify({"erro": "Imagem não encontrada"}), 404
+
+    resposta = imagem_variantes.responder_variante(imagem, largura, webp)
+    if resposta is None and not webp:
+        # Sem Pillow ou formato não redimensionável: a original serve.
+        resposta = imagem.enviar_arquivo()
+    if resposta is not None:
+        return resposta
 
     return jsonify({"erro": "Imagem não disponível"}), 404
 
@@ -184,21 +204,53 @@ def _estrutura_noticias_desatualizada(exc: BaseException) -> bool:
     return False
 
 
+def _per_page() -> int:
+    return max(1, min(request.args.get("per_page", 12, type=int), 50))
+
+
+def _filtro_destaque() -> bool | None:
+    destaque_param = request.args.get("destaque")
+    if not destaque_param:
+        return None
+    destaque_normalizado = destaque_param.lower()
+    if destaque_normalizado in {"true", "1", "sim", "destaque"}:
+        return True
+    if destaque_normalizado in {"false", "0", "nao", "não", "comum"}:
+        return False
+    return None
+
+
+def _filtro_calendario() -> bool | None:
+    return _normalizar_booleano(
+        request.args.get("calendario")
+        or request.args.get("marcar_calendario")
+        or request.args.get("marcarCalendario")
+    )
+
+
+def _chave_feed_publico() -> str | None:
+    """Chave do feed público em cache; buscas e listagens administrativas ficam de fora."""
+
+    args = request.args
+    if args.get("busca") or args.get("q") or args.get("ativo") or args.get("status"):
+        return None
+    if args.get("include_inativas", "false").lower() == "true":
+        return None
+    return noticia_feed.chave_feed(
+        args.get("page", 1, type=int), _per_page(), _filtro_destaque(), _filtro_calendario()
+    )
+
+
 @api_noticias_bp.route("/noticias", methods=["GET"])
+@noticia_feed.feed_publico(_chave_feed_publico)
 def listar_noticias():
     """Lista notícias paginadas, permitindo filtros básicos."""
     page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 12, type=int)
-    per_page = max(1, min(per_page, 50))
+    per_page = _per_page()
     incluir_inativas = request.args.get("include_inativas", "false").lower() == "true"
-    destaque_param = request.args.get("destaque")
+    filtro_destaque = _filtro_destaque()
     status_param = request.args.get("ativo") or request.args.get("status")
     termo_busca = request.args.get("busca") or request.args.get("q")
-    calendario_param = (
-        request.args.get("calendario")
-        or request.args.get("marcar_calendario")
-        or request.args.get("marcarCalendario")
-    )
 
     try:
         consulta = NoticiaRepository.base_query()
@@ -210,26 +262,24 @@ def listar_noticias():
                 consulta = consulta.filter(Noticia.ativo.is_(False))
         elif not incluir_inativas:
             consulta = consulta.filter(Noticia.ativo.is_(True))
-        if destaque_param:
-            destaque_normalizado = destaque_param.lower()
-            if destaque_normalizado in {"true", "1", "sim", "destaque"}:
-                consulta = consulta.filter(Noticia.destaque.is_(True))
-            elif destaque_normalizado in {"false", "0", "nao", "não", "comum"}:
-                consulta = consulta.filter(Noticia.destaque.is_(False))
-        if termo_busca:
-            like = f"%{termo_busca}%"
-            consulta = consulta.filter(
-                or_(Noticia.titulo.ilike(like), Noticia.resumo.ilike(like))
-            )
-        filtro_calendario = _normalizar_booleano(calendario_param)
+        if filtro_destaque is not None:
+            consulta = consulta.filter(Noticia.destaque.is_(filtro_destaque))
+        filtro_calendario = _filtro_calendario()
         if filtro_calendario is True:
             consulta = consulta.filter(Noticia.marcar_calendario.is_(True))
         elif filtro_calendario is False:
             consulta = consulta.filter(Noticia.marcar_calendario.is_(False))
 
-        consulta = consulta.order_by(Noticia.data_publicacao.desc(), Noticia.id.desc())
+        if termo_busca:
+            consulta = noticia_busca.aplicar_busca(consulta, termo_busca)
+        else:
+            consulta = consulta.order_by(Noticia.data_publicacao.desc(), Noticia.id.desc())
         paginacao = consulta.paginate(page=page, per_page=per_page, error_out=False)
         itens = noticias_schema.dump(paginacao.items)
+        if termo_busca:
+            destaques = noticia_busca.trechos([item["id"] for item in itens], termo_busca)
+            for item in itens:
+                item["trecho"] = destaques.get(item["id"])
         return jsonify(
             {
                 "items": itens,
@@ -1,5 +1,5 @@
 """Rotas para gerenciamento de ocupacoes de salas."""
-from flask import Blueprint, request, jsonify, make_response, send_file
+from flask import Blueprint, request, jsonify
 from conecta_senai.models import db
 from conecta_senai.models.ocupacao import Ocupacao
 from conecta_senai.models.sala import Sala
@@ -8,25 +8,30 @@ from conecta_senai.routes.user import verificar_autenticacao, verificar_admin
 from conecta_senai.auth import admin_required
 from sqlalchemy.exc import SQLAlchemyError
 from conecta_senai.utils.error_handler import handle_internal_error
-from conecta_senai.utils.audit import log_action
+from conecta_senai.utils.audit import log_actions
+from conecta_senai.utils.cache_http import cache_http
+from conecta_senai.services.ocupacao_conflito_service import buscar_conflitos_periodo
+from conecta_senai.services.ocupacao_grade_service import (
+    carregar_grade_periodo,
+    cor_turno,
+    grade_de_ocupacoes,
+)
+from conecta_senai.services.ocupacao_serie_service import materializar_serie
+from conecta_senai.services.exportacao_service import consultar_em_lotes, resposta_exportacao
 from datetime import datetime, date, time, timedelta
 from pydantic import ValidationError
 from conecta_senai.schemas import OcupacaoCreateSchema, OcupacaoUpdateSchema
-import csv
-from io import StringIO, BytesIO
-from openpyxl import Workbook
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 from sqlalchemy import and_, or_, func, extract, desc, cast, String
 
 ocupacao_bp = Blueprint('ocupacao', __name__)
 
-# Desabilita cache para todas as respostas deste blueprint para evitar que o
-# navegador utilize dados antigos ao atualizar ou excluir ocupações.
+# Desabilita cache para as respostas deste blueprint para evitar que o
+# navegador utilize dados antigos ao atualizar ou excluir ocupações. Rotas com
+# ``cache_http`` já definem ``private, no-cache`` (revalidação por ETag).
 @ocupacao_bp.after_request
 def add_no_cache_headers(response):
     """Adiciona cabeçalhos para desativar cache."""
-    response.headers['Cache-Control'] = 'no-store'
+    response.headers.setdefault('Cache-Control', 'no-store')
     return response
 
 TURNOS_PADRAO = {
@@ -94,49 +99,67 @@ def obter_turno_por_horarios(horario_inicio, horario_fim):
             return turno_nome
     return None
 
-@ocupacao_bp.route('/ocupacoes', methods=['GET'])
-def listar_ocupacoes():
-    """Lista ocupações agrupadas por reserva (grupo_ocupacao_id)."""
 
-    autenticado, user = verificar_autenticacao(request)
-    if not autenticado:
-        return jsonify({'erro': 'Não autenticado'}), 401
+def _ler_filtros_listagem():
+    """Lê os filtros de listagem/exportação de ocupações da query string.
 
-    data_inicio_str = request.args.get('data_inicio')
-    data_fim_str = request.args.get('data_fim')
-    sala_id = request.args.get('sala_id', type=int)
-    status = request.args.get('status')
-    tipo_ocupacao = request.args.get('tipo_ocupacao')
-    curso_evento = request.args.get('curso_evento')
+    Retorna ``(filtros, erro)``; ``erro`` é uma resposta pronta para ser
+    devolvida quando alguma data está em formato inválido.
+    """
 
-    data_inicio = None
-    data_fim = None
+    filtros = {
+        'data_inicio': None,
+        'data_fim': None,
+        'sala_id': request.args.get('sala_id', type=int),
+        'status': request.args.get('status'),
+        'tipo_ocupacao': request.args.get('tipo_ocupacao'),
+        'curso_evento': request.args.get('curso_evento'),
+    }
 
-    if data_inicio_str:
-        try:
-            data_inicio = datetime.strptime(data_inicio_str, '%Y-%m-%d').date()
-        except ValueError:
-            return jsonify({'erro': 'Formato de data_inicio inválido (YYYY-MM-DD)'}), 400
+    for campo in ('data_inicio', 'data_fim'):
+        valor = request.args.get(campo)
+        if valor:
+            try:
+                filtros[campo] = datetime.strptime(valor, '%Y-%m-%d').date()
+            except ValueError:
+                return None, (jsonify({'erro': f'Formato de {campo} inválido (YYYY-MM-DD)'}), 400)
 
-    if data_fim_str:
-        try:
-            data_fim = datetime.strptime(data_fim_str, '%Y-%m-%d').date()
-        except ValueError:
-            return jsonify({'erro': 'Formato de data_fim inválido (YYYY-MM-DD)'}), 400
+    return filtros, None
 
-    ocupacoes_query = Ocupacao.query
 
-    if sala_id:
-        ocupacoes_query = ocupacoes_query.filter(Ocupacao.sala_id == sala_id)
+def _aplicar_filtros_ocupacao(query, filtros):
+    """Aplica à consulta os filtros por atributo (sala, status, tipo e curso)."""
+
+    if filtros['sala_id']:
+        query = query.filter(Ocupacao.sala_id == filtros['sala_id'])
+
+    if filtros['status']:
+        query = query.filter(Ocupacao.status == filtros['status'])
 
-    if status:
-        ocupacoes_query = ocupacoes_query.filter(Ocupacao.status == status)
+    if filtros['tipo_ocupacao']:
+        query = query.filter(Ocupacao.tipo_ocupacao == filtros['tipo_ocupacao'])
 
-    if tipo_ocupacao:
-        ocupacoes_query = ocupacoes_query.filter(Ocupacao.tipo_ocupacao == tipo_ocupacao)
+    if filtros['curso_evento']:
+        query = query.filter(Ocupacao.curso_evento.ilike(f"%{filtros['curso_evento']}%"))
 
-    if curso_evento:
-        ocupacoes_query = ocupacoes_query.filter(Ocupacao.curso_evento.ilike(f'%{curso_evento}%'))
+    return query
+
+
+@ocupacao_bp.route('/ocupacoes', methods=['GET'])
+def listar_ocupacoes():
+    """Lista ocupações agrupadas por reserva (grupo_ocupacao_id)."""
+
+    autenticado, user = verificar_autenticacao(request)
+    if not autenticado:
+        return jsonify({'erro': 'Não autenticado'}), 401
+
+    filtros, erro = _ler_filtros_listagem()
+    if erro:
+        return erro
+    data_inicio = filtros['data_inicio']
+    data_fim = filtros['data_fim']
+
+    ocupacoes_query = _aplicar_filtros_ocupacao(Ocupacao.query, filtros)
 
     grupo_expr = func.coalesce(Ocupacao.grupo_ocupacao_id, cast(Ocupacao.id, String))
 
@@ -222,61 +245,43 @@ def listar_ocupacoes():
 
 @ocupacao_bp.route('/ocupacoes/export', methods=['GET'])
 def exportar_ocupacoes():
-    """Exporta ocupações em CSV, PDF ou XLSX."""
+    """Exporta ocupações em CSV, PDF ou XLSX.
+
+    Aceita os mesmos filtros de ``listar_ocupacoes``; as datas restringem o
+    dia de cada ocupação exportada.
+    """
     autenticado, user = verificar_autenticacao(request)
     if not autenticado:
         return jsonify({'erro': 'Não autenticado'}), 401
 
     formato = request.args.get('formato', 'csv').lower()
 
-    ocupacoes = Ocupacao.query.all()
-
-    if formato == 'pdf':
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        c.drawString(50, 750, "Relatório de Ocupações")
-        y = 730
-        c.drawString(50, y, "ID  Sala  Data  Início  Fim  Status")
-        y -= 20
-        for oc in ocupacoes:
-            sala = oc.sala.nome if oc.sala else oc.sala_id
-            c.drawString(50, y, f"{oc.id}  {sala}  {oc.data}  {oc.horario_inicio}  {oc.horario_fim}  {oc.status}")
-            y -= 20
-            if y < 50:
-                c.showPage()
-                y = 750
-        c.save()
-        buffer.seek(0)
-        return send_file(buffer, mimetype='application/pdf', as_attachment=True, download_name='ocupacoes.pdf')
-
-    if formato == 'xlsx':
-        wb = Workbook()
-        ws = wb.active
-        ws.append(["ID", "Sala", "Data", "Início", "Fim", "Status"])
-        for oc in ocupacoes:
-            sala = oc.sala.nome if oc.sala else oc.sala_id
-            ws.append([oc.id, sala, oc.data, oc.horario_inicio, oc.horario_fim, oc.status])
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name='ocupacoes.xlsx'
-        )
-
-    # CSV padrão
-    si = StringIO()
-    writer = csv.writer(si)
-    writer.writerow(["ID", "Sala", "Data", "Início", "Fim", "Status"])
-    for oc in ocupacoes:
-        sala = oc.sala.nome if oc.sala else oc.sala_id
-        writer.writerow([oc.id, sala, oc.data, oc.horario_inicio, oc.horario_fim, oc.status])
-    output = make_response(si.getvalue())
-    output.headers["Content-Disposition"] = "attachment; filename=ocupacoes.csv"
-    output.headers["Content-Type"] = "text/csv"
-    return output
+    filtros, erro = _ler_filtros_listagem()
+    if erro:
+        return erro
+
+    query = db.session.query(
+        Ocupacao.id,
+        func.coalesce(Sala.nome, cast(Ocupacao.sala_id, String)),
+        Ocupacao.data,
+        Ocupacao.horario_inicio,
+        Ocupacao.horario_fim,
+        Ocupacao.status,
+    ).outerjoin(Sala, Sala.id == Ocupacao.sala_id)
+    query = _aplicar_filtros_ocupacao(query, filtros)
+    if filtros['data_inicio']:
+        query = query.filter(Ocupacao.data >= filtros['data_inicio'])
+    if filtros['data_fim']:
+        query = query.filter(Ocupacao.data <= filtros['data_fim'])
+    query = consultar_em_lotes(query.order_by(Ocupacao.id))
+
+    return resposta_exportacao(
+        formato,
+        "Relatório de Ocupações",
+        ["ID", "Sala", "Data", "Início", "Fim", "Status"],
+        query,
+        'ocupacoes',
+    )
 
 @ocupacao_bp.route('/ocupacoes/<string:identificador>', methods=['GET'])
 def obter_ocupacao(identificador):
@@ -357,13 +362,9 @@ def criar_ocupacao():
 
         horario_inicio, horario_fim = TURNOS_PADRAO[payload.turno]
 
-        conflitos_totais = []
-        dia = data_inicio
-        while dia <= data_fim:
-            if not sala.is_disponivel(dia, horario_inicio, horario_fim):
-                conflitos = Ocupacao.buscar_conflitos(payload.sala_id, dia, horario_inicio, horario_fim)
-                conflitos_totais.extend(conflitos)
-            dia += timedelta(days=1)
+        conflitos_totais = buscar_conflitos_periodo(
+            payload.sala_id, data_inicio, data_fim, horario_inicio, horario_fim
+        )
 
         if conflitos_totais:
             return jsonify({
@@ -386,35 +387,29 @@ def criar_ocupacao():
         import uuid
         grupo_id = uuid.uuid4().hex
 
-        ocupacoes_criadas = []
-        dia = data_inicio
-        while dia <= data_fim:
-            # Se o tipo de ocupação for 'aula_regular' e o dia for sábado ou domingo, ignora
-            if payload.tipo_ocupacao == 'aula_regular' and dia.weekday() >= 5:
-                dia += timedelta(days=1)
-                continue
-            nova_ocupacao = Ocupacao(
-                sala_id=payload.sala_id,
-                usuario_id=user.id,
-                curso_evento=payload.curso_evento,
-                data=dia,
-                horario_inicio=horario_inicio,
-                horario_fim=horario_fim,
-                tipo_ocupacao=tipo_ocupacao,
-                recorrencia=recorrencia,
-                status=payload.status or 'confirmado',
-                observacoes=payload.observacoes,
-                grupo_ocupacao_id=grupo_id
-            )
-            db.session.add(nova_ocupacao)
-            ocupacoes_criadas.append(nova_ocupacao)
-            dia += timedelta(days=1)
+        ocupacoes_criadas = materializar_serie(
+            sala_id=payload.sala_id,
+            usuario_id=user.id,
+            curso_evento=payload.curso_evento,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            horario_inicio=horario_inicio,
+            horario_fim=horario_fim,
+            tipo_ocupacao=tipo_ocupacao,
+            recorrencia=recorrencia,
+            status=payload.status or 'confirmado',
+            observacoes=payload.observacoes,
+            grupo_ocupacao_id=grupo_id,
+            # Aulas regulares não ocupam sábados e domingos
+            ignorar_fim_de_semana=payload.tipo_ocupacao == 'aula_regular',
+        )
 
+        # Serializa antes do commit para evitar um refresh por linha expirada.
+        dados_criados = [o.to_dict() for o in ocupacoes_criadas]
         db.session.commit()
-        for oc in ocupacoes_criadas:
-            log_action(user.id, 'create', 'Ocupacao', oc.id, oc.to_dict())
+        log_actions(user.id, 'create', 'Ocupacao', [(d['id'], d) for d in dados_criados])
 
-        return jsonify([o.to_dict() for o in ocupacoes_criadas]), 201
+        return jsonify(dados_criados), 201
         
     except ValueError:
         return jsonify({'erro': 'Formato de data ou horário inválido'}), 400
@@ -496,20 +491,15 @@ def atualizar_ocupacao(identificador):
 
         ignorar_ocupacao_id = None if grupo_id_existente else ocupacao_original.id
 
-        conflitos_totais = []
-        dia_atual = data_inicio
-        while dia_atual <= data_fim:
-            if not sala.is_disponivel(dia_atual, horario_inicio, horario_fim, ignorar_ocupacao_id, grupo_id_existente):
-                conflitos = Ocupacao.buscar_conflitos(
-                    sala_id,
-                    dia_atual,
-                    horario_inicio,
-                    horario_fim,
-                    ignorar_ocupacao_id,
-                    grupo_id_existente
-                )
-                conflitos_totais.extend(conflitos)
-            dia_atual += timedelta(days=1)
+        conflitos_totais = buscar_conflitos_periodo(
+            sala_id,
+            data_inicio,
+            data_fim,
+            horario_inicio,
+            horario_fim,
+            ignorar_ocupacao_id,
+            grupo_id_existente
+        )
 
         if conflitos_totais:
             raise ValueError('Conflito de horário detectado. A sala já está ocupada neste período.')
@@ -520,43 +510,37 @@ def atualizar_ocupacao(identificador):
         for oc in ocupacoes_anteriores:
             db.session.delete(oc)
 
+        # O DELETE precisa chegar ao banco antes do INSERT em lote da nova série.
+        db.session.flush()
+
         # 6. Recria as novas ocupações com os dados atualizados.
-        ocupacoes_criadas = []
-        dia_atual = data_inicio
-        while dia_atual <= data_fim:
-            # Se o tipo de ocupação for 'aula_regular' e o dia for sábado ou domingo, ignora
-            if payload.tipo_ocupacao == 'aula_regular' and dia_atual.weekday() >= 5:
-                dia_atual += timedelta(days=1)
-                continue
-            nova_ocupacao = Ocupacao(
-                sala_id=sala_id,
-                usuario_id=user.id,
-                curso_evento=curso_evento,
-                data=dia_atual,
-                horario_inicio=horario_inicio,
-                horario_fim=horario_fim,
-                tipo_ocupacao=tipo_ocupacao,
-                recorrencia=recorrencia,
-                status=status_atual,
-                observacoes=observacoes,
-                grupo_ocupacao_id=grupo_id_final
-            )
-            db.session.add(nova_ocupacao)
-            ocupacoes_criadas.append(nova_ocupacao)
-            dia_atual += timedelta(days=1)
+        ocupacoes_criadas = materializar_serie(
+            sala_id=sala_id,
+            usuario_id=user.id,
+            curso_evento=curso_evento,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            horario_inicio=horario_inicio,
+            horario_fim=horario_fim,
+            tipo_ocupacao=tipo_ocupacao,
+            recorrencia=recorrencia,
+            status=status_atual,
+            observacoes=observacoes,
+            grupo_ocupacao_id=grupo_id_final,
+            # Aulas regulares não ocupam sábados e domingos
+            ignorar_fim_de_semana=payload.tipo_ocupacao == 'aula_regular',
+        )
 
         # 9. Comita a transação.
+        dados_criados = [o.to_dict() for o in ocupacoes_criadas]
         db.session.commit()
 
-        for antigo in dados_anteriores:
-            log_action(user.id, 'delete', 'Ocupacao', antigo['id'], antigo)
-
-        for oc in ocupacoes_criadas:
-            log_action(user.id, 'update', 'Ocupacao', oc.id, oc.to_dict())
+        log_actions(user.id, 'delete', 'Ocupacao', [(d['id'], d) for d in dados_anteriores])
+        log_actions(user.id, 'update', 'Ocupacao', [(d['id'], d) for d in dados_criados])
 
         return jsonify({
             'mensagem': 'Ocupação atualizada com sucesso!',
-            'ocupacoes': [o.to_dict() for o in ocupacoes_criadas]
+            'ocupacoes': dados_criados
         }), 200
 
     except ValueError as e:
@@ -601,8 +585,7 @@ def remover_ocupacao(identificador):
             db.session.delete(oc)
 
         db.session.commit()
-        for info in dados:
-            log_action(user.id, 'delete', 'Ocupacao', info['id'], info)
+        log_actions(user.id, 'delete', 'Ocupacao', [(info['id'], info) for info in dados])
         return jsonify({'mensagem': 'Ocupação removida com sucesso', 'removidas': quantidade})
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -647,6 +630,8 @@ def atualizar_instrutor_ocupacao(identificador):
         if not ocupacoes_grupo:
             ocupacoes_grupo = [ocupacao_base]
 
+        instrutor_anterior = ocupacao_base.instrutor_id
+
         # Atualiza todas as ocupações do grupo
         for ocupacao in ocupacoes_grupo:
             ocupacao.instrutor_id = instrutor_id
@@ -654,12 +639,14 @@ def atualizar_instrutor_ocupacao(identificador):
         db.session.commit()
 
         # Log de auditoria
-        for oc in ocupacoes_grupo:
-            log_action(user.id, 'update', 'Ocupacao', oc.id, {
+        log_actions(user.id, 'update', 'Ocupacao', [
+            (oc.id, {
                 'campo': 'instrutor_id',
-                'valor_anterior': ocupacao_base.instrutor_id,
+                'valor_anterior': instrutor_anterior,
                 'valor_novo': instrutor_id
             })
+            for oc in ocupacoes_grupo
+        ])
 
         return jsonify({
             'mensagem': 'Instrutor atualizado com sucesso',
@@ -716,19 +703,16 @@ def verificar_disponibilidade():
 
         horario_inicio, horario_fim = TURNOS_PADRAO[turno]
 
-        disponivel = True
-        conflitos = []
-        dia = data_inicio
-        while dia <= data_fim:
-            if not sala.is_disponivel(dia, horario_inicio, horario_fim, ocupacao_id, grupo_ocupacao_id):
-                disponivel = False
-                conflitos.extend(Ocupacao.buscar_conflitos(sala_id, dia, horario_inicio, horario_fim, ocupacao_id, grupo_ocupacao_id))
-            dia += timedelta(days=1)
-        
+        conflitos = buscar_conflitos_periodo(
+            sala_id, data_inicio, data_fim, horario_inicio, horario_fim, ocupacao_id, grupo_ocupacao_id
+        )
+        # Salas inativas nunca estão disponíveis, mesmo sem ocupações no período.
+        disponivel = sala.status == 'ativa' and not conflitos
+
         return jsonify({
             'disponivel': disponivel,
             'sala': sala.to_dict(),
-            'conflitos': conflitos
+            'conflitos': [c.to_dict(include_relations=False) for c in conflitos]
         })
         
     except ValueError:
@@ -737,6 +721,7 @@ def verificar_disponibilidade():
         return handle_internal_error(e)
 
 @ocupacao_bp.route('/ocupacoes/calendario', methods=['GET'])
+@cache_http('ocupacoes', 'salas', 'instrutores', 'usuarios')
 def obter_ocupacoes_calendario():
     """
     Obtém ocupações formatadas para exibição em calendário.
@@ -796,22 +781,23 @@ def obter_ocupacoes_calendario():
         )
     
     
-    ocupacoes = query.order_by(Ocupacao.data, Ocupacao.horario_inicio).all()
+    ocupacoes = query.order_by(Ocupacao.data, Ocupacao.horario_inicio).options(*Ocupacao.opcoes_serializacao()).all()
     
-    # Formata para o calendário
-    def cor_turno(t):
-        """Retorna a cor associada ao turno."""
-        cores = {
-            'Manhã': '#FDD835',
-            'Tarde': '#00539F',
-            'Noite': '#512DA8'
-        }
-        return cores.get(t, '#888888')
+    # A situação do turno considera todas as salas, não só as ocupações filtradas.
+    if sala_id or instrutor_id or turno:
+        grade = carregar_grade_periodo(data_inicio, data_fim)
+    else:
+        grade = grade_de_ocupacoes(ocupacoes, data_inicio, data_fim)
 
+    # Formata para o calendário
     eventos_calendario = []
     for ocupacao in ocupacoes:
         turno_evento = ocupacao.get_turno()
         cor = cor_turno(turno_evento)
+        propriedades = ocupacao.to_dict()
+        propriedades['situacao_turno'] = (
+            grade.situacao(ocupacao.data, turno_evento) if turno_evento else None
+        )
         evento = {
             'id': ocupacao.id,
             # Exibe apenas o turno no calendário mensal para evitar poluição visual
@@ -820,7 +806,7 @@ def obter_ocupacoes_calendario():
             'end': f"{ocupacao.data}T{ocupacao.horario_fim}",
             'backgroundColor': cor,
             'borderColor': cor,
-            'extendedProps': ocupacao.to_dict()
+            'extendedProps': propriedades
         }
         eventos_calendario.append(evento)
 
@@ -828,6 +814,7 @@ def obter_ocupacoes_calendario():
 
 
 @ocupacao_bp.route('/ocupacoes/resumo-periodo', methods=['GET'])
+@cache_http('ocupacoes', 'salas', 'instrutores')
 def obter_resumo_periodo():
     """Retorna resumo de salas ocupadas e livres por dia e turno."""
     autenticado, user = verificar_autenticacao(request)
@@ -857,67 +844,11 @@ def obter_resumo_periodo():
         except ValueError:
             return jsonify({'erro': 'Formato de data inválido (YYYY-MM-DD)'}), 400
 
-    salas_ativas = Sala.query.filter_by(status='ativa').all()
-    total_salas = len(salas_ativas)
-    salas_dict = {s.id: s.nome for s in salas_ativas}
-
-    query = Ocupacao.query.filter(
-        Ocupacao.data >= data_inicio,
-        Ocupacao.data <= data_fim,
-        Ocupacao.status.in_(['confirmado', 'pendente'])
-    )
-
-    if sala_id:
-        query = query.filter(Ocupacao.sala_id == sala_id)
-
-    if instrutor_id:
-        query = query.filter(Ocupacao.instrutor_id == instrutor_id)
-
-    if turno_filtro:
-        if turno_filtro not in TURNOS_PADRAO:
-            return jsonify({'erro': 'Turno inválido'}), 400
-        inicio, fim = TURNOS_PADRAO[turno_filtro]
-        query = query.filter(
-            Ocupacao.horario_inicio == inicio,
-            Ocupacao.horario_fim == fim
-        )
-
-
-    ocupacoes = query.all()
-
-    resumo = {}
-    dia = data_inicio
-    while dia <= data_fim:
-        resumo[dia.isoformat()] = {
-            turno: {
-                'ocupadas': 0,
-                'salas_ocupadas': [],
-                'salas_livres': [],
-                'total_salas': total_salas
-            } for turno in TURNOS_PADRAO
-        }
-        dia += timedelta(days=1)
-
-    for oc in ocupacoes:
-        turno = oc.get_turno()
-        if not turno:
-            continue
-        info = resumo[oc.data.isoformat()][turno]
-        info['ocupadas'] += 1
-        info['salas_ocupadas'].append({
-            'sala_id': oc.sala_id,
-            'sala_nome': salas_dict.get(oc.sala_id, str(oc.sala_id)),
-            'curso_evento': oc.curso_evento,
-            'instrutor_nome': oc.instrutor.nome if oc.instrutor else None
-        })
-
-    for dia_key, turnos in resumo.items():
-        for turno, info in turnos.items():
-            ocupadas_ids = [s['sala_id'] for s in info['salas_ocupadas']]
-            info['salas_livres'] = [nome for sid, nome in salas_dict.items() if sid not in ocupadas_ids]
-            info['livres'] = info['total_salas'] - info['ocupadas']
+    if turno_filtro and turno_filtro not in TURNOS_PADRAO:
+        return jsonify({'erro': 'Turno inválido'}), 400
 
-    return jsonify(resumo)
+    grade = carregar_grade_periodo(data_inicio, data_fim, sala_id, instrutor_id, turno_filtro)
+    return jsonify(grade.resumo())
 
 @ocupacao_bp.route('/ocupacoes/tipos', methods=['GET'])
 def listar_tipos_ocupacao():
@@ -1073,6 +1004,7 @@ def obter_tendencia_ocupacoes():
 
 
 @ocupacao_bp.route('/dashboard/salas/utilizacao', methods=['GET'])
+@cache_http('ocupacoes', 'salas')
 def salas_utilizacao_mes():
     """Retorna contagem de ocupações por sala no mês atual."""
     autenticado, user = verificar_autenticacao(request)
@@ -299,7 +299,7 @@ def listar_ocupacoes_sala(id):
         query = query.filter(Ocupacao.status == status)
     
     # Ordena por data e horário
-    ocupacoes = query.order_by(Ocupacao.data, Ocupacao.horario_inicio).all()
+    ocupacoes = query.order_by(Ocupacao.data, Ocupacao.horario_inicio).options(*Ocupacao.opcoes_serializacao()).all()
     
     return jsonify({
         'sala': sala.to_dict(),
@@ -15,7 +15,16 @@ from conecta_senai.auth import admin_required
 from conecta_senai.models import db
 from conecta_senai.models.suporte_basedados import SuporteArea, SuporteTipoEquipamento
 from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.models.suporte_indicador_diario import SuporteIndicadorDiario
 from conecta_senai.routes.suporte_ti.utils import ensure_tables_exist
+from conecta_senai.services.suporte_indicadores_service import (
+    calcular_indicadores,
+    ler_filtros_indicadores,
+)
+from conecta_senai.services.suporte_rollup_service import (
+    contribuicao_chamado,
+    registrar_alteracao,
+)
 
 suporte_ti_admin_bp = Blueprint(
     "suporte_ti_admin",
@@ -264,7 +273,7 @@ def exportar_chamados_excel():
 def atualizar_status_chamado(chamado_id: int):
     """Atualiza o status de um chamado existente."""
 
-    ensure_tables_exist([SuporteChamado])
+    ensure_tables_exist([SuporteChamado, SuporteIndicadorDiario])
 
     dados = request.get_json(silent=True) or {}
     novo_status = (dados.get("status") or "").strip()
@@ -282,6 +291,7 @@ def atualizar_status_chamado(chamado_id: int):
 
     # Salvar status anterior para comparação
     status_anterior = chamado.status
+    contribuicao_anterior = contribuicao_chamado(chamado)
 
     # Timezone de Brasília (UTC-3)
     tz_brasilia = timezone(timedelta(hours=-3))
@@ -330,6 +340,7 @@ def atualizar_status_chamado(chamado_id: int):
             chamado.observacoes = str(valor_observacoes)
 
     try:
+        registrar_alteracao(contribuicao_anterior, chamado)
         db.session.commit()
     except SQLAlchemyError:
         db.session.rollback()
@@ -355,7 +366,9 @@ def atualizar_chamado(chamado_id: int):
     if not _eh_admin_raiz():
         return _resposta_nao_autorizado()
 
-    ensure_tables_exist([SuporteChamado, SuporteArea, SuporteTipoEquipamento])
+    ensure_tables_exist(
+        [SuporteChamado, SuporteArea, SuporteTipoEquipamento, SuporteIndicadorDiario]
+    )
 
     payload = request.get_json(silent=True) or {}
     if not payload:
@@ -364,6 +377,7 @@ def atualizar_chamado(chamado_id: int):
     chamado = db.session.get(SuporteChamado, chamado_id)
     if not chamado:
         return jsonify({"erro": "Chamado não encontrado."}), 404
+    contribuicao_anterior = contribuicao_chamado(chamado)
 
     campos_atualizados = False
 
@@ -447,6 +461,7 @@ def atualizar_chamado(chamado_id: int):
     chamado.updated_at = datetime.now(tz_brasilia).replace(tzinfo=None)
 
     try:
+        registrar_alteracao(contribuicao_anterior, chamado)
         db.session.commit()
     except SQLAlchemyError:
         db.session.rollback()
@@ -471,13 +486,14 @@ def excluir_chamado(chamado_id: int):
     if not _eh_admin_raiz():
         return _resposta_nao_autorizado()
 
-    ensure_tables_exist([SuporteChamado])
+    ensure_tables_exist([SuporteChamado, SuporteIndicadorDiario])
 
     chamado = db.session.get(SuporteChamado, chamado_id)
     if not chamado:
         return jsonify({"erro": "Chamado não encontrado."}), 404
 
     try:
+        registrar_alteracao(contribuicao_chamado(chamado), None)
         db.session.delete(chamado)
         db.session.commit()
     except SQLAlchemyError:
@@ -491,187 +507,9 @@ def excluir_chamado(chamado_id: int):
 @admin_required
 def obter_indicadores():
     """Retorna indicadores de suporte com filtros e métricas de tempo."""
-    ensure_tables_exist([SuporteChamado])
-
-    # Construir query base
-    query = db.session.query(SuporteChamado)
-
-    # Aplicar filtros da query string
-    data_inicio_str = request.args.get("data_inicio")
-    data_fim_str = request.args.get("data_fim")
-    area = request.args.get("area")
-    tipo_equipamento_id = request.args.get("tipo_equipamento_id")
-    nivel_urgencia = request.args.get("nivel_urgencia")
-    status = request.args.get("status")
-
-    # Filtro de data início
-    if data_inicio_str:
-        try:
-            # Timezone de Brasília (UTC-3)
-            tz_brasilia = timezone(timedelta(hours=-3))
-            data_inicio = datetime.fromisoformat(data_inicio_str).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=tz_brasilia).replace(tzinfo=None)
-            query = query.filter(SuporteChamado.created_at >= data_inicio)
-        except (ValueError, TypeError):
-            pass
-
-    # Filtro de data fim
-    if data_fim_str:
-        try:
-            tz_brasilia = timezone(timedelta(hours=-3))
-            data_fim = datetime.fromisoformat(data_fim_str).replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=tz_brasilia).replace(tzinfo=None)
-            query = query.filter(SuporteChamado.created_at <= data_fim)
-        except (ValueError, TypeError):
-            pass
-
-    # Filtro de área
-    if area:
-        query = query.filter(SuporteChamado.area == area)
-
-    # Filtro de tipo de equipamento
-    if tipo_equipamento_id:
-        try:
-            tipo_id = int(tipo_equipamento_id)
-            query = query.filter(SuporteChamado.tipo_equipamento_id == tipo_id)
-        except (ValueError, TypeError):
-            pass
-
-    # Filtro de nível de urgência
-    if nivel_urgencia:
-        query = query.filter(SuporteChamado.nivel_urgencia == nivel_urgencia)
-
-    # Filtro de status
-    if status:
-        query = query.filter(SuporteChamado.status == status)
-
-    # Estatísticas básicas (com filtros aplicados)
-    total = query.count()
-    
-    por_status = (
-        db.session.query(SuporteChamado.status, func.count(SuporteChamado.id))
-        .filter(SuporteChamado.id.in_(query.with_entities(SuporteChamado.id).subquery()))
-        .group_by(SuporteChamado.status)
-        .all()
-    )
-    
-    por_tipo = (
-        db.session.query(SuporteTipoEquipamento.nome, func.count(SuporteChamado.id))
-        .join(
-            SuporteTipoEquipamento,
-            SuporteTipoEquipamento.id == SuporteChamado.tipo_equipamento_id,
-            isouter=True,
-        )
-        .filter(SuporteChamado.id.in_(query.with_entities(SuporteChamado.id).subquery()))
-        .group_by(SuporteTipoEquipamento.nome)
-        .all()
-    )
-    
-    por_urgencia = (
-        db.session.query(SuporteChamado.nivel_urgencia, func.count(SuporteChamado.id))
-        .filter(SuporteChamado.id.in_(query.with_entities(SuporteChamado.id).subquery()))
-        .group_by(SuporteChamado.nivel_urgencia)
-        .all()
-    )
-
-    # Métricas de tempo - Tempo médio até início de atendimento (em segundos)
-    tempo_medio_atendimento = (
-        db.session.query(
-            func.avg(
-                func.extract('epoch', SuporteChamado.inicio_atendimento_at) - 
-                func.extract('epoch', SuporteChamado.created_at)
-            )
-        )
-        .filter(SuporteChamado.inicio_atendimento_at.isnot(None))
-        .filter(SuporteChamado.id.in_(query.with_entities(SuporteChamado.id).subquery()))
-        .scalar()
-    )
-
-    # Tempo médio até encerramento (em segundos)
-    tempo_medio_encerramento = (
-        db.session.query(
-            func.avg(
-                func.extract('epoch', SuporteChamado.encerrado_at) - 
-                func.extract('epoch', SuporteChamado.created_at)
-            )
-        )
-        .filter(SuporteChamado.encerrado_at.isnot(None))
-        .filter(SuporteChamado.id.in_(query.with_entities(SuporteChamado.id).subquery()))
-        .scalar()
-    )
-
-    # Percentual de chamados atendidos em menos de 24 horas
-    total_com_atendimento = (
-        query.filter(SuporteChamado.inicio_atendimento_at.isnot(None)).count()
-    )
-    
-    if total_com_atendimento > 0:
-        atendidos_em_24h = (
-            query.filter(SuporteChamado.inicio_atendimento_at.isnot(None))
-            .filter(
-                func.extract('epoch', SuporteChamado.inicio_atendimento_at) - 
-                func.extract('epoch', SuporteChamado.created_at) < 86400
-            )
-            .count()
-        )
-        percentual_24h = (atendidos_em_24h / total_com_atendimento) * 100
-    else:
-        percentual_24h = 0
-
-    # Tempo médio por urgência
-    tempo_por_urgencia = []
-    for nivel in ["Baixo", "Médio", "Alto"]:
-        query_nivel = query.filter(SuporteChamado.nivel_urgencia == nivel)
-        
-        tempo_atend = (
-            db.session.query(
-                func.avg(
-                    func.extract('epoch', SuporteChamado.inicio_atendimento_at) - 
-                    func.extract('epoch', SuporteChamado.created_at)
-                )
-            )
-            .filter(SuporteChamado.inicio_atendimento_at.isnot(None))
-            .filter(SuporteChamado.id.in_(query_nivel.with_entities(SuporteChamado.id).subquery()))
-            .scalar()
-        )
-        
-        tempo_encer = (
-            db.session.query(
-                func.avg(
-                    func.extract('epoch', SuporteChamado.encerrado_at) - 
-                    func.extract('epoch', SuporteChamado.created_at)
-                )
-            )
-            .filter(SuporteChamado.encerrado_at.isnot(None))
-            .filter(SuporteChamado.id.in_(query_nivel.with_entities(SuporteChamado.id).subquery()))
-            .scalar()
-        )
-        
-        tempo_por_urgencia.append({
-            "nivel": nivel,
-            "tempo_atendimento": float(tempo_atend) if tempo_atend else 0,
-            "tempo_encerramento": float(tempo_encer) if tempo_encer else 0,
-        })
-
-    return jsonify(
-        {
-            "total_chamados": total,
-            "por_status": [
-                {"status": status or "Não informado", "quantidade": quantidade}
-                for status, quantidade in por_status
-            ],
-            "por_tipo_equipamento": [
-                {"tipo": tipo or "Não informado", "quantidade": quantidade}
-                for tipo, quantidade in por_tipo
-            ],
-            "por_nivel_urgencia": [
-                {"nivel": nivel or "Não informado", "quantidade": quantidade}
-                for nivel, quantidade in por_urgencia
-            ],
-            "tempo_medio_abertura_para_atendimento_segundos": float(tempo_medio_atendimento) if tempo_medio_atendimento else 0,
-            "tempo_medio_abertura_para_encerramento_segundos": float(tempo_medio_encerramento) if tempo_medio_encerramento else 0,
-            "percentual_atendidos_em_24h": round(percentual_24h, 2),
-            "tempo_medio_por_urgencia": tempo_por_urgencia,
-        }
-    )
+    ensure_tables_exist([SuporteChamado, SuporteIndicadorDiario])
+    filtros = ler_filtros_indicadores(request.args)
+    return jsonify(calcular_indicadores(filtros))
 
 
 def _criar_registro_basico(model, nome: str):
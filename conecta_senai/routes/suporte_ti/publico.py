@@ -14,7 +14,9 @@ from conecta_senai.models import db
 from conecta_senai.models.suporte_anexo import SuporteAnexo
 from conecta_senai.models.suporte_basedados import SuporteArea, SuporteTipoEquipamento
 from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.models.suporte_indicador_diario import SuporteIndicadorDiario
 from conecta_senai.routes.suporte_ti.utils import ensure_tables_exist
+from conecta_senai.services.suporte_rollup_service import registrar_alteracao
 
 suporte_ti_public_bp = Blueprint(
     "suporte_ti_publico",
@@ -62,7 +64,13 @@ def _serialize_chamado(chamado: SuporteChamado) -> dict:
 @login_required
 def criar_chamado():
     ensure_tables_exist(
-        [SuporteArea, SuporteTipoEquipamento, SuporteChamado, SuporteAnexo]
+        [
+            SuporteArea,
+            SuporteTipoEquipamento,
+            SuporteChamado,
+            SuporteAnexo,
+            SuporteIndicadorDiario,
+        ]
     )
 
     usuario = g.current_user
@@ -165,6 +173,8 @@ def criar_chamado():
 
     try:
         db.session.add(chamado)
+        db.session.flush()
+        registrar_alteracao(None, chamado)
         db.session.commit()
     except SQLAlchemyError:
         db.session.rollback()
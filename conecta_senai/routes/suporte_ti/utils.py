@@ -31,6 +31,12 @@ def ensure_tables_exist(models: Iterable[type[db.Model]]) -> None:
         if not inspector.has_table(table_name):
             model.__table__.create(db.engine)
             inspector = inspect(db.engine)
+            if table_name == "suporte_indicadores_diarios":
+                from conecta_senai.services.suporte_rollup_service import (
+                    reconstruir_rollup,
+                )  # lazy import
+
+                reconstruir_rollup()
 
         if table_name == SuporteChamado.__tablename__:
             inspector = _ensure_suporte_chamados_columns(inspector)
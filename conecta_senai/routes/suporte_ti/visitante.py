@@ -10,7 +10,9 @@ from wtforms.validators import ValidationError
 from conecta_senai.models import db
 from conecta_senai.models.suporte_basedados import SuporteArea, SuporteTipoEquipamento
 from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.models.suporte_indicador_diario import SuporteIndicadorDiario
 from conecta_senai.routes.suporte_ti.utils import ensure_tables_exist
+from conecta_senai.services.suporte_rollup_service import registrar_alteracao
 
 suporte_ti_visitante_bp = Blueprint(
     "suporte_ti_visitante",
@@ -99,7 +101,9 @@ def obter_base_dados_visitante():
 def abrir_chamado_publico():
     """Cria um novo chamado de suporte enviado por um visitante não autenticado."""
 
-    ensure_tables_exist([SuporteArea, SuporteTipoEquipamento, SuporteChamado])
+    ensure_tables_exist(
+        [SuporteArea, SuporteTipoEquipamento, SuporteChamado, SuporteIndicadorDiario]
+    )
 
     form = request.form
     payload = _recuperar_payload()
@@ -200,6 +204,8 @@ def abrir_chamado_publico():
 
     try:
         db.session.add(chamado)
+        db.session.flush()
+        registrar_alteracao(None, chamado)
         db.session.commit()
     except SQLAlchemyError:
         db.session.rollback()
@@ -59,6 +59,8 @@ from conecta_senai.services.email_service import (
     send_treinamento_desmarcado_email,
     send_turma_alterada_email,
 )
+from conecta_senai.services.email_outbox_service import enfileirar_envios
+from conecta_senai.services.turma_listagem_service import resposta_listagem_turmas
 
 log = logging.getLogger(__name__)
 
@@ -99,32 +101,7 @@ def coletar_dados_turma(turma: TurmaTreinamento) -> dict:
 @login_required
 def listar_turmas_agendadas():
     """Lista as turmas de treinamento que ainda não começaram."""
-    hoje = date.today()
-    turmas = (
-        TurmaTreinamento.query.filter(TurmaTreinamento.data_inicio > hoje)
-        .join(Treinamento)
-        .order_by(TurmaTreinamento.data_inicio)
-        .all()
-    )
-
-    dados = []
-    for turma in turmas:
-        dados.append(
-            {
-                "turma_id": turma.id,
-                "treinamento": turma.treinamento.to_dict(),
-                "data_inicio": (
-                    turma.data_inicio.isoformat() if turma.data_inicio else None
-                ),
-                "data_fim": turma.data_fim.isoformat() if turma.data_fim else None,
-                "local_realizacao": turma.local_realizacao,
-                "horario": turma.horario,
-                "instrutor_nome": turma.instrutor.nome if turma.instrutor else "A definir",
-                "teoria_online": turma.teoria_online,
-                "has_pratica": bool(getattr(turma.treinamento, "tem_pratica", False)),
-            }
-        )
-    return jsonify(dados)
+    return resposta_listagem_turmas("agendadas")
 
 
 # NOVO: Endpoint para as turmas ativas (em andamento)
@@ -132,36 +109,7 @@ def listar_turmas_agendadas():
 @login_required
 def listar_turmas_ativas():
     """Lista as turmas de treinamento que estão atualmente em andamento."""
-    hoje = date.today()
-    turmas = (
-        TurmaTreinamento.query.filter(
-            db.and_(
-                TurmaTreinamento.data_inicio <= hoje, TurmaTreinamento.data_fim >= hoje
-            )
-        )
-        .join(Treinamento)
-        .order_by(TurmaTreinamento.data_inicio.desc())
-        .all()
-    )
-
-    dados = []
-    for turma in turmas:
-        dados.append(
-            {
-                "turma_id": turma.id,
-                "treinamento": turma.treinamento.to_dict(),
-                "data_inicio": (
-                    turma.data_inicio.isoformat() if turma.data_inicio else None
-                ),
-                "data_fim": turma.data_fim.isoformat() if turma.data_fim else None,
-                "local_realizacao": turma.local_realizacao,
-                "horario": turma.horario,
-                "instrutor": turma.instrutor.to_dict() if turma.instrutor else None,
-                "teoria_online": turma.teoria_online,
-                "has_pratica": bool(getattr(turma.treinamento, "tem_pratica", False)),
-            }
-        )
-    return jsonify(dados)
+    return resposta_listagem_turmas("ativas")
 
 
 # MODIFICADO: Endpoint para o histórico de turmas (concluídas)
@@ -169,32 +117,7 @@ def listar_turmas_ativas():
 @login_required
 def listar_historico_turmas():
     """Lista as turmas de treinamento que já foram concluídas."""
-    hoje = date.today()
-    turmas = (
-        TurmaTreinamento.query.filter(TurmaTreinamento.data_fim < hoje)
-        .join(Treinamento)
-        .order_by(TurmaTreinamento.data_inicio.desc())
-        .all()
-    )
-
-    dados = []
-    for turma in turmas:
-        dados.append(
-            {
-                "turma_id": turma.id,
-                "treinamento": turma.treinamento.to_dict(),
-                "data_inicio": (
-                    turma.data_inicio.isoformat() if turma.data_inicio else None
-                ),
-                "data_fim": turma.data_fim.isoformat() if turma.data_fim else None,
-                "local_realizacao": turma.local_realizacao,
-                "horario": turma.horario,
-                "instrutor": turma.instrutor.to_dict() if turma.instrutor else None,
-                "teoria_online": turma.teoria_online,
-                "has_pratica": bool(getattr(turma.treinamento, "tem_pratica", False)),
-            }
-        )
-    return jsonify(dados)
+    return resposta_listagem_turmas("historico")
 
 
 # Se precisar retornar todas as turmas, mantém a rota original com novo nome
@@ -202,25 +125,7 @@ def listar_historico_turmas():
 @login_required
 def listar_todas_as_turmas():
     """Lista TODAS as turmas de treinamento (futuras, presentes e passadas)."""
-    turmas = TurmaTreinamento.query.join(Treinamento).order_by(Treinamento.nome).all()
-    dados = []
-    for turma in turmas:
-        dados.append(
-            {
-                "turma_id": turma.id,
-                "treinamento": turma.treinamento.to_dict(),
-                "data_inicio": (
-                    turma.data_inicio.isoformat() if turma.data_inicio else None
-                ),
-                "data_fim": turma.data_fim.isoformat() if turma.data_fim else None,
-                "local_realizacao": turma.local_realizacao,
-                "horario": turma.horario,
-                "instrutor": turma.instrutor.to_dict() if turma.instrutor else None,
-                "teoria_online": turma.teoria_online,
-                "has_pratica": bool(getattr(turma.treinamento, "tem_pratica", False)),
-            }
-        )
-    return jsonify(dados)
+    return resposta_listagem_turmas("todas")
 
 
 @treinamento_bp.route("/treinamentos/<int:turma_id>/inscricoes", methods=["POST"])
@@ -616,19 +521,23 @@ def atualizar_turma_treinamento(turma_id):
                 instrutor_antigo.nome if instrutor_antigo else None,
                 turma.instrutor.nome if turma.instrutor else None,
             )
+        job_id = None
         if diff:
-            try:
-                send_turma_alterada_email(dados_antigos, dados_novos)
-            except Exception as e:  # pragma: no cover - log apenas
-                current_app.logger.error(
-                    f"Erro ao enfileirar e-mail de alteração para turma {turma_id}: {e}"
-                )
-            try:
-                notificar_atualizacao_turma(
-                    turma, diff, instrutor_antigo, notificar_secretaria=False
-                )
-            except Exception as exc:  # pragma: no cover - log apenas
-                log.error(f"Erro ao notificar atualização de turma: {exc}")
+            with enfileirar_envios() as fila:
+                try:
+                    send_turma_alterada_email(dados_antigos, dados_novos)
+                except Exception as e:  # pragma: no cover - log apenas
+                    current_app.logger.error(
+                        f"Erro ao enfileirar e-mail de alteração para turma {turma_id}: {e}"
+                    )
+                try:
+                    notificar_atualizacao_turma(
+                        turma, diff, instrutor_antigo, notificar_secretaria=False
+                    )
+                except Exception as exc:  # pragma: no cover - log apenas
+                    log.error(f"Erro ao notificar atualização de turma: {exc}")
+            if fila.mensagens:
+                job_id = fila.job_id
         log_action(
             g.current_user.id,
             'update',
@@ -636,6 +545,8 @@ def atualizar_turma_treinamento(turma_id):
             turma.id,
             payload.model_dump(exclude_unset=True)
         )
+        if job_id:
+            return jsonify({**turma.to_dict(), "job_id": job_id}), 202
         return jsonify(turma.to_dict())
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -12,9 +12,8 @@ from conecta_senai.services.email_service import (
     notificar_atualizacao_turma,
     EmailService,
 )
+from conecta_senai.services.email_outbox_service import enfileirar_envios
 from conecta_senai.auth import admin_required
-from datetime import datetime
-import time
 
 turma_bp = Blueprint("turma", __name__)
 
@@ -238,50 +237,49 @@ def convocar_todos_da_turma(turma_id: int):
         total_inscricoes,
     )
 
-    convocados_sucesso = 0
-    for inscricao in inscricoes_para_convocar:
-        try:
-            # Pausa para respeitar o limite do provedor de e-mail (2 req/s)
-            time.sleep(0.6)
-            enviar_convocacao(inscricao, turma)
-            inscricao.convocado_em = datetime.utcnow()
-            convocados_sucesso += 1
-        except Exception as e:  # pragma: no cover - log de erro
-            current_app.logger.error(
-                "Falha ao convocar participante %s (email: %s): %s",
-                inscricao.id,
-                inscricao.email,
-                e,
-            )
-
-    try:
-        db.session.commit()
-        current_app.logger.info(
-            "Commit realizado. %s convocações atualizadas no banco de dados.",
-            convocados_sucesso,
-        )
-    except Exception as e:  # pragma: no cover - log de erro
-        db.session.rollback()
-        current_app.logger.error(
-            "Erro ao commitar as alterações no banco de dados: %s",
-            e,
-        )
+    enfileirados = 0
+    with enfileirar_envios() as fila:
+        for inscricao in inscricoes_para_convocar:
+            fila.referencia = ("convocacao", inscricao.id)
+            try:
+                enviar_convocacao(inscricao, turma)
+                enfileirados += 1
+            except Exception as e:  # pragma: no cover - log de erro
+                current_app.logger.error(
+                    "Falha ao convocar participante %s (email: %s): %s",
+                    inscricao.id,
+                    inscricao.email,
+                    e,
+                )
+
+    if not enfileirados:
+        # Nada foi para a outbox: não há job para acompanhar.
         return (
             jsonify(
                 {
-                    "error": (
-                        "Ocorreu um erro ao salvar o estado das convocações."
-                    )
+                    "message": (
+                        f"0 de {total_inscricoes} convocações "
+                        "enfileiradas para envio."
+                    ),
+                    "total": 0,
                 }
             ),
-            500,
+            200,
         )
 
-    return jsonify(
-        {
-            "message": (
-                f"{convocados_sucesso} de {total_inscricoes} participantes "
-                "convocados com sucesso."
-            )
-        }
+    current_app.logger.info(
+        "%s convocações enfileiradas no job %s.", enfileirados, fila.job_id
+    )
+    return (
+        jsonify(
+            {
+                "message": (
+                    f"{enfileirados} de {total_inscricoes} convocações "
+                    "enfileiradas para envio."
+                ),
+                "job_id": fila.job_id,
+                "total": enfileirados,
+            }
+        ),
+        202,
     )
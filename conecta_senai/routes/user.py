@@ -13,7 +13,7 @@ from conecta_senai.models.user import User
 from conecta_senai.repositories.user_repository import UserRepository
 from conecta_senai.models.refresh_token import RefreshToken
 import hashlib
-from conecta_senai.config.redis import redis_conn
+from conecta_senai.config.redis import revogacao
 from sqlalchemy.exc import SQLAlchemyError
 import requests
 from werkzeug.security import check_password_hash
@@ -23,6 +23,8 @@ from conecta_senai.auth import (
     verificar_admin,
     login_required,
     admin_required,
+    invalidar_token_cache,
+    invalidar_usuario_cache,
 )
 from flask_wtf.csrf import generate_csrf
 from conecta_senai.services import user_service
@@ -415,6 +417,7 @@ def atualizar_usuario(id):
 
     try:
         UserRepository.commit()
+        invalidar_usuario_cache(usuario.id)
         return jsonify(usuario.to_dict())
     except SQLAlchemyError as e:
         UserRepository.rollback()
@@ -461,6 +464,7 @@ def remover_usuario(id):
 
     try:
         UserRepository.delete(usuario)
+        invalidar_usuario_cache(id)
         return jsonify({"mensagem": "Usuário removido com sucesso"})
     except SQLAlchemyError as e:
         UserRepository.rollback()
@@ -668,10 +672,9 @@ def logout():
                 options={"verify_exp": False},
             )
             jti = dados.get("jti")
-            exp = datetime.utcfromtimestamp(dados["exp"])
-            ttl = exp - datetime.utcnow()
-            if ttl.total_seconds() > 0 and jti:
-                redis_conn.setex(jti, ttl, "revoked")
+            if jti:
+                revogacao.revogar(jti, dados["exp"])
+            invalidar_token_cache(token)
         except jwt.InvalidTokenError:
             return jsonify({"erro": "Token inválido"}), 401
 
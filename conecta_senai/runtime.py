@@ -0,0 +1,36 @@
+"""Inicialização dos workers do Gunicorn com ``preload_app``.
+
+Com o app pré-carregado no processo mestre, cada worker herda por ``fork`` o
+pool de conexões do SQLAlchemy e o cliente Redis criados antes dele. Conexões
+compartilhadas entre processos corrompem o protocolo, então ``post_fork``
+descarta o pool herdado (sem fechar os sockets do mestre), recria o cliente
+Redis e só então disputa a liderança do scheduler.
+"""
+
+from __future__ import annotations
+
+from flask import Flask
+
+from conecta_senai.config.redis import init_redis
+from conecta_senai.extensions import db
+from conecta_senai.tasks import iniciar_scheduler_com_lideranca
+from conecta_senai.utils.metricas_pool import obter_metricas_pool
+
+
+def reinicializar_apos_fork(app: Flask) -> None:
+    """Refaz no worker os recursos que não podem ser herdados do mestre."""
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    metricas = obter_metricas_pool(app)
+    if metricas is not None:
+        metricas.reiniciar()
+    init_redis(app)
+    # Cache HTTP guarda o cliente Redis do mestre; recriado no primeiro uso.
+    app.extensions.pop("cache_http", None)
+    if app.config.get("SCHEDULER_ENABLED"):
+        iniciar_scheduler_com_lideranca(app)
+
+
+__all__ = ["reinicializar_apos_fork"]
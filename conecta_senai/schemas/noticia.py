@@ -8,6 +8,8 @@ from typing import Any
 from marshmallow import Schema, fields
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 
+from conecta_senai.services import imagem_variantes
+
 
 log = logging.getLogger(__name__)
 
@@ -19,6 +21,16 @@ class ImagemNoticiaSchema(Schema):
     nome_arquivo = fields.Str()
     caminho_relativo = fields.Str()
     url = fields.Str(attribute="url_publica", allow_none=True)
+    largura = fields.Int(allow_none=True)
+    altura = fields.Int(allow_none=True)
+    srcset = fields.Method("get_srcset", allow_none=True)
+    srcset_webp = fields.Method("get_srcset_webp", allow_none=True)
+
+    def get_srcset(self, obj: Any):
+        return imagem_variantes.srcset(obj)
+
+    def get_srcset_webp(self, obj: Any):
+        return imagem_variantes.srcset(obj, webp=True)
 
 
 _imagem_schema = ImagemNoticiaSchema()
@@ -6,7 +6,11 @@ from io import StringIO, BytesIO
 from sqlalchemy.exc import SQLAlchemyError
 
 from conecta_senai.models import db
-from conecta_senai.models.agendamento import Agendamento
+from conecta_senai.models.agendamento import (
+    Agendamento,
+    mascara_horarios,
+    normalizar_horarios,
+)
 from conecta_senai.models.laboratorio_turma import Laboratorio
 from conecta_senai.models.user import User
 from conecta_senai.utils.error_handler import handle_internal_error
@@ -15,18 +19,39 @@ from conecta_senai.models.log_agendamento import LogAgendamento
 from conecta_senai.routes.user import verificar_admin
 
 
+def calcular_intervalo_horarios(horarios):
+    """Resume uma lista de horários como ``"início - fim"`` (ou ``None``)."""
+    try:
+        horarios = normalizar_horarios(horarios)
+        if not horarios:
+            return None
+        return f"{horarios[0].split(' - ')[0]} - {horarios[-1].split(' - ')[1]}"
+    except (AttributeError, IndexError):
+        return None
+
+
 def registrar_log_agenda(user, acao, antes, depois):
-    """Registra informações detalhadas dos agendamentos."""
+    """Registra informações detalhadas dos agendamentos.
+
+    O intervalo de horários exibido na tela de logs é calculado aqui, uma
+    vez, em vez de a cada listagem.
+    """
     try:
         ref = depois or antes or {}
+        data_agendamento = ref.get('data')
+        if isinstance(data_agendamento, str):
+            data_agendamento = datetime.strptime(data_agendamento, '%Y-%m-%d').date()
         log = LogAgendamento(
             usuario=user.nome if user else 'Sistema',
             tipo_acao=acao,
             laboratorio=ref.get('laboratorio'),
             turno=ref.get('turno'),
-            data_agendamento=ref.get('data'),
+            data_agendamento=data_agendamento,
             dados_antes=antes,
             dados_depois=depois,
+            intervalo_horarios=calcular_intervalo_horarios(
+                (depois or {}).get('horarios') or (antes or {}).get('horarios')
+            ),
         )
         db.session.add(log)
         db.session.commit()
@@ -61,34 +86,38 @@ def obter_agendamento_detalhes(id, user):
 
 
 def verificar_conflitos_horarios(data, laboratorio, horarios_list, agendamento_id=None):
+    """Lista os agendamentos do laboratório/dia que compartilham horários.
+
+    A seleção usa ``mascara_horarios & mascara`` no índice de
+    ``(laboratorio, data, turno, mascara_horarios)``; só as linhas com bits em
+    comum são carregadas para montar os horários conflitantes.
+    """
+    try:
+        horarios_novos = set(horarios_list)
+    except (TypeError, ValueError):
+        return ['Formato de horários inválido']
+    mascara = mascara_horarios(list(horarios_novos))
+    if not mascara:
+        return []
     query = Agendamento.query.filter(
         Agendamento.data == data,
         Agendamento.laboratorio == laboratorio,
+        Agendamento.mascara_horarios.op('&')(mascara) != 0,
     )
     if agendamento_id:
         query = query.filter(Agendamento.id != agendamento_id)
-    agendamentos_existentes = query.all()
-    if not agendamentos_existentes:
-        return []
-    try:
-        horarios_novos = set(horarios_list)
-    except (TypeError, ValueError):
-        return ['Formato de horários inválido']
     conflitos = []
-    for agendamento in agendamentos_existentes:
-        try:
-            horarios_existentes = set(agendamento.horarios)
-            intersecao = horarios_novos.intersection(horarios_existentes)
-            if intersecao:
-                conflitos.append({
-                    'agendamento_id': agendamento.id,
-                    'data': agendamento.data.isoformat(),
-                    'laboratorio': agendamento.laboratorio,
-                    'turma': agendamento.turma,
-                    'horarios_conflitantes': list(intersecao),
-                })
-        except Exception:  # nosec B110
-            pass
+    for agendamento in query.all():
+        # Horários fora da grade compartilham um único bit; confirma pelo texto.
+        intersecao = horarios_novos.intersection(normalizar_horarios(agendamento.horarios))
+        if intersecao:
+            conflitos.append({
+                'agendamento_id': agendamento.id,
+                'data': agendamento.data.isoformat(),
+                'laboratorio': agendamento.laboratorio,
+                'turma': agendamento.turma,
+                'horarios_conflitantes': list(intersecao),
+            })
     return conflitos
 
 
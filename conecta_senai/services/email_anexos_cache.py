@@ -0,0 +1,92 @@
+"""Cache em memória dos anexos de e-mail já codificados em base64.
+
+O logo de assinatura acompanha todas as mensagens e o tutorial em PDF todas as
+convocações de turmas com teoria online; sem cache, cada envio relê e recodifica
+os arquivos. As entradas são indexadas pelo caminho e invalidadas quando o
+``mtime``/tamanho do arquivo muda. O total de bytes mantidos é limitado por
+``EMAIL_ANEXOS_CACHE_MAX_BYTES`` (padrão 16 MiB), descartando os anexos usados
+há mais tempo.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+MAX_BYTES_PADRAO = int(os.getenv("EMAIL_ANEXOS_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+class CacheAnexos:
+    """LRU de anexos base64 limitado pelo total de bytes armazenados."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES_PADRAO) -> None:
+        self.max_bytes = max_bytes
+        self._entradas: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def _remover(self, caminho: str) -> None:
+        _, conteudo = self._entradas.pop(caminho)
+        self._bytes -= len(conteudo)
+
+    def obter(self, caminho: str) -> str:
+        """Retorna o conteúdo base64 do arquivo, lendo do disco só se mudou.
+
+        Propaga ``FileNotFoundError`` quando o arquivo não existe.
+        """
+
+        info = os.stat(caminho)
+        versao = (info.st_mtime_ns, info.st_size)
+        with self._lock:
+            entrada = self._entradas.get(caminho)
+            if entrada is not None and entrada[0] == versao:
+                self._entradas.move_to_end(caminho)
+                self.acertos += 1
+                return entrada[1]
+            self.falhas += 1
+
+        with open(caminho, "rb") as f:
+            conteudo = base64.b64encode(f.read()).decode()
+
+        with self._lock:
+            if caminho in self._entradas:
+                self._remover(caminho)
+            if len(conteudo) <= self.max_bytes:
+                self._entradas[caminho] = (versao, conteudo)
+                self._bytes += len(conteudo)
+                while self._bytes > self.max_bytes:
+                    self._remover(next(iter(self._entradas)))
+                    self.descartes += 1
+        return conteudo
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+            self.acertos = self.falhas = self.descartes = 0
+
+    def estatisticas(self) -> Dict[str, float]:
+        """Contadores de uso e a taxa de acerto (0 a 1)."""
+
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "descartes": self.descartes,
+                "taxa_acerto": round(self.acertos / total, 4) if total else 0.0,
+            }
+
+
+cache_anexos = CacheAnexos()
+
+
+__all__ = ["CacheAnexos", "cache_anexos"]
@@ -0,0 +1,310 @@
+"""Fila persistente de e-mails (outbox) e despacho em segundo plano.
+
+As rotas gravam as mensagens na tabela ``email_outbox`` dentro de
+:func:`enfileirar_envios` e respondem imediatamente com o ``job_id``. O job
+``despachar_emails`` do scheduler drena a fila respeitando um *token bucket*
+(``EMAIL_RATE_PER_SEC``, padrão 2 envios/s, o limite do provedor). Respostas
+HTTP 429 reagendam a mensagem com *backoff* exponencial; demais falhas marcam a
+mensagem como ``erro``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time as time_module
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from resend.exceptions import ResendError
+from sqlalchemy import update
+
+from conecta_senai.models import db
+from conecta_senai.models.email_outbox import EmailOutbox
+from conecta_senai.services import email_service
+
+log = logging.getLogger(__name__)
+
+EMAIL_RATE_PER_SEC = float(os.getenv("EMAIL_RATE_PER_SEC", "2"))
+MAX_TENTATIVAS = int(os.getenv("EMAIL_OUTBOX_MAX_TENTATIVAS", "5"))
+BACKOFF_BASE_SEGUNDOS = 2
+LOTE_DESPACHO = 50
+# Mensagens presas em ``enviando`` (worker encerrado no meio do envio) voltam
+# para a fila depois deste intervalo.
+TIMEOUT_ENVIANDO = timedelta(minutes=10)
+
+
+class TokenBucket:
+    """Limitador de taxa com capacidade de rajada e reposição contínua."""
+
+    def __init__(
+        self,
+        taxa: float,
+        capacidade: float | None = None,
+        relogio: Callable[[], float] = time_module.monotonic,
+        dormir: Callable[[float], None] = time_module.sleep,
+    ) -> None:
+        self.taxa = taxa
+        self.capacidade = capacidade if capacidade is not None else max(taxa, 1.0)
+        self.tokens = self.capacidade
+        self._relogio = relogio
+        self._dormir = dormir
+        self._ultimo = relogio()
+        self._lock = threading.Lock()
+
+    def _repor(self) -> None:
+        agora = self._relogio()
+        self.tokens = min(
+            self.capacidade, self.tokens + (agora - self._ultimo) * self.taxa
+        )
+        self._ultimo = agora
+
+    def adquirir(self) -> None:
+        """Bloqueia até haver um token disponível e o consome."""
+
+        with self._lock:
+            self._repor()
+            while self.tokens < 1:
+                self._dormir((1 - self.tokens) / self.taxa)
+                self._repor()
+            self.tokens -= 1
+
+
+_bucket = TokenBucket(EMAIL_RATE_PER_SEC)
+
+# Ações executadas após o envio bem-sucedido, por ``referencia_tipo``.
+_POS_ENVIO: Dict[str, Callable[[int], None]] = {}
+
+
+def registrar_pos_envio(tipo: str) -> Callable[[Callable[[int], None]], Callable[[int], None]]:
+    """Registra a ação executada quando uma mensagem do ``tipo`` é enviada."""
+
+    def decorator(func: Callable[[int], None]) -> Callable[[int], None]:
+        _POS_ENVIO[tipo] = func
+        return func
+
+    return decorator
+
+
+@registrar_pos_envio("convocacao")
+def _marcar_convocado(inscricao_id: int) -> None:
+    from conecta_senai.models.treinamento import InscricaoTreinamento
+
+    inscricao = db.session.get(InscricaoTreinamento, inscricao_id)
+    if inscricao is not None:
+        inscricao.convocado_em = datetime.utcnow()
+
+
+class FilaEnvio:
+    """Acumula as mensagens de um job; ativa via :func:`enfileirar_envios`."""
+
+    def __init__(self) -> None:
+        self.job_id = str(uuid.uuid4())
+        self.referencia: Optional[Tuple[str, int]] = None
+        self.mensagens: List[EmailOutbox] = []
+
+    def adicionar(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        tipo, ref_id = self.referencia or (None, None)
+        mensagem = EmailOutbox(
+            job_id=self.job_id,
+            destinatarios=params["to"],
+            assunto=params["subject"],
+            html=params["html"],
+            parametros={
+                k: v for k, v in params.items() if k not in ("to", "subject", "html")
+            },
+            referencia_tipo=tipo,
+            referencia_id=ref_id,
+            status=EmailOutbox.STATUS_PENDENTE,
+            tentativas=0,
+            proxima_tentativa_em=datetime.utcnow(),
+        )
+        db.session.add(mensagem)
+        self.mensagens.append(mensagem)
+        return {"id": None, "job_id": self.job_id, "status": mensagem.status}
+
+
+@contextmanager
+def enfileirar_envios() -> Iterator[FilaEnvio]:
+    """Redireciona as chamadas a ``send_email`` do bloco para a outbox.
+
+    As mensagens são gravadas com commit ao final do bloco e o dispatcher é
+    acordado para processá-las sem aguardar o próximo ciclo.
+    """
+
+    fila = FilaEnvio()
+    token = email_service.fila_envio_ativa.set(fila)
+    try:
+        yield fila
+    finally:
+        email_service.fila_envio_ativa.reset(token)
+    if fila.mensagens:
+        db.session.commit()
+        from conecta_senai.tasks.scheduler import acordar_despacho_emails
+
+        acordar_despacho_emails()
+
+
+def _params_envio(mensagem: EmailOutbox) -> Dict[str, Any]:
+    params = dict(mensagem.parametros or {})
+    params.update(
+        {"to": mensagem.destinatarios, "subject": mensagem.assunto, "html": mensagem.html}
+    )
+    return params
+
+
+def _reivindicar(mensagem_id: int) -> bool:
+    """Marca a mensagem como ``enviando`` se nenhum outro worker o fez."""
+
+    resultado = db.session.execute(
+        update(EmailOutbox)
+        .where(
+            EmailOutbox.id == mensagem_id,
+            EmailOutbox.status == EmailOutbox.STATUS_PENDENTE,
+        )
+        .values(
+            status=EmailOutbox.STATUS_ENVIANDO,
+            tentativas=EmailOutbox.tentativas + 1,
+            proxima_tentativa_em=datetime.utcnow(),
+        )
+    )
+    db.session.commit()
+    return resultado.rowcount == 1
+
+
+def _liberar_presas(agora: datetime) -> None:
+    db.session.execute(
+        update(EmailOutbox)
+        .where(
+            EmailOutbox.status == EmailOutbox.STATUS_ENVIANDO,
+            EmailOutbox.proxima_tentativa_em < agora - TIMEOUT_ENVIANDO,
+        )
+        .values(status=EmailOutbox.STATUS_PENDENTE)
+    )
+    db.session.commit()
+
+
+def _executar_pos_envio(mensagem: EmailOutbox, acao: Callable[[int], None]) -> None:
+    """Executa a ação pós-envio num SAVEPOINT.
+
+    O e-mail já saiu: uma falha da ação é registrada em ``ultimo_erro`` sem
+    impedir que a mensagem fique ``enviado`` (em ``enviando`` ela voltaria à
+    fila e seria reenviada).
+    """
+
+    try:
+        with db.session.begin_nested():
+            acao(mensagem.referencia_id)
+    except Exception as exc:
+        mensagem.ultimo_erro = f"Falha na ação pós-envio: {exc}"
+        log.exception(
+            "EMAIL_POST_SEND_FAILURE",
+            extra={"email_outbox_id": mensagem.id, "referencia_tipo": mensagem.referencia_tipo},
+        )
+
+
+def _enviar(mensagem: EmailOutbox, bucket: TokenBucket) -> str:
+    bucket.adquirir()
+    try:
+        resultado = email_service.resend.Emails.send(
+            email_service.preparar_envio(_params_envio(mensagem))
+        )
+    except ResendError as exc:
+        mensagem.ultimo_erro = str(exc)
+        if getattr(exc, "code", None) == 429 and mensagem.tentativas < MAX_TENTATIVAS:
+            espera = BACKOFF_BASE_SEGUNDOS ** mensagem.tentativas
+            mensagem.status = EmailOutbox.STATUS_PENDENTE
+            mensagem.proxima_tentativa_em = datetime.utcnow() + timedelta(seconds=espera)
+            log.warning(
+                "EMAIL_RATE_LIMIT_HIT",
+                extra={"email_outbox_id": mensagem.id, "retry_in": espera},
+            )
+        else:
+            mensagem.status = EmailOutbox.STATUS_ERRO
+            log.error(
+                "EMAIL_SEND_FAILURE",
+                extra={"email_outbox_id": mensagem.id, "error": str(exc)},
+            )
+    except Exception as exc:  # pragma: no cover - falha inesperada
+        mensagem.ultimo_erro = str(exc)
+        mensagem.status = EmailOutbox.STATUS_ERRO
+        log.exception("EMAIL_SEND_FAILURE", extra={"email_outbox_id": mensagem.id})
+    else:
+        mensagem.status = EmailOutbox.STATUS_ENVIADO
+        mensagem.enviado_em = datetime.utcnow()
+        mensagem.provedor_id = (resultado or {}).get("id")
+        mensagem.ultimo_erro = None
+        acao = _POS_ENVIO.get(mensagem.referencia_tipo or "")
+        if acao and mensagem.referencia_id is not None:
+            _executar_pos_envio(mensagem, acao)
+    db.session.commit()
+    return mensagem.status
+
+
+def processar_fila(
+    limite: int = LOTE_DESPACHO, bucket: TokenBucket | None = None
+) -> Dict[str, int]:
+    """Envia as mensagens pendentes cujo horário de tentativa já chegou."""
+
+    bucket = bucket or _bucket
+    agora = datetime.utcnow()
+    _liberar_presas(agora)
+    ids = db.session.scalars(
+        db.select(EmailOutbox.id)
+        .where(
+            EmailOutbox.status == EmailOutbox.STATUS_PENDENTE,
+            EmailOutbox.proxima_tentativa_em <= agora,
+        )
+        .order_by(EmailOutbox.proxima_tentativa_em, EmailOutbox.id)
+        .limit(limite)
+    ).all()
+
+    resumo = {"enviados": 0, "reagendados": 0, "erros": 0}
+    for mensagem_id in ids:
+        if not _reivindicar(mensagem_id):
+            continue
+        mensagem = db.session.get(EmailOutbox, mensagem_id)
+        status = _enviar(mensagem, bucket)
+        if status == EmailOutbox.STATUS_ENVIADO:
+            resumo["enviados"] += 1
+        elif status == EmailOutbox.STATUS_PENDENTE:
+            resumo["reagendados"] += 1
+        else:
+            resumo["erros"] += 1
+    return resumo
+
+
+def status_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Resume o andamento de um job de envio e o status de cada mensagem."""
+
+    mensagens = (
+        EmailOutbox.query.filter_by(job_id=job_id).order_by(EmailOutbox.id).all()
+    )
+    if not mensagens:
+        return None
+    contagem: Dict[str, int] = {}
+    for mensagem in mensagens:
+        contagem[mensagem.status] = contagem.get(mensagem.status, 0) + 1
+    return {
+        "job_id": job_id,
+        "total": len(mensagens),
+        "status": contagem,
+        "concluido": all(
+            m.status in (EmailOutbox.STATUS_ENVIADO, EmailOutbox.STATUS_ERRO)
+            for m in mensagens
+        ),
+        "mensagens": [m.to_dict() for m in mensagens],
+    }
+
+
+__all__ = [
+    "FilaEnvio",
+    "TokenBucket",
+    "enfileirar_envios",
+    "processar_fila",
+    "registrar_pos_envio",
+    "status_job",
+]
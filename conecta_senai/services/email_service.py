@@ -1,6 +1,5 @@
 from __future__ import annotations
 import os
-import base64
 from typing import (
     Iterable,
     Optional,
@@ -16,6 +15,7 @@ import re
 import time as time_module
 import threading
 from collections import deque
+from contextvars import ContextVar
 
 import resend
 from flask import current_app, render_template
@@ -23,6 +23,8 @@ from types import SimpleNamespace
 from datetime import time, date
 from resend.exceptions import ResendError
 
+from conecta_senai.services.email_anexos_cache import cache_anexos
+
 log = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
@@ -45,6 +47,9 @@ Address = Union[str, Iterable[str]]
 RATE_LIMIT_DELAY = 0.5
 MAX_EMAIL_RETRIES = 2
 
+# Fila de envio ativa no contexto atual (ver ``email_outbox_service``).
+fila_envio_ativa: ContextVar[Any] = ContextVar("fila_envio_ativa", default=None)
+
 
 class RateLimiter:
     """Decorator que limita a taxa de execução de uma função."""
@@ -135,8 +140,7 @@ def build_user_context(nome: str) -> SimpleNamespace:
     return SimpleNamespace(name=nome)
 
 
-@RateLimiter(max_calls=2, period=1)
-def send_email(
+def montar_parametros_email(
     to: Address,
     subject: str,
     html: str,
@@ -149,8 +153,8 @@ def send_email(
     attachments: Optional[List[Dict[str, Any]]] = None,
     from_: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Envia e-mail via Resend."""
-    params = {
+    """Monta o payload serializável enviado ao Resend (sem o logo embutido)."""
+    params: Dict[str, Any] = {
         "from": from_ or DEFAULT_FROM,
         "to": _normalize(to),
         "subject": subject,
@@ -168,7 +172,37 @@ def send_email(
         params["headers"] = headers
     if tags:
         params["tags"] = tags
-    attachments = list(attachments) if attachments else []
+    if attachments:
+        params["attachments"] = list(attachments)
+    return params
+
+
+def _resolver_anexo(anexo: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Converte anexos com ``caminho_local`` no formato base64 do Resend."""
+
+    caminho = anexo.get("caminho_local")
+    if not caminho:
+        return anexo
+    try:
+        encoded = cache_anexos.obter(caminho)
+    except FileNotFoundError:
+        log.error("Anexo não encontrado: %s", caminho)
+        return None
+    resolvido = {k: v for k, v in anexo.items() if k != "caminho_local"}
+    resolvido.setdefault("filename", os.path.basename(caminho))
+    resolvido["content"] = encoded
+    return resolvido
+
+
+def preparar_envio(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Completa o payload com o logo de assinatura e os anexos em base64."""
+
+    params = dict(params)
+    attachments = [
+        anexo
+        for anexo in map(_resolver_anexo, params.pop("attachments", None) or [])
+        if anexo is not None
+    ]
     logo_path = None
     try:
         logo_path = os.path.join(
@@ -178,8 +212,7 @@ def send_email(
         logo_path = None
 
     if logo_path and os.path.exists(logo_path):
-        with open(logo_path, "rb") as f:
-            encoded = base64.b64encode(f.read()).decode()
+        encoded = cache_anexos.obter(logo_path)
         attachments.append(
             {
                 "filename": "logo_assinatura.png",
@@ -197,7 +230,13 @@ def send_email(
 
     if attachments:
         params["attachments"] = attachments
+    return params
 
+
+@RateLimiter(max_calls=2, period=1)
+def _enviar_agora(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Envia imediatamente, repetindo a tentativa em caso de HTTP 429."""
+    subject = params.get("subject")
     log.debug(
         "EMAIL_SEND_START", extra={"to": params["to"], "subject": subject}
     )
@@ -227,6 +266,51 @@ def send_email(
             raise
 
 
+def send_email(
+    to: Address,
+    subject: str,
+    html: str,
+    text: Optional[str] = None,
+    cc: Address | None = None,
+    bcc: Address | None = None,
+    reply_to: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    tags: Optional[List[Dict[str, str]]] = None,
+    attachments: Optional[List[Dict[str, Any]]] = None,
+    from_: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Envia e-mail via Resend.
+
+    Dentro de :func:`conecta_senai.services.email_outbox_service.enfileirar_envios`
+    a mensagem é gravada na fila (``email_outbox``) e enviada depois pelo
+    dispatcher; caso contrário o envio é feito na hora.
+    """
+    params = montar_parametros_email(
+        to,
+        subject,
+        html,
+        text=text,
+        cc=cc,
+        bcc=bcc,
+        reply_to=reply_to,
+        headers=headers,
+        tags=tags,
+        attachments=attachments,
+        from_=from_,
+    )
+    fila = fila_envio_ativa.get()
+    if fila is not None:
+        return fila.adicionar(params)
+    return _enviar_agora(preparar_envio(params))
+
+
+def _aguardar_limite_envio() -> None:
+    """Pausa entre envios diretos; envios enfileirados não precisam esperar."""
+
+    if fila_envio_ativa.get() is None:
+        time_module.sleep(RATE_LIMIT_DELAY)
+
+
 def render_email_template(name: str, **ctx: Any) -> str:
     template = current_app.jinja_env.get_or_select_template(f"email/{name}")
     return template.render(**ctx)
@@ -424,9 +508,9 @@ def enviar_convocacao(
                 "Tutorial de Acesso e Navegação - Aluno Anglo.pdf",
             )
             file_name = "Tutorial de Acesso e Navegação - Aluno Anglo.pdf"
-            with open(file_path, "rb") as f:
-                encoded = base64.b64encode(f.read()).decode()
-            attachments.append({"filename": file_name, "content": encoded})
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(file_path)
+            attachments.append({"filename": file_name, "caminho_local": file_path})
         except FileNotFoundError:
             current_app.logger.error("Arquivo de tutorial não encontrado.")
 
@@ -673,7 +757,7 @@ def notificar_atualizacao_turma(
     emails_secretaria = listar_emails_secretaria()
     if notificar_secretaria and emails_secretaria:
         send_turma_alterada_email(dados_antigos, dados_novos)
-        time_module.sleep(RATE_LIMIT_DELAY)
+        _aguardar_limite_envio()
 
     instrutor_atual = getattr(turma, "instrutor", None)
 
@@ -719,7 +803,7 @@ def notificar_atualizacao_turma(
             )
             subject_rem = f"Remanejamento de Turma - {nome_treinamento}"
             send_email(instrutor_antigo_obj.email, subject_rem, html_rem)
-            time_module.sleep(RATE_LIMIT_DELAY)
+            _aguardar_limite_envio()
 
     if (
         atual_id
@@ -727,7 +811,7 @@ def notificar_atualizacao_turma(
         and getattr(instrutor_atual, "email", None)
     ):
         send_nova_turma_instrutor_email(turma, instrutor_atual)
-        time_module.sleep(RATE_LIMIT_DELAY)
+        _aguardar_limite_envio()
     elif (
         atual_id
         and antigo_id == atual_id
@@ -743,7 +827,7 @@ def notificar_atualizacao_turma(
             dados_novos=dados_novos,
         )
         send_email(instrutor_atual.email, subject, html_body)
-        time_module.sleep(RATE_LIMIT_DELAY)
+        _aguardar_limite_envio()
 
 
 class EmailService:
@@ -768,10 +852,10 @@ class EmailService:
 
         attachments: List[Dict[str, Any]] = []
         if attachment_path and os.path.exists(attachment_path):
-            with open(attachment_path, "rb") as f:
-                encoded = base64.b64encode(f.read()).decode()
             file_name = os.path.basename(attachment_path)
-            attachments.append({"filename": file_name, "content": encoded})
+            attachments.append(
+                {"filename": file_name, "caminho_local": attachment_path}
+            )
             current_app.logger.info(f"Anexando '{file_name}' ao e-mail.")
 
         send_email(
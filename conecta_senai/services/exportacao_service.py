@@ -0,0 +1,144 @@
+"""Exportação de relatórios em CSV, XLSX e PDF sem materializar a tabela.
+
+As linhas são consumidas de um iterador (normalmente uma consulta com
+``yield_per``, que usa cursor do lado do servidor quando o driver permite) e
+escritas de forma incremental: o CSV é transmitido em blocos como resposta
+*chunked*, enquanto XLSX e PDF são gravados em arquivo temporário em disco e
+enviados com ``send_file``.
+"""
+
+from __future__ import annotations
+
+import csv
+import tempfile
+from typing import Any, Iterable, Iterator, Sequence
+
+from flask import Response, send_file, stream_with_context
+from openpyxl import Workbook
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+TAMANHO_LOTE = 1000
+MIMETYPE_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class _Eco:
+    """Pseudo-arquivo que devolve o texto escrito, usado com ``csv.writer``."""
+
+    def write(self, valor: str) -> str:
+        return valor
+
+
+def consultar_em_lotes(query, tamanho_lote: int = TAMANHO_LOTE):
+    """Configura a consulta para buscar linhas em lotes via cursor do servidor."""
+
+    return query.execution_options(yield_per=tamanho_lote)
+
+
+def gerar_csv(
+    cabecalho: Sequence[str],
+    linhas: Iterable[Sequence[Any]],
+    linhas_por_bloco: int = 500,
+) -> Iterator[str]:
+    """Produz o CSV em blocos de texto, agrupando ``linhas_por_bloco`` linhas."""
+
+    escritor = csv.writer(_Eco())
+    bloco = [escritor.writerow(cabecalho)]
+    for linha in linhas:
+        bloco.append(escritor.writerow(linha))
+        if len(bloco) >= linhas_por_bloco:
+            yield ''.join(bloco)
+            bloco = []
+    if bloco:
+        yield ''.join(bloco)
+
+
+def resposta_csv(
+    cabecalho: Sequence[str], linhas: Iterable[Sequence[Any]], nome_arquivo: str
+) -> Response:
+    """Transmite um CSV como resposta *chunked*."""
+
+    resposta = Response(
+        stream_with_context(gerar_csv(cabecalho, linhas)),
+        mimetype='text/csv',
+    )
+    resposta.headers['Content-Disposition'] = f'attachment; filename={nome_arquivo}'
+    return resposta
+
+
+def resposta_xlsx(
+    cabecalho: Sequence[str], linhas: Iterable[Sequence[Any]], nome_arquivo: str
+) -> Response:
+    """Gera uma planilha em modo *write-only* do openpyxl e a envia do disco."""
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(cabecalho))
+    for linha in linhas:
+        ws.append(list(linha))
+    arquivo = tempfile.TemporaryFile()
+    wb.save(arquivo)
+    arquivo.seek(0)
+    return send_file(
+        arquivo,
+        mimetype=MIMETYPE_XLSX,
+        as_attachment=True,
+        download_name=nome_arquivo,
+    )
+
+
+def resposta_pdf(
+    titulo: str,
+    cabecalho: Sequence[str],
+    linhas: Iterable[Sequence[Any]],
+    nome_arquivo: str,
+) -> Response:
+    """Gera um relatório PDF simples, paginando conforme as linhas chegam."""
+
+    arquivo = tempfile.TemporaryFile()
+    c = canvas.Canvas(arquivo, pagesize=letter, pageCompression=1)
+    c.drawString(50, 750, titulo)
+    y = 730
+    c.drawString(50, y, '  '.join(cabecalho))
+    y -= 20
+    for linha in linhas:
+        c.drawString(50, y, '  '.join(str(valor) for valor in linha))
+        y -= 20
+        if y < 50:
+            c.showPage()
+            y = 750
+    c.save()
+    arquivo.seek(0)
+    return send_file(
+        arquivo,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=nome_arquivo,
+    )
+
+
+def resposta_exportacao(
+    formato: str,
+    titulo: str,
+    cabecalho: Sequence[str],
+    linhas: Iterable[Sequence[Any]],
+    nome_base: str,
+) -> Response:
+    """Despacha para o formato solicitado; CSV é o padrão."""
+
+    formato = (formato or 'csv').lower()
+    if formato == 'pdf':
+        return resposta_pdf(titulo, cabecalho, linhas, f'{nome_base}.pdf')
+    if formato == 'xlsx':
+        return resposta_xlsx(cabecalho, linhas, f'{nome_base}.xlsx')
+    return resposta_csv(cabecalho, linhas, f'{nome_base}.csv')
+
+
+__all__ = [
+    'consultar_em_lotes',
+    'gerar_csv',
+    'resposta_csv',
+    'resposta_exportacao',
+    'resposta_pdf',
+    'resposta_xlsx',
+]
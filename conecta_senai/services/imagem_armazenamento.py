@@ -0,0 +1,188 @@
+"""Armazenamento das imagens de notícias endereçado por conteúdo.
+
+Cada imagem é identificada pelo SHA-256 dos seus bytes. No backend ``local``
+(padrão) o arquivo fica em ``uploads/noticias/<2 primeiros>/<sha256><ext>``
+sob ``IMAGENS_NOTICIAS_RAIZ`` (por padrão a pasta ``static``) e é servido
+direto do disco com ``send_file`` — ``wsgi.file_wrapper``/``sendfile`` no
+Gunicorn ou ``X-Sendfile`` com ``USE_X_SENDFILE``. O binário continua gravado
+em ``imagens_noticias.conteudo`` como cópia durável: se o arquivo sumir (por
+exemplo, após um novo deploy) ele é restaurado do banco na primeira
+requisição. No backend ``banco`` as imagens são servidas apenas do banco.
+
+O ``ETag`` é o próprio hash e a URL pública leva o hash em ``?v=``; com ele a
+resposta é marcada como imutável, sem ele o navegador revalida e recebe
+``304`` enquanto a imagem não mudar.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Optional
+
+from flask import current_app, request, send_file
+
+if TYPE_CHECKING:  # pragma: no cover
+    from conecta_senai.models.imagem_noticia import ImagemNoticia
+
+UPLOAD_SUBDIR = PurePosixPath("uploads") / "noticias"
+CACHE_IMUTAVEL_SEGUNDOS = 365 * 24 * 3600
+
+
+def calcular_sha256(conteudo: bytes) -> str:
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def chave_imagem(sha256: str, extensao: str = "") -> str:
+    """Caminho relativo (à raiz do armazenamento) da imagem com o hash dado."""
+
+    return (UPLOAD_SUBDIR / sha256[:2] / f"{sha256}{extensao.lower()}").as_posix()
+
+
+class ArmazenamentoLocal:
+    """Arquivos em disco, um por hash; gravações repetidas são ignoradas."""
+
+    nome = "local"
+
+    def __init__(self, raiz: Path) -> None:
+        self.raiz = Path(raiz).resolve()
+
+    def guardar(self, conteudo: bytes, sha256: str, extensao: str = "") -> str:
+        chave = chave_imagem(sha256, extensao)
+        destino = self.raiz / chave
+        if not destino.exists():
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            descritor, temporario = tempfile.mkstemp(dir=destino.parent, suffix=".tmp")
+            try:
+                with os.fdopen(descritor, "wb") as arquivo:
+                    arquivo.write(conteudo)
+                os.replace(temporario, destino)
+            except BaseException:
+                Path(temporario).unlink(missing_ok=True)
+                raise
+        return chave
+
+    def caminho(self, chave: Optional[str]) -> Optional[Path]:
+        """Arquivo da ``chave`` se existir dentro da raiz."""
+
+        if not chave:
+            return None
+        caminho = (self.raiz / chave.lstrip("/")).resolve()
+        if self.raiz not in caminho.parents or not caminho.is_file():
+            return None
+        return caminho
+
+    def remover(self, chave: Optional[str]) -> None:
+        caminho = self.caminho(chave)
+        if caminho is not None:
+            caminho.unlink(missing_ok=True)
+
+
+class ArmazenamentoBanco:
+    """Sem cópia em disco: a imagem vem sempre de ``imagens_noticias.conteudo``."""
+
+    nome = "banco"
+
+    def guardar(self, conteudo: bytes, sha256: str, extensao: str = "") -> str:
+        return chave_imagem(sha256, extensao)
+
+    def caminho(self, chave: Optional[str]) -> Optional[Path]:
+        return None
+
+    def remover(self, chave: Optional[str]) -> None:
+        return None
+
+
+def obter_armazenamento():
+    """Backend configurado em ``IMAGENS_NOTICIAS_BACKEND`` (``local`` ou ``banco``)."""
+
+    config = current_app.config
+    backend = (config.get("IMAGENS_NOTICIAS_BACKEND") or "local").lower()
+    if backend == "banco":
+        return ArmazenamentoBanco()
+    raiz = config.get("IMAGENS_NOTICIAS_RAIZ") or current_app.static_folder
+    return ArmazenamentoLocal(Path(raiz))
+
+
+def aplicar_cache_imagem(resposta, sha256: Optional[str]):
+    """Cache imutável quando a URL traz a versão (``?v=``) atual; senão revalidação."""
+
+    versao = request.args.get("v")
+    if sha256 and versao == sha256[:16]:
+        resposta.cache_control.public = True
+        resposta.cache_control.max_age = CACHE_IMUTAVEL_SEGUNDOS
+        resposta.cache_control.immutable = True
+    else:
+        resposta.cache_control.public = True
+        resposta.cache_control.no_cache = True
+        resposta.cache_control.max_age = None
+    return resposta
+
+
+def responder_imagem(imagem: "ImagemNoticia"):
+    """Resposta HTTP da imagem com ``ETag`` forte, ``304`` e envio do disco.
+
+    Devolve ``None`` quando não há arquivo em disco nem binário no banco.
+    """
+
+    from conecta_senai.models import db
+
+    armazenamento = obter_armazenamento()
+    mimetype = imagem.content_type or "application/octet-stream"
+
+    if imagem.sha256 is None and imagem.tem_conteudo and imagem.conteudo:
+        # Registros anteriores ao armazenamento por hash: calculado uma vez.
+        imagem.sha256 = calcular_sha256(imagem.conteudo)
+        db.session.commit()
+    sha256 = imagem.sha256
+
+    if sha256 and sha256 in request.if_none_match:
+        resposta = current_app.response_class(status=304)
+        resposta.set_etag(sha256)
+        return aplicar_cache_imagem(resposta, sha256)
+
+    caminho = armazenamento.caminho(imagem.caminho_relativo)
+    if caminho is None and sha256 and imagem.tem_conteudo:
+        conteudo = imagem.conteudo
+        if conteudo:
+            extensao = PurePosixPath(imagem.caminho_relativo or "").suffix
+            chave = armazenamento.guardar(conteudo, sha256, extensao)
+            caminho = armazenamento.caminho(chave)
+            if caminho is not None and chave != imagem.caminho_relativo:
+                imagem.caminho_relativo = chave
+                db.session.commit()
+            if caminho is None:
+                resposta = send_file(
+                    BytesIO(conteudo),
+                    mimetype=mimetype,
+                    download_name=imagem.nome_arquivo,
+                    etag=sha256,
+                    conditional=True,
+                )
+                return aplicar_cache_imagem(resposta, sha256)
+
+    if caminho is None:
+        return None
+    resposta = send_file(
+        caminho,
+        mimetype=mimetype,
+        download_name=imagem.nome_arquivo,
+        etag=sha256 or True,
+        conditional=True,
+    )
+    return aplicar_cache_imagem(resposta, sha256)
+
+
+__all__ = [
+    "ArmazenamentoBanco",
+    "ArmazenamentoLocal",
+    "UPLOAD_SUBDIR",
+    "aplicar_cache_imagem",
+    "calcular_sha256",
+    "chave_imagem",
+    "obter_armazenamento",
+    "responder_imagem",
+]
@@ -0,0 +1,271 @@
+"""Variantes redimensionadas (e em WebP) das imagens de notícias.
+
+As variantes são geradas sob demanda na primeira requisição de
+``/api/noticias/imagens/<id>/<largura>[.webp]`` e guardadas em disco em
+``uploads/noticias/variantes/`` (raiz em ``IMAGENS_VARIANTES_RAIZ``; por
+padrão a mesma das imagens originais). O nome do arquivo combina o SHA-256
+da original, a largura e o formato, então uma variante nunca muda e pode ser
+servida com cache imutável. A pasta é um cache: acima de
+``IMAGENS_VARIANTES_MAX_MB`` as variantes usadas há mais tempo são removidas.
+
+Sem o Pillow instalado nenhuma variante é gerada e as URLs de ``srcset``
+não são publicadas.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+from flask import current_app, request, send_file, url_for
+
+from conecta_senai.services.imagem_armazenamento import (
+    UPLOAD_SUBDIR,
+    aplicar_cache_imagem,
+    obter_armazenamento,
+)
+
+try:  # pragma: no cover - dependência opcional
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ImportError:  # pragma: no cover - ambientes sem Pillow
+    Image = None  # type: ignore[assignment]
+    UnidentifiedImageError = OSError  # type: ignore[assignment,misc]
+
+if TYPE_CHECKING:  # pragma: no cover
+    from conecta_senai.models.imagem_noticia import ImagemNoticia
+
+log = logging.getLogger(__name__)
+
+LARGURAS = (320, 640, 1280)
+FORMATO_WEBP = "webp"
+VARIANTES_SUBDIR = UPLOAD_SUBDIR / "variantes"
+QUALIDADE_JPEG = 82
+QUALIDADE_WEBP = 80
+# Formatos que o Pillow sabe reduzir sem perder animação ou vetor.
+_FORMATOS_ORIGINAIS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+_MIMETYPES = {".jpg": "image/jpeg", ".png": "image/png", ".webp": "image/webp"}
+
+_lock_geracao = threading.Lock()
+
+
+def pillow_disponivel() -> bool:
+    return Image is not None
+
+
+def _raiz() -> Path:
+    config = current_app.config
+    raiz = (
+        config.get("IMAGENS_VARIANTES_RAIZ")
+        or config.get("IMAGENS_NOTICIAS_RAIZ")
+        or current_app.static_folder
+    )
+    return Path(raiz).resolve()
+
+
+def _limite_bytes() -> int:
+    return int(float(current_app.config.get("IMAGENS_VARIANTES_MAX_MB", 512)) * 1024 * 1024)
+
+
+def _extensao_original(imagem: "ImagemNoticia") -> Optional[str]:
+    extensao = PurePosixPath(imagem.caminho_relativo or imagem.nome_arquivo or "").suffix.lower()
+    extensao = ".jpg" if extensao == ".jpeg" else extensao
+    return extensao if extensao in _MIMETYPES else None
+
+
+def suporta_variantes(imagem: "ImagemNoticia") -> bool:
+    return (
+        pillow_disponivel()
+        and bool(imagem.sha256)
+        and imagem.id is not None
+        and _extensao_original(imagem) is not None
+    )
+
+
+def larguras_disponiveis(imagem: "ImagemNoticia") -> List[int]:
+    """Larguras menores que a original (todas, se a original não foi medida)."""
+
+    if imagem.largura is None:
+        return list(LARGURAS)
+    return [largura for largura in LARGURAS if largura < imagem.largura]
+
+
+def url_variante(imagem: "ImagemNoticia", largura: int, webp: bool = False) -> str:
+    endpoint = "api_noticias.obter_variante_webp" if webp else "api_noticias.obter_variante"
+    try:
+        return url_for(endpoint, imagem_id=imagem.id, largura=largura, v=imagem.sha256[:16])
+    except RuntimeError:
+        sufixo = ".webp" if webp else ""
+        return f"/api/noticias/imagens/{imagem.id}/{largura}{sufixo}?v={imagem.sha256[:16]}"
+
+
+def srcset(imagem: "ImagemNoticia", webp: bool = False) -> Optional[str]:
+    """Valor de ``srcset`` com as variantes e, no formato original, a própria imagem."""
+
+    if not suporta_variantes(imagem):
+        return None
+    candidatos = [f"{url_variante(imagem, largura, webp)} {largura}w" for largura in larguras_disponiveis(imagem)]
+    if imagem.largura and not webp:
+        candidatos.append(f"{imagem.url_publica} {imagem.largura}w")
+    return ", ".join(candidatos) or None
+
+
+def medir(conteudo: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """Largura e altura (já considerando a orientação EXIF) ou ``(None, None)``."""
+
+    if not pillow_disponivel():
+        return None, None
+    try:
+        with Image.open(BytesIO(conteudo)) as original:
+            largura, altura = original.size
+            orientacao = original.getexif().get(0x0112)
+    except (UnidentifiedImageError, OSError):
+        return None, None
+    if orientacao in (5, 6, 7, 8):
+        largura, altura = altura, largura
+    return largura, altura
+
+
+def _gerar(conteudo: bytes, largura: int, extensao: str) -> bytes:
+    with Image.open(BytesIO(conteudo)) as original:
+        if original.format not in _FORMATOS_ORIGINAIS:
+            raise ValueError(f"formato {original.format} não suportado")
+        imagem = ImageOps.exif_transpose(original)
+        if imagem.width > largura:
+            altura = max(1, round(imagem.height * largura / imagem.width))
+            imagem = imagem.resize((largura, altura), Image.LANCZOS)
+        saida = BytesIO()
+        if extensao == ".webp":
+            imagem.save(saida, "WEBP", quality=QUALIDADE_WEBP, method=4)
+        elif extensao == ".jpg":
+            if imagem.mode not in ("RGB", "L"):
+                imagem = imagem.convert("RGB")
+            imagem.save(saida, "JPEG", quality=QUALIDADE_JPEG, optimize=True, progressive=True)
+        else:
+            imagem.save(saida, "PNG", optimize=True)
+        return saida.getvalue()
+
+
+def _arquivos(pasta: Path) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(pasta) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    yield from _arquivos(Path(entrada.path))
+                elif entrada.is_file(follow_symlinks=False):
+                    yield entrada
+    except FileNotFoundError:
+        return
+
+
+def limpar_cache(raiz: Path, limite_bytes: int) -> int:
+    """Remove as variantes menos usadas até o total caber em ``limite_bytes``."""
+
+    entradas = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in _arquivos(raiz / VARIANTES_SUBDIR)]
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    removidas = 0
+    for _, tamanho, caminho in sorted(entradas):
+        if total <= limite_bytes:
+            break
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+        total -= tamanho
+        removidas += 1
+    return removidas
+
+
+def _gravar(destino: Path, dados: bytes) -> None:
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=destino.parent, suffix=".tmp")
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(dados)
+        os.replace(temporario, destino)
+    except BaseException:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+
+
+def _conteudo_original(imagem: "ImagemNoticia") -> Optional[bytes]:
+    caminho = obter_armazenamento().caminho(imagem.caminho_relativo)
+    if caminho is not None:
+        return caminho.read_bytes()
+    return imagem.conteudo if imagem.tem_conteudo else None
+
+
+def obter_variante(imagem: "ImagemNoticia", largura: int, webp: bool = False) -> Optional[Path]:
+    """Arquivo da variante, gerado e guardado no cache na primeira chamada."""
+
+    if largura not in LARGURAS or not suporta_variantes(imagem):
+        return None
+    extensao = ".webp" if webp else _extensao_original(imagem)
+    raiz = _raiz()
+    destino = raiz / VARIANTES_SUBDIR / imagem.sha256[:2] / f"{imagem.sha256}-{largura}{extensao}"
+    if destino.is_file():
+        os.utime(destino)
+        return destino
+
+    conteudo = _conteudo_original(imagem)
+    if not conteudo:
+        return None
+    try:
+        dados = _gerar(conteudo, largura, extensao)
+    except (UnidentifiedImageError, ValueError, OSError) as exc:
+        log.warning("Não foi possível gerar a variante %sw da imagem %s: %s", largura, imagem.id, exc)
+        return None
+    _gravar(destino, dados)
+    if _lock_geracao.acquire(blocking=False):
+        try:
+            limpar_cache(raiz, _limite_bytes())
+        finally:
+            _lock_geracao.release()
+    return destino if destino.is_file() else None
+
+
+def responder_variante(imagem: "ImagemNoticia", largura: int, webp: bool = False):
+    """Resposta HTTP da variante com ``ETag`` e cache imutável; ``None`` se indisponível."""
+
+    if imagem.largura is None and suporta_variantes(imagem):
+        from conecta_senai.models import db
+
+        conteudo = _conteudo_original(imagem)
+        if conteudo:
+            imagem.largura, imagem.altura = medir(conteudo)
+            db.session.commit()
+
+    etag = f"{imagem.sha256}-{largura}{'-webp' if webp else ''}"
+    if imagem.sha256 and etag in request.if_none_match:
+        resposta = current_app.response_class(status=304)
+        resposta.set_etag(etag)
+        return aplicar_cache_imagem(resposta, imagem.sha256)
+
+    caminho = obter_variante(imagem, largura, webp)
+    if caminho is None:
+        return None
+    resposta = send_file(
+        caminho,
+        mimetype=_MIMETYPES[caminho.suffix],
+        etag=etag,
+        conditional=True,
+    )
+    return aplicar_cache_imagem(resposta, imagem.sha256)
+
+
+__all__ = [
+    "LARGURAS",
+    "larguras_disponiveis",
+    "limpar_cache",
+    "medir",
+    "obter_variante",
+    "pillow_disponivel",
+    "responder_variante",
+    "srcset",
+    "suporta_variantes",
+    "url_variante",
+]
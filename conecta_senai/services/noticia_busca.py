@@ -0,0 +1,154 @@
+"""Busca textual de notícias com ordenação por relevância e trechos destacados.
+
+Usa o índice mantido pelo banco (ver :mod:`conecta_senai.models.noticia`):
+
+* PostgreSQL: ``busca_vetor @@ websearch_to_tsquery(...)`` na configuração
+  ``portuguese_unaccent`` (radicais em português, sem acentos), ordenado por
+  ``ts_rank_cd`` e com trechos de ``ts_headline``;
+* SQLite: tabela FTS5 ``noticias_fts`` com prefixo em cada termo, ordenada
+  por ``bm25`` e com trechos de ``snippet``.
+
+Sem o índice (migração pendente ou outro banco) volta ao ``LIKE`` em título,
+resumo e conteúdo, ordenado por data. Os trechos são devolvidos como HTML já
+escapado, com os termos encontrados entre ``<mark>``.
+"""
+
+from __future__ import annotations
+
+import re
+import weakref
+from html import escape
+from typing import Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+
+from conecta_senai.models import db
+from conecta_senai.models.noticia import CONFIG_BUSCA_POSTGRES, Noticia
+
+# Pesos de título, resumo e conteúdo no ``bm25`` (equivalentes a A/B/C no PostgreSQL).
+PESOS_SQLITE = (10.0, 4.0, 1.0)
+PALAVRAS_TRECHO = 24
+_INICIO, _FIM = "\x02", "\x03"
+_TERMO = re.compile(r"\w+", re.UNICODE)
+
+_indices: "weakref.WeakKeyDictionary[sa.engine.Engine, Optional[str]]" = weakref.WeakKeyDictionary()
+
+_vetor = sa.literal_column("noticias.busca_vetor")
+_config = sa.literal_column(f"'{CONFIG_BUSCA_POSTGRES}'::regconfig")
+_fts = sa.table("noticias_fts", sa.column("rowid"))
+_fts_tabela = sa.literal_column("noticias_fts")
+
+
+def _termos(termo: str) -> List[str]:
+    return _TERMO.findall(termo or "")
+
+
+def indice_disponivel() -> Optional[str]:
+    """Dialeto do índice textual disponível (``postgresql``/``sqlite``) ou ``None``."""
+
+    engine = db.engine
+    if engine not in _indices:
+        inspector = sa.inspect(engine)
+        dialeto = engine.dialect.name
+        if dialeto == "postgresql":
+            colunas = {coluna["name"] for coluna in inspector.get_columns(Noticia.__tablename__)}
+            _indices[engine] = dialeto if "busca_vetor" in colunas else None
+        elif dialeto == "sqlite":
+            _indices[engine] = dialeto if inspector.has_table("noticias_fts") else None
+        else:
+            _indices[engine] = None
+    return _indices[engine]
+
+
+def _consulta_fts(termo: str) -> str:
+    # Cada termo vira uma frase com prefixo; aspas não sobrevivem ao ``\w+``.
+    return " ".join(f'"{palavra}"*' for palavra in _termos(termo))
+
+
+def _tsquery(termo: str):
+    return sa.func.websearch_to_tsquery(_config, termo)
+
+
+def aplicar_busca(consulta, termo: str):
+    """Filtra ``consulta`` por ``termo`` e a ordena da mais para a menos relevante."""
+
+    indice = indice_disponivel() if _termos(termo) else None
+    if indice == "postgresql":
+        tsquery = _tsquery(termo)
+        return consulta.filter(_vetor.op("@@")(tsquery)).order_by(
+            sa.func.ts_rank_cd(_vetor, tsquery).desc(),
+            Noticia.data_publicacao.desc(),
+            Noticia.id.desc(),
+        )
+    if indice == "sqlite":
+        relevancia = (
+            sa.select(
+                _fts.c.rowid.label("id"),
+                sa.func.bm25(_fts_tabela, *PESOS_SQLITE).label("rank"),
+            )
+            .select_from(_fts)
+            .where(_fts_tabela.op("MATCH")(_consulta_fts(termo)))
+            # Sem materializar, o SQLite achata a junção na contagem da
+            # paginação e repete a consulta FTS para cada notícia.
+            .cte("relevancia")
+            .prefix_with("MATERIALIZED")
+        )
+        return consulta.join(relevancia, relevancia.c.id == Noticia.id).order_by(
+            relevancia.c.rank,
+            Noticia.data_publicacao.desc(),
+            Noticia.id.desc(),
+        )
+
+    like = f"%{termo}%"
+    return consulta.filter(
+        sa.or_(Noticia.titulo.ilike(like), Noticia.resumo.ilike(like), Noticia.conteudo.ilike(like))
+    ).order_by(Noticia.data_publicacao.desc(), Noticia.id.desc())
+
+
+def _destacar(trecho: Optional[str]) -> Optional[str]:
+    if not trecho:
+        return None
+    return escape(trecho).replace(_INICIO, "<mark>").replace(_FIM, "</mark>")
+
+
+def trechos(ids: Iterable[int], termo: str) -> Dict[int, str]:
+    """Trecho com os termos destacados de cada notícia em ``ids`` (só com índice)."""
+
+    ids = list(ids)
+    indice = indice_disponivel()
+    if not ids or not _termos(termo) or indice is None:
+        return {}
+
+    if indice == "postgresql":
+        texto = sa.func.concat_ws(" — ", Noticia.resumo, Noticia.conteudo)
+        opcoes = (
+            f"StartSel=\"{_INICIO}\", StopSel=\"{_FIM}\", MaxWords={PALAVRAS_TRECHO}, "
+            f"MinWords={PALAVRAS_TRECHO // 2}, MaxFragments=2, FragmentDelimiter=\" … \""
+        )
+        instrucao = sa.select(
+            Noticia.id,
+            sa.func.ts_headline(
+                _config,
+                texto,
+                _tsquery(termo),
+                opcoes,
+            ),
+        ).where(Noticia.id.in_(ids))
+    else:
+        instrucao = (
+            sa.select(
+                _fts.c.rowid,
+                sa.func.snippet(_fts_tabela, -1, _INICIO, _FIM, "…", PALAVRAS_TRECHO),
+            )
+            .select_from(_fts)
+            .where(_fts_tabela.op("MATCH")(_consulta_fts(termo)), _fts.c.rowid.in_(ids))
+        )
+
+    return {
+        identificador: destacado
+        for identificador, trecho in db.session.execute(instrucao)
+        if (destacado := _destacar(trecho))
+    }
+
+
+__all__ = ["aplicar_busca", "indice_disponivel", "trechos"]
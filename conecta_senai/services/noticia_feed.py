@@ -0,0 +1,120 @@
+"""Cache do feed público de notícias (``GET /api/noticias``).
+
+Os visitantes repetem poucas combinações de filtros — lista geral,
+``destaque=true`` e ``calendario=true`` — quase sempre nas primeiras páginas.
+Para essas combinações (sem busca e só com notícias ativas) o JSON já
+serializado fica no :class:`~conecta_senai.utils.cache_http.CacheHTTP` do app
+(Redis compartilhado entre os workers ou LRU local), sob um ``ETag`` derivado
+da combinação e de uma versão do feed. Cada gravação em notícias
+(``criar_noticia``, ``atualizar_noticia``, ``excluir_noticia`` e os jobs de
+publicação e de expiração de destaques) incrementa a versão; depois de cada
+ciclo de publicação o scheduler renderiza de novo as combinações mais comuns.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import current_app, has_app_context, make_response
+
+from conecta_senai.config import redis as config_redis
+from conecta_senai.utils.cache_http import (
+    CACHE_HTTP_TTL,
+    CacheHTTP,
+    obter_cache_http,
+    responder_com_cache,
+)
+
+log = logging.getLogger(__name__)
+
+NOTICIAS_FEED_PAGINAS = int(os.getenv("NOTICIAS_FEED_PAGINAS", "3"))
+VERSAO_FEED = "noticias_feed"
+ENDPOINT_FEED = "api_noticias.listar_noticias"
+# Combinações pedidas pelo portal público (``static/js/noticias/publico.js``):
+# (destaque, calendario, per_page).
+FEED_AQUECIMENTO = (
+    (None, None, 6),
+    (True, None, 5),
+    (None, True, 100),
+)
+
+
+def chave_feed(page: int, per_page: int, destaque: Optional[bool], calendario: Optional[bool]) -> Optional[str]:
+    """Chave da página do feed ou ``None`` se ela não deve ser guardada."""
+
+    if page < 1 or page > NOTICIAS_FEED_PAGINAS:
+        return None
+    return f"noticias_feed|p={page}|pp={per_page}|d={destaque}|c={calendario}"
+
+
+def invalidar_feed() -> None:
+    """Incrementa a versão do feed, tornando obsoletas as páginas guardadas."""
+
+    if has_app_context():
+        obter_cache_http().incrementar((VERSAO_FEED,))
+    elif not isinstance(config_redis.redis_conn, config_redis.DummyRedis):
+        CacheHTTP(config_redis.redis_conn).incrementar((VERSAO_FEED,))
+
+
+def feed_publico(chave: Callable[[], Optional[str]]):
+    """Serve a rota do cache quando ``chave()`` identifica uma página do feed.
+
+    ``If-None-Match`` com o ``ETag`` atual responde ``304`` sem consultar o
+    banco; só respostas 200 são guardadas.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            chave_atual = chave() if CACHE_HTTP_TTL > 0 else None
+            if chave_atual is None:
+                return view(*args, **kwargs)
+
+            cache = obter_cache_http()
+            etag = cache.etag(chave_atual, (VERSAO_FEED,))
+            return responder_com_cache(
+                cache, etag, lambda: view(*args, **kwargs), "public, no-cache"
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def aquecer_feed() -> int:
+    """Renderiza as primeiras páginas das combinações comuns; devolve quantas."""
+
+    view = current_app.view_functions.get(ENDPOINT_FEED)
+    if view is None or CACHE_HTTP_TTL <= 0:
+        return 0
+
+    renderizadas = 0
+    for destaque, calendario, per_page in FEED_AQUECIMENTO:
+        filtros = {"per_page": per_page}
+        if destaque is not None:
+            filtros["destaque"] = str(destaque).lower()
+        if calendario is not None:
+            filtros["calendario"] = str(calendario).lower()
+        for page in range(1, NOTICIAS_FEED_PAGINAS + 1):
+            with current_app.test_request_context(query_string={**filtros, "page": page}):
+                resposta = make_response(view())
+            if resposta.status_code != 200:
+                log.warning("Falha ao aquecer o feed de notícias (%s): HTTP %s", filtros, resposta.status_code)
+                break
+            renderizadas += 1
+            if page >= json.loads(resposta.get_data()).get("pages", 0):
+                break
+    return renderizadas
+
+
+__all__ = [
+    "NOTICIAS_FEED_PAGINAS",
+    "aquecer_feed",
+    "chave_feed",
+    "feed_publico",
+    "invalidar_feed",
+]
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Tuple
 from uuid import uuid4
 
-from flask import current_app
-from sqlalchemy import inspect
+from flask import current_app, has_app_context
+from sqlalchemy import func, inspect, select, update
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
@@ -18,59 +18,70 @@ from conecta_senai.models import db
 from conecta_senai.models.imagem_noticia import ImagemNoticia
 from conecta_senai.models.noticia import Noticia
 from conecta_senai.repositories.noticia_repository import NoticiaRepository
-
-UPLOAD_SUBDIR = Path("uploads") / "noticias"
+from conecta_senai.services.imagem_armazenamento import (
+    ArmazenamentoLocal,
+    calcular_sha256,
+    obter_armazenamento,
+)
+from conecta_senai.services.imagem_variantes import medir
+from conecta_senai.services.noticia_feed import invalidar_feed
 
 _TABELA_IMAGENS_DISPONIVEL: bool | None = None
+DIAS_UTEIS_DESTAQUE = 5
 
 
 log = logging.getLogger(__name__)
 
 
-def _obter_pasta_upload() -> Path:
-    static_folder = Path(current_app.static_folder)
-    pasta = static_folder / UPLOAD_SUBDIR
-    pasta.mkdir(parents=True, exist_ok=True)
-    return pasta
-
-
 def _gerar_nome_arquivo(arquivo: FileStorage) -> str:
     nome_seguro = secure_filename(arquivo.filename or "")
     extensao = Path(nome_seguro).suffix
     return f"{uuid4().hex}{extensao}" if extensao else uuid4().hex
 
 
-def _salvar_arquivo_imagem(arquivo: FileStorage) -> Tuple[str, str, bytes, str]:
-    pasta = _obter_pasta_upload()
+def _salvar_arquivo_imagem(arquivo: FileStorage) -> Tuple[str, str, bytes, str, str]:
     nome_arquivo = _gerar_nome_arquivo(arquivo)
-    caminho_absoluto = pasta / nome_arquivo
     arquivo.stream.seek(0)
     conteudo = arquivo.read()
     arquivo.stream.seek(0)
-    caminho_absoluto.write_bytes(conteudo)
-    caminho_relativo = (UPLOAD_SUBDIR / nome_arquivo).as_posix()
+    sha256 = calcular_sha256(conteudo)
+    caminho_relativo = obter_armazenamento().guardar(
+        conteudo, sha256, Path(nome_arquivo).suffix
+    )
     content_type = arquivo.mimetype or "application/octet-stream"
-    return nome_arquivo, caminho_relativo, conteudo, content_type
+    return nome_arquivo, caminho_relativo, conteudo, content_type, sha256
 
 
-def _remover_arquivo(caminho_relativo: str | None) -> None:
-    if not caminho_relativo:
-        return
-    static_folder = Path(current_app.static_folder).resolve()
+def _armazenamento_estatico() -> ArmazenamentoLocal:
+    return ArmazenamentoLocal(Path(current_app.static_folder))
+
+
+def _arquivo_referenciado(caminho_relativo: str) -> bool:
+    """Indica se outra imagem ainda aponta para o mesmo arquivo (mesmo hash)."""
+
+    if _TABELA_IMAGENS_DISPONIVEL is False:
+        return False
     try:
-        caminho = (static_folder / caminho_relativo).resolve()
-    except FileNotFoundError:
-        return
-    if static_folder not in caminho.parents and caminho != static_folder:
+        return (
+            db.session.query(ImagemNoticia.id)
+            .filter(ImagemNoticia.caminho_relativo == caminho_relativo)
+            .first()
+            is not None
+        )
+    except SQLAlchemyError:  # pragma: no cover - na dúvida, mantém o arquivo
+        db.session.rollback()
+        return True
+
+
+def _remover_arquivo(caminho_relativo: str | None) -> None:
+    if not caminho_relativo or _arquivo_referenciado(caminho_relativo):
         return
     try:
-        caminho.unlink(missing_ok=True)
-    except TypeError:  # Python < 3.8 compatibility
-        if caminho.exists():
-            caminho.unlink()
+        obter_armazenamento().remover(caminho_relativo)
+        _armazenamento_estatico().remover(caminho_relativo)
     except OSError:
         current_app.logger.warning(
-            "Não foi possível remover o arquivo de imagem %s", caminho, exc_info=True
+            "Não foi possível remover o arquivo de imagem %s", caminho_relativo, exc_info=True
         )
 
 
@@ -166,15 +177,19 @@ def _aplicar_imagem(noticia: Noticia, arquivo: FileStorage | None) -> Tuple[str
     if not arquivo or not arquivo.filename:
         return None, None
 
-    nome_arquivo, caminho_relativo, conteudo, content_type = _salvar_arquivo_imagem(arquivo)
+    nome_arquivo, caminho_relativo, conteudo, content_type, sha256 = _salvar_arquivo_imagem(arquivo)
     imagem_relacionada, caminho_antigo, tabela_disponivel = _carregar_imagem_relacionada(noticia)
+    largura, altura = medir(conteudo)
 
     if tabela_disponivel and imagem_relacionada is not None:
         imagem_relacionada.nome_arquivo = nome_arquivo
         imagem_relacionada.caminho_relativo = caminho_relativo
         imagem_relacionada.conteudo = conteudo
+        imagem_relacionada.sha256 = sha256
         imagem_relacionada.tem_conteudo = bool(conteudo)
         imagem_relacionada.content_type = content_type
+        imagem_relacionada.largura = largura
+        imagem_relacionada.altura = altura
         noticia.imagem_url = imagem_relacionada.url_publica
         return caminho_antigo, caminho_relativo
 
@@ -184,8 +199,11 @@ def _aplicar_imagem(noticia: Noticia, arquivo: FileStorage | None) -> Tuple[str
                 nome_arquivo=nome_arquivo,
                 caminho_relativo=caminho_relativo,
                 conteudo=conteudo,
+                sha256=sha256,
                 tem_conteudo=bool(conteudo),
                 content_type=content_type,
+                largura=largura,
+                altura=altura,
             )
         except (ProgrammingError, SQLAlchemyError) as exc:
             _registrar_tabela_imagens_indisponivel(exc)
@@ -197,6 +215,8 @@ def _aplicar_imagem(noticia: Noticia, arquivo: FileStorage | None) -> Tuple[str
 
     if tabela_disponivel:
         noticia.imagem = None
+    # Sem a tabela o arquivo só é acessível por ``/static``.
+    _armazenamento_estatico().guardar(conteudo, sha256, Path(nome_arquivo).suffix)
     noticia.imagem_url = _construir_url_publica(caminho_relativo)
     current_app.logger.debug(
         "Persistindo caminho da imagem no campo 'imagem_url' por indisponibilidade da tabela 'imagens_noticias'."
@@ -213,6 +233,7 @@ def criar_noticia(dados: Dict[str, Any], arquivo_imagem: FileStorage | None = No
         if arquivo_imagem and arquivo_imagem.filename:
             _, caminho_salvo = _aplicar_imagem(noticia, arquivo_imagem)
         noticia = NoticiaRepository.add(noticia)
+        invalidar_feed()
         return noticia
     except SQLAlchemyError as exc:  # pragma: no cover - erros de banco são delegados
         NoticiaRepository.rollback()
@@ -238,6 +259,7 @@ def atualizar_noticia(
 
     try:
         NoticiaRepository.commit()
+        invalidar_feed()
         if caminho_antigo and caminho_antigo != caminho_novo:
             _remover_arquivo(caminho_antigo)
         return noticia
@@ -254,6 +276,7 @@ def excluir_noticia(noticia: Noticia) -> None:
     _, caminho_antigo, _ = _carregar_imagem_relacionada(noticia)
     try:
         NoticiaRepository.delete(noticia)
+        invalidar_feed()
         if caminho_antigo:
             _remover_arquivo(caminho_antigo)
     except SQLAlchemyError as exc:  # pragma: no cover
@@ -261,47 +284,38 @@ def excluir_noticia(noticia: Noticia) -> None:
         raise exc
 
 
+def _contar(*filtros) -> int:
+    try:
+        return db.session.scalar(select(func.count()).select_from(Noticia).where(*filtros)) or 0
+    except SQLAlchemyError:
+        db.session.rollback()
+        log.exception("Erro ao contar notícias afetadas por um job.")
+        return 0
+
+
 def publicar_noticias_agendadas() -> dict[str, int]:
-    """Ativa notícias agendadas cuja data de publicação já passou."""
+    """Ativa, em um único ``UPDATE``, notícias cuja data de publicação já passou."""
 
     agora = datetime.now(timezone.utc)
-    noticias_para_publicar = Noticia.query.filter(
-        Noticia.ativo.is_(False),
-        Noticia.data_publicacao <= agora,
-    ).all()
+    filtros = (Noticia.ativo.is_(False), Noticia.data_publicacao <= agora)
+    try:
+        resultado = db.session.execute(
+            update(Noticia).where(*filtros).values(ativo=True),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        log.exception("Erro ao publicar notícias agendadas. Nenhuma alteração foi salva.")
+        falhas = _contar(*filtros)
+        return {"total": falhas, "publicadas": 0, "falhas": falhas}
 
-    total = len(noticias_para_publicar)
-    if total == 0:
+    publicadas = resultado.rowcount
+    if publicadas == 0:
         log.info("Nenhuma notícia agendada para publicar no momento.")
-        return {"total": 0, "publicadas": 0, "falhas": 0}
-
-    sucesso_count = 0
-    falha_count = 0
-
-    for noticia in noticias_para_publicar:
-        try:
-            noticia.ativo = True
-            db.session.add(noticia)
-            sucesso_count += 1
-        except SQLAlchemyError:
-            falha_count += 1
-            log.exception(
-                "Falha ao tentar publicar a notícia agendada com ID %s",
-                noticia.id,
-            )
-
-    if sucesso_count > 0:
-        try:
-            db.session.commit()
-        except SQLAlchemyError:
-            db.session.rollback()
-            log.exception(
-                "Erro ao commitar a publicação de notícias. Nenhuma alteração foi salva."
-            )
-            falha_count += sucesso_count
-            sucesso_count = 0
-
-    return {"total": total, "publicadas": sucesso_count, "falhas": falha_count}
+    else:
+        invalidar_feed()
+    return {"total": publicadas, "publicadas": publicadas, "falhas": 0}
 
 
 def _normalizar_para_utc(data: datetime) -> datetime:
@@ -310,65 +324,59 @@ def _normalizar_para_utc(data: datetime) -> datetime:
     return data.astimezone(timezone.utc)
 
 
-def _dias_uteis_decorridos(inicio: datetime, fim: datetime) -> int:
-    data_inicio = _normalizar_para_utc(inicio).date()
-    data_fim = _normalizar_para_utc(fim).date()
+def _feriados() -> set[date]:
+    valores = current_app.config.get("FERIADOS") if has_app_context() else None
+    feriados = set()
+    for valor in valores or ():
+        try:
+            feriados.add(valor if isinstance(valor, date) else date.fromisoformat(str(valor)))
+        except ValueError:
+            log.warning("Feriado inválido ignorado: %r", valor)
+    return feriados
 
-    if data_fim <= data_inicio:
-        return 0
 
-    dias_uteis = 0
-    dia_atual = data_inicio
+def limite_destaque(agora: datetime, dias_uteis: int = DIAS_UTEIS_DESTAQUE) -> datetime:
+    """Instante a partir do qual uma publicação ainda não completou ``dias_uteis``.
 
-    while dia_atual < data_fim:
-        if dia_atual.weekday() < 5:
-            dias_uteis += 1
-        dia_atual += timedelta(days=1)
+    Conta para trás, a partir do dia de ``agora`` (exclusive), os dias de
+    semana que não são feriados; notícias publicadas antes da meia-noite (UTC)
+    seguinte ao ``dias_uteis``-ésimo dia útil já cumpriram o prazo.
+    """
 
-    return dias_uteis
+    feriados = _feriados()
+    dia = _normalizar_para_utc(agora).date()
+    contados = 0
+    while contados < dias_uteis:
+        dia -= timedelta(days=1)
+        if dia.weekday() < 5 and dia not in feriados:
+            contados += 1
+    return datetime.combine(dia + timedelta(days=1), time.min, tzinfo=timezone.utc)
 
 
 def remover_destaques_expirados() -> dict[str, int]:
-    """Remove o destaque de notícias cuja data ultrapassou cinco dias úteis."""
+    """Remove, em um único ``UPDATE``, o destaque de notícias com cinco dias úteis."""
 
-    try:
-        noticias_em_destaque = (
-            Noticia.query.filter(
-                Noticia.destaque.is_(True),
-                Noticia.data_publicacao.isnot(None),
-            ).all()
-        )
-    except SQLAlchemyError:
-        db.session.rollback()
-        log.exception("Erro ao buscar notícias em destaque para verificação de expiração.")
-        return {"total": 0, "ajustados": 0, "falhas": 0}
-
-    total = len(noticias_em_destaque)
+    limite = limite_destaque(datetime.now(timezone.utc))
+    em_destaque = (Noticia.destaque.is_(True), Noticia.data_publicacao.isnot(None))
+    total = _contar(*em_destaque)
     if total == 0:
         return {"total": 0, "ajustados": 0, "falhas": 0}
 
-    agora = datetime.now(timezone.utc)
-    ajustados = 0
-
-    for noticia in noticias_em_destaque:
-        data_publicacao = noticia.data_publicacao
-        if not data_publicacao:
-            continue
-
-        dias_uteis = _dias_uteis_decorridos(data_publicacao, agora)
-        if dias_uteis >= 5:
-            noticia.destaque = False
-            ajustados += 1
-
-    if ajustados == 0:
-        return {"total": total, "ajustados": 0, "falhas": 0}
-
+    expirados = (*em_destaque, Noticia.data_publicacao < limite)
     try:
+        resultado = db.session.execute(
+            update(Noticia).where(*expirados).values(destaque=False),
+            execution_options={"synchronize_session": False},
+        )
         db.session.commit()
     except SQLAlchemyError:
         db.session.rollback()
         log.exception("Erro ao remover destaques expirados de notícias.")
-        return {"total": total, "ajustados": 0, "falhas": ajustados}
+        return {"total": total, "ajustados": 0, "falhas": _contar(*expirados)}
 
+    ajustados = resultado.rowcount
+    if ajustados == 0:
+        return {"total": total, "ajustados": 0, "falhas": 0}
+    invalidar_feed()
     log.info("Removidos %d destaques de notícias expiradas.", ajustados)
     return {"total": total, "ajustados": ajustados, "falhas": 0}
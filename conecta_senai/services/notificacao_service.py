@@ -1,5 +1,6 @@
 from flask import jsonify
 from datetime import datetime, timedelta
+from sqlalchemy import insert as sa_insert, select, text
 from sqlalchemy.exc import SQLAlchemyError
 
 from conecta_senai.models import db
@@ -7,6 +8,9 @@ from conecta_senai.models.agendamento import Notificacao, Agendamento
 from conecta_senai.routes.user import verificar_admin
 from conecta_senai.utils.error_handler import handle_internal_error
 
+# Linhas por ``INSERT``; mantém os parâmetros abaixo do limite do SQLite.
+TAMANHO_LOTE_LEMBRETES = 1000
+
 
 def listar_notificacoes(user):
     """Retorna notificações ordenadas por data de criação."""
@@ -37,37 +41,83 @@ def marcar_notificacao_lida(id, user):
         return handle_internal_error(e)
 
 
+def _insert_ignorando_duplicatas(dialeto):
+    """``INSERT`` que descarta lembretes já existentes (índice parcial único)."""
+    if dialeto == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        nao_lida = text('lida = false')
+    elif dialeto == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        nao_lida = text('lida = 0')
+    else:
+        return sa_insert(Notificacao)
+    # O predicado precisa ser o mesmo do índice parcial para ser reconhecido.
+    return insert(Notificacao).on_conflict_do_nothing(
+        index_elements=[Notificacao.agendamento_id],
+        index_where=nao_lida,
+    )
+
+
 def criar_notificacoes_agendamentos_proximos():
-    """Gera lembretes para agendamentos que ocorrerão nas próximas 24 horas."""
+    """Gera lembretes para agendamentos que ocorrerão nas próximas 24 horas.
+
+    Uma única consulta (anti-join) seleciona os agendamentos do período sem
+    lembrete não lido e os lembretes são gravados com um ``INSERT`` em lote.
+    O índice parcial único ``uq_notificacoes_agendamento_nao_lida`` torna a
+    operação idempotente mesmo com dois agendadores executando ao mesmo
+    tempo. Retorna a quantidade de notificações criadas.
+    """
     agora = datetime.utcnow()
     limite = agora + timedelta(hours=24)
 
-    agendamentos_proximos = Agendamento.query.filter(
-        Agendamento.data >= agora.date(),
-        Agendamento.data <= limite.date(),
+    lembrete_pendente = (
+        select(Notificacao.id)
+        .where(
+            Notificacao.agendamento_id == Agendamento.id,
+            Notificacao.lida.is_(False),
+        )
+        .exists()
+    )
+    pendentes = db.session.execute(
+        select(
+            Agendamento.id,
+            Agendamento.usuario_id,
+            Agendamento.laboratorio,
+            Agendamento.data,
+        ).where(
+            Agendamento.data >= agora.date(),
+            Agendamento.data <= limite.date(),
+            ~lembrete_pendente,
+        )
     ).all()
+    if not pendentes:
+        return 0
 
-    for agendamento in agendamentos_proximos:
-        notificacao_existente = Notificacao.query.filter_by(
-            agendamento_id=agendamento.id,
-            lida=False,
-        ).first()
-        if not notificacao_existente:
-            mensagem = (
-                f"Lembrete: Você tem um agendamento para {agendamento.laboratorio} em "
-                f"{agendamento.data.strftime('%d/%m/%Y')}"
-            )
-            nova_notificacao = Notificacao(
-                usuario_id=agendamento.usuario_id,
-                agendamento_id=agendamento.id,
-                mensagem=mensagem,
-            )
-            db.session.add(nova_notificacao)
+    linhas = [
+        {
+            'usuario_id': usuario_id,
+            'agendamento_id': agendamento_id,
+            'mensagem': (
+                f"Lembrete: Você tem um agendamento para {laboratorio} em "
+                f"{data.strftime('%d/%m/%Y')}"
+            ),
+            'lida': False,
+            'data_criacao': agora,
+        }
+        for agendamento_id, usuario_id, laboratorio, data in pendentes
+    ]
 
+    stmt = _insert_ignorando_duplicatas(db.session.get_bind().dialect.name)
+    criadas = 0
     try:
+        for inicio in range(0, len(linhas), TAMANHO_LOTE_LEMBRETES):
+            resultado = db.session.execute(
+                stmt.values(linhas[inicio:inicio + TAMANHO_LOTE_LEMBRETES])
+            )
+            criadas += max(resultado.rowcount, 0)
         db.session.commit()
-        return True
     except SQLAlchemyError as e:
         db.session.rollback()
         handle_internal_error(e)
-        return False
+        return 0
+    return criadas
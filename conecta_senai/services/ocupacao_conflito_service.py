@@ -0,0 +1,136 @@
+"""Detecção de conflitos de ocupação de salas em memória.
+
+Em vez de consultar o banco dia a dia, as ocupações ativas da sala no período
+são carregadas em uma única query e indexadas por data. Cada dia mantém os
+intervalos ordenados pelo horário de início, permitindo localizar os candidatos
+a conflito com busca binária.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, time
+from typing import Dict, Iterable, List
+
+from conecta_senai.models.ocupacao import Ocupacao
+
+STATUS_ATIVOS = ("confirmado", "pendente")
+
+
+def _sobrepoe(
+    inicio_existente: time,
+    fim_existente: time,
+    horario_inicio: time,
+    horario_fim: time,
+) -> bool:
+    """Replica o critério de sobreposição usado em ``Ocupacao.buscar_conflitos``."""
+
+    return (
+        (inicio_existente <= horario_inicio and fim_existente > horario_inicio)
+        or (inicio_existente < horario_fim and fim_existente >= horario_fim)
+        or (inicio_existente >= horario_inicio and fim_existente <= horario_fim)
+    )
+
+
+class IndiceConflitosOcupacao:
+    """Índice de intervalos das ocupações de uma sala agrupadas por dia."""
+
+    def __init__(self, ocupacoes: Iterable[Ocupacao]):
+        por_dia: Dict[date, List[Ocupacao]] = defaultdict(list)
+        for ocupacao in ocupacoes:
+            por_dia[ocupacao.data].append(ocupacao)
+
+        self._inicios: Dict[date, List[time]] = {}
+        self._ocupacoes: Dict[date, List[Ocupacao]] = {}
+        for dia, itens in por_dia.items():
+            itens.sort(key=lambda oc: (oc.horario_inicio, oc.id or 0))
+            self._ocupacoes[dia] = itens
+            self._inicios[dia] = [oc.horario_inicio for oc in itens]
+
+    def __len__(self) -> int:
+        return sum(len(itens) for itens in self._ocupacoes.values())
+
+    def conflitos_no_dia(
+        self, dia: date, horario_inicio: time, horario_fim: time
+    ) -> List[Ocupacao]:
+        """Retorna as ocupações do dia que se sobrepõem ao intervalo informado."""
+
+        itens = self._ocupacoes.get(dia)
+        if not itens:
+            return []
+        # Nenhuma ocupação iniciada depois de ``horario_fim`` pode conflitar.
+        limite = bisect_right(self._inicios[dia], horario_fim)
+        conflitos = [
+            oc
+            for oc in itens[:limite]
+            if _sobrepoe(oc.horario_inicio, oc.horario_fim, horario_inicio, horario_fim)
+        ]
+        conflitos.sort(key=lambda oc: oc.id or 0)
+        return conflitos
+
+    def conflitos_no_periodo(
+        self,
+        data_inicio: date,
+        data_fim: date,
+        horario_inicio: time,
+        horario_fim: time,
+    ) -> List[Ocupacao]:
+        """Retorna os conflitos de todos os dias do período, em ordem cronológica."""
+
+        conflitos: List[Ocupacao] = []
+        for dia in sorted(self._ocupacoes):
+            if data_inicio <= dia <= data_fim:
+                conflitos.extend(self.conflitos_no_dia(dia, horario_inicio, horario_fim))
+        return conflitos
+
+
+def carregar_indice_conflitos(
+    sala_id: int,
+    data_inicio: date,
+    data_fim: date,
+    ocupacao_id: int | None = None,
+    grupo_ocupacao_id: str | None = None,
+) -> IndiceConflitosOcupacao:
+    """Carrega com uma única consulta as ocupações ativas da sala no período.
+
+    ``ocupacao_id`` e ``grupo_ocupacao_id`` seguem a mesma semântica de
+    ``Ocupacao.buscar_conflitos``: os registros informados são ignorados para
+    permitir a edição de uma reserva existente.
+    """
+
+    query = Ocupacao.query.filter(
+        Ocupacao.sala_id == sala_id,
+        Ocupacao.data >= data_inicio,
+        Ocupacao.data <= data_fim,
+        Ocupacao.status.in_(STATUS_ATIVOS),
+    )
+    if ocupacao_id:
+        query = query.filter(Ocupacao.id != ocupacao_id)
+    if grupo_ocupacao_id:
+        query = query.filter(Ocupacao.grupo_ocupacao_id != grupo_ocupacao_id)
+    return IndiceConflitosOcupacao(query.all())
+
+
+def buscar_conflitos_periodo(
+    sala_id: int,
+    data_inicio: date,
+    data_fim: date,
+    horario_inicio: time,
+    horario_fim: time,
+    ocupacao_id: int | None = None,
+    grupo_ocupacao_id: str | None = None,
+) -> List[Ocupacao]:
+    """Lista as ocupações que conflitam com o turno em qualquer dia do período."""
+
+    indice = carregar_indice_conflitos(
+        sala_id, data_inicio, data_fim, ocupacao_id, grupo_ocupacao_id
+    )
+    return indice.conflitos_no_periodo(data_inicio, data_fim, horario_inicio, horario_fim)
+
+
+__all__ = [
+    "IndiceConflitosOcupacao",
+    "buscar_conflitos_periodo",
+    "carregar_indice_conflitos",
+]
@@ -0,0 +1,224 @@
+"""Grade de disponibilidade de salas por dia e turno.
+
+Cada sala ativa recebe um índice denso e cada célula ``(dia, turno)`` do
+período guarda um inteiro usado como conjunto de bits das salas ocupadas,
+preenchido em uma única passagem pelas ocupações. As salas livres de uma
+célula saem do complemento da máscara e são memorizadas por máscara, já que
+a maioria das células de um período repete poucas combinações.
+
+A mesma grade alimenta ``/ocupacoes/resumo-periodo`` e a situação do turno
+(``livre``/``parcial``/``cheio``) exibida em ``/ocupacoes/calendario``.
+"""
+
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from conecta_senai.models import db
+from conecta_senai.models.instrutor import Instrutor
+from conecta_senai.models.ocupacao import Ocupacao, TURNOS_PADRAO
+from conecta_senai.models.sala import Sala
+
+STATUS_ATIVOS = ("confirmado", "pendente")
+TURNOS = tuple(TURNOS_PADRAO)
+CORES_TURNO = {
+    'Manhã': '#FDD835',
+    'Tarde': '#00539F',
+    'Noite': '#512DA8',
+}
+COR_TURNO_PADRAO = '#888888'
+
+_TURNO_POR_HORARIOS = {horarios: i for i, horarios in enumerate(TURNOS_PADRAO.values())}
+
+
+def cor_turno(turno: Optional[str]) -> str:
+    """Retorna a cor associada ao turno."""
+    return CORES_TURNO.get(turno, COR_TURNO_PADRAO)
+
+
+class GradeDisponibilidade:
+    """Salas ocupadas por dia e turno como máscaras de bits.
+
+    ``salas`` é a sequência ``(id, nome)`` das salas consideradas no total;
+    ocupações de salas fora dela contam em ``ocupadas`` mas não alteram as
+    livres, como no resumo original.
+    """
+
+    def __init__(
+        self,
+        salas: Sequence[Tuple[int, str]],
+        data_inicio: date,
+        data_fim: date,
+    ) -> None:
+        self.data_inicio = data_inicio
+        self.dias = max((data_fim - data_inicio).days + 1, 0)
+        self._nomes = [nome for _, nome in salas]
+        self._bit = {sala_id: 1 << i for i, (sala_id, _) in enumerate(salas)}
+        self.total_salas = len(self._nomes)
+        self._todas = (1 << self.total_salas) - 1
+        celulas = self.dias * len(TURNOS)
+        self._mascaras = [0] * celulas
+        self._contagens = [0] * celulas
+        self._detalhes: Dict[int, List[dict]] = {}
+        self._livres: Dict[int, List[str]] = {}
+
+    def _celula(self, dia: date, horario_inicio: time, horario_fim: time) -> Optional[int]:
+        turno = _TURNO_POR_HORARIOS.get((horario_inicio, horario_fim))
+        deslocamento = (dia - self.data_inicio).days
+        if turno is None or not 0 <= deslocamento < self.dias:
+            return None
+        return deslocamento * len(TURNOS) + turno
+
+    def marcar(
+        self,
+        dia: date,
+        horario_inicio: time,
+        horario_fim: time,
+        sala_id: int,
+        detalhe: Optional[dict] = None,
+    ) -> bool:
+        """Registra uma ocupação; ignora horários fora dos turnos padrão."""
+        celula = self._celula(dia, horario_inicio, horario_fim)
+        if celula is None:
+            return False
+        self._mascaras[celula] |= self._bit.get(sala_id, 0)
+        self._contagens[celula] += 1
+        if detalhe is not None:
+            self._detalhes.setdefault(celula, []).append(detalhe)
+        return True
+
+    def salas_livres(self, mascara: int) -> List[str]:
+        """Nomes das salas fora de ``mascara``, na ordem de ``salas``."""
+        livres = self._livres.get(mascara)
+        if livres is None:
+            restantes = self._todas & ~mascara
+            livres = []
+            while restantes:
+                bit = restantes & -restantes
+                livres.append(self._nomes[bit.bit_length() - 1])
+                restantes ^= bit
+            self._livres[mascara] = livres
+        return livres
+
+    def situacao(self, dia: date, turno: str) -> Optional[str]:
+        """``livre``, ``parcial`` ou ``cheio`` para o turno do dia.
+
+        Conta salas ativas distintas: duas ocupações da mesma sala (ou de uma
+        sala inativa) não tornam o turno ``cheio``.
+        """
+        deslocamento = (dia - self.data_inicio).days
+        if turno not in TURNOS or not 0 <= deslocamento < self.dias:
+            return None
+        mascara = self._mascaras[deslocamento * len(TURNOS) + TURNOS.index(turno)]
+        ocupadas = bin(mascara & self._todas).count('1')
+        if ocupadas == 0:
+            return 'livre'
+        return 'cheio' if ocupadas >= self.total_salas else 'parcial'
+
+    def resumo(self) -> Dict[str, Dict[str, dict]]:
+        """Dicionário dia → turno no formato de ``/ocupacoes/resumo-periodo``."""
+        resultado = {}
+        celula = 0
+        for deslocamento in range(self.dias):
+            turnos = {}
+            for turno in TURNOS:
+                ocupadas = self._contagens[celula]
+                turnos[turno] = {
+                    'ocupadas': ocupadas,
+                    'salas_ocupadas': self._detalhes.get(celula, []),
+                    'salas_livres': self.salas_livres(self._mascaras[celula]),
+                    'total_salas': self.total_salas,
+                    'livres': self.total_salas - ocupadas,
+                }
+                celula += 1
+            resultado[(self.data_inicio + timedelta(days=deslocamento)).isoformat()] = turnos
+        return resultado
+
+
+def salas_ativas() -> List[Tuple[int, str]]:
+    return [
+        tuple(linha)
+        for linha in db.session.execute(
+            db.select(Sala.id, Sala.nome).where(Sala.status == 'ativa').order_by(Sala.id)
+        )
+    ]
+
+
+def grade_de_ocupacoes(
+    ocupacoes: Iterable[Ocupacao],
+    data_inicio: date,
+    data_fim: date,
+) -> GradeDisponibilidade:
+    """Grade das salas ativas a partir de ocupações já carregadas."""
+    grade = GradeDisponibilidade(salas_ativas(), data_inicio, data_fim)
+    for oc in ocupacoes:
+        grade.marcar(oc.data, oc.horario_inicio, oc.horario_fim, oc.sala_id)
+    return grade
+
+
+def carregar_grade_periodo(
+    data_inicio: date,
+    data_fim: date,
+    sala_id: Optional[int] = None,
+    instrutor_id: Optional[int] = None,
+    turno: Optional[str] = None,
+) -> GradeDisponibilidade:
+    """Monta a grade do período com os detalhes das salas ocupadas.
+
+    Usa uma consulta projetada (com o nome do instrutor via ``LEFT JOIN``) em
+    vez de carregar as entidades; ``turno`` deve ser uma chave de
+    ``TURNOS_PADRAO``.
+    """
+    salas = salas_ativas()
+    nomes = dict(salas)
+    stmt = (
+        db.select(
+            Ocupacao.data,
+            Ocupacao.horario_inicio,
+            Ocupacao.horario_fim,
+            Ocupacao.sala_id,
+            Ocupacao.curso_evento,
+            Instrutor.nome,
+        )
+        .outerjoin(Instrutor, Instrutor.id == Ocupacao.instrutor_id)
+        .where(
+            Ocupacao.data >= data_inicio,
+            Ocupacao.data <= data_fim,
+            Ocupacao.status.in_(STATUS_ATIVOS),
+        )
+        .order_by(Ocupacao.id)
+    )
+    if sala_id:
+        stmt = stmt.where(Ocupacao.sala_id == sala_id)
+    if instrutor_id:
+        stmt = stmt.where(Ocupacao.instrutor_id == instrutor_id)
+    if turno:
+        inicio, fim = TURNOS_PADRAO[turno]
+        stmt = stmt.where(Ocupacao.horario_inicio == inicio, Ocupacao.horario_fim == fim)
+
+    grade = GradeDisponibilidade(salas, data_inicio, data_fim)
+    for dia, inicio, fim, sala, curso_evento, instrutor_nome in db.session.execute(stmt):
+        grade.marcar(
+            dia,
+            inicio,
+            fim,
+            sala,
+            {
+                'sala_id': sala,
+                'sala_nome': nomes.get(sala, str(sala)),
+                'curso_evento': curso_evento,
+                'instrutor_nome': instrutor_nome,
+            },
+        )
+    return grade
+
+
+__all__ = [
+    "CORES_TURNO",
+    "GradeDisponibilidade",
+    "carregar_grade_periodo",
+    "cor_turno",
+    "grade_de_ocupacoes",
+    "salas_ativas",
+]
@@ -0,0 +1,80 @@
+"""Materialização em lote das séries de ocupações (``grupo_ocupacao_id``)."""
+
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+
+from conecta_senai.models import db
+from conecta_senai.models.ocupacao import Ocupacao
+
+
+def gerar_linhas_serie(
+    *,
+    sala_id: int,
+    usuario_id: int,
+    curso_evento: str,
+    data_inicio: date,
+    data_fim: date,
+    horario_inicio: time,
+    horario_fim: time,
+    grupo_ocupacao_id: str,
+    tipo_ocupacao: str | None = None,
+    recorrencia: str | None = 'unica',
+    status: str | None = 'confirmado',
+    observacoes: str | None = None,
+    ignorar_fim_de_semana: bool = False,
+) -> List[Dict[str, Any]]:
+    """Monta os valores de cada dia da série, prontos para um ``INSERT`` em lote."""
+
+    linhas = []
+    dia = data_inicio
+    while dia <= data_fim:
+        if not (ignorar_fim_de_semana and dia.weekday() >= 5):
+            linhas.append({
+                'sala_id': sala_id,
+                'usuario_id': usuario_id,
+                'curso_evento': curso_evento,
+                'data': dia,
+                'horario_inicio': horario_inicio,
+                'horario_fim': horario_fim,
+                'tipo_ocupacao': tipo_ocupacao,
+                'recorrencia': recorrencia,
+                'status': status,
+                'observacoes': observacoes,
+                'grupo_ocupacao_id': grupo_ocupacao_id,
+            })
+        dia += timedelta(days=1)
+    return linhas
+
+
+def materializar_serie(**dados_serie) -> List[Ocupacao]:
+    """Insere todos os dias de uma série com uma única instrução.
+
+    Aceita os mesmos argumentos de :func:`gerar_linhas_serie`. Em bancos com
+    suporte a ``INSERT ... RETURNING`` em lote (PostgreSQL, SQLite) as
+    ocupações são inseridas com ``executemany`` e retornadas já como objetos
+    ORM; nos demais o envio é delegado ao *unit of work* da sessão. O commit
+    fica a cargo de quem chama.
+    """
+
+    linhas = gerar_linhas_serie(**dados_serie)
+    if not linhas:
+        return []
+
+    if db.session.get_bind().dialect.insert_executemany_returning:
+        resultado = db.session.scalars(
+            insert(Ocupacao).returning(Ocupacao, sort_by_parameter_order=True),
+            linhas,
+        )
+        return list(resultado.all())
+
+    ocupacoes = [Ocupacao(**linha) for linha in linhas]
+    db.session.add_all(ocupacoes)
+    db.session.flush()
+    return ocupacoes
+
+
+__all__ = ["gerar_linhas_serie", "materializar_serie"]
@@ -0,0 +1,216 @@
+"""Cálculo dos indicadores do suporte de TI em uma única consulta agregada.
+
+Todas as contagens, médias e o percentual de atendimentos em 24h saem de um
+único ``GROUP BY`` (status, urgência, tipo de equipamento) com agregação
+condicional. Como médias são derivadas de somas e contagens, os totais por
+status, tipo e urgência — e as médias gerais e por urgência — são obtidos
+somando os grupos em Python, sem novas idas ao banco. Consultas com período
+usam o agregado diário mantido por ``suporte_rollup_service``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy import case, func, select
+
+from conecta_senai.models import db
+from conecta_senai.models.suporte_basedados import SuporteTipoEquipamento
+from conecta_senai.models.suporte_chamado import SuporteChamado
+
+NIVEIS_URGENCIA = ("Baixo", "Médio", "Alto")
+SEGUNDOS_24H = 86400
+_TZ_BRASILIA = timezone(timedelta(hours=-3))
+
+
+def segundos_entre(inicio, fim, dialeto: str):
+    """Expressão SQL com a duração ``fim - inicio`` em segundos."""
+
+    if dialeto == "sqlite":
+        # ``julianday`` é um REAL em dias; arredonda para milissegundos para
+        # descartar o erro de ponto flutuante da conversão.
+        return func.round((func.julianday(fim) - func.julianday(inicio)) * 86400.0, 3)
+    if dialeto == "postgresql":
+        return func.extract("epoch", fim - inicio)
+    return func.extract("epoch", fim) - func.extract("epoch", inicio)
+
+
+def _ler_data(valor: str | None, **substituir) -> Optional[datetime]:
+    if not valor:
+        return None
+    try:
+        return (
+            datetime.fromisoformat(valor)
+            .replace(tzinfo=_TZ_BRASILIA, **substituir)
+            .replace(tzinfo=None)
+        )
+    except (ValueError, TypeError):
+        return None
+
+
+def ler_filtros_indicadores(args: Mapping[str, str]) -> Dict[str, Any]:
+    """Normaliza os filtros da query string; valores inválidos são ignorados."""
+
+    tipo_equipamento_id = None
+    if args.get("tipo_equipamento_id"):
+        try:
+            tipo_equipamento_id = int(args["tipo_equipamento_id"])
+        except (ValueError, TypeError):
+            tipo_equipamento_id = None
+    return {
+        "data_inicio": _ler_data(
+            args.get("data_inicio"), hour=0, minute=0, second=0, microsecond=0
+        ),
+        "data_fim": _ler_data(
+            args.get("data_fim"), hour=23, minute=59, second=59, microsecond=999999
+        ),
+        "area": args.get("area") or None,
+        "tipo_equipamento_id": tipo_equipamento_id,
+        "nivel_urgencia": args.get("nivel_urgencia") or None,
+        "status": args.get("status") or None,
+    }
+
+
+def aplicar_filtros_indicadores(stmt, filtros: Mapping[str, Any]):
+    """Aplica os filtros de :func:`ler_filtros_indicadores` a um ``select``."""
+
+    if filtros.get("data_inicio"):
+        stmt = stmt.where(SuporteChamado.created_at >= filtros["data_inicio"])
+    if filtros.get("data_fim"):
+        stmt = stmt.where(SuporteChamado.created_at <= filtros["data_fim"])
+    for campo in ("area", "tipo_equipamento_id", "nivel_urgencia", "status"):
+        if filtros.get(campo) is not None:
+            stmt = stmt.where(getattr(SuporteChamado, campo) == filtros[campo])
+    return stmt
+
+
+def _consulta_agrupada(filtros: Mapping[str, Any]):
+    dialeto = db.session.get_bind().dialect.name
+    atendimento = segundos_entre(
+        SuporteChamado.created_at, SuporteChamado.inicio_atendimento_at, dialeto
+    )
+    encerramento = segundos_entre(
+        SuporteChamado.created_at, SuporteChamado.encerrado_at, dialeto
+    )
+    stmt = (
+        select(
+            SuporteChamado.status,
+            SuporteChamado.nivel_urgencia,
+            SuporteTipoEquipamento.nome,
+            func.count(SuporteChamado.id),
+            func.count(SuporteChamado.inicio_atendimento_at),
+            func.sum(atendimento),
+            func.count(SuporteChamado.encerrado_at),
+            func.sum(encerramento),
+            func.sum(case((atendimento < SEGUNDOS_24H, 1), else_=0)),
+        )
+        .select_from(SuporteChamado)
+        .outerjoin(
+            SuporteTipoEquipamento,
+            SuporteTipoEquipamento.id == SuporteChamado.tipo_equipamento_id,
+        )
+        .group_by(
+            SuporteChamado.status,
+            SuporteChamado.nivel_urgencia,
+            SuporteTipoEquipamento.nome,
+        )
+    )
+    return aplicar_filtros_indicadores(stmt, filtros)
+
+
+def _media(soma: float, quantidade: int) -> float:
+    return float(soma) / quantidade if quantidade else 0
+
+
+def _ordenar(contagens: Dict[Any, int]):
+    return sorted(contagens.items(), key=lambda item: (item[0] is not None, item[0] or ""))
+
+
+def montar_indicadores(linhas) -> Dict[str, Any]:
+    """Consolida as linhas agregadas no payload de ``/indicadores``.
+
+    Cada linha traz ``(status, nivel, tipo, total, n_atendidos, soma_atendimento,
+    n_encerrados, soma_encerramento, atendidos_24h)``.
+    """
+
+    por_status: Dict[Any, int] = defaultdict(int)
+    por_tipo: Dict[Any, int] = defaultdict(int)
+    por_urgencia: Dict[Any, int] = defaultdict(int)
+    tempos_nivel: Dict[Any, list] = defaultdict(lambda: [0, 0.0, 0, 0.0])
+    total = atendidos = encerrados = atendidos_24h = 0
+    soma_atend = soma_encer = 0.0
+
+    for status, nivel, tipo, qtd, n_at, s_at, n_enc, s_enc, em_24h in linhas:
+        por_status[status] += qtd
+        por_tipo[tipo] += qtd
+        por_urgencia[nivel] += qtd
+        total += qtd
+        atendidos += n_at
+        soma_atend += float(s_at or 0)
+        encerrados += n_enc
+        soma_encer += float(s_enc or 0)
+        atendidos_24h += int(em_24h or 0)
+        acumulado = tempos_nivel[nivel]
+        acumulado[0] += n_at
+        acumulado[1] += float(s_at or 0)
+        acumulado[2] += n_enc
+        acumulado[3] += float(s_enc or 0)
+
+    percentual_24h = (atendidos_24h / atendidos) * 100 if atendidos else 0
+    return {
+        "total_chamados": total,
+        "por_status": [
+            {"status": status or "Não informado", "quantidade": quantidade}
+            for status, quantidade in _ordenar(por_status)
+        ],
+        "por_tipo_equipamento": [
+            {"tipo": tipo or "Não informado", "quantidade": quantidade}
+            for tipo, quantidade in _ordenar(por_tipo)
+        ],
+        "por_nivel_urgencia": [
+            {"nivel": nivel or "Não informado", "quantidade": quantidade}
+            for nivel, quantidade in _ordenar(por_urgencia)
+        ],
+        "tempo_medio_abertura_para_atendimento_segundos": _media(soma_atend, atendidos),
+        "tempo_medio_abertura_para_encerramento_segundos": _media(soma_encer, encerrados),
+        "percentual_atendidos_em_24h": round(percentual_24h, 2),
+        "tempo_medio_por_urgencia": [
+            {
+                "nivel": nivel,
+                "tempo_atendimento": _media(tempos_nivel[nivel][1], tempos_nivel[nivel][0]),
+                "tempo_encerramento": _media(tempos_nivel[nivel][3], tempos_nivel[nivel][2]),
+            }
+            for nivel in NIVEIS_URGENCIA
+        ],
+    }
+
+
+def calcular_indicadores(
+    filtros: Mapping[str, Any], usar_rollup: bool | None = None
+) -> Dict[str, Any]:
+    """Executa a consulta agregada e devolve o payload de ``/indicadores``.
+
+    Consultas com período leem o agregado diário ``suporte_indicadores_diarios``
+    (os filtros de data têm granularidade de dia); as demais agregam direto
+    sobre ``suporte_chamados``.
+    """
+
+    if usar_rollup is None:
+        usar_rollup = bool(filtros.get("data_inicio") or filtros.get("data_fim"))
+    if usar_rollup:
+        from conecta_senai.services.suporte_rollup_service import consultar_rollup
+
+        return montar_indicadores(consultar_rollup(filtros))
+    linhas = db.session.execute(_consulta_agrupada(filtros)).all()
+    return montar_indicadores(linhas)
+
+
+__all__ = [
+    "aplicar_filtros_indicadores",
+    "calcular_indicadores",
+    "ler_filtros_indicadores",
+    "montar_indicadores",
+    "segundos_entre",
+]
@@ -0,0 +1,237 @@
+"""Manutenção do agregado diário ``suporte_indicadores_diarios``.
+
+Cada chamado contribui com uma linha do agregado, identificada pelo dia de
+abertura e por área, tipo de equipamento, urgência e status. Quando um
+chamado é criado, alterado ou excluído, a contribuição anterior é subtraída e
+a nova somada na mesma transação, de modo que os indicadores com período não
+precisem mais varrer ``suporte_chamados``. A soma é um *upsert*
+(``INSERT ... ON CONFLICT DO UPDATE``) para que dois chamados abertos ao mesmo
+tempo na mesma linha não disputem o ``INSERT`` e derrubem a transação.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from conecta_senai.models import db
+from conecta_senai.models.suporte_basedados import SuporteTipoEquipamento
+from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.models.suporte_indicador_diario import SuporteIndicadorDiario
+from conecta_senai.services.suporte_indicadores_service import (
+    SEGUNDOS_24H,
+    segundos_entre,
+)
+
+CAMPOS_CHAVE = ("dia", "area", "tipo_equipamento_id", "nivel_urgencia", "status")
+CHAVE_VAZIA = SuporteIndicadorDiario.CHAVE_VAZIA
+CAMPOS_VALOR = (
+    "quantidade",
+    "atendidos",
+    "soma_atendimento_segundos",
+    "encerrados",
+    "soma_encerramento_segundos",
+    "atendidos_24h",
+)
+
+
+class Contribuicao(NamedTuple):
+    """Linha do agregado afetada por um chamado e os valores que ele soma."""
+
+    chave: Tuple[Any, ...]
+    valores: Tuple[float, ...]
+
+
+def contribuicao_chamado(chamado: SuporteChamado) -> Optional[Contribuicao]:
+    """Calcula a contribuição atual do chamado para o agregado."""
+
+    if chamado.created_at is None:
+        return None
+    atendimento = encerramento = None
+    if chamado.inicio_atendimento_at is not None:
+        atendimento = (chamado.inicio_atendimento_at - chamado.created_at).total_seconds()
+    if chamado.encerrado_at is not None:
+        encerramento = (chamado.encerrado_at - chamado.created_at).total_seconds()
+    return Contribuicao(
+        chave=(chamado.created_at.date(),)
+        + tuple(
+            vazio if getattr(chamado, campo) is None else getattr(chamado, campo)
+            for campo, vazio in CHAVE_VAZIA.items()
+        ),
+        valores=(
+            1,
+            1 if atendimento is not None else 0,
+            atendimento or 0.0,
+            1 if encerramento is not None else 0,
+            encerramento or 0.0,
+            1 if atendimento is not None and atendimento < SEGUNDOS_24H else 0,
+        ),
+    )
+
+
+def _filtro_chave(chave: Tuple[Any, ...]):
+    return and_(
+        *(getattr(SuporteIndicadorDiario, campo) == valor for campo, valor in zip(CAMPOS_CHAVE, chave))
+    )
+
+
+def _incrementos(valores: Tuple[float, ...], sinal: int) -> Dict[str, Any]:
+    return {
+        campo: getattr(SuporteIndicadorDiario, campo) + sinal * valor
+        for campo, valor in zip(CAMPOS_VALOR, valores)
+    }
+
+
+def _inserir_ou_somar(contribuicao: Contribuicao) -> None:
+    linha = {
+        **dict(zip(CAMPOS_CHAVE, contribuicao.chave)),
+        **dict(zip(CAMPOS_VALOR, contribuicao.valores)),
+    }
+    dialeto = db.session.get_bind().dialect.name
+    if dialeto in ("postgresql", "sqlite"):
+        if dialeto == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+        else:
+            from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+        stmt = insert_dialeto(SuporteIndicadorDiario).values(**linha)
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=list(CAMPOS_CHAVE),
+                set_={
+                    campo: getattr(SuporteIndicadorDiario, campo) + getattr(stmt.excluded, campo)
+                    for campo in CAMPOS_VALOR
+                },
+            )
+        )
+        return
+
+    # Sem upsert no dialeto: o INSERT roda num SAVEPOINT e, se outra
+    # transação criou a linha no meio tempo, o UPDATE é repetido.
+    atualizar = (
+        update(SuporteIndicadorDiario)
+        .where(_filtro_chave(contribuicao.chave))
+        .values(**_incrementos(contribuicao.valores, 1))
+    )
+    if db.session.execute(atualizar).rowcount:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(SuporteIndicadorDiario).values(**linha))
+    except IntegrityError:
+        db.session.execute(atualizar)
+
+
+def _somar(contribuicao: Contribuicao, sinal: int) -> None:
+    if sinal > 0:
+        _inserir_ou_somar(contribuicao)
+        return
+    filtro = _filtro_chave(contribuicao.chave)
+    db.session.execute(
+        update(SuporteIndicadorDiario)
+        .where(filtro)
+        .values(**_incrementos(contribuicao.valores, sinal))
+    )
+    db.session.execute(
+        delete(SuporteIndicadorDiario).where(filtro, SuporteIndicadorDiario.quantidade <= 0)
+    )
+
+
+def registrar_alteracao(
+    anterior: Optional[Contribuicao], chamado: Optional[SuporteChamado]
+) -> None:
+    """Move a contribuição do chamado de ``anterior`` para o estado atual.
+
+    Use ``anterior=None`` para chamados novos (após o ``flush``) e
+    ``chamado=None`` para exclusões. Não faz commit.
+    """
+
+    atual = contribuicao_chamado(chamado) if chamado is not None else None
+    if anterior == atual:
+        return
+    if anterior is not None:
+        _somar(anterior, -1)
+    if atual is not None:
+        _somar(atual, 1)
+
+
+def reconstruir_rollup() -> int:
+    """Recalcula o agregado inteiro a partir de ``suporte_chamados``."""
+
+    dialeto = db.session.get_bind().dialect.name
+    atendimento = segundos_entre(
+        SuporteChamado.created_at, SuporteChamado.inicio_atendimento_at, dialeto
+    )
+    encerramento = segundos_entre(
+        SuporteChamado.created_at, SuporteChamado.encerrado_at, dialeto
+    )
+    dia = func.date(SuporteChamado.created_at)
+    chave = [
+        func.coalesce(getattr(SuporteChamado, campo), vazio)
+        for campo, vazio in CHAVE_VAZIA.items()
+    ]
+    origem = select(
+        dia,
+        *chave,
+        func.count(SuporteChamado.id),
+        func.count(SuporteChamado.inicio_atendimento_at),
+        func.coalesce(func.sum(atendimento), 0),
+        func.count(SuporteChamado.encerrado_at),
+        func.coalesce(func.sum(encerramento), 0),
+        func.sum(case((atendimento < SEGUNDOS_24H, 1), else_=0)),
+    ).group_by(dia, *chave)
+    db.session.execute(delete(SuporteIndicadorDiario))
+    db.session.execute(
+        insert(SuporteIndicadorDiario).from_select(CAMPOS_CHAVE + CAMPOS_VALOR, origem)
+    )
+    db.session.commit()
+    return db.session.scalar(select(func.count(SuporteIndicadorDiario.id)))
+
+
+def consultar_rollup(filtros: Dict[str, Any]):
+    """Linhas agrupadas no formato esperado por ``montar_indicadores``.
+
+    Os valores de ``CHAVE_VAZIA`` voltam como ``None`` ("Não informado").
+    """
+
+    stmt = (
+        select(
+            func.nullif(SuporteIndicadorDiario.status, CHAVE_VAZIA["status"]),
+            func.nullif(SuporteIndicadorDiario.nivel_urgencia, CHAVE_VAZIA["nivel_urgencia"]),
+            SuporteTipoEquipamento.nome,
+            func.sum(SuporteIndicadorDiario.quantidade),
+            func.sum(SuporteIndicadorDiario.atendidos),
+            func.sum(SuporteIndicadorDiario.soma_atendimento_segundos),
+            func.sum(SuporteIndicadorDiario.encerrados),
+            func.sum(SuporteIndicadorDiario.soma_encerramento_segundos),
+            func.sum(SuporteIndicadorDiario.atendidos_24h),
+        )
+        .select_from(SuporteIndicadorDiario)
+        .outerjoin(
+            SuporteTipoEquipamento,
+            SuporteTipoEquipamento.id == SuporteIndicadorDiario.tipo_equipamento_id,
+        )
+        .group_by(
+            SuporteIndicadorDiario.status,
+            SuporteIndicadorDiario.nivel_urgencia,
+            SuporteTipoEquipamento.nome,
+        )
+    )
+    if filtros.get("data_inicio"):
+        stmt = stmt.where(SuporteIndicadorDiario.dia >= filtros["data_inicio"].date())
+    if filtros.get("data_fim"):
+        stmt = stmt.where(SuporteIndicadorDiario.dia <= filtros["data_fim"].date())
+    for campo in ("area", "tipo_equipamento_id", "nivel_urgencia", "status"):
+        if filtros.get(campo) is not None:
+            stmt = stmt.where(getattr(SuporteIndicadorDiario, campo) == filtros[campo])
+    return db.session.execute(stmt).all()
+
+
+__all__ = [
+    "Contribuicao",
+    "consultar_rollup",
+    "contribuicao_chamado",
+    "reconstruir_rollup",
+    "registrar_alteracao",
+]
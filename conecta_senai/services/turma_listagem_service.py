@@ -0,0 +1,210 @@
+"""Listagens de turmas de treinamento por período em uma única consulta.
+
+As rotas ``/treinamentos/agendadas``, ``/turmas-ativas``, ``/historico`` e
+``/todas`` diferem apenas no filtro e na ordenação. Aqui elas compartilham uma
+projeção de colunas de ``TurmaTreinamento``, ``Treinamento`` e ``Instrutor``
+(com ``JOIN``/``LEFT JOIN``), convertida direto em dicionários — sem carregar
+entidades nem disparar uma consulta por turma para o treinamento e o
+instrutor. A resposta aceita ``page``/``per_page`` e leva um ``ETag``
+calculado sobre o corpo, respondendo ``304`` quando o cliente já tem a versão.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Response, jsonify, request
+from sqlalchemy import func, select
+
+from conecta_senai.models import db
+from conecta_senai.models.instrutor import Instrutor
+from conecta_senai.models.treinamento import Treinamento, TurmaTreinamento
+
+PER_PAGE_MAXIMO = 200
+
+_COLUNAS_TURMA = (
+    TurmaTreinamento.id,
+    TurmaTreinamento.data_inicio,
+    TurmaTreinamento.data_fim,
+    TurmaTreinamento.local_realizacao,
+    TurmaTreinamento.horario,
+    TurmaTreinamento.teoria_online,
+)
+_COLUNAS_TREINAMENTO = (
+    Treinamento.id,
+    Treinamento.nome,
+    Treinamento.codigo,
+    Treinamento.capacidade_maxima,
+    Treinamento.carga_horaria,
+    Treinamento.tem_pratica,
+    Treinamento.links_materiais,
+    Treinamento.tipo,
+    Treinamento.conteudo_programatico,
+    Treinamento.data_criacao,
+    Treinamento.data_atualizacao,
+)
+_COLUNAS_INSTRUTOR = (
+    Instrutor.id,
+    Instrutor.nome,
+    Instrutor.email,
+    Instrutor.telefone,
+    Instrutor.area_atuacao,
+    Instrutor.observacoes,
+    Instrutor.disponibilidade,
+    Instrutor.status,
+    Instrutor.data_criacao,
+    Instrutor.data_atualizacao,
+)
+_FIM_TURMA = len(_COLUNAS_TURMA)
+_FIM_TREINAMENTO = _FIM_TURMA + len(_COLUNAS_TREINAMENTO)
+
+
+def _iso(valor):
+    return valor.isoformat() if valor else None
+
+
+def _filtro_e_ordem(periodo: str, hoje: date):
+    if periodo == "agendadas":
+        return (
+            [TurmaTreinamento.data_inicio > hoje],
+            [TurmaTreinamento.data_inicio, TurmaTreinamento.id],
+        )
+    if periodo == "ativas":
+        return (
+            [TurmaTreinamento.data_inicio <= hoje, TurmaTreinamento.data_fim >= hoje],
+            [TurmaTreinamento.data_inicio.desc(), TurmaTreinamento.id.desc()],
+        )
+    if periodo == "historico":
+        return (
+            [TurmaTreinamento.data_fim < hoje],
+            [TurmaTreinamento.data_inicio.desc(), TurmaTreinamento.id.desc()],
+        )
+    if periodo == "todas":
+        return [], [Treinamento.nome, TurmaTreinamento.id]
+    raise ValueError(f"Período desconhecido: {periodo}")
+
+
+def consulta_turmas(periodo: str, hoje: Optional[date] = None):
+    """``select`` projetado das turmas do período, já ordenado."""
+
+    filtros, ordem = _filtro_e_ordem(periodo, hoje or date.today())
+    return (
+        select(*_COLUNAS_TURMA, *_COLUNAS_TREINAMENTO, *_COLUNAS_INSTRUTOR)
+        .join(Treinamento, Treinamento.id == TurmaTreinamento.treinamento_id)
+        .outerjoin(Instrutor, Instrutor.id == TurmaTreinamento.instrutor_id)
+        .where(*filtros)
+        .order_by(*ordem)
+    )
+
+
+def serializar_turma(linha, instrutor_resumido: bool = False) -> Dict[str, Any]:
+    """Monta o item da listagem a partir de uma linha de :func:`consulta_turmas`.
+
+    Com ``instrutor_resumido`` traz apenas ``instrutor_nome`` (formato de
+    ``/treinamentos/agendadas``); caso contrário, o instrutor completo.
+    """
+
+    turma_id, data_inicio, data_fim, local, horario, teoria_online = linha[:_FIM_TURMA]
+    (
+        treinamento_id, nome, codigo, capacidade, carga, tem_pratica, links,
+        tipo, conteudo, tr_criacao, tr_atualizacao,
+    ) = linha[_FIM_TURMA:_FIM_TREINAMENTO]
+    item = {
+        "turma_id": turma_id,
+        "treinamento": {
+            "id": treinamento_id,
+            "nome": nome,
+            "codigo": codigo,
+            "capacidade_maxima": capacidade,
+            "carga_horaria": carga,
+            "tem_pratica": tem_pratica,
+            "links_materiais": links or [],
+            "tipo": tipo,
+            "conteudo_programatico": conteudo,
+            "data_criacao": _iso(tr_criacao),
+            "data_atualizacao": _iso(tr_atualizacao),
+        },
+        "data_inicio": _iso(data_inicio),
+        "data_fim": _iso(data_fim),
+        "local_realizacao": local,
+        "horario": horario,
+    }
+
+    (
+        instrutor_id, i_nome, i_email, i_telefone, i_area, i_obs, i_disp,
+        i_status, i_criacao, i_atualizacao,
+    ) = linha[_FIM_TREINAMENTO:]
+    if instrutor_resumido:
+        item["instrutor_nome"] = i_nome if instrutor_id is not None else "A definir"
+    else:
+        item["instrutor"] = None if instrutor_id is None else {
+            "id": instrutor_id,
+            "nome": i_nome,
+            "email": i_email,
+            "telefone": i_telefone,
+            "area_atuacao": i_area,
+            "observacoes": i_obs,
+            "disponibilidade": i_disp or [],
+            "status": i_status,
+            "data_criacao": _iso(i_criacao),
+            "data_atualizacao": _iso(i_atualizacao),
+        }
+    item["teoria_online"] = teoria_online
+    item["has_pratica"] = bool(tem_pratica)
+    return item
+
+
+def listar_turmas(
+    periodo: str,
+    page: Optional[int] = None,
+    per_page: int = 50,
+    hoje: Optional[date] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, int]]]:
+    """Itens do período e, quando ``page`` é informado, os dados de paginação."""
+
+    stmt = consulta_turmas(periodo, hoje)
+    resumido = periodo == "agendadas"
+    if page is None:
+        linhas = db.session.execute(stmt).all()
+        return [serializar_turma(linha, resumido) for linha in linhas], None
+
+    page = max(page, 1)
+    per_page = max(1, min(per_page, PER_PAGE_MAXIMO))
+    total = db.session.scalar(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
+    )
+    linhas = db.session.execute(stmt.limit(per_page).offset((page - 1) * per_page)).all()
+    paginacao = {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": -(-total // per_page),
+    }
+    return [serializar_turma(linha, resumido) for linha in linhas], paginacao
+
+
+def resposta_listagem_turmas(periodo: str) -> Response:
+    """Resposta JSON da listagem, paginada se ``page`` vier na query string.
+
+    Sem ``page`` a resposta continua sendo a lista completa (formato antigo);
+    com ``page`` segue o envelope ``items``/``page``/``per_page``/``total``/
+    ``pages`` usado nas demais listagens paginadas.
+    """
+
+    page = request.args.get("page", type=int)
+    per_page = request.args.get("per_page", 50, type=int)
+    itens, paginacao = listar_turmas(periodo, page, per_page)
+    corpo = itens if paginacao is None else {"items": itens, **paginacao}
+    resposta = jsonify(corpo)
+    resposta.add_etag()
+    resposta.headers["Cache-Control"] = "private, no-cache"
+    return resposta.make_conditional(request)
+
+
+__all__ = [
+    "consulta_turmas",
+    "listar_turmas",
+    "resposta_listagem_turmas",
+    "serializar_turma",
+]
@@ -1,4 +1,4 @@
 """Tarefas agendadas e utilidades relacionadas a rotinas periódicas."""
-from .scheduler import start_scheduler
+from .scheduler import iniciar_scheduler_com_lideranca, parar_scheduler, start_scheduler
 
-__all__ = ["start_scheduler"]
+__all__ = ["iniciar_scheduler_com_lideranca", "parar_scheduler", "start_scheduler"]
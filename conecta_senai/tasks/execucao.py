@@ -0,0 +1,249 @@
+"""Execução única e histórico dos jobs agendados.
+
+Cada job roda dentro de :func:`executar_job`, que obtém uma concessão
+exclusiva (*lease*) antes de começar: ``SET NX PX`` no Redis ou, sem ele, uma
+linha em ``jobs_leases`` atualizada de forma condicional. Se outro processo
+ou réplica já estiver executando o mesmo job, a execução é pulada. Toda
+execução concluída fica em ``execucoes_jobs`` com início, fim, duração,
+linhas afetadas e erro, base de ``/health/jobs``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from conecta_senai.config import redis as config_redis
+from conecta_senai.models import db
+from conecta_senai.models.execucao_job import ExecucaoJob, LeaseJob
+from conecta_senai.tasks.lideranca import SCRIPT_LIBERAR
+
+logger = logging.getLogger(__name__)
+
+LEASE_PADRAO = timedelta(minutes=10)
+HISTORICO_DIAS = int(os.getenv("JOBS_HISTORICO_DIAS", "30"))
+# A limpeza do histórico roda a cada N execuções registradas.
+_LIMPEZA_A_CADA = 100
+# Campos de ``resumo_execucoes`` expostos sem autenticação em ``/health/jobs``.
+CAMPOS_PUBLICOS = ("job", "status", "inicio", "fim", "duracao_ms", "em_execucao")
+
+
+class LeaseRedis:
+    """Concessão com dono e expiração em milissegundos no Redis."""
+
+    def __init__(self, cliente, job: str, dono: str, duracao: timedelta) -> None:
+        self.cliente = cliente
+        self.chave = f"jobs:lease:{job}"
+        self.dono = dono
+        self.duracao = duracao
+
+    def adquirir(self) -> bool:
+        px = int(self.duracao.total_seconds() * 1000)
+        return bool(self.cliente.set(self.chave, self.dono, nx=True, px=px))
+
+    def liberar(self) -> None:
+        self.cliente.eval(SCRIPT_LIBERAR, 1, self.chave, self.dono)
+
+
+class LeaseBanco:
+    """Concessão na tabela ``jobs_leases``.
+
+    A linha é tomada por ``UPDATE ... WHERE expira_em < agora`` ou criada por
+    ``INSERT``; a chave primária garante que só um processo vence a disputa.
+    """
+
+    def __init__(self, job: str, dono: str, duracao: timedelta) -> None:
+        self.job = job
+        self.dono = dono
+        self.duracao = duracao
+
+    def adquirir(self) -> bool:
+        agora = datetime.utcnow()
+        valores = {"dono": self.dono, "expira_em": agora + self.duracao}
+        tomada = db.session.execute(
+            update(LeaseJob)
+            .where(LeaseJob.job == self.job, LeaseJob.expira_em < agora)
+            .values(**valores)
+        )
+        if tomada.rowcount:
+            db.session.commit()
+            return True
+        try:
+            db.session.execute(insert(LeaseJob).values(job=self.job, **valores))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return False
+        return True
+
+    def liberar(self) -> None:
+        db.session.execute(
+            delete(LeaseJob).where(LeaseJob.job == self.job, LeaseJob.dono == self.dono)
+        )
+        db.session.commit()
+
+
+def criar_lease(job: str, duracao: timedelta = LEASE_PADRAO):
+    """Concessão no Redis configurado ou, sem ele, no banco."""
+    dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    cliente = config_redis.redis_conn
+    if not isinstance(cliente, config_redis.DummyRedis):
+        return LeaseRedis(cliente, job, dono, duracao)
+    return LeaseBanco(job, dono, duracao)
+
+
+def contar_linhas(resultado: Any) -> Optional[int]:
+    """Linhas afetadas a partir do retorno do job (inteiro ou dicionário de contagens)."""
+    if isinstance(resultado, bool):
+        return None
+    if isinstance(resultado, int):
+        return resultado
+    if isinstance(resultado, dict):
+        return sum(v for k, v in resultado.items() if k != "total" and isinstance(v, int))
+    return None
+
+
+def executar_job(
+    nome: str,
+    funcao: Callable[[], Any],
+    duracao_lease: timedelta = LEASE_PADRAO,
+    linhas: Callable[[Any], Optional[int]] = contar_linhas,
+) -> Any:
+    """Executa ``funcao`` se nenhum outro processo estiver executando ``nome``.
+
+    Requer contexto de aplicação. Devolve o resultado do job ou ``None``
+    quando a execução foi pulada; exceções do job são registradas no
+    histórico e propagadas ao scheduler.
+    """
+    lease = criar_lease(nome, duracao_lease)
+    if not lease.adquirir():
+        logger.info("Job %s já está em execução em outro processo; pulando.", nome)
+        return None
+
+    inicio = time.perf_counter()
+    execucao_id = None
+    resultado = None
+    erro = None
+    try:
+        execucao_id = _registrar_inicio(nome, lease.dono, duracao_lease)
+        resultado = funcao()
+        return resultado
+    except Exception as exc:
+        erro = exc
+        raise
+    finally:
+        if erro is not None:
+            db.session.rollback()
+        if execucao_id is not None:
+            _registrar_fim(nome, execucao_id, inicio, erro, resultado, linhas)
+        try:
+            lease.liberar()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Falha ao liberar a concessão do job %s.", nome)
+
+
+def _registrar_inicio(nome: str, processo: str, duracao_lease: timedelta) -> Optional[int]:
+    """Grava a execução como ``executando``; sem histórico o job roda mesmo assim."""
+    agora = datetime.utcnow()
+    execucao = ExecucaoJob(
+        job=nome,
+        processo=processo,
+        status=ExecucaoJob.STATUS_EXECUTANDO,
+        inicio=agora,
+        expira_em=agora + duracao_lease,
+    )
+    try:
+        db.session.add(execucao)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception("Falha ao registrar o início do job %s.", nome)
+        return None
+    return execucao.id
+
+
+def _registrar_fim(
+    nome: str,
+    execucao_id: int,
+    inicio: float,
+    erro: Optional[BaseException],
+    resultado: Any,
+    linhas: Callable[[Any], Optional[int]],
+) -> None:
+    duracao_ms = int((time.perf_counter() - inicio) * 1000)
+    try:
+        db.session.execute(
+            update(ExecucaoJob)
+            .where(ExecucaoJob.id == execucao_id)
+            .values(
+                status=ExecucaoJob.STATUS_ERRO if erro else ExecucaoJob.STATUS_SUCESSO,
+                fim=datetime.utcnow(),
+                duracao_ms=duracao_ms,
+                linhas_afetadas=None if erro else linhas(resultado),
+                erro=repr(erro)[:2000] if erro else None,
+            )
+        )
+        if execucao_id % _LIMPEZA_A_CADA == 0:
+            db.session.execute(
+                delete(ExecucaoJob).where(
+                    ExecucaoJob.inicio < datetime.utcnow() - timedelta(days=HISTORICO_DIAS)
+                )
+            )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception("Falha ao registrar a execução do job %s.", nome)
+
+
+def resumo_execucoes(
+    agora: Optional[datetime] = None, detalhado: bool = False
+) -> List[Dict[str, Any]]:
+    """Última execução de cada job, com a idade e a duração dela.
+
+    Uma execução que continua ``executando`` depois de a concessão expirar
+    (processo encerrado no meio do job) aparece como ``abandonado``. Sem
+    ``detalhado`` só saem os campos de ``CAMPOS_PUBLICOS``: ``erro`` e
+    ``processo`` expõem detalhes internos e ficam para administradores.
+    """
+    agora = agora or datetime.utcnow()
+    ultimas = (
+        select(func.max(ExecucaoJob.id))
+        .group_by(ExecucaoJob.job)
+        .scalar_subquery()
+    )
+    execucoes = db.session.scalars(
+        select(ExecucaoJob).where(ExecucaoJob.id.in_(ultimas)).order_by(ExecucaoJob.job)
+    )
+    resumo = []
+    for execucao in execucoes:
+        item = execucao.to_dict()
+        item["segundos_desde_inicio"] = round((agora - execucao.inicio).total_seconds(), 1)
+        if execucao.status == ExecucaoJob.STATUS_EXECUTANDO:
+            limite = execucao.expira_em or execucao.inicio + LEASE_PADRAO
+            if agora > limite:
+                item["status"] = ExecucaoJob.STATUS_ABANDONADO
+        item["em_execucao"] = item["status"] == ExecucaoJob.STATUS_EXECUTANDO
+        if not detalhado:
+            item = {campo: item[campo] for campo in CAMPOS_PUBLICOS}
+        resumo.append(item)
+    return resumo
+
+
+__all__ = [
+    "CAMPOS_PUBLICOS",
+    "LeaseBanco",
+    "LeaseRedis",
+    "contar_linhas",
+    "criar_lease",
+    "executar_job",
+    "resumo_execucoes",
+]
@@ -1,20 +1,49 @@
-"""Rotinas de convocação automática de turmas."""
+"""Rotinas de convocação automática de turmas.
+
+As inscrições pendentes são lidas em lotes por paginação de chave (``id``
+crescente) e cada lote é gravado na outbox de e-mails dentro de
+:func:`enfileirar_envios`, com commit ao final do lote. O envio fica com o
+dispatcher da outbox, que respeita o limite de taxa do provedor e marca
+``convocado_em`` quando a mensagem sai. Inscrições com convocação ainda na
+fila não são lidas de novo, de modo que uma execução interrompida retoma do
+ponto em que parou sem reenviar o que já foi enfileirado.
+"""
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable
+import os
+import time
+from typing import Dict, List
 
 from flask import current_app
 from sqlalchemy.orm import joinedload
 
-from conecta_senai.models import db, InscricaoTreinamento, TurmaTreinamento
+from conecta_senai.models import EmailOutbox, InscricaoTreinamento, TurmaTreinamento, db
+from conecta_senai.services.email_outbox_service import enfileirar_envios
 from conecta_senai.services.email_service import enviar_convocacao
 
+LOTE_CONVOCACAO = int(os.getenv("CONVOCACAO_LOTE", "100"))
+# Tempo máximo de uma execução; o restante fica para o próximo ciclo.
+ORCAMENTO_SEGUNDOS = float(os.getenv("CONVOCACAO_ORCAMENTO_SEGUNDOS", "300"))
+REFERENCIA_CONVOCACAO = "convocacao"
+
 
-def _carregar_inscricoes_pendentes() -> Iterable[InscricaoTreinamento]:
-    """Retorna as inscrições que ainda não receberam convocação."""
+def _carregar_inscricoes_pendentes(
+    apos_id: int = 0, limite: int = LOTE_CONVOCACAO
+) -> List[InscricaoTreinamento]:
+    """Próximo lote de inscrições sem convocação e sem envio na fila."""
 
+    na_fila = (
+        db.select(EmailOutbox.id)
+        .where(
+            EmailOutbox.referencia_tipo == REFERENCIA_CONVOCACAO,
+            EmailOutbox.referencia_id == InscricaoTreinamento.id,
+            EmailOutbox.status.in_(
+                (EmailOutbox.STATUS_PENDENTE, EmailOutbox.STATUS_ENVIANDO)
+            ),
+        )
+        .exists()
+    )
     return (
         InscricaoTreinamento.query.options(
             joinedload(InscricaoTreinamento.usuario),
@@ -25,54 +54,99 @@ def _carregar_inscricoes_pendentes() -> Iterable[InscricaoTreinamento]:
                 TurmaTreinamento.instrutor
             ),
         )
-        .filter(InscricaoTreinamento.convocado_em.is_(None))
+        .filter(
+            InscricaoTreinamento.convocado_em.is_(None),
+            InscricaoTreinamento.id > apos_id,
+            ~na_fila,
+        )
+        .order_by(InscricaoTreinamento.id)
+        .limit(limite)
         .all()
     )
 
 
-def convocacao_automatica_job() -> None:
-    """Executa a convocação automática de participantes."""
-
+def _enfileirar_lote(inscricoes: List[InscricaoTreinamento], resumo: Dict[str, int]) -> None:
     logger = current_app.logger
+    with enfileirar_envios() as fila:
+        for inscricao in inscricoes:
+            turma = getattr(inscricao, "turma", None)
+            treinamento = getattr(turma, "treinamento", None) if turma else None
+            if turma is None or treinamento is None:
+                logger.warning(
+                    "Inscrição %s sem turma ou treinamento associado; ignorando.",
+                    inscricao.id,
+                )
+                resumo["ignoradas"] += 1
+                continue
 
-    inscricoes_a_convocar = _carregar_inscricoes_pendentes()
-    if not inscricoes_a_convocar:
-        logger.debug("Nenhuma inscrição pendente de convocação encontrada.")
-        return
-
-    for inscricao in inscricoes_a_convocar:
-        turma = getattr(inscricao, "turma", None)
-        treinamento = getattr(turma, "treinamento", None) if turma else None
-        if turma is None or treinamento is None:
-            logger.warning(
-                "Inscrição %s sem turma ou treinamento associado; ignorando.",
-                getattr(inscricao, "id", "?"),
-            )
-            continue
+            fila.referencia = (REFERENCIA_CONVOCACAO, inscricao.id)
+            try:
+                enviar_convocacao(inscricao, turma)
+            except ValueError as exc:
+                logger.warning(
+                    "Convocação ignorada para inscrição %s: %s", inscricao.id, exc
+                )
+                resumo["ignoradas"] += 1
+                continue
+            except Exception:  # pragma: no cover - apenas log
+                logger.exception(
+                    "Falha ao preparar convocação automática para inscrição %s.",
+                    inscricao.id,
+                )
+                resumo["falhas"] += 1
+                continue
+            resumo["enfileiradas"] += 1
+
+
+def convocacao_automatica_job(
+    lote: int = LOTE_CONVOCACAO, orcamento_segundos: float = ORCAMENTO_SEGUNDOS
+) -> Dict[str, float]:
+    """Enfileira as convocações pendentes em lotes e devolve as estatísticas da execução."""
+
+    logger = current_app.logger
+    inicio = time.perf_counter()
+    resumo: Dict[str, int] = {"enfileiradas": 0, "ignoradas": 0, "falhas": 0, "lotes": 0}
+    cursor = 0
+    interrompida = False
 
+    while True:
+        inscricoes = _carregar_inscricoes_pendentes(cursor, lote)
+        if not inscricoes:
+            break
+        cursor = inscricoes[-1].id
         try:
-            enviar_convocacao(inscricao, turma)
-        except ValueError as exc:
-            logger.warning(
-                "Convocação ignorada para inscrição %s: %s",
-                getattr(inscricao, "id", "?"),
-                exc,
-            )
-            continue
+            _enfileirar_lote(inscricoes, resumo)
         except Exception:  # pragma: no cover - apenas log
+            db.session.rollback()
             logger.exception(
-                "Falha ao enviar convocação automática para inscrição %s.",
-                getattr(inscricao, "id", "?"),
+                "Erro ao gravar o lote de convocações automáticas até a inscrição %s.",
+                cursor,
             )
-            continue
+            raise
+        resumo["lotes"] += 1
+        db.session.expunge_all()
+        if len(inscricoes) < lote:
+            break
+        if time.perf_counter() - inicio >= orcamento_segundos:
+            interrompida = True
+            break
 
-        inscricao.convocado_em = datetime.utcnow()
-
-    try:
-        db.session.commit()
-    except Exception:  # pragma: no cover - apenas log
-        db.session.rollback()
-        logger.exception(
-            "Erro ao salvar o status das convocações automáticas no banco de dados.",
+    duracao = time.perf_counter() - inicio
+    estatisticas: Dict[str, float] = dict(resumo)
+    estatisticas["segundos"] = round(duracao, 3)
+    estatisticas["por_segundo"] = round(resumo["enfileiradas"] / duracao, 1) if duracao else 0.0
+    if resumo["lotes"] == 0:
+        logger.debug("Nenhuma inscrição pendente de convocação encontrada.")
+    else:
+        logger.info(
+            "Convocação automática: %d enfileiradas, %d ignoradas, %d falhas em %d lotes "
+            "(%.2fs, %.1f/s)%s.",
+            resumo["enfileiradas"],
+            resumo["ignoradas"],
+            resumo["falhas"],
+            resumo["lotes"],
+            duracao,
+            estatisticas["por_segundo"],
+            "; orçamento de tempo esgotado, restante no próximo ciclo" if interrompida else "",
         )
-        raise
+    return estatisticas
@@ -0,0 +1,33 @@
+"""Job de despacho da fila de e-mails (outbox)."""
+
+import logging
+
+from conecta_senai.services.email_anexos_cache import cache_anexos
+from conecta_senai.services.email_outbox_service import processar_fila
+
+log = logging.getLogger(__name__)
+
+
+def despachar_emails() -> dict[str, int]:
+    """Drena a outbox até esvaziar as mensagens prontas para envio."""
+
+    total = {"enviados": 0, "reagendados": 0, "erros": 0}
+    while True:
+        resultado = processar_fila()
+        for chave, valor in resultado.items():
+            total[chave] += valor
+        if not any(resultado.values()):
+            break
+
+    if any(total.values()):
+        estatisticas = cache_anexos.estatisticas()
+        log.info(
+            "Outbox de e-mails: %d enviados, %d reagendados, %d com erro "
+            "(cache de anexos: %.0f%% de acerto, %d bytes).",
+            total["enviados"],
+            total["reagendados"],
+            total["erros"],
+            estatisticas["taxa_acerto"] * 100,
+            estatisticas["bytes"],
+        )
+    return total
@@ -2,6 +2,7 @@
 
 import logging
 
+from conecta_senai.services.noticia_feed import aquecer_feed
 from conecta_senai.services.noticia_service import (
     publicar_noticias_agendadas as _publicar_noticias_agendadas,
     remover_destaques_expirados as _remover_destaques_expirados,
@@ -11,9 +12,14 @@ log = logging.getLogger(__name__)
 
 
 def publicar_noticias_agendadas() -> dict[str, int]:
-    """Executa a publicação de notícias agendadas com registro em log."""
+    """Executa a publicação de notícias agendadas com registro em log.
+
+    Ao final de cada ciclo as páginas mais acessadas do feed público são
+    renderizadas de novo, para que o primeiro visitante não pague a consulta.
+    """
 
     resultado = _publicar_noticias_agendadas()
+    _aquecer_feed()
 
     if resultado["total"] == 0:
         return resultado
@@ -33,6 +39,15 @@ def publicar_noticias_agendadas() -> dict[str, int]:
     return resultado
 
 
+def _aquecer_feed() -> None:
+    try:
+        paginas = aquecer_feed()
+    except Exception:  # pragma: no cover - o aquecimento nunca derruba o job
+        log.exception("Falha ao aquecer o feed público de notícias.")
+    else:
+        log.debug("Feed público de notícias aquecido: %d páginas.", paginas)
+
+
 def remover_destaques_expirados() -> dict[str, int]:
     """Remove destaques expirados registrando o total afetado."""
 
@@ -41,6 +56,7 @@ def remover_destaques_expirados() -> dict[str, int]:
     ajustados = resultado.get("ajustados", 0)
     if ajustados:
         log.info("Removidos %d destaques expirados de notícias.", ajustados)
+        _aquecer_feed()
     else:
         log.debug("Nenhum destaque expirado precisou ser removido no ciclo atual.")
 
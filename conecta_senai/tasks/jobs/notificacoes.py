@@ -1,11 +1,17 @@
 """Jobs relacionados a notificações."""
 
+import logging
+
 from flask import current_app
 from conecta_senai.services.notificacao_service import criar_notificacoes_agendamentos_proximos
 
+log = logging.getLogger(__name__)
+
 
 def _executar_lembretes():
     """Executa geração de lembretes dentro do contexto da aplicação."""
     app = current_app._get_current_object()
     with app.app_context():
-        criar_notificacoes_agendamentos_proximos()
+        criadas = criar_notificacoes_agendamentos_proximos()
+    log.info("Lembretes de agendamentos: %d notificações criadas.", criadas)
+    return criadas
@@ -0,0 +1,170 @@
+"""Eleição do processo que executa o scheduler entre vários workers.
+
+Com vários workers do Gunicorn (ou várias réplicas), apenas o líder executa
+os jobs periódicos. A liderança é uma trava no Redis (``SET NX EX``) renovada
+a cada terço do TTL; se o líder morre, outro worker assume quando a trava
+expira. Sem Redis, a trava é um ``flock`` em arquivo, o que cobre os workers
+de uma mesma máquina.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import tempfile
+import threading
+import uuid
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+from conecta_senai.config import redis as config_redis
+
+logger = logging.getLogger(__name__)
+
+CHAVE_LIDER = "scheduler:lider"
+LIDER_TTL = int(os.getenv("SCHEDULER_LIDER_TTL", "30"))
+
+SCRIPT_RENOVAR = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+SCRIPT_LIBERAR = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class TravaRedis:
+    """Trava com dono e expiração em uma chave do Redis."""
+
+    def __init__(self, cliente, chave: str, identificador: str, ttl: int) -> None:
+        self.cliente = cliente
+        self.chave = chave
+        self.identificador = identificador
+        self.ttl = ttl
+
+    def adquirir(self) -> bool:
+        return bool(self.cliente.set(self.chave, self.identificador, nx=True, ex=self.ttl))
+
+    def renovar(self) -> bool:
+        return bool(self.cliente.eval(SCRIPT_RENOVAR, 1, self.chave, self.identificador, self.ttl))
+
+    def liberar(self) -> None:
+        self.cliente.eval(SCRIPT_LIBERAR, 1, self.chave, self.identificador)
+
+
+class TravaArquivo:
+    """Trava exclusiva (``flock``) mantida enquanto o arquivo estiver aberto."""
+
+    def __init__(self, caminho: str) -> None:
+        self.caminho = caminho
+        self._arquivo = None
+
+    def adquirir(self) -> bool:
+        if fcntl is None:
+            return True
+        arquivo = open(self.caminho, "a+")
+        try:
+            fcntl.flock(arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            arquivo.close()
+            return False
+        self._arquivo = arquivo
+        return True
+
+    def renovar(self) -> bool:
+        return fcntl is None or self._arquivo is not None
+
+    def liberar(self) -> None:
+        arquivo, self._arquivo = self._arquivo, None
+        if arquivo is not None:
+            fcntl.flock(arquivo, fcntl.LOCK_UN)
+            arquivo.close()
+
+
+def criar_trava(ttl: int = LIDER_TTL):
+    """Trava no Redis configurado ou, sem ele, em arquivo local."""
+    cliente = config_redis.redis_conn
+    if not isinstance(cliente, config_redis.DummyRedis):
+        identificador = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        return TravaRedis(cliente, CHAVE_LIDER, identificador, ttl)
+    caminho = os.getenv(
+        "SCHEDULER_LOCK_FILE",
+        os.path.join(tempfile.gettempdir(), "conecta_senai_scheduler.lock"),
+    )
+    return TravaArquivo(caminho)
+
+
+class LiderancaScheduler:
+    """Disputa a liderança periodicamente e liga/desliga o scheduler."""
+
+    def __init__(
+        self,
+        trava,
+        ao_assumir: Callable[[], object],
+        ao_perder: Callable[[], object],
+        intervalo: float = LIDER_TTL / 3,
+    ) -> None:
+        self.trava = trava
+        self.ao_assumir = ao_assumir
+        self.ao_perder = ao_perder
+        self.intervalo = intervalo
+        self.lider = False
+        self._parar = threading.Event()
+        self._thread = None
+
+    def verificar(self) -> bool:
+        """Renova ou tenta obter a liderança; devolve se este processo é o líder."""
+        try:
+            if self.lider:
+                if not self.trava.renovar():
+                    logger.warning("Liderança do scheduler perdida (pid %s).", os.getpid())
+                    self.lider = False
+                    self.ao_perder()
+            elif self.trava.adquirir():
+                logger.info("Processo %s assumiu o scheduler.", os.getpid())
+                self.lider = True
+                self.ao_assumir()
+        except Exception as exc:
+            logger.warning("Falha na eleição do scheduler: %s", exc)
+        return self.lider
+
+    def iniciar(self) -> None:
+        self.verificar()
+        self._thread = threading.Thread(
+            target=self._executar, name="lideranca-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def encerrar(self) -> None:
+        self._parar.set()
+        if self.lider:
+            self.lider = False
+            self.ao_perder()
+            try:
+                self.trava.liberar()
+            except Exception as exc:  # pragma: no cover - encerramento best effort
+                logger.debug("Falha ao liberar a liderança: %s", exc)
+
+    def _executar(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            self.verificar()
+
+
+__all__ = [
+    "SCRIPT_LIBERAR",
+    "SCRIPT_RENOVAR",
+    "LiderancaScheduler",
+    "TravaArquivo",
+    "TravaRedis",
+    "criar_trava",
+]
@@ -3,11 +3,16 @@
 """Background scheduler setup."""
 
 import os
+from datetime import datetime, timedelta
+
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.schedulers.base import STATE_RUNNING
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING
 
+from conecta_senai.tasks.execucao import executar_job
+from conecta_senai.tasks.lideranca import LiderancaScheduler, criar_trava
 
 scheduler = BackgroundScheduler()
+JOB_DESPACHO_EMAILS = "despachar_emails"
 
 
 def start_scheduler(app):
@@ -18,7 +23,7 @@ def start_scheduler(app):
         from conecta_senai.tasks.jobs.notificacoes import _executar_lembretes
 
         with app.app_context():
-            _executar_lembretes()
+            executar_job("lembretes_notificacoes", _executar_lembretes)
 
     scheduler.add_job(
         job,
@@ -35,7 +40,12 @@ def start_scheduler(app):
         from conecta_senai.tasks.jobs.convocacao_automatica import convocacao_automatica_job
 
         with app.app_context():
-            convocacao_automatica_job()
+            executar_job(
+                "convocacao_automatica",
+                convocacao_automatica_job,
+                duracao_lease=timedelta(minutes=50),
+                linhas=lambda resultado: resultado["enfileiradas"],
+            )
 
     scheduler.add_job(
         convocacao_job,
@@ -52,7 +62,11 @@ def start_scheduler(app):
         from conecta_senai.tasks.jobs.noticias import publicar_noticias_agendadas
 
         with app.app_context():
-            publicar_noticias_agendadas()
+            executar_job(
+                "publicar_noticias_agendadas",
+                publicar_noticias_agendadas,
+                duracao_lease=timedelta(minutes=4),
+            )
 
     scheduler.add_job(
         publicacao_noticias_job,
@@ -65,11 +79,30 @@ def start_scheduler(app):
         misfire_grace_time=60,
     )
 
+    def despacho_emails_job():
+        from conecta_senai.tasks.jobs.emails import despachar_emails
+
+        with app.app_context():
+            executar_job(
+                JOB_DESPACHO_EMAILS, despachar_emails, duracao_lease=timedelta(minutes=5)
+            )
+
+    scheduler.add_job(
+        despacho_emails_job,
+        "interval",
+        seconds=int(os.getenv("EMAIL_OUTBOX_INTERVALO_SEGUNDOS", "30")),
+        id=JOB_DESPACHO_EMAILS,
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
+    )
+
     def limpeza_destaques_job():
         from conecta_senai.tasks.jobs.noticias import remover_destaques_expirados
 
         with app.app_context():
-            remover_destaques_expirados()
+            executar_job("remover_destaques_expirados", remover_destaques_expirados)
 
     scheduler.add_job(
         limpeza_destaques_job,
@@ -83,7 +116,13 @@ def start_scheduler(app):
         misfire_grace_time=3600,
     )
 
-    if scheduler.state != STATE_RUNNING:
+    if scheduler.state == STATE_PAUSED:
+        scheduler.resume()
+        app.logger.info(
+            "Scheduler de tarefas retomado com %d jobs agendados.",
+            len(scheduler.get_jobs()),
+        )
+    elif scheduler.state != STATE_RUNNING:
         scheduler.start()
         app.logger.info(
             "Scheduler de tarefas iniciado com %d jobs agendados.",
@@ -94,3 +133,45 @@ def start_scheduler(app):
 
     app.extensions.setdefault("apscheduler", scheduler)
     return scheduler
+
+
+def parar_scheduler() -> None:
+    """Suspende o scheduler sem aguardar jobs em andamento.
+
+    Usa ``pause()`` em vez de ``shutdown()``: um ``BackgroundScheduler``
+    encerrado não pode ser iniciado de novo, e o processo pode voltar a ser
+    líder mais tarde (:func:`start_scheduler` o retoma).
+    """
+
+    if scheduler.state == STATE_RUNNING:
+        scheduler.pause()
+
+
+def iniciar_scheduler_com_lideranca(app):
+    """Disputa a liderança e executa o scheduler apenas no processo eleito.
+
+    Cada processo chama esta função (no ``post_fork`` do Gunicorn ou ao criar
+    o app); os demais ficam de prontidão para assumir se o líder cair.
+    """
+
+    anterior = app.extensions.get("scheduler_lideranca")
+    if anterior is not None:
+        anterior.encerrar()
+    lideranca = LiderancaScheduler(
+        criar_trava(),
+        ao_assumir=lambda: start_scheduler(app),
+        ao_perder=parar_scheduler,
+    )
+    app.extensions["scheduler_lideranca"] = lideranca
+    lideranca.iniciar()
+    return lideranca
+
+
+def acordar_despacho_emails() -> None:
+    """Antecipa a próxima execução do despacho de e-mails para agora."""
+
+    if scheduler.state != STATE_RUNNING:
+        return
+    job = scheduler.get_job(JOB_DESPACHO_EMAILS)
+    if job is not None:
+        job.modify(next_run_time=datetime.now(scheduler.timezone))
@@ -1,5 +1,5 @@
 """Funções utilitárias compartilhadas pela aplicação."""
-from .audit import log_action
+from .audit import log_action, log_actions
 from .error_handler import handle_internal_error
 from .paths import ensure_path_is_safe
 from .tokens import confirm_reset_token, generate_reset_token
@@ -10,4 +10,5 @@ __all__ = [
     "generate_reset_token",
     "handle_internal_error",
     "log_action",
+    "log_actions",
 ]
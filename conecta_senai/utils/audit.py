@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable, Tuple
+
+from sqlalchemy import insert
+
 from conecta_senai.models import db
 from conecta_senai.models.audit_log import AuditLog
 
@@ -21,3 +24,33 @@ def log_action(user_id: int | None, action: str, entity: str, entity_id: int, de
         db.session.commit()
     except Exception:
         db.session.rollback()
+
+
+def log_actions(
+    user_id: int | None,
+    action: str,
+    entity: str,
+    registros: Iterable[Tuple[int, dict | None]],
+) -> None:
+    """Grava vários registros de auditoria em uma única instrução.
+
+    Equivalente a chamar :func:`log_action` para cada par ``(entity_id,
+    details)``, mas com um ``INSERT`` em lote e um único commit.
+    """
+    linhas: list[dict[str, Any]] = [
+        {
+            "user_id": user_id,
+            "action": action,
+            "entity": entity,
+            "entity_id": entity_id,
+            "details": details or {},
+        }
+        for entity_id, details in registros
+    ]
+    if not linhas:
+        return
+    try:
+        db.session.execute(insert(AuditLog), linhas)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
@@ -0,0 +1,72 @@
+"""Cache em memória com expiração e limite de entradas, local ao processo."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class CacheTTL:
+    """Mapa LRU com tempo de vida por entrada e tamanho máximo.
+
+    Cada worker mantém a sua cópia; use apenas para dados que podem ficar
+    defasados por até ``ttl`` segundos ou que sejam invalidados explicitamente.
+    Com ``ttl`` ou ``max_entradas`` iguais a zero o cache fica desativado.
+    """
+
+    def __init__(
+        self,
+        max_entradas: int,
+        ttl: float,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._relogio = relogio
+        self._dados: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.ttl > 0 and self.max_entradas > 0
+
+    def get(self, chave: Hashable, padrao: Any = None) -> Any:
+        with self._lock:
+            entrada = self._dados.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return padrao
+            expira_em, valor = entrada
+            if expira_em <= self._relogio():
+                del self._dados[chave]
+                self.falhas += 1
+                return padrao
+            self._dados.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def set(self, chave: Hashable, valor: Any, ttl: Optional[float] = None) -> None:
+        if not self.ativo:
+            return
+        duracao = self.ttl if ttl is None else min(ttl, self.ttl)
+        if duracao <= 0:
+            return
+        with self._lock:
+            self._dados[chave] = (self._relogio() + duracao, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.max_entradas:
+                self._dados.popitem(last=False)
+
+    def pop(self, chave: Hashable) -> None:
+        with self._lock:
+            self._dados.pop(chave, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dados.clear()
+
+    def __len__(self) -> int:
+        return len(self._dados)
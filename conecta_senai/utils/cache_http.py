@@ -0,0 +1,261 @@
+"""Cache de respostas JSON com validação por ``ETag``.
+
+Pensado para os calendários e dashboards consultados repetidamente pelo
+frontend. A chave de cada resposta combina o endpoint, os argumentos da rota
+e da query string normalizados, o escopo do usuário e a data corrente; o
+``ETag`` soma a isso a versão de cada tabela da qual a resposta depende.
+
+As versões são contadores por tabela incrementados no ``commit`` de qualquer
+sessão que tenha gravado nelas (inclusive ``INSERT``/``UPDATE``/``DELETE`` em
+lote). Assim o ``ETag`` é calculado sem executar a rota: ``If-None-Match``
+igual responde ``304`` direto e, caso contrário, o corpo já renderizado é
+procurado no Redis (ou, sem Redis, em um LRU local ao processo) antes de a
+rota ser executada.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+from datetime import date
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from flask import current_app, has_app_context, make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from conecta_senai.auth.decorators import verificar_admin, verificar_autenticacao
+from conecta_senai.config import redis as config_redis
+from conecta_senai.utils.cache import CacheTTL
+
+logger = logging.getLogger(__name__)
+
+CACHE_HTTP_TTL = float(os.getenv("CACHE_HTTP_TTL", "300"))
+CACHE_HTTP_MAX = int(os.getenv("CACHE_HTTP_MAX", "256"))
+# Sem Redis, gravações feitas por outro worker não chegam às versões locais;
+# a janela limita por quanto tempo um ETag local pode continuar valendo.
+CACHE_HTTP_JANELA_LOCAL = float(os.getenv("CACHE_HTTP_JANELA_LOCAL", "30"))
+_PREFIXO = "cache_http"
+_CHAVE_EXTENSAO = "cache_http"
+_CHAVE_SESSAO = "cache_http_tabelas"
+
+# Tabelas das quais alguma resposta em cache depende; gravações nas demais
+# não incrementam versão.
+TABELAS_MONITORADAS: Set[str] = set()
+
+
+class CacheHTTP:
+    """Versões por tabela, corpos renderizados e métricas de um app.
+
+    Com ``cliente`` Redis as versões e os corpos são compartilhados entre os
+    workers; sem ele ficam no processo e os ``ETag`` também mudam a cada
+    ``janela_local`` segundos (zero desativa a janela).
+    """
+
+    def __init__(self, cliente=None, ttl: float = CACHE_HTTP_TTL,
+                 max_entradas: int = CACHE_HTTP_MAX,
+                 janela_local: float = CACHE_HTTP_JANELA_LOCAL) -> None:
+        self.cliente = cliente
+        self.ttl = ttl
+        self.janela_local = janela_local
+        self._versoes: Dict[str, int] = {}
+        self._corpos = CacheTTL(max_entradas, ttl)
+        self.acertos = 0
+        self.falhas = 0
+        self.nao_modificados = 0
+
+    def versoes(self, tabelas: Iterable[str]) -> list:
+        tabelas = list(tabelas)
+        if self.cliente is not None:
+            try:
+                valores = self.cliente.mget([f"{_PREFIXO}:versao:{t}" for t in tabelas])
+                return [int(v or 0) for v in valores]
+            except Exception as exc:
+                logger.warning("Falha ao ler versões do cache HTTP: %s", exc)
+        return [self._versoes.get(t, 0) for t in tabelas]
+
+    def incrementar(self, tabelas: Iterable[str]) -> None:
+        tabelas = list(tabelas)
+        for tabela in tabelas:
+            self._versoes[tabela] = self._versoes.get(tabela, 0) + 1
+        if self.cliente is not None:
+            try:
+                pipe = self.cliente.pipeline(transaction=False)
+                for tabela in tabelas:
+                    pipe.incr(f"{_PREFIXO}:versao:{tabela}")
+                pipe.execute()
+            except Exception as exc:
+                logger.warning("Falha ao incrementar versões do cache HTTP: %s", exc)
+
+    def etag(self, chave: str, tabelas: Iterable[str]) -> str:
+        tabelas = sorted(tabelas)
+        versoes = ",".join(f"{t}={v}" for t, v in zip(tabelas, self.versoes(tabelas)))
+        if self.cliente is None and self.janela_local > 0:
+            versoes += f",janela={int(time.time() // self.janela_local)}"
+        return hashlib.sha1(f"{chave}|{versoes}".encode()).hexdigest()
+
+    def obter(self, etag: str) -> Optional[bytes]:
+        if self.cliente is not None:
+            try:
+                corpo = self.cliente.get(f"{_PREFIXO}:corpo:{etag}")
+                if corpo is not None:
+                    return corpo
+            except Exception as exc:
+                logger.warning("Falha ao ler o cache HTTP: %s", exc)
+        return self._corpos.get(etag)
+
+    def guardar(self, etag: str, corpo: bytes) -> None:
+        if self.cliente is not None:
+            try:
+                self.cliente.setex(f"{_PREFIXO}:corpo:{etag}", int(self.ttl), corpo)
+                return
+            except Exception as exc:
+                logger.warning("Falha ao gravar no cache HTTP: %s", exc)
+        self._corpos.set(etag, corpo)
+
+    def metricas(self) -> dict:
+        consultas = self.acertos + self.falhas
+        return {
+            "backend": "local" if self.cliente is None else "redis",
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "nao_modificados": self.nao_modificados,
+            "taxa_acerto": round(self.acertos / consultas, 4) if consultas else None,
+            "entradas_locais": len(self._corpos),
+        }
+
+
+def obter_cache_http(app=None) -> CacheHTTP:
+    """Instância de :class:`CacheHTTP` do app, criada no primeiro uso."""
+    app = app or current_app
+    cache = app.extensions.get(_CHAVE_EXTENSAO)
+    if cache is None:
+        cliente = config_redis.redis_conn
+        if isinstance(cliente, config_redis.DummyRedis):
+            cliente = None
+        cache = app.extensions[_CHAVE_EXTENSAO] = CacheHTTP(cliente)
+    return cache
+
+
+def _chave(endpoint: str, view_args: dict, escopo: str) -> str:
+    argumentos = sorted(
+        (nome, valor) for nome, valores in request.args.lists() for valor in valores
+    )
+    rota = sorted(view_args.items())
+    return f"{endpoint}|{rota}|{argumentos}|{escopo}|{date.today().isoformat()}"
+
+
+def responder_com_cache(
+    cache: CacheHTTP, etag: str, gerar: Callable[[], Any], cache_control: str
+):
+    """Responde ``304``, o corpo guardado sob ``etag`` ou o de ``gerar()``.
+
+    ``gerar`` só é chamado quando não há corpo guardado; só respostas 200
+    (fora de ``direct_passthrough``) são guardadas e recebem o ``ETag``.
+    """
+    if etag in request.if_none_match:
+        cache.nao_modificados += 1
+        resposta = current_app.response_class(status=304)
+    else:
+        corpo = cache.obter(etag)
+        if corpo is not None:
+            cache.acertos += 1
+            resposta = current_app.response_class(corpo, mimetype="application/json")
+        else:
+            cache.falhas += 1
+            resposta = make_response(gerar())
+            if resposta.status_code != 200 or resposta.direct_passthrough:
+                return resposta
+            cache.guardar(etag, resposta.get_data())
+    resposta.set_etag(etag)
+    resposta.headers["Cache-Control"] = cache_control
+    return resposta
+
+
+def cache_http(*tabelas: str, por_usuario: bool = False):
+    """Guarda a resposta JSON da rota até uma gravação em ``tabelas``.
+
+    Usuários não autenticados seguem direto para a rota (que responde 401).
+    O escopo separa administradores dos demais usuários; com ``por_usuario``
+    cada usuário tem a sua entrada, para rotas que filtram pelo solicitante.
+    Só respostas 200 são guardadas.
+    """
+    TABELAS_MONITORADAS.update(tabelas)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if CACHE_HTTP_TTL <= 0:
+                return view(*args, **kwargs)
+            autenticado, user = verificar_autenticacao(request)
+            if not autenticado:
+                return view(*args, **kwargs)
+
+            if por_usuario:
+                escopo = f"u{user.id}"
+            else:
+                escopo = "admin" if verificar_admin(user) else "usuario"
+            cache = obter_cache_http()
+            etag = cache.etag(_chave(request.endpoint, kwargs, escopo), tabelas)
+            return responder_com_cache(
+                cache, etag, lambda: view(*args, **kwargs), "private, no-cache"
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def _registrar_tabelas(session, tabelas) -> None:
+    tabelas = set(tabelas) & TABELAS_MONITORADAS
+    if tabelas:
+        session.info.setdefault(_CHAVE_SESSAO, set()).update(tabelas)
+
+
+@event.listens_for(Session, "after_flush")
+def _ao_gravar(session, flush_context):
+    _registrar_tabelas(
+        session,
+        (
+            getattr(obj, "__tablename__", None)
+            for obj in (*session.new, *session.dirty, *session.deleted)
+        ),
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _ao_executar_em_lote(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        _registrar_tabelas(
+            orm_execute_state.session, (mapper.persist_selectable.name,)
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _ao_confirmar(session):
+    tabelas = session.info.pop(_CHAVE_SESSAO, None)
+    if not tabelas:
+        return
+    if has_app_context():
+        obter_cache_http().incrementar(tabelas)
+    elif not isinstance(config_redis.redis_conn, config_redis.DummyRedis):
+        CacheHTTP(config_redis.redis_conn).incrementar(tabelas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _ao_desfazer(session):
+    session.info.pop(_CHAVE_SESSAO, None)
+
+
+__all__ = [
+    "CacheHTTP",
+    "TABELAS_MONITORADAS",
+    "cache_http",
+    "obter_cache_http",
+    "responder_com_cache",
+]
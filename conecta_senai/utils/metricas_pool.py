@@ -0,0 +1,160 @@
+"""Métricas do pool de conexões do SQLAlchemy.
+
+O tempo de espera por uma conexão é medido por :class:`PoolMedido`, um
+``QueuePool`` que cronometra o ``connect()`` até o evento ``checkout``; os
+demais números (conexões em uso, pico, conexões de *overflow*, invalidações e
+esgotamentos do ``pool_timeout``) vêm dos eventos do pool. Os valores são por
+processo: com vários workers do Gunicorn cada um tem o seu pool.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+_CHAVE_EXTENSAO = "metricas_pool"
+# Quantidade de esperas mais recentes usadas no cálculo dos percentis.
+AMOSTRAS_ESPERA = 1000
+
+_inicio_checkout = threading.local()
+
+
+class PoolMedido(QueuePool):
+    """``QueuePool`` que marca o início de cada ``connect()``.
+
+    A marca é lida pelo ouvinte de ``checkout`` de :class:`MetricasPool`; a
+    classe sobrevive ao ``dispose()``, que recria o pool com a mesma classe.
+    """
+
+    timeouts = 0
+
+    def connect(self):
+        _inicio_checkout.valor = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            type(self).timeouts += 1
+            raise
+        finally:
+            _inicio_checkout.valor = None
+
+
+class MetricasPool:
+    """Contadores de um engine alimentados pelos eventos do pool."""
+
+    def __init__(self, amostras: int = AMOSTRAS_ESPERA) -> None:
+        self._lock = threading.Lock()
+        self._esperas: Deque[float] = deque(maxlen=amostras)
+        self.engine = None
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._esperas.clear()
+            self.checkouts = 0
+            self.em_uso = 0
+            self.pico_em_uso = 0
+            self.conexoes_criadas = 0
+            self.conexoes_overflow = 0
+            self.invalidadas = 0
+            self.espera_total_ms = 0.0
+            self.timeouts_base = PoolMedido.timeouts
+
+    def instrumentar(self, engine) -> None:
+        """Registra os ouvintes no pool do ``engine`` (mantidos após ``dispose``)."""
+
+        self.engine = engine
+        event.listen(engine, "connect", self._ao_conectar)
+        event.listen(engine, "checkout", self._ao_retirar)
+        event.listen(engine, "checkin", self._ao_devolver)
+        event.listen(engine, "invalidate", self._ao_invalidar)
+
+    def _ao_conectar(self, dbapi_connection, connection_record) -> None:
+        overflow = getattr(self.engine.pool, "overflow", None)
+        with self._lock:
+            self.conexoes_criadas += 1
+            if overflow is not None and overflow() > 0:
+                self.conexoes_overflow += 1
+
+    def _ao_retirar(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        inicio = getattr(_inicio_checkout, "valor", None)
+        with self._lock:
+            self.checkouts += 1
+            self.em_uso += 1
+            self.pico_em_uso = max(self.pico_em_uso, self.em_uso)
+            if inicio is not None:
+                espera_ms = (time.perf_counter() - inicio) * 1000
+                self._esperas.append(espera_ms)
+                self.espera_total_ms += espera_ms
+
+    def _ao_devolver(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.em_uso = max(0, self.em_uso - 1)
+
+    def _ao_invalidar(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidadas += 1
+
+    def _percentil(self, ordenadas: list, fracao: float) -> Optional[float]:
+        if not ordenadas:
+            return None
+        return round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * fracao))], 3)
+
+    def resumo(self) -> dict:
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            esperas = sorted(self._esperas)
+            medidas = len(esperas)
+            dados = {
+                "pool": type(pool).__name__ if pool is not None else None,
+                "tamanho": pool.size() if hasattr(pool, "size") else None,
+                "max_overflow": getattr(pool, "_max_overflow", None),
+                "em_uso": self.em_uso,
+                "pico_em_uso": self.pico_em_uso,
+                "ociosas": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                "overflow_atual": max(0, pool.overflow()) if hasattr(pool, "overflow") else None,
+                "checkouts": self.checkouts,
+                "conexoes_criadas": self.conexoes_criadas,
+                "conexoes_overflow": self.conexoes_overflow,
+                "invalidadas": self.invalidadas,
+                "timeouts": PoolMedido.timeouts - self.timeouts_base,
+                "espera_ms": {
+                    "amostras": medidas,
+                    "media": round(sum(esperas) / medidas, 3) if medidas else None,
+                    "p50": self._percentil(esperas, 0.50),
+                    "p95": self._percentil(esperas, 0.95),
+                    "p99": self._percentil(esperas, 0.99),
+                    "max": round(esperas[-1], 3) if esperas else None,
+                },
+            }
+        return dados
+
+
+def instrumentar_pool(app, engine) -> MetricasPool:
+    """Cria as métricas do ``engine`` e as guarda em ``app.extensions``."""
+
+    metricas = MetricasPool()
+    metricas.instrumentar(engine)
+    app.extensions[_CHAVE_EXTENSAO] = metricas
+    return metricas
+
+
+def obter_metricas_pool(app=None) -> Optional[MetricasPool]:
+    """Métricas do pool do app, se o engine foi instrumentado."""
+
+    app = app or current_app
+    return app.extensions.get(_CHAVE_EXTENSAO)
+
+
+__all__ = [
+    "MetricasPool",
+    "PoolMedido",
+    "instrumentar_pool",
+    "obter_metricas_pool",
+]
@@ -1,10 +1,19 @@
+import multiprocessing
 import os
 from gunicorn import glogging
 from conecta_senai.logging_conf import LOGGING_CONFIG
 
+# Perfil "producao" (padrão com FLASK_ENV=production): app pré-carregado no
+# mestre e um worker por núcleo; o perfil "padrao" mantém um único worker.
+PERFIL = os.getenv(
+    "GUNICORN_PERFIL",
+    "producao" if os.getenv("FLASK_ENV") == "production" else "padrao",
+)
+PRODUCAO = PERFIL == "producao"
+
 wsgi_app = "conecta_senai.main:create_app()"
 bind = "0.0.0.0:8080"
-workers = 1
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1 if PRODUCAO else 1))
 threads = int(os.getenv("GTHREADS", "1"))
 worker_class = os.getenv("WORKER_CLASS", "sync")
 timeout = 30
@@ -12,7 +21,25 @@ loglevel = "debug"
 keepalive = 2
 max_requests = 600
 max_requests_jitter = 60
-preload_app = False
+preload_app = os.getenv("GUNICORN_PRELOAD", "1" if PRODUCAO else "0") == "1"
+
+if preload_app:
+    # O scheduler é eleito nos workers, não no mestre que carrega o app.
+    os.environ["SCHEDULER_APOS_FORK"] = "1"
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from conecta_senai.runtime import reinicializar_apos_fork
+
+        reinicializar_apos_fork(server.app.wsgi())
+
+
+def worker_exit(server, worker):
+    if preload_app:
+        lideranca = server.app.wsgi().extensions.get("scheduler_lideranca")
+        if lideranca is not None:
+            lideranca.encerrar()
 
 
 class RequestIDLogger(glogging.Logger):
@@ -0,0 +1,45 @@
+"""create email_outbox table
+
+Revision ID: 3a9d5e7c1b20
+Revises: 892341234567
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a9d5e7c1b20'
+down_revision = '892341234567'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('destinatarios', sa.JSON(), nullable=False),
+        sa.Column('assunto', sa.String(length=255), nullable=False),
+        sa.Column('html', sa.Text(), nullable=False),
+        sa.Column('parametros', sa.JSON(), nullable=True),
+        sa.Column('referencia_tipo', sa.String(length=50), nullable=True),
+        sa.Column('referencia_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('tentativas', sa.Integer(), nullable=False),
+        sa.Column('proxima_tentativa_em', sa.DateTime(), nullable=False),
+        sa.Column('ultimo_erro', sa.Text(), nullable=True),
+        sa.Column('provedor_id', sa.String(length=100), nullable=True),
+        sa.Column('criado_em', sa.DateTime(), nullable=True),
+        sa.Column('enviado_em', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_email_outbox_job_id', 'email_outbox', ['job_id'])
+    op.create_index('ix_email_outbox_status', 'email_outbox', ['status'])
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_status', table_name='email_outbox')
+    op.drop_index('ix_email_outbox_job_id', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,82 @@
+"""create suporte_indicadores_diarios rollup
+
+Revision ID: 5c2e8a4f9d31
+Revises: 3a9d5e7c1b20
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8a4f9d31'
+down_revision = '3a9d5e7c1b20'
+branch_labels = None
+depends_on = None
+
+
+def _duracao(coluna, dialeto):
+    if dialeto == 'sqlite':
+        return f"ROUND((julianday({coluna}) - julianday(created_at)) * 86400.0, 3)"
+    if dialeto == 'postgresql':
+        return f"EXTRACT(EPOCH FROM ({coluna} - created_at))"
+    return f"(EXTRACT(EPOCH FROM {coluna}) - EXTRACT(EPOCH FROM created_at))"
+
+
+def upgrade():
+    op.create_table(
+        'suporte_indicadores_diarios',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('area', sa.String(length=120), nullable=True),
+        sa.Column('tipo_equipamento_id', sa.Integer(), nullable=True),
+        sa.Column('nivel_urgencia', sa.String(length=20), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('quantidade', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atendidos', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('soma_atendimento_segundos', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('encerrados', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('soma_encerramento_segundos', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('atendidos_24h', sa.Integer(), nullable=False, server_default='0'),
+        sa.UniqueConstraint(
+            'dia',
+            'area',
+            'tipo_equipamento_id',
+            'nivel_urgencia',
+            'status',
+            name='uq_suporte_indicadores_diarios_chave',
+        ),
+    )
+    op.create_index(
+        'ix_suporte_indicadores_diarios_dia', 'suporte_indicadores_diarios', ['dia']
+    )
+
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('suporte_chamados'):
+        return
+    atendimento = _duracao('inicio_atendimento_at', bind.dialect.name)
+    encerramento = _duracao('encerrado_at', bind.dialect.name)
+    op.execute(
+        f"""
+        INSERT INTO suporte_indicadores_diarios (
+            dia, area, tipo_equipamento_id, nivel_urgencia, status,
+            quantidade, atendidos, soma_atendimento_segundos,
+            encerrados, soma_encerramento_segundos, atendidos_24h
+        )
+        SELECT
+            DATE(created_at), area, tipo_equipamento_id, nivel_urgencia, status,
+            COUNT(id), COUNT(inicio_atendimento_at), COALESCE(SUM({atendimento}), 0),
+            COUNT(encerrado_at), COALESCE(SUM({encerramento}), 0),
+            SUM(CASE WHEN {atendimento} < 86400 THEN 1 ELSE 0 END)
+        FROM suporte_chamados
+        GROUP BY DATE(created_at), area, tipo_equipamento_id, nivel_urgencia, status
+        """
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_suporte_indicadores_diarios_dia', table_name='suporte_indicadores_diarios'
+    )
+    op.drop_table('suporte_indicadores_diarios')
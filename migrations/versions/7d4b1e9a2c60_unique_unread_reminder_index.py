@@ -0,0 +1,45 @@
+"""unique partial index for unread agendamento reminders
+
+Revision ID: 7d4b1e9a2c60
+Revises: 5c2e8a4f9d31
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d4b1e9a2c60'
+down_revision = '5c2e8a4f9d31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Mantém apenas o lembrete não lido mais antigo de cada agendamento antes
+    # de criar o índice.
+    op.execute(
+        """
+        DELETE FROM notificacoes
+        WHERE agendamento_id IS NOT NULL
+          AND lida = false
+          AND id NOT IN (
+              SELECT MIN(id) FROM notificacoes
+              WHERE agendamento_id IS NOT NULL AND lida = false
+              GROUP BY agendamento_id
+          )
+        """
+    )
+    op.create_index(
+        'uq_notificacoes_agendamento_nao_lida',
+        'notificacoes',
+        ['agendamento_id'],
+        unique=True,
+        postgresql_where=sa.text('lida = false'),
+        sqlite_where=sa.text('lida = 0'),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_notificacoes_agendamento_nao_lida', table_name='notificacoes')
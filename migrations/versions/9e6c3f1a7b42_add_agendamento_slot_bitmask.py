@@ -0,0 +1,86 @@
+"""add mascara_horarios bitmask to agendamentos
+
+Revision ID: 9e6c3f1a7b42
+Revises: 7d4b1e9a2c60
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e6c3f1a7b42'
+down_revision = '7d4b1e9a2c60'
+branch_labels = None
+depends_on = None
+
+# Cópia congelada da grade de ``models.agendamento`` no momento da migração.
+HORARIOS = [
+    "08:00 - 08:45", "08:45 - 09:30", "09:30 - 10:15", "10:30 - 11:15", "11:15 - 12:00",
+    "13:30 - 14:15", "14:15 - 15:00", "15:00 - 15:45", "16:00 - 16:45", "16:45 - 17:30",
+    "18:30 - 19:15", "19:15 - 20:00", "20:00 - 20:45", "21:00 - 21:45", "21:45 - 22:30",
+]
+BIT_POR_HORARIO = {horario: 1 << i for i, horario in enumerate(HORARIOS)}
+BIT_HORARIO_AVULSO = 1 << 30
+LOTE = 1000
+
+
+def _mascara(horarios):
+    if isinstance(horarios, str):
+        try:
+            horarios = json.loads(horarios)
+        except json.JSONDecodeError:
+            return 0
+    if not isinstance(horarios, list):
+        return 0
+    mascara = 0
+    for horario in horarios:
+        mascara |= BIT_POR_HORARIO.get(horario, BIT_HORARIO_AVULSO)
+    return mascara
+
+
+def upgrade():
+    with op.batch_alter_table('agendamentos') as batch_op:
+        batch_op.add_column(
+            sa.Column('mascara_horarios', sa.Integer(), nullable=False, server_default='0')
+        )
+
+    agendamentos = sa.table(
+        'agendamentos',
+        sa.column('id', sa.Integer()),
+        sa.column('horarios', sa.JSON()),
+        sa.column('mascara_horarios', sa.Integer()),
+    )
+    conn = op.get_bind()
+    ultimo_id = 0
+    while True:
+        linhas = conn.execute(
+            sa.select(agendamentos.c.id, agendamentos.c.horarios)
+            .where(agendamentos.c.id > ultimo_id)
+            .order_by(agendamentos.c.id)
+            .limit(LOTE)
+        ).all()
+        if not linhas:
+            break
+        conn.execute(
+            agendamentos.update()
+            .where(agendamentos.c.id == sa.bindparam('b_id'))
+            .values(mascara_horarios=sa.bindparam('b_mascara')),
+            [{'b_id': id_, 'b_mascara': _mascara(horarios)} for id_, horarios in linhas],
+        )
+        ultimo_id = linhas[-1][0]
+
+    op.create_index(
+        'ix_agendamentos_laboratorio_data_turno',
+        'agendamentos',
+        ['laboratorio', 'data', 'turno', 'mascara_horarios'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_agendamentos_laboratorio_data_turno', table_name='agendamentos')
+    with op.batch_alter_table('agendamentos') as batch_op:
+        batch_op.drop_column('mascara_horarios')
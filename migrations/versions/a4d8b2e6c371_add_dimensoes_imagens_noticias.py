@@ -0,0 +1,26 @@
+"""add largura/altura to imagens_noticias for responsive variants
+
+Revision ID: a4d8b2e6c371
+Revises: f3a7c1d9e254
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d8b2e6c371'
+down_revision = 'f3a7c1d9e254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('imagens_noticias', sa.Column('largura', sa.Integer(), nullable=True))
+    op.add_column('imagens_noticias', sa.Column('altura', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('imagens_noticias', 'altura')
+    op.drop_column('imagens_noticias', 'largura')
@@ -0,0 +1,89 @@
+"""precomputed intervalo_horarios and keyset index for logs_agendamentos
+
+Revision ID: b3f8d2c6e914
+Revises: 9e6c3f1a7b42
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f8d2c6e914'
+down_revision = '9e6c3f1a7b42'
+branch_labels = None
+depends_on = None
+
+LOTE = 1000
+
+
+def _carregar(valor):
+    if isinstance(valor, str):
+        try:
+            return json.loads(valor)
+        except json.JSONDecodeError:
+            return None
+    return valor
+
+
+def _intervalo(antes, depois):
+    horarios = (_carregar(depois) or {}).get('horarios') or (_carregar(antes) or {}).get('horarios')
+    horarios = _carregar(horarios)
+    try:
+        if not horarios:
+            return None
+        return f"{horarios[0].split(' - ')[0]} - {horarios[-1].split(' - ')[1]}"
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return None
+
+
+def upgrade():
+    with op.batch_alter_table('logs_agendamentos') as batch_op:
+        batch_op.add_column(sa.Column('intervalo_horarios', sa.String(length=20), nullable=True))
+
+    logs = sa.table(
+        'logs_agendamentos',
+        sa.column('id', sa.Integer()),
+        sa.column('dados_antes', sa.JSON()),
+        sa.column('dados_depois', sa.JSON()),
+        sa.column('intervalo_horarios', sa.String()),
+    )
+    conn = op.get_bind()
+    ultimo_id = 0
+    while True:
+        linhas = conn.execute(
+            sa.select(logs.c.id, logs.c.dados_antes, logs.c.dados_depois)
+            .where(logs.c.id > ultimo_id)
+            .order_by(logs.c.id)
+            .limit(LOTE)
+        ).all()
+        if not linhas:
+            break
+        valores = [
+            {'b_id': id_, 'b_intervalo': _intervalo(antes, depois)}
+            for id_, antes, depois in linhas
+        ]
+        valores = [v for v in valores if v['b_intervalo']]
+        if valores:
+            conn.execute(
+                logs.update()
+                .where(logs.c.id == sa.bindparam('b_id'))
+                .values(intervalo_horarios=sa.bindparam('b_intervalo')),
+                valores,
+            )
+        ultimo_id = linhas[-1][0]
+
+    op.create_index(
+        'ix_logs_agendamentos_timestamp_id',
+        'logs_agendamentos',
+        ['timestamp', 'id'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_logs_agendamentos_timestamp_id', table_name='logs_agendamentos')
+    with op.batch_alter_table('logs_agendamentos') as batch_op:
+        batch_op.drop_column('intervalo_horarios')
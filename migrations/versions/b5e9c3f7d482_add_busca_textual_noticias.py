@@ -0,0 +1,111 @@
+"""add full-text search index to noticias
+
+Revision ID: b5e9c3f7d482
+Revises: a4d8b2e6c371
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e9c3f7d482'
+down_revision = 'a4d8b2e6c371'
+branch_labels = None
+depends_on = None
+
+
+POSTGRES_UPGRADE = (
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portuguese_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+            ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+        END IF;
+    END
+    $$
+    """,
+    "ALTER TABLE noticias ADD COLUMN IF NOT EXISTS busca_vetor tsvector",
+    """
+    CREATE OR REPLACE FUNCTION noticias_busca_vetor_atualizar() RETURNS trigger AS $$
+    BEGIN
+        NEW.busca_vetor :=
+            setweight(to_tsvector('portuguese_unaccent', coalesce(NEW.titulo, '')), 'A')
+            || setweight(to_tsvector('portuguese_unaccent', coalesce(NEW.resumo, '')), 'B')
+            || setweight(to_tsvector('portuguese_unaccent', coalesce(NEW.conteudo, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_noticias_busca_vetor ON noticias",
+    """
+    CREATE TRIGGER trg_noticias_busca_vetor
+        BEFORE INSERT OR UPDATE OF titulo, resumo, conteudo ON noticias
+        FOR EACH ROW EXECUTE FUNCTION noticias_busca_vetor_atualizar()
+    """,
+    "UPDATE noticias SET titulo = titulo WHERE busca_vetor IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_noticias_busca_vetor ON noticias USING GIN (busca_vetor)",
+)
+
+POSTGRES_DOWNGRADE = (
+    "DROP INDEX IF EXISTS ix_noticias_busca_vetor",
+    "DROP TRIGGER IF EXISTS trg_noticias_busca_vetor ON noticias",
+    "DROP FUNCTION IF EXISTS noticias_busca_vetor_atualizar()",
+    "ALTER TABLE noticias DROP COLUMN IF EXISTS busca_vetor",
+    "DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent",
+)
+
+SQLITE_UPGRADE = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS noticias_fts USING fts5(
+        titulo, resumo, conteudo,
+        content='noticias', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS noticias_fts_ai AFTER INSERT ON noticias BEGIN
+        INSERT INTO noticias_fts(rowid, titulo, resumo, conteudo)
+        VALUES (new.id, new.titulo, new.resumo, new.conteudo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS noticias_fts_ad AFTER DELETE ON noticias BEGIN
+        INSERT INTO noticias_fts(noticias_fts, rowid, titulo, resumo, conteudo)
+        VALUES ('delete', old.id, old.titulo, old.resumo, old.conteudo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS noticias_fts_au AFTER UPDATE OF titulo, resumo, conteudo ON noticias BEGIN
+        INSERT INTO noticias_fts(noticias_fts, rowid, titulo, resumo, conteudo)
+        VALUES ('delete', old.id, old.titulo, old.resumo, old.conteudo);
+        INSERT INTO noticias_fts(rowid, titulo, resumo, conteudo)
+        VALUES (new.id, new.titulo, new.resumo, new.conteudo);
+    END
+    """,
+    "INSERT INTO noticias_fts(noticias_fts) VALUES ('rebuild')",
+)
+
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS noticias_fts_au",
+    "DROP TRIGGER IF EXISTS noticias_fts_ad",
+    "DROP TRIGGER IF EXISTS noticias_fts_ai",
+    "DROP TABLE IF EXISTS noticias_fts",
+)
+
+
+def _executar(instrucoes_por_dialeto):
+    instrucoes = instrucoes_por_dialeto.get(op.get_bind().dialect.name, ())
+    for instrucao in instrucoes:
+        op.execute(instrucao)
+
+
+def upgrade():
+    _executar({'postgresql': POSTGRES_UPGRADE, 'sqlite': SQLITE_UPGRADE})
+
+
+def downgrade():
+    _executar({'postgresql': POSTGRES_DOWNGRADE, 'sqlite': SQLITE_DOWNGRADE})
@@ -0,0 +1,24 @@
+"""add expira_em to execucoes_jobs to detect abandoned runs
+
+Revision ID: c6f1a8d3e597
+Revises: b5e9c3f7d482
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f1a8d3e597'
+down_revision = 'b5e9c3f7d482'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('execucoes_jobs', sa.Column('expira_em', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('execucoes_jobs', 'expira_em')
@@ -0,0 +1,33 @@
+"""index turmas_treinamento by data_inicio/data_fim for period listings
+
+Revision ID: c7a1e5d9f320
+Revises: b3f8d2c6e914
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a1e5d9f320'
+down_revision = 'b3f8d2c6e914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_turmas_treinamento_data_inicio',
+        'turmas_treinamento',
+        ['data_inicio', 'id'],
+    )
+    op.create_index(
+        'ix_turmas_treinamento_data_fim',
+        'turmas_treinamento',
+        ['data_fim'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_turmas_treinamento_data_fim', table_name='turmas_treinamento')
+    op.drop_index('ix_turmas_treinamento_data_inicio', table_name='turmas_treinamento')
@@ -0,0 +1,46 @@
+"""create execucoes_jobs and jobs_leases tables for scheduled job runs
+
+Revision ID: d8e4a2b6f153
+Revises: c7a1e5d9f320
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e4a2b6f153'
+down_revision = 'c7a1e5d9f320'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'execucoes_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('job', sa.String(length=100), nullable=False),
+        sa.Column('processo', sa.String(length=120), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('inicio', sa.DateTime(), nullable=False),
+        sa.Column('fim', sa.DateTime(), nullable=True),
+        sa.Column('duracao_ms', sa.Integer(), nullable=True),
+        sa.Column('linhas_afetadas', sa.Integer(), nullable=True),
+        sa.Column('erro', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_execucoes_jobs_inicio', 'execucoes_jobs', ['inicio'])
+    op.create_index('ix_execucoes_jobs_job_inicio', 'execucoes_jobs', ['job', 'inicio'])
+    op.create_table(
+        'jobs_leases',
+        sa.Column('job', sa.String(length=100), primary_key=True),
+        sa.Column('dono', sa.String(length=120), nullable=False),
+        sa.Column('expira_em', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('jobs_leases')
+    op.drop_index('ix_execucoes_jobs_job_inicio', table_name='execucoes_jobs')
+    op.drop_index('ix_execucoes_jobs_inicio', table_name='execucoes_jobs')
+    op.drop_table('execucoes_jobs')
@@ -0,0 +1,80 @@
+"""make suporte_indicadores_diarios key columns not null
+
+Revision ID: d9a3e1b7f460
+Revises: c6f1a8d3e597
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a3e1b7f460'
+down_revision = 'c6f1a8d3e597'
+branch_labels = None
+depends_on = None
+
+# Valores gravados no lugar de NULL (ver ``SuporteIndicadorDiario.CHAVE_VAZIA``).
+CHAVE = (
+    ('area', sa.String(length=120), "''"),
+    ('tipo_equipamento_id', sa.Integer(), '0'),
+    ('nivel_urgencia', sa.String(length=20), "''"),
+    ('status', sa.String(length=20), "''"),
+)
+
+
+def _duracao(coluna, dialeto):
+    if dialeto == 'sqlite':
+        return f"ROUND((julianday({coluna}) - julianday(created_at)) * 86400.0, 3)"
+    if dialeto == 'postgresql':
+        return f"EXTRACT(EPOCH FROM ({coluna} - created_at))"
+    return f"(EXTRACT(EPOCH FROM {coluna}) - EXTRACT(EPOCH FROM created_at))"
+
+
+def upgrade():
+    # Com NULLs na chave a restrição única não impedia linhas repetidas; o
+    # agregado é descartado e reconstruído a partir de ``suporte_chamados``.
+    op.execute('DELETE FROM suporte_indicadores_diarios')
+    with op.batch_alter_table('suporte_indicadores_diarios') as batch_op:
+        for coluna, tipo, vazio in CHAVE:
+            batch_op.alter_column(
+                coluna,
+                existing_type=tipo,
+                nullable=False,
+                server_default=sa.text(vazio),
+            )
+
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('suporte_chamados'):
+        return
+    atendimento = _duracao('inicio_atendimento_at', bind.dialect.name)
+    encerramento = _duracao('encerrado_at', bind.dialect.name)
+    chave = ', '.join(f'COALESCE({coluna}, {vazio})' for coluna, _, vazio in CHAVE)
+    op.execute(
+        f"""
+        INSERT INTO suporte_indicadores_diarios (
+            dia, area, tipo_equipamento_id, nivel_urgencia, status,
+            quantidade, atendidos, soma_atendimento_segundos,
+            encerrados, soma_encerramento_segundos, atendidos_24h
+        )
+        SELECT
+            DATE(created_at), {chave},
+            COUNT(id), COUNT(inicio_atendimento_at), COALESCE(SUM({atendimento}), 0),
+            COUNT(encerrado_at), COALESCE(SUM({encerramento}), 0),
+            SUM(CASE WHEN {atendimento} < 86400 THEN 1 ELSE 0 END)
+        FROM suporte_chamados
+        GROUP BY DATE(created_at), {chave}
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('suporte_indicadores_diarios') as batch_op:
+        for coluna, tipo, _ in CHAVE:
+            batch_op.alter_column(
+                coluna,
+                existing_type=tipo,
+                nullable=True,
+                server_default=None,
+            )
@@ -0,0 +1,27 @@
+"""index email_outbox by referencia for pending convocation lookups
+
+Revision ID: e2c9f4a7b816
+Revises: d8e4a2b6f153
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c9f4a7b816'
+down_revision = 'd8e4a2b6f153'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_email_outbox_referencia',
+        'email_outbox',
+        ['referencia_tipo', 'referencia_id'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_referencia', table_name='email_outbox')
@@ -0,0 +1,26 @@
+"""add sha256 to imagens_noticias for content-addressed storage
+
+Revision ID: f3a7c1d9e254
+Revises: e2c9f4a7b816
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7c1d9e254'
+down_revision = 'e2c9f4a7b816'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('imagens_noticias', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.create_index('ix_imagens_noticias_sha256', 'imagens_noticias', ['sha256'])
+
+
+def downgrade():
+    op.drop_index('ix_imagens_noticias_sha256', table_name='imagens_noticias')
+    op.drop_column('imagens_noticias', 'sha256')
@@ -6,10 +6,11 @@ echo "[start] Running DB migrations..."
 ls -la migrations/versions
 SCHEDULER_ENABLED=${SCHEDULER_ENABLED:-0} flask db upgrade
 echo "[start] Starting Gunicorn..."
+# Workers, threads e preload vêm de gunicorn.conf.py (GUNICORN_PERFIL,
+# WEB_CONCURRENCY, GTHREADS, GUNICORN_PRELOAD).
 exec gunicorn "conecta_senai.main:create_app()" \
+  --config gunicorn.conf.py \
   --bind 0.0.0.0:${PORT:-8080} \
-  --workers 1 \
-  --threads 1 \
   --max-requests 200 \
   --max-requests-jitter 50 \
   --timeout 30 \
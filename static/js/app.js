@@ -1149,7 +1149,8 @@ async function carregarLaboratoriosParaFiltro(seletorElemento) {
 // Exporta dados genéricos (CSV, PDF ou XLSX)
 async function exportarDados(endpoint, formato, nomeArquivo) {
     try {
-        const response = await fetch(`${API_URL}${endpoint}?formato=${formato}`, {
+        const separador = endpoint.includes('?') ? '&' : '?';
+        const response = await fetch(`${API_URL}${endpoint}${separador}formato=${formato}`, {
         });
         if (!response.ok) {
             throw new Error('Erro ao exportar dados');
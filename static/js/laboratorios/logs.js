@@ -10,8 +10,10 @@ document.addEventListener('DOMContentLoaded', () => {
     verificarPermissaoAdmin();
 
     const tabelaBody = document.querySelector('#tabelaLogs tbody');
+    const btnCarregarMais = document.getElementById('btnCarregarMais');
+    let proximoCursor = null;
 
-    async function carregarLogs() {
+    function parametrosFiltro() {
         const params = new URLSearchParams();
         const usuario = document.getElementById('filtroUsuario').value.trim();
         const data = document.getElementById('filtroData').value;
@@ -19,13 +21,21 @@ document.addEventListener('DOMContentLoaded', () => {
         if (usuario) params.append('usuario', usuario);
         if (data) params.append('data', data);
         if (tipo) params.append('tipo', tipo);
-        const logs = await chamarAPI(`/logs-agenda?${params.toString()}`, 'GET');
-        atualizarTabela(logs);
+        return params;
     }
 
-    function atualizarTabela(logs) {
-        tabelaBody.innerHTML = '';
-        if (!logs || logs.length === 0) {
+    async function carregarLogs(continuar = false) {
+        const params = parametrosFiltro();
+        if (continuar && proximoCursor) params.append('cursor', proximoCursor);
+        const pagina = await chamarAPI(`/logs-agenda?${params.toString()}`, 'GET');
+        proximoCursor = pagina ? pagina.proximo_cursor : null;
+        atualizarTabela(pagina ? pagina.items : [], continuar);
+        btnCarregarMais.classList.toggle('d-none', !proximoCursor);
+    }
+
+    function atualizarTabela(logs, continuar) {
+        if (!continuar) tabelaBody.innerHTML = '';
+        if ((!logs || logs.length === 0) && !continuar) {
             tabelaBody.innerHTML = '<tr><td colspan="7" class="text-center">Nenhum registro encontrado.</td></tr>';
             return;
         }
@@ -43,7 +53,8 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    document.getElementById('btnAplicarFiltros').addEventListener('click', carregarLogs);
+    document.getElementById('btnAplicarFiltros').addEventListener('click', () => carregarLogs());
+    btnCarregarMais.addEventListener('click', () => carregarLogs(true));
     document.getElementById('btnLimparFiltros').addEventListener('click', () => {
         document.getElementById('filtroUsuario').value = '';
         document.getElementById('filtroData').value = '';
@@ -52,7 +63,8 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     document.getElementById('btnExportarCsv').addEventListener('click', () => {
-        exportarDados('/logs-agenda/export', 'csv', 'logs_agenda');
+        const params = parametrosFiltro().toString();
+        exportarDados(`/logs-agenda/export${params ? `?${params}` : ''}`, 'csv', 'logs_agenda');
     });
 
     carregarLogs();
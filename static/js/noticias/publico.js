@@ -464,16 +464,40 @@ document.addEventListener('DOMContentLoaded', () => {
         `;
     }
 
+    const TAMANHOS_CARD = '(max-width: 576px) 100vw, (max-width: 992px) 50vw, 33vw';
+
+    function criarImagemCard(noticia, urlImagem) {
+        if (!urlImagem) {
+            return '<div class="news-card__image" role="presentation"></div>';
+        }
+        const dados = noticia.imagem || {};
+        const dimensoes = dados.largura && dados.altura ? ` width="${dados.largura}" height="${dados.altura}"` : '';
+        const srcset = dados.srcset ? ` srcset="${escapeHTML(dados.srcset)}" sizes="${TAMANHOS_CARD}"` : '';
+        const img = `<img class="news-card__image" src="${encodeURI(urlImagem)}"${srcset}${dimensoes} loading="lazy" decoding="async" alt="Imagem ilustrativa da notícia">`;
+        if (!dados.srcset_webp) {
+            return img;
+        }
+        return `<picture class="news-card__picture"><source type="image/webp" srcset="${escapeHTML(dados.srcset_webp)}" sizes="${TAMANHOS_CARD}">${img}</picture>`;
+    }
+
+    function resumoCard(noticia) {
+        // O trecho da busca já vem escapado pelo servidor, só com <mark> nos termos.
+        if (noticia.trecho) {
+            return noticia.trecho;
+        }
+        return escapeHTML(noticia.resumo ?? '');
+    }
+
     function criarCardNoticia(noticia) {
         const urlImagem = obterUrlImagem(noticia);
-        const imagem = urlImagem ? `<img class="news-card__image" src="${encodeURI(urlImagem)}" alt="Imagem ilustrativa da notícia">` : '<div class="news-card__image" role="presentation"></div>';
+        const imagem = criarImagemCard(noticia, urlImagem);
         return `
             <article class="news-card" role="listitem">
                 ${imagem}
                 <div class="news-card__body">
                     <time class="news-card__date" datetime="${escapeHTML(noticia.data_publicacao || '')}">${formatarDataHumana(noticia.data_publicacao)}</time>
                     <h3 class="news-card__title">${escapeHTML(noticia.titulo)}</h3>
-                    <p class="news-card__summary">${escapeHTML(noticia.resumo ?? '')}</p>
+                    <p class="news-card__summary">${resumoCard(noticia)}</p>
                     <div class="news-card__actions">
                         <button class="btn btn-outline-primary" type="button" data-news-id="${noticia.id}" aria-label="Abrir notícia ${escapeHTML(noticia.titulo)}" data-bs-toggle="modal" data-bs-target="#newsModal">
                             <i class="bi bi-journal-text me-1"></i> Ler notícia
@@ -155,7 +155,10 @@ async function carregarOcupacoes(dataInicio, dataFim) {
                 title: evento.title,
                 start: evento.start,
                 end: evento.end,
-                className: getClasseTurno(evento.extendedProps.turno),
+                className: [
+                    getClasseTurno(evento.extendedProps.turno),
+                    getClasseSituacaoTurno(evento.extendedProps.situacao_turno)
+                ].filter(Boolean),
                 extendedProps: evento.extendedProps
             }));
         } else {
@@ -167,6 +170,11 @@ async function carregarOcupacoes(dataInicio, dataFim) {
     }
 }
 
+// Marca o evento com a situação do turno no dia (todas as salas, não só as filtradas)
+function getClasseSituacaoTurno(situacao) {
+    return situacao ? `ocupacao-situacao-${situacao}` : '';
+}
+
 // Consulta a API para obter o resumo de ocupações entre duas datas
 // Aplica também os filtros selecionados na interface
 async function carregarResumoPeriodo(dataInicio, dataFim) {
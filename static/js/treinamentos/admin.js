@@ -206,7 +206,7 @@ async function executarConvocacao() {
 
     try {
         await chamarAPI(`/treinamentos/turmas/${turmaParaConvocarId}/convocar-todos`, 'POST');
-        showToast('Todos os participantes foram convocados com sucesso!', 'success');
+        showToast('Convocações enfileiradas; os e-mails serão enviados em instantes.', 'success');
     } catch (e) {
         showToast(`Não foi possível convocar: ${e.message}`, 'danger');
     } finally {
@@ -1,18 +1,25 @@
+const HISTORICO_POR_PAGINA = 50;
+let paginaHistorico = 0;
+
 document.addEventListener('DOMContentLoaded', () => {
     verificarAutenticacao();
     verificarPermissaoAdmin();
+    document.getElementById('btnCarregarMais')?.addEventListener('click', () => carregarHistoricoPassado(true));
     carregarHistoricoPassado(); // Nome da função alterado para clareza
 });
 
-async function carregarHistoricoPassado() {
+async function carregarHistoricoPassado(continuar = false) {
     try {
-        // A rota /treinamentos/historico agora retorna apenas turmas passadas
-        const turmas = await chamarAPI('/treinamentos/historico');
+        // A rota /treinamentos/historico retorna apenas turmas passadas, paginadas
+        paginaHistorico = continuar ? paginaHistorico + 1 : 1;
+        const pagina = await chamarAPI(`/treinamentos/historico?page=${paginaHistorico}&per_page=${HISTORICO_POR_PAGINA}`);
+        const turmas = pagina.items;
         const tbody = document.getElementById('turmasTableBody');
         if (!tbody) return;
 
-        tbody.innerHTML = '';
-        if (turmas.length === 0) {
+        document.getElementById('btnCarregarMais')?.classList.toggle('d-none', pagina.page >= pagina.pages);
+        if (!continuar) tbody.innerHTML = '';
+        if (turmas.length === 0 && !continuar) {
             tbody.innerHTML = '<tr><td colspan="6" class="text-center">Nenhum histórico de turmas encerradas encontrado.</td></tr>';
             return;
         }
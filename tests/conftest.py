@@ -26,6 +26,8 @@ from conecta_senai.routes.laboratorios import agendamento_bp, laboratorio_bp
 from conecta_senai.routes.rateio.rateio import rateio_bp
 from conecta_senai.routes.noticias import api_noticias_bp
 from conecta_senai.auth import auth_bp
+from conecta_senai.auth.decorators import limpar_cache_autenticacao
+from conecta_senai.config.redis import DummyRedis, revogacao
 from conecta_senai.routes.treinamentos.basedados import (
     secretaria_bp as treinamentos_basedados_bp,
     horarios_bp as treinamentos_horarios_bp,
@@ -43,6 +45,8 @@ def app():
         template_folder=os.path.join(base_dir, 'templates'),
         static_folder=os.path.join(base_dir, 'static')
     )
+    limpar_cache_autenticacao()
+    revogacao.configurar(DummyRedis())
     app.config['TESTING'] = True
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -200,3 +200,55 @@ def test_non_admin_update_other_forbidden(client, login_admin, non_admin_auth_he
         headers=non_admin_auth_headers,
     )
     assert resp_forbidden.status_code == 403
+
+
+def test_mascara_horarios_na_grade(client, login_admin):
+    token, _ = login_admin(client)
+    headers = {'Authorization': f'Bearer {token}'}
+    hoje = date.today().isoformat()
+
+    resp = client.post('/api/agendamentos', json={
+        'data': hoje,
+        'laboratorio': 'LabGrade',
+        'turma': '4A',
+        'turno': 'Manhã',
+        'horarios': ['08:00 - 08:45', '08:45 - 09:30']
+    }, headers=headers)
+    assert resp.status_code == 201
+    ag_id = resp.get_json()['id']
+
+    resp_conf = client.post('/api/agendamentos', json={
+        'data': hoje,
+        'laboratorio': 'LabGrade',
+        'turma': '4B',
+        'turno': 'Manhã',
+        'horarios': ['08:45 - 09:30', '09:30 - 10:15']
+    }, headers=headers)
+    assert resp_conf.status_code == 409
+    conflito = resp_conf.get_json()['conflitos'][0]
+    assert conflito['agendamento_id'] == ag_id
+    assert conflito['horarios_conflitantes'] == ['08:45 - 09:30']
+
+    resp_livre = client.post('/api/agendamentos', json={
+        'data': hoje,
+        'laboratorio': 'LabGrade',
+        'turma': '4C',
+        'turno': 'Manhã',
+        'horarios': ['09:30 - 10:15']
+    }, headers=headers)
+    assert resp_livre.status_code == 201
+
+    # Atualizar o próprio agendamento não conflita consigo mesmo.
+    resp_put = client.put(f'/api/agendamentos/{ag_id}', json={
+        'horarios': ['08:00 - 08:45', '08:45 - 09:30', '10:30 - 11:15']
+    }, headers=headers)
+    assert resp_put.status_code == 200
+
+    resp_check = client.get('/api/agendamentos/verificar-disponibilidade', query_string={
+        'data': hoje,
+        'laboratorio': 'LabGrade',
+        'turno': 'Manhã'
+    }, headers=headers)
+    assert resp_check.get_json()['horarios_reservados'] == [
+        '08:00 - 08:45', '08:45 - 09:30', '09:30 - 10:15', '10:30 - 11:15'
+    ]
@@ -32,3 +32,38 @@ def test_audit_log_criacao_e_atualizacao(client, login_admin, app):
         updates = AuditLog.query.filter_by(entity="Agendamento", entity_id=ag_id, action="update").all()
         assert len(creates) == 1
         assert len(updates) == 1
+
+
+def test_audit_log_serie_de_ocupacoes(client, login_admin, app):
+    token, _ = login_admin(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with app.app_context():
+        from conecta_senai.models.sala import Sala
+
+        sala_id = Sala.query.first().id
+
+    resp = client.post(
+        "/api/ocupacoes",
+        json={
+            "sala_id": sala_id,
+            "curso_evento": "Série",
+            "data_inicio": "2030-03-04",
+            "data_fim": "2030-03-10",
+            "turno": "Manhã",
+            "tipo_ocupacao": "aula_regular",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    ocupacoes = resp.get_json()
+    # 04/03/2030 é segunda-feira: o fim de semana da série é ignorado
+    assert [o["data"] for o in ocupacoes] == [
+        "2030-03-04", "2030-03-05", "2030-03-06", "2030-03-07", "2030-03-08"
+    ]
+    assert len({o["grupo_ocupacao_id"] for o in ocupacoes}) == 1
+
+    with app.app_context():
+        creates = AuditLog.query.filter_by(entity="Ocupacao", action="create").all()
+        assert sorted(log.entity_id for log in creates) == sorted(o["id"] for o in ocupacoes)
+        assert all(log.details["sala_nome"] for log in creates)
@@ -0,0 +1,99 @@
+from datetime import date
+
+from conecta_senai import create_app
+from conecta_senai.models import db
+from conecta_senai.models.ocupacao import Ocupacao
+from conecta_senai.models.sala import Sala
+from conecta_senai.models.user import User
+from conecta_senai.utils.cache_http import obter_cache_http
+
+
+def _periodo():
+    hoje = date.today().isoformat()
+    return {'data_inicio': hoje, 'data_fim': hoje}
+
+
+def test_calendario_ocupacoes_etag_e_invalidacao(client, app, login_admin):
+    token, _ = login_admin(client)
+    headers = {'Authorization': f'Bearer {token}'}
+    cache = obter_cache_http(app)
+    cache.janela_local = 0
+
+    resp = client.get('/api/ocupacoes/calendario', query_string=_periodo(), headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers['Cache-Control'] == 'private, no-cache'
+    etag = resp.headers['ETag']
+    assert resp.get_json() == []
+
+    resp = client.get(
+        '/api/ocupacoes/calendario',
+        query_string=_periodo(),
+        headers={**headers, 'If-None-Match': etag},
+    )
+    assert resp.status_code == 304
+
+    # Outra ordem dos parâmetros cai na mesma entrada.
+    resp = client.get(
+        '/api/ocupacoes/calendario?data_fim={data_fim}&data_inicio={data_inicio}'.format(**_periodo()),
+        headers=headers,
+    )
+    assert resp.headers['ETag'] == etag
+    assert (cache.acertos, cache.falhas, cache.nao_modificados) == (1, 1, 1)
+
+    with app.app_context():
+        sala = Sala.query.first()
+        usuario = User.query.filter_by(email='admin@example.com').first()
+        db.session.add(Ocupacao(
+            sala_id=sala.id,
+            usuario_id=usuario.id,
+            curso_evento='Nova',
+            data=date.today(),
+            horario_inicio='08:00',
+            horario_fim='12:00',
+        ))
+        db.session.commit()
+
+    resp = client.get(
+        '/api/ocupacoes/calendario',
+        query_string=_periodo(),
+        headers={**headers, 'If-None-Match': etag},
+    )
+    assert resp.status_code == 200
+    assert resp.headers['ETag'] != etag
+    assert [e['extendedProps']['curso_evento'] for e in resp.get_json()] == ['Nova']
+
+
+def test_cache_http_separa_usuarios_e_ignora_erros(client, app, login_admin, non_admin_auth_headers):
+    token, _ = login_admin(client)
+    admin = {'Authorization': f'Bearer {token}'}
+    client.post('/api/agendamentos', json={
+        'data': date.today().isoformat(),
+        'laboratorio': 'Lab1',
+        'turma': '1A',
+        'turno': 'Manhã',
+        'horarios': ['08:00'],
+    }, headers=admin)
+
+    resp_admin = client.get('/api/agendamentos/calendario', query_string=_periodo(), headers=admin)
+    resp_usuario = client.get(
+        '/api/agendamentos/calendario', query_string=_periodo(), headers=non_admin_auth_headers
+    )
+    assert len(resp_admin.get_json()) == 1
+    assert resp_usuario.get_json() == []
+    assert resp_admin.headers['ETag'] != resp_usuario.headers['ETag']
+
+    resp = client.get('/api/dashboard/salas/utilizacao', headers=non_admin_auth_headers)
+    assert resp.status_code == 403
+    assert 'ETag' not in resp.headers
+    assert client.get('/api/dashboard/salas/utilizacao', headers=admin).status_code == 200
+    assert client.get('/api/dashboard/salas/utilizacao').status_code == 401
+
+
+def test_health_cache_expoe_metricas(monkeypatch):
+    monkeypatch.setenv('SECRET_KEY', 'testing')
+    monkeypatch.setenv('SCHEDULER_ENABLED', '0')
+    app = create_app()
+
+    metricas = app.test_client().get('/health/cache').get_json()
+    assert metricas['backend'] == 'local'
+    assert metricas['acertos'] == 0
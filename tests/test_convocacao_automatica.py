@@ -0,0 +1,63 @@
+from datetime import date
+from unittest.mock import patch
+
+from conecta_senai.models import EmailOutbox, InscricaoTreinamento, Treinamento, TurmaTreinamento, db
+from conecta_senai.services.email_outbox_service import TokenBucket, processar_fila
+from conecta_senai.tasks.jobs.convocacao_automatica import convocacao_automatica_job
+
+
+def _criar_inscricoes(quantidade):
+    treino = Treinamento(nome='Treino', codigo='TA', carga_horaria=8)
+    db.session.add(treino)
+    db.session.flush()
+    turma = TurmaTreinamento(
+        treinamento_id=treino.id,
+        data_inicio=date.today(),
+        data_fim=date.today(),
+        local_realizacao='Local',
+        horario='08h',
+    )
+    db.session.add(turma)
+    db.session.flush()
+    db.session.add_all(
+        InscricaoTreinamento(
+            turma_id=turma.id, nome=f'Aluno {i}', email=f'aluno{i}@example.com', cpf=str(i)
+        )
+        for i in range(quantidade)
+    )
+    db.session.commit()
+
+
+def test_convocacao_enfileira_em_lotes_sem_duplicar(app):
+    with app.app_context():
+        _criar_inscricoes(5)
+
+        resumo = convocacao_automatica_job(lote=2)
+
+        assert resumo['enfileiradas'] == 5
+        assert resumo['lotes'] == 3
+        assert EmailOutbox.query.filter_by(referencia_tipo='convocacao').count() == 5
+        assert convocacao_automatica_job(lote=2)['enfileiradas'] == 0
+
+        with patch(
+            'conecta_senai.services.email_service.resend.Emails.send',
+            return_value={'id': 'x'},
+        ):
+            assert processar_fila(bucket=TokenBucket(1000))['enviados'] == 5
+        assert InscricaoTreinamento.query.filter(
+            InscricaoTreinamento.convocado_em.is_(None)
+        ).count() == 0
+        assert convocacao_automatica_job(lote=2)['lotes'] == 0
+
+
+def test_convocacao_respeita_orcamento_e_retoma(app):
+    with app.app_context():
+        _criar_inscricoes(5)
+
+        primeira = convocacao_automatica_job(lote=2, orcamento_segundos=0)
+        assert primeira['enfileiradas'] == 2
+        assert primeira['lotes'] == 1
+
+        segunda = convocacao_automatica_job(lote=2)
+        assert segunda['enfileiradas'] == 3
+        assert EmailOutbox.query.count() == 5
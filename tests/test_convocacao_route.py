@@ -58,3 +58,155 @@ def test_convocar_inscrito(client, app, monkeypatch):
     with app.app_context():
         insc = db.session.get(InscricaoTreinamento, iid)
         assert insc.convocado_em is not None
+
+
+def test_convocar_todos_enfileira_e_despacha(client, app):
+    from unittest.mock import patch
+
+    from resend.exceptions import ResendError
+
+    from conecta_senai.models import EmailOutbox
+    from conecta_senai.services.email_outbox_service import (
+        TokenBucket,
+        processar_fila,
+        status_job,
+    )
+
+    headers = admin_headers(app)
+    with app.app_context():
+        treino = Treinamento(nome='Treino', codigo='T2', carga_horaria=8)
+        db.session.add(treino)
+        db.session.commit()
+        turma = TurmaTreinamento(
+            treinamento_id=treino.id,
+            data_inicio=date.today(),
+            data_fim=date.today(),
+            local_realizacao='Local',
+            horario='08h',
+        )
+        db.session.add(turma)
+        db.session.commit()
+        for i in range(2):
+            db.session.add(
+                InscricaoTreinamento(
+                    turma_id=turma.id,
+                    nome=f'Aluno {i}',
+                    email=f'aluno{i}@example.com',
+                    cpf=str(i),
+                )
+            )
+        db.session.commit()
+        turma_id = turma.id
+
+    resp = client.post(
+        f'/api/treinamentos/turmas/{turma_id}/convocar-todos', headers=headers
+    )
+    assert resp.status_code == 202
+    job_id = resp.get_json()['job_id']
+
+    respostas = [
+        ResendError(code=429, error_type='rate_limit', message='Too many', suggested_action=''),
+        {'id': 'a'},
+        {'id': 'b'},
+    ]
+
+    def fake_send(params):
+        resposta = respostas.pop(0)
+        if isinstance(resposta, Exception):
+            raise resposta
+        return resposta
+
+    bucket = TokenBucket(1000)
+    with app.app_context():
+        assert InscricaoTreinamento.query.filter(
+            InscricaoTreinamento.convocado_em.isnot(None)
+        ).count() == 0
+        with patch(
+            'conecta_senai.services.email_service.resend.Emails.send',
+            side_effect=fake_send,
+        ):
+            assert processar_fila(bucket=bucket) == {'enviados': 1, 'reagendados': 1, 'erros': 0}
+            reagendada = EmailOutbox.query.filter_by(status='pendente').one()
+            assert reagendada.tentativas == 1
+            reagendada.proxima_tentativa_em = datetime.utcnow() - timedelta(seconds=1)
+            db.session.commit()
+            assert processar_fila(bucket=bucket)['enviados'] == 1
+
+        status = status_job(job_id)
+        assert status['concluido'] is True
+        assert status['status'] == {'enviado': 2}
+        assert InscricaoTreinamento.query.filter(
+            InscricaoTreinamento.convocado_em.isnot(None)
+        ).count() == 2
+
+
+def test_convocar_todos_sem_envios_nao_devolve_job(client, app, monkeypatch):
+    headers = admin_headers(app)
+    with app.app_context():
+        treino = Treinamento(nome='Treino', codigo='T3', carga_horaria=8)
+        db.session.add(treino)
+        db.session.commit()
+        turma = TurmaTreinamento(
+            treinamento_id=treino.id,
+            data_inicio=date.today(),
+            data_fim=date.today(),
+            local_realizacao='Local',
+            horario='08h',
+        )
+        db.session.add(turma)
+        db.session.commit()
+        db.session.add(
+            InscricaoTreinamento(turma_id=turma.id, nome='Aluno', email='aluno@example.com', cpf='9')
+        )
+        db.session.commit()
+        turma_id = turma.id
+
+    def falha(inscricao, turma):
+        raise RuntimeError('template indisponível')
+
+    monkeypatch.setattr('conecta_senai.routes.treinamentos.turma.enviar_convocacao', falha)
+
+    resp = client.post(
+        f'/api/treinamentos/turmas/{turma_id}/convocar-todos', headers=headers
+    )
+    assert resp.status_code == 200
+    assert 'job_id' not in resp.get_json()
+    assert resp.get_json()['total'] == 0
+
+
+def test_falha_na_acao_pos_envio_nao_prende_a_mensagem(app, monkeypatch):
+    from unittest.mock import patch
+
+    from conecta_senai.models import EmailOutbox
+    from conecta_senai.services import email_outbox_service
+    from conecta_senai.services.email_outbox_service import TokenBucket, processar_fila
+
+    def acao_com_falha(referencia_id):
+        raise RuntimeError('inscrição bloqueada')
+
+    monkeypatch.setitem(email_outbox_service._POS_ENVIO, 'teste', acao_com_falha)
+    with app.app_context():
+        for referencia in ('teste', None):
+            db.session.add(
+                EmailOutbox(
+                    job_id='job-teste',
+                    destinatarios=['a@example.com'],
+                    assunto='Assunto',
+                    html='<p>x</p>',
+                    referencia_tipo=referencia,
+                    referencia_id=1,
+                    proxima_tentativa_em=datetime.utcnow() - timedelta(seconds=1),
+                )
+            )
+        db.session.commit()
+
+        with patch(
+            'conecta_senai.services.email_service.resend.Emails.send',
+            return_value={'id': 'x'},
+        ):
+            assert processar_fila(bucket=TokenBucket(1000)) == {'enviados': 2, 'reagendados': 0, 'erros': 0}
+
+        mensagens = EmailOutbox.query.order_by(EmailOutbox.id).all()
+        assert [m.status for m in mensagens] == ['enviado', 'enviado']
+        assert 'inscrição bloqueada' in mensagens[0].ultimo_erro
+        assert mensagens[1].ultimo_erro is None
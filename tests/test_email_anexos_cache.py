@@ -0,0 +1,44 @@
+import base64
+import os
+
+from conecta_senai.services.email_anexos_cache import CacheAnexos
+
+
+def test_cache_reutiliza_ate_arquivo_mudar(tmp_path):
+    arquivo = tmp_path / 'tutorial.pdf'
+    arquivo.write_bytes(b'versao 1')
+    cache = CacheAnexos()
+
+    assert cache.obter(str(arquivo)) == base64.b64encode(b'versao 1').decode()
+    assert cache.obter(str(arquivo)) == base64.b64encode(b'versao 1').decode()
+    assert cache.estatisticas()['acertos'] == 1
+
+    arquivo.write_bytes(b'versao 2 maior')
+    stat = arquivo.stat()
+    os.utime(arquivo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.obter(str(arquivo)) == base64.b64encode(b'versao 2 maior').decode()
+
+    estatisticas = cache.estatisticas()
+    assert estatisticas['falhas'] == 2
+    assert estatisticas['entradas'] == 1
+    assert estatisticas['taxa_acerto'] == round(1 / 3, 4)
+
+
+def test_cache_respeita_limite_de_bytes(tmp_path):
+    caminhos = []
+    for nome in ('a', 'b', 'c'):
+        caminho = tmp_path / nome
+        caminho.write_bytes(b'x' * 30)  # 40 bytes em base64
+        caminhos.append(str(caminho))
+    cache = CacheAnexos(max_bytes=100)
+
+    cache.obter(caminhos[0])
+    cache.obter(caminhos[1])
+    cache.obter(caminhos[0])
+    cache.obter(caminhos[2])
+
+    estatisticas = cache.estatisticas()
+    assert estatisticas['bytes'] <= 100
+    assert estatisticas['descartes'] == 1
+    cache.obter(caminhos[0])
+    assert cache.estatisticas()['acertos'] == 2
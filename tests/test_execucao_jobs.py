@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conecta_senai import create_app
+from conecta_senai.models import db
+from conecta_senai.models.execucao_job import ExecucaoJob, LeaseJob
+from conecta_senai.tasks.execucao import (
+    CAMPOS_PUBLICOS,
+    LeaseBanco,
+    contar_linhas,
+    executar_job,
+    resumo_execucoes,
+)
+
+
+def test_executar_job_registra_sucesso_e_linhas(app):
+    with app.app_context():
+        resultado = executar_job('publicar', lambda: {'publicadas': 3, 'falhas': 1, 'total': 4})
+
+        assert resultado['publicadas'] == 3
+        execucao = ExecucaoJob.query.one()
+        assert execucao.status == ExecucaoJob.STATUS_SUCESSO
+        assert execucao.linhas_afetadas == 4
+        assert execucao.fim is not None and execucao.duracao_ms >= 0
+        assert db.session.get(LeaseJob, 'publicar') is None
+
+
+def test_executar_job_registra_erro_e_propaga(app):
+    def falha():
+        raise RuntimeError('sem conexão')
+
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            executar_job('emails', falha)
+
+        execucao = ExecucaoJob.query.one()
+        assert execucao.status == ExecucaoJob.STATUS_ERRO
+        assert 'sem conexão' in execucao.erro
+        assert db.session.get(LeaseJob, 'emails') is None
+
+
+def test_lease_ocupado_pula_execucao(app):
+    chamadas = []
+    with app.app_context():
+        outro = LeaseBanco('convocacao', 'outro-processo', timedelta(minutes=5))
+        assert outro.adquirir() is True
+
+        assert executar_job('convocacao', lambda: chamadas.append(1)) is None
+        assert chamadas == []
+        assert ExecucaoJob.query.count() == 0
+
+
+def test_lease_expirado_pode_ser_tomado(app):
+    with app.app_context():
+        db.session.add(
+            LeaseJob(job='destaques', dono='morto', expira_em=datetime.utcnow() - timedelta(seconds=1))
+        )
+        db.session.commit()
+
+        assert LeaseBanco('destaques', 'novo', timedelta(minutes=5)).adquirir() is True
+        assert LeaseBanco('destaques', 'terceiro', timedelta(minutes=5)).adquirir() is False
+        assert db.session.get(LeaseJob, 'destaques').dono == 'novo'
+
+
+def test_contar_linhas():
+    assert contar_linhas(7) == 7
+    assert contar_linhas({'enviados': 2, 'erros': 1}) == 3
+    assert contar_linhas(None) is None
+    assert contar_linhas(True) is None
+
+
+def test_resumo_execucoes_mostra_ultima_execucao_por_job(app):
+    with app.app_context():
+        executar_job('a', lambda: 1)
+        executar_job('a', lambda: 2)
+        executar_job('b', lambda: 5)
+
+        resumo = {item['job']: item for item in resumo_execucoes(detalhado=True)}
+
+    assert set(resumo) == {'a', 'b'}
+    assert resumo['a']['linhas_afetadas'] == 2
+    assert resumo['a']['em_execucao'] is False
+    assert resumo['a']['segundos_desde_inicio'] >= 0
+
+
+def test_falha_no_historico_nao_prende_o_lease(app, monkeypatch):
+    with app.app_context():
+        commit = db.session.commit
+
+        def commit_sem_historico():
+            if any(isinstance(obj, ExecucaoJob) for obj in db.session.new):
+                raise RuntimeError('tabela bloqueada')
+            commit()
+
+        monkeypatch.setattr(db.session, 'commit', commit_sem_historico)
+        assert executar_job('sincronizar', lambda: 3) == 3
+        monkeypatch.undo()
+
+        assert ExecucaoJob.query.count() == 0
+        assert db.session.get(LeaseJob, 'sincronizar') is None
+
+
+def test_resumo_execucoes_marca_execucao_abandonada(app):
+    inicio = datetime(2026, 1, 5, 8, 0)
+    with app.app_context():
+        db.session.add_all([
+            ExecucaoJob(job='morto', processo='p1', status=ExecucaoJob.STATUS_EXECUTANDO,
+                        inicio=inicio, expira_em=inicio + timedelta(minutes=10)),
+            ExecucaoJob(job='vivo', processo='p2', status=ExecucaoJob.STATUS_EXECUTANDO,
+                        inicio=inicio + timedelta(minutes=25), expira_em=inicio + timedelta(minutes=35)),
+        ])
+        db.session.commit()
+
+        resumo = {item['job']: item for item in resumo_execucoes(agora=inicio + timedelta(minutes=30))}
+
+    assert resumo['morto']['status'] == ExecucaoJob.STATUS_ABANDONADO
+    assert resumo['morto']['em_execucao'] is False
+    assert resumo['vivo']['status'] == ExecucaoJob.STATUS_EXECUTANDO
+    assert resumo['vivo']['em_execucao'] is True
+
+
+def test_resumo_publico_omite_erro_e_processo(app):
+    def falha():
+        raise RuntimeError('senha=segredo em /srv/app')
+
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            executar_job('emails', falha)
+
+        (publico,) = resumo_execucoes()
+        (detalhado,) = resumo_execucoes(detalhado=True)
+
+    assert set(publico) == set(CAMPOS_PUBLICOS)
+    assert publico['status'] == ExecucaoJob.STATUS_ERRO
+    assert 'segredo' in detalhado['erro'] and detalhado['processo']
+
+
+def test_health_jobs_registrado_no_app(monkeypatch):
+    monkeypatch.setenv('SECRET_KEY', 'testing')
+    monkeypatch.setenv('SCHEDULER_ENABLED', '0')
+    app = create_app()
+
+    assert {'/health/jobs', '/health/jobs/detalhes'} <= {regra.rule for regra in app.url_map.iter_rules()}
+    assert app.test_client().get('/health/jobs/detalhes').status_code == 401
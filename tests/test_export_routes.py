@@ -138,3 +138,32 @@ def test_export_ocupacoes_xlsx(client_oc, app_ocupacoes):
     assert resp.status_code == 200
     assert 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' in resp.content_type
 
+
+def test_export_ocupacoes_csv_aplica_filtros_de_data(client_oc, app_ocupacoes):
+    token = gerar_token(app_ocupacoes)
+    headers = {'Authorization': f'Bearer {token}'}
+    with app_ocupacoes.app_context():
+        sala = Sala.query.first()
+    hoje = date.today()
+    client_oc.post('/api/ocupacoes', json={
+        'sala_id': sala.id,
+        'curso_evento': 'Evento',
+        'data_inicio': hoje.isoformat(),
+        'data_fim': (hoje + timedelta(days=2)).isoformat(),
+        'turno': 'Tarde'
+    }, headers=headers)
+
+    resp = client_oc.get('/api/ocupacoes/export', query_string={
+        'formato': 'csv',
+        'sala_id': sala.id,
+        'data_inicio': (hoje + timedelta(days=1)).isoformat(),
+    }, headers=headers)
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    linhas = resp.get_data(as_text=True).strip().splitlines()
+    assert linhas[0] == 'ID,Sala,Data,Início,Fim,Status'
+    assert len(linhas) == 3
+    assert all(',Sala,' in linha for linha in linhas[1:])
+
+    resp_invalida = client_oc.get('/api/ocupacoes/export?data_inicio=x', headers=headers)
+    assert resp_invalida.status_code == 400
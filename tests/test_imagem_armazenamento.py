@@ -0,0 +1,114 @@
+import hashlib
+import io
+from pathlib import Path
+
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+
+from conecta_senai.models import db
+from conecta_senai.models.imagem_noticia import ImagemNoticia
+from conecta_senai.models.noticia import Noticia
+from conecta_senai.services import noticia_service
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"0" * 64
+SHA = hashlib.sha256(PNG).hexdigest()
+
+
+def _arquivo():
+    return FileStorage(stream=io.BytesIO(PNG), filename="foto.png", content_type="image/png")
+
+
+def _noticia_com_imagem(titulo):
+    noticia = Noticia(titulo=titulo, conteudo="Conteúdo")
+    db.session.add(noticia)
+    db.session.commit()
+    return noticia_service.atualizar_noticia(noticia, {}, _arquivo())
+
+
+def test_mesmo_conteudo_compartilha_arquivo_ate_a_ultima_referencia(app, tmp_path):
+    with app.app_context():
+        noticia_service._TABELA_IMAGENS_DISPONIVEL = None
+        current_app.static_folder = tmp_path.as_posix()
+
+        primeira = _noticia_com_imagem("Primeira")
+        segunda = _noticia_com_imagem("Segunda")
+
+        caminho = primeira.imagem.caminho_relativo
+        assert caminho == segunda.imagem.caminho_relativo
+        assert caminho == f"uploads/noticias/{SHA[:2]}/{SHA}.png"
+        assert primeira.imagem.sha256 == SHA
+        arquivo = Path(tmp_path) / caminho
+        assert arquivo.read_bytes() == PNG
+
+        noticia_service.excluir_noticia(primeira)
+        assert arquivo.exists()
+        noticia_service.excluir_noticia(segunda)
+        assert not arquivo.exists()
+
+
+def test_imagem_servida_com_etag_cache_imutavel_e_304(app, client, tmp_path):
+    with app.app_context():
+        noticia_service._TABELA_IMAGENS_DISPONIVEL = None
+        current_app.static_folder = tmp_path.as_posix()
+        noticia = _noticia_com_imagem("Com imagem")
+        url = noticia.imagem.url_publica
+        imagem_id = noticia.imagem.id
+
+    assert url == f"/api/noticias/imagens/{imagem_id}?v={SHA[:16]}"
+    resposta = client.get(url)
+    assert resposta.status_code == 200
+    assert resposta.data == PNG
+    assert resposta.headers["ETag"] == f'"{SHA}"'
+    assert "immutable" in resposta.headers["Cache-Control"]
+
+    revalidacao = client.get(url, headers={"If-None-Match": f'"{SHA}"'})
+    assert revalidacao.status_code == 304
+    assert revalidacao.data == b""
+
+    sem_versao = client.get(f"/api/noticias/imagens/{imagem_id}")
+    assert "no-cache" in sem_versao.headers["Cache-Control"]
+    assert "immutable" not in sem_versao.headers["Cache-Control"]
+
+    prefixo_curto = client.get(f"/api/noticias/imagens/{imagem_id}?v={SHA[:1]}")
+    assert "no-cache" in prefixo_curto.headers["Cache-Control"]
+    assert "immutable" not in prefixo_curto.headers["Cache-Control"]
+
+
+def test_registro_antigo_ganha_hash_e_arquivo_no_primeiro_acesso(app, client, tmp_path):
+    with app.app_context():
+        noticia_service._TABELA_IMAGENS_DISPONIVEL = None
+        current_app.static_folder = tmp_path.as_posix()
+        noticia = Noticia(titulo="Legada", conteudo="Conteúdo")
+        noticia.imagem = ImagemNoticia(
+            nome_arquivo="antiga.png",
+            caminho_relativo="uploads/noticias/antiga.png",
+            conteudo=PNG,
+            tem_conteudo=True,
+            content_type="image/png",
+        )
+        db.session.add(noticia)
+        db.session.commit()
+        imagem_id = noticia.imagem.id
+
+        resposta = client.get(f"/api/noticias/imagens/{imagem_id}")
+        assert resposta.status_code == 200
+        assert resposta.data == PNG
+
+        imagem = db.session.get(ImagemNoticia, imagem_id)
+        assert imagem.sha256 == SHA
+        assert (Path(tmp_path) / imagem.caminho_relativo).exists()
+
+
+def test_backend_banco_nao_grava_em_disco(app, client, tmp_path):
+    app.config["IMAGENS_NOTICIAS_BACKEND"] = "banco"
+    with app.app_context():
+        noticia_service._TABELA_IMAGENS_DISPONIVEL = None
+        current_app.static_folder = tmp_path.as_posix()
+        noticia = _noticia_com_imagem("Banco")
+        url = noticia.imagem.url_publica
+
+    assert not any(Path(tmp_path).rglob("*.png"))
+    resposta = client.get(url)
+    assert resposta.status_code == 200
+    assert resposta.data == PNG
+    assert resposta.headers["ETag"] == f'"{SHA}"'
@@ -0,0 +1,104 @@
+import io
+import os
+from pathlib import Path
+
+import pytest
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+
+from conecta_senai.models import db
+from conecta_senai.models.noticia import Noticia
+from conecta_senai.schemas.noticia import NoticiaSchema
+from conecta_senai.services import imagem_variantes, noticia_service
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _jpeg(largura, altura):
+    saida = io.BytesIO()
+    Image.new("RGB", (largura, altura), (200, 30, 30)).save(saida, "JPEG")
+    return saida.getvalue()
+
+
+def _noticia_com_imagem(conteudo, titulo="Com foto"):
+    noticia = Noticia(titulo=titulo, conteudo="Conteúdo")
+    db.session.add(noticia)
+    db.session.commit()
+    arquivo = FileStorage(stream=io.BytesIO(conteudo), filename="foto.jpg", content_type="image/jpeg")
+    return noticia_service.atualizar_noticia(noticia, {}, arquivo)
+
+
+def _abrir(dados):
+    return Image.open(io.BytesIO(dados))
+
+
+def test_upload_registra_dimensoes_e_srcset(app, tmp_path):
+    with app.app_context():
+        noticia_service._TABELA_IMAGENS_DISPONIVEL = None
+        current_app.static_folder = tmp_path.as_posix()
+        noticia = _noticia_com_imagem(_jpeg(800, 400))
+        imagem = noticia.imagem
+
+        assert (imagem.largura, imagem.altura) == (800, 400)
+        dados = NoticiaSchema().dump(noticia)["imagem"]
+        versao = imagem.sha256[:16]
+        assert dados["srcset"] == (
+            f"/api/noticias/imagens/{imagem.id}/320?v={versao} 320w, "
+            f"/api/noticias/imagens/{imagem.id}/640?v={versao} 640w, "
+            f"{imagem.url_publica} 800w"
+        )
+        assert dados["srcset_webp"].endswith(f"/api/noticias/imagens/{imagem.id}/640.webp?v={versao} 640w")
+
+
+def test_variante_reduzida_no_formato_original_e_em_webp(app, client, tmp_path):
+    with app.app_context():
+        noticia_service._TABELA_IMAGENS_DISPONIVEL = None
+        current_app.static_folder = tmp_path.as_posix()
+        imagem = _noticia_com_imagem(_jpeg(1000, 500)).imagem
+        imagem_id, sha = imagem.id, imagem.sha256
+
+    resposta = client.get(f"/api/noticias/imagens/{imagem_id}/320?v={sha[:16]}")
+    assert resposta.status_code == 200
+    assert resposta.mimetype == "image/jpeg"
+    assert _abrir(resposta.data).size == (320, 160)
+    assert resposta.headers["ETag"] == f'"{sha}-320"'
+    assert "immutable" in resposta.headers["Cache-Control"]
+
+    webp = client.get(f"/api/noticias/imagens/{imagem_id}/640.webp?v={sha[:16]}")
+    assert webp.status_code == 200
+    assert webp.mimetype == "image/webp"
+    assert _abrir(webp.data).format == "WEBP"
+    assert _abrir(webp.data).size == (640, 320)
+
+    revalidacao = client.get(
+        f"/api/noticias/imagens/{imagem_id}/640.webp", headers={"If-None-Match": f'"{sha}-640-webp"'}
+    )
+    assert revalidacao.status_code == 304
+
+    assert len(list((Path(tmp_path) / imagem_variantes.VARIANTES_SUBDIR).rglob(f"{sha}-*"))) == 2
+    assert client.get(f"/api/noticias/imagens/{imagem_id}/500").status_code == 404
+
+
+def test_variante_nao_amplia_imagem_pequena(app, client, tmp_path):
+    with app.app_context():
+        noticia_service._TABELA_IMAGENS_DISPONIVEL = None
+        current_app.static_folder = tmp_path.as_posix()
+        imagem = _noticia_com_imagem(_jpeg(200, 100)).imagem
+        imagem_id = imagem.id
+        assert imagem_variantes.larguras_disponiveis(imagem) == []
+
+    resposta = client.get(f"/api/noticias/imagens/{imagem_id}/1280.webp")
+    assert resposta.status_code == 200
+    assert _abrir(resposta.data).size == (200, 100)
+
+
+def test_limpar_cache_remove_variantes_menos_usadas(tmp_path):
+    pasta = tmp_path / imagem_variantes.VARIANTES_SUBDIR / "ab"
+    pasta.mkdir(parents=True)
+    for indice, nome in enumerate(["antiga", "media", "recente"]):
+        arquivo = pasta / f"{nome}.webp"
+        arquivo.write_bytes(b"0" * 100)
+        os.utime(arquivo, (1000 + indice, 1000 + indice))
+
+    assert imagem_variantes.limpar_cache(tmp_path, 250) == 1
+    assert sorted(p.name for p in pasta.iterdir()) == ["media.webp", "recente.webp"]
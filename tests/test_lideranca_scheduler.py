@@ -0,0 +1,98 @@
+import threading
+from datetime import datetime
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING
+
+from conecta_senai.tasks import scheduler as agendador
+from conecta_senai.tasks.lideranca import LiderancaScheduler, TravaArquivo, TravaRedis
+
+
+class RedisTravas:
+    """Redis mínimo para ``SET NX EX`` e os scripts de renovação/liberação."""
+
+    def __init__(self):
+        self.valores = {}
+
+    def set(self, chave, valor, nx=False, ex=None):
+        if nx and chave in self.valores:
+            return None
+        self.valores[chave] = valor
+        return True
+
+    def eval(self, script, numkeys, chave, dono, *args):
+        if self.valores.get(chave) != dono:
+            return 0
+        if 'expire' in script:
+            return 1
+        del self.valores[chave]
+        return 1
+
+
+def _eventos(nome, eventos):
+    return (
+        lambda: eventos.append(f'{nome}:assumiu'),
+        lambda: eventos.append(f'{nome}:perdeu'),
+    )
+
+
+def test_apenas_um_lider_e_sucessao_na_queda():
+    redis = RedisTravas()
+    eventos = []
+    a = LiderancaScheduler(TravaRedis(redis, 'lider', 'a', 30), *_eventos('a', eventos))
+    b = LiderancaScheduler(TravaRedis(redis, 'lider', 'b', 30), *_eventos('b', eventos))
+
+    assert a.verificar() is True
+    assert b.verificar() is False
+    assert a.verificar() is True
+    assert eventos == ['a:assumiu']
+
+    # A trava expira (líder travado ou morto): o seguidor assume e o antigo
+    # líder percebe na próxima renovação.
+    del redis.valores['lider']
+    assert b.verificar() is True
+    assert a.verificar() is False
+    assert eventos == ['a:assumiu', 'b:assumiu', 'a:perdeu']
+
+    b.encerrar()
+    assert eventos[-1] == 'b:perdeu'
+    assert 'lider' not in redis.valores
+    assert a.verificar() is True
+
+
+def test_trava_arquivo_exclusiva(tmp_path):
+    caminho = str(tmp_path / 'scheduler.lock')
+    primeira, segunda = TravaArquivo(caminho), TravaArquivo(caminho)
+    assert primeira.adquirir()
+    assert not segunda.adquirir()
+    assert primeira.renovar() and not segunda.renovar()
+    primeira.liberar()
+    assert segunda.adquirir()
+    segunda.liberar()
+
+
+def test_scheduler_volta_a_executar_jobs_ao_reassumir(app, monkeypatch):
+    monkeypatch.setattr(agendador, 'scheduler', BackgroundScheduler())
+    redis = RedisTravas()
+    lideranca = LiderancaScheduler(
+        TravaRedis(redis, 'lider', 'a', 30),
+        ao_assumir=lambda: agendador.start_scheduler(app),
+        ao_perder=agendador.parar_scheduler,
+    )
+    try:
+        assert lideranca.verificar() is True
+        assert agendador.scheduler.state == STATE_RUNNING
+
+        redis.valores['lider'] = 'b'
+        assert lideranca.verificar() is False
+        assert agendador.scheduler.state == STATE_PAUSED
+
+        del redis.valores['lider']
+        assert lideranca.verificar() is True
+        assert agendador.scheduler.state == STATE_RUNNING
+
+        executou = threading.Event()
+        agendador.scheduler.add_job(executou.set, 'date', run_date=datetime.now(agendador.scheduler.timezone))
+        assert executou.wait(5)
+    finally:
+        agendador.scheduler.shutdown(wait=False)
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+from conecta_senai.models import db
+from conecta_senai.models.log_agendamento import LogAgendamento
+
+
+def _criar_logs(app, quantidade, inicio):
+    with app.app_context():
+        for i in range(quantidade):
+            log = LogAgendamento(
+                usuario='Admin' if i % 2 else 'Outro',
+                tipo_acao='create',
+                laboratorio='Lab',
+                turno='Manhã',
+                data_agendamento=inicio.date(),
+                dados_antes=None,
+                dados_depois={'horarios': ['08:00 - 08:45']},
+                intervalo_horarios='08:00 - 08:45',
+            )
+            # Metade das linhas com o mesmo timestamp exercita o desempate por id.
+            log.timestamp = inicio + timedelta(minutes=i // 2)
+            db.session.add(log)
+        db.session.commit()
+
+
+def test_logs_agenda_paginados_por_cursor(client, app, login_admin):
+    token, _ = login_admin(client)
+    headers = {'Authorization': f'Bearer {token}'}
+    _criar_logs(app, 7, datetime(2025, 3, 10, 12, 0))
+
+    vistos = []
+    cursor = None
+    while True:
+        params = {'limite': 3}
+        if cursor:
+            params['cursor'] = cursor
+        resp = client.get('/api/logs-agenda', query_string=params, headers=headers)
+        assert resp.status_code == 200
+        pagina = resp.get_json()
+        vistos.extend(pagina['items'])
+        cursor = pagina['proximo_cursor']
+        if not cursor:
+            break
+
+    assert len(vistos) == 7
+    assert len({log['id'] for log in vistos}) == 7
+    chaves = [(log['timestamp'], log['id']) for log in vistos]
+    assert chaves == sorted(chaves, reverse=True)
+    assert vistos[0]['intervalo_horarios'] == '08:00 - 08:45'
+
+
+def test_logs_agenda_filtros_e_exportacao(client, app, login_admin):
+    token, _ = login_admin(client)
+    headers = {'Authorization': f'Bearer {token}'}
+    _criar_logs(app, 4, datetime(2025, 3, 10, 23, 59))
+
+    resp = client.get('/api/logs-agenda?data=2025-03-10', headers=headers)
+    assert [log['timestamp'][:10] for log in resp.get_json()['items']] == ['2025-03-10'] * 2
+
+    resp = client.get('/api/logs-agenda?data=2025-02-30', headers=headers)
+    assert resp.status_code == 400
+    resp = client.get('/api/logs-agenda?cursor=invalido', headers=headers)
+    assert resp.status_code == 400
+
+    resp = client.get('/api/logs-agenda/export?usuario=Outro', headers=headers)
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    linhas = resp.get_data(as_text=True).strip().splitlines()
+    assert linhas[0].startswith('Data/Hora')
+    assert len(linhas) == 3
+    assert all('08:00 - 08:45' in linha for linha in linhas[1:])
+
+
+def test_registrar_log_agenda_grava_intervalo(client, app, login_admin):
+    token, _ = login_admin(client)
+    resp = client.post('/api/agendamentos', json={
+        'data': '2025-03-10',
+        'laboratorio': 'LabLog',
+        'turma': '5A',
+        'turno': 'Manhã',
+        'horarios': ['08:00 - 08:45', '09:30 - 10:15'],
+    }, headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 201
+    with app.app_context():
+        log = LogAgendamento.query.filter_by(laboratorio='LabLog').one()
+        assert log.intervalo_horarios == '08:00 - 10:15'
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from conecta_senai import create_app
+from conecta_senai.config.database import opcoes_engine
+from conecta_senai.utils.metricas_pool import MetricasPool, PoolMedido
+
+
+def _config(uri, **extras):
+    config = {
+        'SQLALCHEMY_DATABASE_URI': uri,
+        'DB_POOL_SIZE': 1,
+        'DB_MAX_OVERFLOW': 1,
+        'DB_POOL_TIMEOUT': 0.05,
+        'DB_POOL_RECYCLE': 600,
+        'DB_POOL_PRE_PING': True,
+        'DB_STATEMENT_TIMEOUT_MS': 0,
+    }
+    config.update(extras)
+    return config
+
+
+def test_opcoes_engine_por_banco():
+    assert opcoes_engine(_config('sqlite:///:memory:')) == {'pool_pre_ping': True}
+
+    opcoes = opcoes_engine(
+        _config('postgresql://u:s@localhost/db', DB_STATEMENT_TIMEOUT_MS=15000)
+    )
+    assert opcoes['poolclass'] is PoolMedido
+    assert opcoes['pool_size'] == 1 and opcoes['max_overflow'] == 1
+    assert opcoes['pool_recycle'] == 600
+    assert opcoes['connect_args'] == {'options': '-c statement_timeout=15000'}
+    assert 'connect_args' not in opcoes_engine(
+        _config('sqlite:///arquivo.db', DB_STATEMENT_TIMEOUT_MS=15000)
+    )
+
+
+def test_metricas_registram_uso_overflow_e_timeout(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(uri, **opcoes_engine(_config(uri)))
+    metricas = MetricasPool()
+    metricas.instrumentar(engine)
+
+    primeira = engine.connect()
+    segunda = engine.connect()
+    primeira.execute(text('select 1'))
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    resumo = metricas.resumo()
+    assert resumo['em_uso'] == 2
+    assert resumo['overflow_atual'] == 1
+    assert resumo['conexoes_overflow'] == 1
+    assert resumo['timeouts'] == 1
+
+    segunda.close()
+    primeira.close()
+    resumo = metricas.resumo()
+    assert resumo['em_uso'] == 0
+    assert resumo['pico_em_uso'] == 2
+    assert resumo['checkouts'] == 2
+    assert resumo['espera_ms']['amostras'] == 2
+    assert resumo['espera_ms']['max'] >= resumo['espera_ms']['p50'] >= 0
+
+    engine.dispose()
+    with engine.connect() as conexao:
+        conexao.execute(text('select 1'))
+    assert metricas.resumo()['checkouts'] == 3
+
+
+def test_health_db_pool_descreve_o_pool(monkeypatch):
+    monkeypatch.setenv('SECRET_KEY', 'testing')
+    monkeypatch.setenv('SCHEDULER_ENABLED', '0')
+    app = create_app()
+
+    pool = app.test_client().get('/health/db-pool').get_json()
+    assert pool['pool'] == 'PoolMedido'
+    assert pool['tamanho'] == app.config['DB_POOL_SIZE']
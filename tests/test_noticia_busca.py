@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+from conecta_senai.models import db
+from conecta_senai.models.noticia import Noticia
+from conecta_senai.services import noticia_busca
+
+
+def _criar(titulo, resumo, conteudo, dias=0):
+    noticia = Noticia(
+        titulo=titulo,
+        resumo=resumo,
+        conteudo=conteudo,
+        ativo=True,
+        data_publicacao=datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(days=dias),
+    )
+    db.session.add(noticia)
+    db.session.commit()
+    return noticia
+
+
+def test_busca_ordena_por_relevancia_e_destaca_trecho(app, client):
+    with app.app_context():
+        assert noticia_busca.indice_disponivel() == "sqlite"
+        no_conteudo = _criar(
+            "Agenda da semana", "Eventos gerais", "Haverá palestra sobre robótica <b>educacional</b>.", dias=5
+        )
+        no_titulo = _criar("Robótica na escola", "Competição regional", "Equipes de todo o estado.", dias=1)
+        _criar("Matrículas abertas", "Cursos técnicos", "Inscrições até sexta.", dias=9)
+        ids = [no_titulo.id, no_conteudo.id]
+
+    resposta = client.get("/api/noticias?busca=robotica")
+    assert resposta.status_code == 200
+    dados = resposta.get_json()
+    assert [item["id"] for item in dados["items"]] == ids
+    assert dados["total"] == 2
+    trecho = dados["items"][1]["trecho"]
+    assert "<mark>robótica</mark>" in trecho
+    assert "&lt;b&gt;educacional" in trecho
+
+
+def test_busca_acompanha_alteracoes_e_exclusoes(app, client):
+    with app.app_context():
+        noticia = _criar("Semana da indústria", "Programação", "Oficinas de solda.")
+        noticia.conteudo = "Oficinas de usinagem."
+        db.session.commit()
+        noticia_id = noticia.id
+
+    assert client.get("/api/noticias?busca=solda").get_json()["total"] == 0
+    assert client.get("/api/noticias?busca=usin").get_json()["total"] == 1
+
+    with app.app_context():
+        db.session.delete(db.session.get(Noticia, noticia_id))
+        db.session.commit()
+
+    assert client.get("/api/noticias?busca=usinagem").get_json()["total"] == 0
+
+
+def test_busca_sem_termos_pesquisaveis_usa_like(app, client):
+    with app.app_context():
+        _criar("Resultado 100%", "Aprovação", "Turma concluiu.")
+
+    dados = client.get("/api/noticias?busca=%25").get_json()
+    assert dados["total"] == 1
+    assert dados["items"][0]["trecho"] is None
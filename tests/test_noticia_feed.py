@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+
+from conecta_senai.models import db
+from conecta_senai.models.noticia import Noticia
+from conecta_senai.services import noticia_feed, noticia_service
+from conecta_senai.tasks.jobs.noticias import publicar_noticias_agendadas
+from conecta_senai.utils.cache_http import obter_cache_http
+
+
+def _cache(app):
+    cache = obter_cache_http(app)
+    cache.janela_local = 0
+    return cache
+
+
+def _criar(titulo, **campos):
+    dados = {"titulo": titulo, "conteudo": "Conteúdo", "data_publicacao": datetime.now(timezone.utc), **campos}
+    return noticia_service.criar_noticia(dados)
+
+
+def test_feed_publico_servido_do_cache_com_etag(app, client):
+    cache = _cache(app)
+    with app.app_context():
+        _criar("Primeira")
+
+    resposta = client.get("/api/noticias?page=1&per_page=6")
+    assert resposta.status_code == 200
+    assert resposta.headers["Cache-Control"] == "public, no-cache"
+    etag = resposta.headers["ETag"]
+
+    # Mesma combinação em outra ordem e com parâmetros ignorados pela rota.
+    repetida = client.get("/api/noticias?per_page=6&ano=2026&page=1")
+    assert repetida.headers["ETag"] == etag
+    assert repetida.get_json() == resposta.get_json()
+
+    revalidacao = client.get("/api/noticias?page=1&per_page=6", headers={"If-None-Match": etag})
+    assert revalidacao.status_code == 304
+    assert (cache.acertos, cache.falhas, cache.nao_modificados) == (1, 1, 1)
+
+
+def test_gravacoes_e_jobs_invalidam_o_feed(app, client):
+    _cache(app)
+    with app.app_context():
+        noticia = _criar("Original", destaque=True)
+        noticia_id = noticia.id
+
+    etag = client.get("/api/noticias?destaque=true&per_page=5").headers["ETag"]
+
+    with app.app_context():
+        noticia_service.atualizar_noticia(db.session.get(Noticia, noticia_id), {"titulo": "Alterada"})
+    resposta = client.get("/api/noticias?destaque=true&per_page=5")
+    assert resposta.headers["ETag"] != etag
+    assert resposta.get_json()["items"][0]["titulo"] == "Alterada"
+    etag = resposta.headers["ETag"]
+
+    with app.app_context():
+        db.session.add(Noticia(titulo="Agendada", conteudo="Conteúdo", ativo=False, destaque=True,
+                               data_publicacao=datetime(2020, 1, 1, tzinfo=timezone.utc)))
+        db.session.commit()
+        noticia_service.publicar_noticias_agendadas()
+    resposta = client.get("/api/noticias?destaque=true&per_page=5")
+    assert resposta.headers["ETag"] != etag
+    assert resposta.get_json()["total"] == 2
+
+
+def test_busca_e_listagens_administrativas_nao_usam_o_cache(app, client):
+    _cache(app)
+    with app.app_context():
+        _criar("Visível")
+        assert noticia_feed.chave_feed(noticia_feed.NOTICIAS_FEED_PAGINAS + 1, 6, None, None) is None
+
+    assert "ETag" not in client.get("/api/noticias?busca=visivel").headers
+    assert "ETag" not in client.get("/api/noticias?include_inativas=true").headers
+    assert "ETag" not in client.get(f"/api/noticias?page={noticia_feed.NOTICIAS_FEED_PAGINAS + 1}").headers
+
+
+def test_job_de_publicacao_aquece_o_feed(app, client):
+    cache = _cache(app)
+    with app.test_request_context():
+        _criar("Aquecida", destaque=True, marcar_calendario=True)
+        publicar_noticias_agendadas()
+    assert cache.falhas == len(noticia_feed.FEED_AQUECIMENTO)
+
+    for consulta in ("per_page=6&page=1", "destaque=true&per_page=5", "calendario=true&per_page=100"):
+        assert client.get(f"/api/noticias?{consulta}").status_code == 200
+    assert cache.falhas == len(noticia_feed.FEED_AQUECIMENTO)
+    assert cache.acertos == 3
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 import io
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
 from flask import current_app
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.orm.attributes import LoaderCallableStatus
 from werkzeug.datastructures import FileStorage
 
@@ -190,3 +190,54 @@ def test_criar_noticia_persiste_data_evento(app):
         assert recuperada is not None
         assert recuperada.data_evento is not None
         assert recuperada.data_evento.replace(tzinfo=None) == esperado_naive
+
+
+def _dias_uteis_entre(inicio, fim, feriados=()):
+    dias, dia = 0, inicio
+    while dia < fim:
+        if dia.weekday() < 5 and dia not in feriados:
+            dias += 1
+        dia += timedelta(days=1)
+    return dias
+
+
+def test_limite_destaque_equivale_a_contagem_de_dias_uteis(app):
+    feriados = {date(2026, 11, 2)}
+    app.config["FERIADOS"] = ["2026-11-02"]
+    with app.app_context():
+        for deslocamento in range(14):
+            agora = datetime(2026, 10, 28, 15, tzinfo=timezone.utc) + timedelta(days=deslocamento)
+            limite = noticia_service.limite_destaque(agora)
+            for dias_atras in range(1, 20):
+                publicacao = (agora - timedelta(days=dias_atras)).replace(hour=12)
+                expirada = _dias_uteis_entre(publicacao.date(), agora.date(), feriados) >= 5
+                assert (publicacao < limite) is expirada, (agora, publicacao)
+
+
+def test_jobs_de_noticias_atualizam_em_lote(app):
+    with app.app_context():
+        agora = datetime.now(timezone.utc)
+        db.session.add_all(
+            Noticia(titulo=f"N{i}", conteudo="C", ativo=False, destaque=True,
+                    data_publicacao=agora - timedelta(days=30))
+            for i in range(20)
+        )
+        db.session.commit()
+        db.session.expunge_all()
+
+        instrucoes = []
+
+        def registrar(conn, cursor, statement, *args):
+            instrucoes.append(statement.split()[0].upper())
+
+        event.listen(db.engine, "before_cursor_execute", registrar)
+        try:
+            publicacao = noticia_service.publicar_noticias_agendadas()
+            destaques = noticia_service.remover_destaques_expirados()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", registrar)
+
+        assert publicacao == {"total": 20, "publicadas": 20, "falhas": 0}
+        assert destaques == {"total": 20, "ajustados": 20, "falhas": 0}
+        assert instrucoes.count("UPDATE") == 2
+        assert Noticia.query.filter_by(ativo=True, destaque=False).count() == 20
@@ -0,0 +1,78 @@
+"""Testes da geração de lembretes de agendamentos."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from conecta_senai.models import db
+from conecta_senai.models.agendamento import Agendamento, Notificacao
+from conecta_senai.models.user import User
+from conecta_senai.services.notificacao_service import (
+    _insert_ignorando_duplicatas,
+    criar_notificacoes_agendamentos_proximos,
+)
+
+
+def _agendar(usuario_id, data, laboratorio='Lab 1'):
+    agendamento = Agendamento(
+        data=data,
+        laboratorio=laboratorio,
+        turma='T1',
+        turno='Manhã',
+        horarios=['08:00'],
+        usuario_id=usuario_id,
+    )
+    db.session.add(agendamento)
+    return agendamento
+
+
+def test_lembretes_criados_em_lote_e_idempotentes(app):
+    with app.app_context():
+        usuario_id = User.query.filter_by(email='usuario@example.com').first().id
+        hoje = datetime.utcnow().date()
+        proximos = [_agendar(usuario_id, hoje, f'Lab {i}') for i in range(5)]
+        _agendar(usuario_id, hoje + timedelta(days=10))
+        db.session.commit()
+
+        consultas = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            consultas.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            assert criar_notificacoes_agendamentos_proximos() == 5
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+        assert len([c for c in consultas if c.lstrip().upper().startswith(('SELECT', 'INSERT'))]) == 2
+
+        assert criar_notificacoes_agendamentos_proximos() == 0
+        assert Notificacao.query.count() == 5
+        notificacao = Notificacao.query.filter_by(agendamento_id=proximos[0].id).one()
+        assert notificacao.mensagem == (
+            f"Lembrete: Você tem um agendamento para Lab 0 em {hoje.strftime('%d/%m/%Y')}"
+        )
+
+        notificacao.lida = True
+        db.session.commit()
+        assert criar_notificacoes_agendamentos_proximos() == 1
+
+
+def test_lembrete_duplicado_ignorado_pelo_indice(app):
+    with app.app_context():
+        usuario_id = User.query.filter_by(email='usuario@example.com').first().id
+        agendamento = _agendar(usuario_id, datetime.utcnow().date())
+        db.session.commit()
+        # Simula outra instância do agendador gravando o lembrete primeiro.
+        db.session.add(Notificacao(usuario_id, 'Outro lembrete', agendamento.id))
+        db.session.commit()
+
+        stmt = _insert_ignorando_duplicatas('sqlite').values([{
+            'usuario_id': usuario_id,
+            'agendamento_id': agendamento.id,
+            'mensagem': 'Lembrete',
+            'lida': False,
+        }])
+        assert db.session.execute(stmt).rowcount == 0
+        db.session.commit()
+        assert Notificacao.query.filter_by(agendamento_id=agendamento.id).count() == 1
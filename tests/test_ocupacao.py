@@ -1,6 +1,6 @@
 import os
 import sys
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 import jwt
 
 import pytest
@@ -11,7 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from conecta_senai.models import db
 from conecta_senai.models.sala import Sala
 from conecta_senai.models.user import User
-from conecta_senai.models.ocupacao import Ocupacao
+from conecta_senai.models.ocupacao import Ocupacao, TURNOS_PADRAO
 from conecta_senai.routes.ocupacao import ocupacao_bp
 
 @pytest.fixture
@@ -278,6 +278,42 @@ def test_calendario_ocupacoes_cor_por_turno(client, app):
     assert evento['backgroundColor'] == '#512DA8'
     assert evento['borderColor'] == '#512DA8'
     assert evento['extendedProps']['turno'] == 'Noite'
+    assert evento['extendedProps']['situacao_turno'] == 'cheio'
+
+
+def test_calendario_situacao_turno_ignora_filtros(client, app):
+    with app.app_context():
+        db.session.add(Sala(nome='Sala Extra', capacidade=10))
+        db.session.commit()
+        salas = [sala.id for sala in Sala.query.order_by(Sala.id)]
+        user = User.query.first()
+        token = jwt.encode({
+            'user_id': user.id,
+            'nome': user.nome,
+            'perfil': user.tipo,
+            'exp': datetime.utcnow() + timedelta(hours=1)
+        }, app.config['SECRET_KEY'], algorithm='HS256')
+    headers = {'Authorization': f'Bearer {token}'}
+    hoje = date.today()
+
+    for sala_id in salas:
+        resp = client.post('/api/ocupacoes', json={
+            'sala_id': sala_id,
+            'curso_evento': 'Turno lotado',
+            'data_inicio': hoje.isoformat(),
+            'data_fim': hoje.isoformat(),
+            'turno': 'Noite'
+        }, headers=headers)
+        assert resp.status_code == 201
+
+    resp = client.get('/api/ocupacoes/calendario', query_string={
+        'data_inicio': hoje.isoformat(),
+        'data_fim': hoje.isoformat(),
+        'sala_id': salas[0],
+    }, headers=headers)
+    eventos = resp.get_json()
+    assert len(eventos) == 1
+    assert eventos[0]['extendedProps']['situacao_turno'] == 'cheio'
 
 
 def test_resumo_periodo_endpoint(client, app):
@@ -313,6 +349,9 @@ def test_resumo_periodo_endpoint(client, app):
     dia = resumo[hoje.isoformat()]
     assert 'Manhã' in dia
     assert dia['Manhã']['ocupadas'] == 1
+    assert dia['Manhã']['salas_livres'] == []
+    assert dia['Manhã']['salas_ocupadas'][0]['sala_nome'] == 'Sala Teste'
+    assert dia['Tarde']['salas_livres'] == ['Sala Teste']
 
 
 def test_criar_ocupacao_dados_incompletos(client, app):
@@ -353,3 +392,121 @@ def test_atualizar_ocupacao_turno_invalido(client, app):
     ocupacao_id = r.get_json()[0]['id']
     resp = client.put(f'/api/ocupacoes/{ocupacao_id}', json={'turno': 'X'}, headers={'Authorization': f'Bearer {token}'})
     assert resp.status_code == 400
+
+
+def test_conflitos_periodo_detectados_em_criacao_e_verificacao(client, app):
+    with app.app_context():
+        user = User.query.first()
+        sala = Sala.query.first()
+    token = jwt.encode({
+        'user_id': user.id,
+        'nome': user.nome,
+        'perfil': user.tipo,
+        'exp': datetime.utcnow() + timedelta(hours=1)
+    }, app.config['SECRET_KEY'], algorithm='HS256')
+    headers = {'Authorization': f'Bearer {token}'}
+
+    hoje = date.today()
+    r = client.post('/api/ocupacoes', json={
+        'sala_id': sala.id,
+        'curso_evento': 'Existente',
+        'data_inicio': (hoje + timedelta(days=2)).isoformat(),
+        'data_fim': (hoje + timedelta(days=3)).isoformat(),
+        'turno': 'Tarde'
+    }, headers=headers)
+    assert r.status_code == 201
+    ids_existentes = sorted(o['id'] for o in r.get_json())
+
+    resp = client.post('/api/ocupacoes', json={
+        'sala_id': sala.id,
+        'curso_evento': 'Nova',
+        'data_inicio': hoje.isoformat(),
+        'data_fim': (hoje + timedelta(days=10)).isoformat(),
+        'turno': 'Tarde'
+    }, headers=headers)
+    assert resp.status_code == 409
+    assert [c['id'] for c in resp.get_json()['conflitos']] == ids_existentes
+
+    resp_manha = client.get('/api/ocupacoes/verificar-disponibilidade', query_string={
+        'sala_id': sala.id,
+        'data_inicio': hoje.isoformat(),
+        'data_fim': (hoje + timedelta(days=10)).isoformat(),
+        'turno': 'Manhã'
+    }, headers=headers)
+    assert resp_manha.get_json()['disponivel'] is True
+
+    resp_tarde = client.get('/api/ocupacoes/verificar-disponibilidade', query_string={
+        'sala_id': sala.id,
+        'data_inicio': hoje.isoformat(),
+        'data_fim': (hoje + timedelta(days=10)).isoformat(),
+        'turno': 'Tarde'
+    }, headers=headers)
+    dados = resp_tarde.get_json()
+    assert dados['disponivel'] is False
+    assert [c['id'] for c in dados['conflitos']] == ids_existentes
+
+
+def test_to_dict_serializador_compilado(app):
+    from conecta_senai.models.mixins import compilar_serializador
+
+    with app.app_context():
+        user = User.query.first()
+        sala = Sala.query.first()
+        ocupacao = Ocupacao(
+            sala_id=sala.id,
+            usuario_id=user.id,
+            curso_evento='Noturno',
+            data=date(2025, 3, 3),
+            horario_inicio='22:00',
+            horario_fim='01:30',
+            tipo_ocupacao='reuniao',
+        )
+        db.session.add(ocupacao)
+        db.session.commit()
+
+        dados = ocupacao.to_dict()
+        assert dados['data'] == '2025-03-03'
+        assert dados['horario_inicio'] == '22:00'
+        assert dados['duracao_minutos'] == 210
+        assert dados['dia_semana'] == 'segunda'
+        assert dados['turno'] is None
+        assert dados['cor_tipo'] == '#00539F'
+        assert dados['sala_nome'] == 'Sala Teste'
+        assert dados['usuario_nome'] == 'Test'
+        assert 'instrutor_nome' not in dados
+
+        resumo = ocupacao.to_dict(include_relations=False, campos=('id', 'data'))
+        assert list(resumo)[:2] == ['id', 'data']
+        assert 'curso_evento' not in resumo and 'sala_nome' not in resumo
+        assert compilar_serializador(Ocupacao, ['id', 'data']) is compilar_serializador(Ocupacao, ('id', 'data'))
+        assert compilar_serializador(Ocupacao) is compilar_serializador(Ocupacao)
+
+
+def test_grade_disponibilidade_salas_livres_e_situacao():
+    from conecta_senai.services.ocupacao_grade_service import GradeDisponibilidade
+
+    inicio = date(2025, 3, 3)
+    manha = TURNOS_PADRAO['Manhã']
+    grade = GradeDisponibilidade([(1, 'A'), (2, 'B'), (5, 'C')], inicio, inicio + timedelta(days=1))
+    assert grade.marcar(inicio, *manha, 2, {'sala_id': 2})
+    assert not grade.marcar(inicio, time(9, 0), time(10, 0), 1)
+    assert not grade.marcar(inicio + timedelta(days=2), *manha, 1)
+
+    resumo = grade.resumo()
+    assert list(resumo) == ['2025-03-03', '2025-03-04']
+    celula = resumo['2025-03-03']['Manhã']
+    assert celula['salas_livres'] == ['A', 'C']
+    assert celula['salas_ocupadas'] == [{'sala_id': 2}]
+    assert (celula['ocupadas'], celula['livres']) == (1, 2)
+    assert resumo['2025-03-03']['Tarde']['salas_livres'] == ['A', 'B', 'C']
+    assert grade.situacao(inicio, 'Manhã') == 'parcial'
+    assert grade.situacao(inicio, 'Noite') == 'livre'
+
+    # Mais ocupações da mesma sala ou de salas fora da grade não enchem o turno.
+    grade.marcar(inicio, *manha, 2)
+    grade.marcar(inicio, *manha, 9)
+    assert grade.situacao(inicio, 'Manhã') == 'parcial'
+
+    grade.marcar(inicio, *manha, 1)
+    grade.marcar(inicio, *manha, 5)
+    assert grade.situacao(inicio, 'Manhã') == 'cheio'
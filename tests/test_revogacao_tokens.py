@@ -0,0 +1,65 @@
+import time
+
+from conecta_senai.config.redis import BloomFilter, DummyRedis, RevogacaoTokens, revogacao
+from conecta_senai.models.user import User
+from conecta_senai.routes.user import gerar_token_acesso
+
+
+def fetch_csrf(client):
+    return client.get('/api/csrf-token').get_json()['csrf_token']
+
+
+def test_bloom_filter_sem_falso_negativo():
+    filtro = BloomFilter(1000, 0.01)
+    itens = [f'jti-{i}' for i in range(1000)]
+    for item in itens:
+        filtro.add(item)
+    assert all(item in filtro for item in itens)
+    falsos = sum(f'outro-{i}' in filtro for i in range(10000))
+    assert falsos < 300
+
+
+def test_logout_revoga_token(client, app):
+    with app.app_context():
+        user = User.query.filter_by(email='admin@example.com').first()
+        token = gerar_token_acesso(user)
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.get('/api/usuarios', headers=headers).status_code == 200
+
+    resp = client.post('/api/logout', headers={**headers, 'X-CSRFToken': fetch_csrf(client)}, json={})
+    assert resp.status_code == 200
+
+    resp = client.get('/api/usuarios', headers=headers)
+    assert resp.status_code == 401
+    assert resp.get_json()['erro'] == 'Token has been revoked'
+
+
+def test_tokens_validos_nao_consultam_redis(client, login_admin):
+    token, _ = login_admin(client)
+    headers = {'Authorization': f'Bearer {token}'}
+    antes = revogacao.consultas_redis
+    for _ in range(3):
+        assert client.get('/api/usuarios', headers=headers).status_code == 200
+    assert revogacao.consultas_redis == antes
+
+
+def test_revogacao_em_outro_processo_chega_na_sincronizacao():
+    cliente = DummyRedis()
+    worker_a = RevogacaoTokens(cliente, capacidade=100, intervalo_sync=60)
+    worker_b = RevogacaoTokens(cliente, capacidade=100, intervalo_sync=60)
+    assert worker_b.esta_revogado('abc') is False
+
+    worker_a.revogar('abc', time.time() + 60)
+    assert worker_a.esta_revogado('abc') is True
+
+    worker_b.sincronizar()
+    assert worker_b.esta_revogado('abc') is True
+    assert worker_b.esta_revogado('xyz') is False
+
+
+def test_revogacao_ignora_tokens_expirados():
+    cliente = DummyRedis()
+    registro = RevogacaoTokens(cliente, capacidade=100, intervalo_sync=0)
+    registro.revogar('velho', time.time() - 1)
+    assert registro.esta_revogado('velho') is False
+    assert cliente.zrangebyscore('tokens_revogados', '-inf', '+inf') == []
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+
+from conecta_senai.models import db
+from conecta_senai.models.suporte_basedados import SuporteTipoEquipamento
+from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.services.suporte_indicadores_service import (
+    calcular_indicadores,
+    ler_filtros_indicadores,
+)
+
+
+def _chamado(tipo_id, nivel, status, criado, atendimento_h=None, encerramento_h=None, area='TI'):
+    return SuporteChamado(
+        email='a@example.com',
+        area=area,
+        tipo_equipamento_id=tipo_id,
+        descricao_problema='x',
+        nivel_urgencia=nivel,
+        status=status,
+        created_at=criado,
+        inicio_atendimento_at=criado + timedelta(hours=atendimento_h) if atendimento_h is not None else None,
+        encerrado_at=criado + timedelta(hours=encerramento_h) if encerramento_h is not None else None,
+    )
+
+
+def test_indicadores_agregados_em_uma_consulta(app):
+    with app.app_context():
+        tipo = SuporteTipoEquipamento(nome='Notebook')
+        db.session.add(tipo)
+        db.session.flush()
+        base = datetime(2025, 3, 10, 9, 0)
+        db.session.add_all([
+            _chamado(tipo.id, 'Alto', 'Finalizado', base, 2, 10),
+            _chamado(tipo.id, 'Alto', 'Em Atendimento', base, 30),
+            _chamado(tipo.id, 'Baixo', 'Aberto', base),
+            _chamado(tipo.id, 'Baixo', 'Finalizado', base, 4, 8, area='Ensino'),
+        ])
+        db.session.commit()
+
+        dados = calcular_indicadores(ler_filtros_indicadores({}))
+        assert dados['total_chamados'] == 4
+        assert {'status': 'Finalizado', 'quantidade': 2} in dados['por_status']
+        assert dados['por_tipo_equipamento'] == [{'tipo': 'Notebook', 'quantidade': 4}]
+        assert round(dados['tempo_medio_abertura_para_atendimento_segundos']) == 12 * 3600
+        assert round(dados['tempo_medio_abertura_para_encerramento_segundos']) == 9 * 3600
+        assert dados['percentual_atendidos_em_24h'] == round(2 / 3 * 100, 2)
+        alto = next(item for item in dados['tempo_medio_por_urgencia'] if item['nivel'] == 'Alto')
+        assert round(alto['tempo_atendimento']) == 16 * 3600
+        medio = next(item for item in dados['tempo_medio_por_urgencia'] if item['nivel'] == 'Médio')
+        assert medio['tempo_atendimento'] == 0
+
+        filtrado = calcular_indicadores(ler_filtros_indicadores({'area': 'Ensino', 'tipo_equipamento_id': 'x'}))
+        assert filtrado['total_chamados'] == 1
+        assert filtrado['percentual_atendidos_em_24h'] == 100
+
+
+def test_rollup_incremental_equivale_a_consulta_direta(app):
+    from conecta_senai.models.suporte_indicador_diario import SuporteIndicadorDiario
+    from conecta_senai.services.suporte_rollup_service import (
+        contribuicao_chamado,
+        reconstruir_rollup,
+        registrar_alteracao,
+    )
+
+    with app.app_context():
+        tipo = SuporteTipoEquipamento(nome='Impressora')
+        db.session.add(tipo)
+        db.session.flush()
+        base = datetime(2025, 4, 1, 8, 0)
+        chamados = [
+            _chamado(tipo.id, 'Alto', 'Aberto', base),
+            _chamado(tipo.id, 'Baixo', 'Aberto', base + timedelta(days=1)),
+            _chamado(tipo.id, 'Médio', 'Em Atendimento', base + timedelta(days=2), 3),
+        ]
+        for chamado in chamados:
+            db.session.add(chamado)
+            db.session.flush()
+            registrar_alteracao(None, chamado)
+        db.session.commit()
+
+        anterior = contribuicao_chamado(chamados[0])
+        chamados[0].status = 'Finalizado'
+        chamados[0].inicio_atendimento_at = base + timedelta(hours=30)
+        chamados[0].encerrado_at = base + timedelta(hours=40)
+        registrar_alteracao(anterior, chamados[0])
+        registrar_alteracao(contribuicao_chamado(chamados[1]), None)
+        db.session.delete(chamados[1])
+        db.session.commit()
+
+        filtros = ler_filtros_indicadores({'data_inicio': '2025-04-01', 'data_fim': '2025-04-30'})
+        incremental = calcular_indicadores(filtros, usar_rollup=True)
+        direto = calcular_indicadores(filtros, usar_rollup=False)
+        assert incremental == direto
+        assert incremental['total_chamados'] == 2
+        assert incremental['percentual_atendidos_em_24h'] == 50
+
+        linhas_incrementais = SuporteIndicadorDiario.query.count()
+        assert reconstruir_rollup() == linhas_incrementais
+        assert calcular_indicadores(filtros) == direto
+
+
+def test_rollup_soma_na_mesma_linha_com_chave_vazia(app):
+    from conecta_senai.models.suporte_indicador_diario import SuporteIndicadorDiario
+    from conecta_senai.services.suporte_rollup_service import consultar_rollup, registrar_alteracao
+
+    with app.app_context():
+        criado = datetime(2025, 5, 2, 9, 0)
+        # Chamados legados sem status: a chave usa o valor vazio, não NULL.
+        for atendimento_h in (None, 2):
+            registrar_alteracao(None, _chamado(7, 'Alto', None, criado, atendimento_h))
+        db.session.commit()
+
+        linha = SuporteIndicadorDiario.query.one()
+        assert linha.status == SuporteIndicadorDiario.CHAVE_VAZIA['status']
+        assert (linha.quantidade, linha.atendidos, linha.soma_atendimento_segundos) == (2, 1, 7200)
+
+        registrar_alteracao(None, _chamado(7, 'Alto', 'Aberto', criado))
+        db.session.commit()
+        assert SuporteIndicadorDiario.query.count() == 2
+
+        status = {linha[0]: linha[3] for linha in consultar_rollup({})}
+    assert status == {None: 2, 'Aberto': 1}
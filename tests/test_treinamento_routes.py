@@ -64,3 +64,71 @@ def test_atualizar_turma_ativa_permitido(client, app):
     )
     assert resp_up.status_code == 200
     assert resp_up.get_json()['local_realizacao'] == 'Nova'
+
+
+def test_listagens_de_turmas_por_periodo(client, app):
+    from sqlalchemy import event
+    from conecta_senai.models import db, Treinamento, TurmaTreinamento
+    from conecta_senai.models.instrutor import Instrutor
+
+    headers = admin_headers(app)
+    hoje = datetime.utcnow().date()
+    with app.app_context():
+        treino = Treinamento(nome='Listagem', codigo='L1', tem_pratica=True)
+        instrutor = Instrutor(nome='Instrutor L', email='l@example.com', disponibilidade=['manha'])
+        db.session.add_all([treino, instrutor])
+        db.session.flush()
+        for i in range(6):
+            db.session.add(TurmaTreinamento(
+                treinamento_id=treino.id,
+                data_inicio=hoje - timedelta(days=30 + i),
+                data_fim=hoje - timedelta(days=20 + i),
+                instrutor_id=instrutor.id if i % 2 else None,
+            ))
+        db.session.add(TurmaTreinamento(
+            treinamento_id=treino.id,
+            data_inicio=hoje + timedelta(days=5),
+            data_fim=hoje + timedelta(days=6),
+            instrutor_id=instrutor.id,
+        ))
+        db.session.commit()
+        esperado = {
+            t.id: {
+                'treinamento': t.treinamento.to_dict(),
+                'instrutor': t.instrutor.to_dict() if t.instrutor else None,
+            }
+            for t in TurmaTreinamento.query.all()
+        }
+        engine = db.engine
+
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    client.get('/api/treinamentos/historico', headers=headers)
+    event.listen(engine, 'before_cursor_execute', registrar)
+    try:
+        resp = client.get('/api/treinamentos/historico', headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', registrar)
+    historico = resp.get_json()
+    assert len(historico) == 6
+    assert len(consultas) == 1
+    for item in historico:
+        assert item['treinamento'] == esperado[item['turma_id']]['treinamento']
+        assert item['instrutor'] == esperado[item['turma_id']]['instrutor']
+        assert item['has_pratica'] is True
+
+    agendadas = client.get('/api/treinamentos/agendadas', headers=headers).get_json()
+    assert [a['instrutor_nome'] for a in agendadas] == ['Instrutor L']
+
+    pagina = client.get('/api/treinamentos/historico?page=2&per_page=4', headers=headers).get_json()
+    assert pagina['total'] == 6 and pagina['pages'] == 2
+    assert [i['turma_id'] for i in pagina['items']] == [i['turma_id'] for i in historico[4:]]
+
+    etag = resp.headers['ETag']
+    resp_304 = client.get(
+        '/api/treinamentos/historico', headers={**headers, 'If-None-Match': etag}
+    )
+    assert resp_304.status_code == 304
@@ -594,3 +594,43 @@ def test_register_page_sets_csrf_cookie(client):
     resp_post = client.post('/api/registrar', json=data, headers={'X-CSRFToken': token})
     assert resp_post.status_code == 201
     assert resp_post.get_json()['mensagem'] == 'Usuário registrado com sucesso'
+
+
+def test_autenticacao_reutiliza_usuario_em_cache(client, login_admin):
+    from sqlalchemy import event
+
+    token, _ = login_admin(client)
+    headers = {'Authorization': f'Bearer {token}'}
+    with client.application.app_context():
+        admin_id = User.query.filter_by(email='admin@example.com').first().id
+        engine = db.engine
+    assert client.get(f'/api/usuarios/{admin_id}', headers=headers).status_code == 200
+
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', registrar)
+    try:
+        resp = client.get(f'/api/usuarios/{admin_id}', headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', registrar)
+    assert resp.status_code == 200
+    assert resp.get_json()['email'] == 'admin@example.com'
+    assert not [c for c in consultas if 'FROM usuarios' in c]
+
+
+def test_atualizar_usuario_invalida_cache_autenticacao(client, login_admin, non_admin_auth_headers):
+    assert client.get('/api/usuarios', headers=non_admin_auth_headers).status_code == 403
+
+    token, _ = login_admin(client)
+    with client.application.app_context():
+        comum_id = User.query.filter_by(email='usuario@example.com').first().id
+    resp = client.put(
+        f'/api/usuarios/{comum_id}',
+        json={'tipo': 'admin'},
+        headers={'Authorization': f'Bearer {token}', 'X-CSRFToken': fetch_csrf(client)},
+    )
+    assert resp.status_code == 200
+    assert client.get('/api/usuarios', headers=non_admin_auth_headers).status_code == 200